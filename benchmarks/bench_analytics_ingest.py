@@ -0,0 +1,122 @@
+"""
+Benchmark: analytics ingestion with raw vs interned User-Agent strings
+
+Writes the same synthetic page-view stream into two scratch databases:
+- before: full User-Agent text on every analytics row
+- after:  User-Agent interned into user_agents, row stores an integer id
+
+Reports rows/second and on-disk bytes per row for each.
+
+Usage: python benchmarks/bench_analytics_ingest.py [rows]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ua_registry import UserAgentCache, classify_user_agent, create_user_agent_table, intern_user_agent
+
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Mobile/15E148 Safari/604.1',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
+    'Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0',
+    'Mozilla/5.0 (Linux; Android 14; SM-S918B) AppleWebKit/537.36 (KHTML, like Gecko) SamsungBrowser/23.0 Chrome/115.0.0.0 Mobile Safari/537.36',
+    'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)',
+    'Mozilla/5.0 (compatible; UptimeRobot/2.0; http://www.uptimerobot.com/)',
+    'Pingdom.com_bot_version_1.4_(http://www.pingdom.com/)',
+    'curl/8.4.0',
+]
+WEIGHTS = [30, 20, 10, 8, 6, 6, 8, 6, 4, 2]
+DOMAINS = ['edgpt.ai', 'gptsites.ai', 'lawfirmgpt.ai', 'cpafirm.ai', 'taxprepgpt.ai', 'businessbrokergpt.ai']
+PATHS = ['/', '/signup', '/conversion', '/login', '/dashboard']
+
+ANALYTICS_DDL = '''
+    CREATE TABLE analytics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        domain TEXT NOT NULL,
+        page_path TEXT NOT NULL,
+        user_agent TEXT,
+        ip_address TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        user_agent_id INTEGER
+    )
+'''
+
+
+def make_events(count, seed=26):
+    rng = random.Random(seed)
+    agents = rng.choices(USER_AGENTS, weights=WEIGHTS, k=count)
+    return [(rng.choice(DOMAINS), rng.choice(PATHS), ua, f'10.0.{rng.randrange(256)}.{rng.randrange(256)}')
+            for ua in agents]
+
+
+def db_bytes(path):
+    conn = sqlite3.connect(path)
+    page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+    page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+    conn.close()
+    return page_size * page_count
+
+
+def run_before(path, events):
+    conn = sqlite3.connect(path)
+    conn.execute(ANALYTICS_DDL)
+    start = time.perf_counter()
+    for domain, page_path, ua, ip in events:
+        conn.execute('INSERT INTO analytics (domain, page_path, user_agent, ip_address) VALUES (?, ?, ?, ?)',
+                     (domain, page_path, ua, ip))
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def run_after(path, events, drop_bots):
+    conn = sqlite3.connect(path)
+    conn.execute(ANALYTICS_DDL)
+    create_user_agent_table(conn)
+    cache = UserAgentCache()
+    stored = 0
+    start = time.perf_counter()
+    for domain, page_path, ua, ip in events:
+        # As log_analytics does: dropped bots are never interned
+        if drop_bots and classify_user_agent(ua)[0]:
+            continue
+        ua_id, _, _ = intern_user_agent(conn, ua, cache=cache)
+        conn.execute('INSERT INTO analytics (domain, page_path, user_agent_id, ip_address) VALUES (?, ?, ?, ?)',
+                     (domain, page_path, ua_id, ip))
+        conn.commit()
+        stored += 1
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed, stored, cache.stats()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    events = make_events(count)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before_path = os.path.join(tmp, 'before.db')
+        elapsed = run_before(before_path, events)
+        before_bytes = db_bytes(before_path)
+        print(f"before (raw UA)        : {count / elapsed:10.0f} rows/s  "
+              f"{before_bytes / count:7.1f} bytes/row  ({count} rows)")
+
+        for label, drop in (('after (interned, keep)', False), ('after (interned, drop)', True)):
+            path = os.path.join(tmp, f'after_{drop}.db')
+            elapsed, stored, stats = run_after(path, events, drop)
+            size = db_bytes(path)
+            print(f"{label:23}: {count / elapsed:10.0f} rows/s  "
+                  f"{size / max(stored, 1):7.1f} bytes/row  ({stored} rows, cache {stats})")
+
+
+if __name__ == '__main__':
+    main()
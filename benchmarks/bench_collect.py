@@ -0,0 +1,94 @@
+"""
+Benchmark: /collect beacon throughput
+
+Posts sendBeacon-style payloads to /collect from several threads through the
+full Flask app (rate limiting off) and reports requests/s, then checks that
+every view reached the analytics table after the final flush. For
+comparison it times the previous per-view path: open a connection, intern
+the User-Agent, INSERT and COMMIT inside the page handler.
+
+Runs against a freshly migrated database in a temporary directory.
+
+Usage: python benchmarks/bench_collect.py [threads] [seconds]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+os.environ['RATE_LIMIT_ENABLED'] = '0'
+
+AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0 Safari/537.36',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 Version/17.0 Mobile Safari/604.1',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_0) Gecko/20100101 Firefox/121.0',
+]
+PATHS = ['/', '/signup', '/conversion']
+
+
+def hammer(threads, seconds, request_once):
+    counts = []
+    deadline = time.perf_counter() + seconds
+
+    def run(worker):
+        n = 0
+        while time.perf_counter() < deadline:
+            request_once(worker, n)
+            n += 1
+        counts.append(n)
+
+    workers = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(counts)
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        from migrations import migrate
+        migrate('edgpt_platform.db')
+        import main as app_module
+        from ua_registry import intern_user_agent
+        app = app_module.app
+        clients = [app.test_client() for _ in range(threads)]
+
+        def beacon(worker, n):
+            response = clients[worker].post('/collect', data=json.dumps({'path': PATHS[n % 3]}), headers={
+                'Host': 'edgpt.ai', 'Content-Type': 'text/plain;charset=UTF-8', 'User-Agent': AGENTS[n % 3]})
+            assert response.status_code == 204
+
+        total = hammer(threads, seconds, beacon)
+        app_module.analytics_batcher.flush()
+        stats = app_module.analytics_batcher.stats
+        conn = sqlite3.connect('edgpt_platform.db')
+        rows = conn.execute('SELECT COUNT(*) FROM analytics').fetchone()[0]
+        conn.close()
+        print(f"/collect, {threads} threads, {seconds:.0f}s: {total / seconds:8.0f} requests/s, "
+              f"{rows} rows written in {stats['flushes']} flushes, {stats['dropped']} dropped")
+
+        def inline_write(worker, n):
+            conn = sqlite3.connect('edgpt_platform.db', timeout=30)
+            ua_id, _, _ = intern_user_agent(conn, AGENTS[n % 3])
+            conn.execute('INSERT INTO analytics (domain, page_path, user_agent_id, ip_address) '
+                         'VALUES (?, ?, ?, ?)', ('edgpt.ai', PATHS[n % 3], ua_id, '127.0.0.1'))
+            conn.commit()
+            conn.close()
+
+        total = hammer(threads, seconds, inline_write)
+        print(f"previous per-view write only (no HTTP): {total / seconds:8.0f} views/s")
+
+
+if __name__ == '__main__':
+    main()
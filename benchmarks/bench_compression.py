@@ -0,0 +1,77 @@
+"""
+Benchmark: response compression per landing page and level
+
+Renders every tenant landing page through the app, then reports for gzip
+levels 1/6/9 and (if installed) brotli qualities 1/4/6/11:
+- compressed bytes per page
+- compression time per page (what the middleware adds to each response)
+
+It also times full requests through CompressionMiddleware at the default
+settings against identity responses.
+
+Runs against a freshly migrated database in a temporary directory.
+
+Usage: python benchmarks/bench_compression.py [repeats]
+"""
+
+import gzip
+import os
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+
+from compression import brotli
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 6, 11)
+
+
+def timed(fn, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        from migrations import migrate
+        migrate('edgpt_platform.db')
+        import main as app_module
+        client = app_module.app.test_client()
+        hosts = sorted(app_module.DOMAIN_TEMPLATES)
+
+        codecs = [(f'gzip-{level}', lambda data, level=level: gzip.compress(data, level, mtime=0))
+                  for level in GZIP_LEVELS]
+        if brotli is not None:
+            codecs += [(f'br-{quality}', lambda data, quality=quality: brotli.compress(data, quality=quality))
+                       for quality in BROTLI_QUALITIES]
+
+        print(f"{'page':22} {'identity':>9} " + ' '.join(f"{name:>16}" for name, _ in codecs))
+        for host in hosts:
+            html = client.get('/', headers={'Host': host}).get_data()
+            cells = []
+            for _, compress in codecs:
+                compressed, seconds = timed(lambda: compress(html), repeats)
+                cells.append(f"{len(compressed):7d}B {seconds * 1000:5.2f}ms")
+            print(f"{host:22} {len(html):8d}B " + ' '.join(f"{cell:>16}" for cell in cells))
+
+        print("full request through the middleware (default settings, best of repeats)")
+        for label, encoding in (('identity', ''), ('gzip', 'gzip'), ('br', 'br')):
+            if encoding == 'br' and brotli is None:
+                continue
+            headers = {'Host': 'edgpt.ai', 'Accept-Encoding': encoding}
+            response, seconds = timed(lambda: client.get('/', headers=headers).get_data(), repeats)
+            print(f"  {label:9} {len(response):8d} bytes {seconds * 1000:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark: custom-domain resolution under mixed Host headers
+
+Fills a scratch database with N custom domains and replays a request mix of
+- known custom hosts (repeat visitors, cache hits after the first request)
+- subdomains of known hosts (www./app. prefixes, parent-domain match)
+- unknown hosts (scanner-style random names, almost never repeated)
+
+For each mix it reports per-lookup latency and how many SQLite queries were
+issued, next to an uncached indexed lookup per request for comparison.
+
+Usage: python benchmarks/bench_custom_domains.py [domains]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from custom_domains import (CustomDomainResolver, add_ownership_columns, candidate_hosts,
+                            create_custom_domain_table, normalize_host)
+from tenant_registry import TenantRegistry, create_tenant_tables
+
+LOOKUPS = 50000
+
+
+def populate(path, count):
+    conn = sqlite3.connect(path)
+    create_tenant_tables(conn)
+    create_custom_domain_table(conn)
+    add_ownership_columns(conn)
+    conn.execute("INSERT INTO tenants (domain, template, signup_template, config) VALUES "
+                 "('edgpt.ai', 'enhanced_landing_with_slideshow.html', 'fixed_signup_template.html', '{}')")
+    conn.executemany('INSERT INTO custom_domains (host, tenant_domain, status) VALUES (?, ?, ?)',
+                     ((f'chat.school{i}.org', 'edgpt.ai', 'verified') for i in range(count)))
+    conn.commit()
+    conn.close()
+
+
+def uncached_resolve(path):
+    """One indexed query per request: what every lookup costs without the cache"""
+    conn = sqlite3.connect(path)
+
+    def resolve(host):
+        possible = candidate_hosts(normalize_host(host))
+        placeholders = ', '.join('?' * len(possible))
+        row = conn.execute(f'''
+            SELECT tenant_domain FROM custom_domains
+            WHERE host IN ({placeholders}) AND status = 'verified'
+            ORDER BY LENGTH(host) DESC LIMIT 1
+        ''', possible).fetchone()
+        return row[0] if row else None
+    return resolve
+
+
+def run(label, resolver, hosts):
+    resolver.cache.clear()
+    before = dict(resolver.stats)
+    start = time.perf_counter()
+    for host in hosts:
+        resolver.resolve(host)
+    elapsed = time.perf_counter() - start
+    queries = resolver.stats['queries'] - before['queries']
+    filtered = resolver.stats['filtered'] - before['filtered']
+    print(f"  {label:28} {elapsed / len(hosts) * 1e6:8.2f} us/lookup "
+          f"{queries:7d} queries {filtered:7d} filtered")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(32)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'domains.db')
+        populate(path, count)
+        registry = TenantRegistry(path)
+
+        start = time.perf_counter()
+        resolver = CustomDomainResolver(path, registry)
+        print(f"{count} custom domains: prefilter load {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        # Visitors concentrate on a few thousand sites; scanners never repeat
+        popular = [f'chat.school{rng.randrange(count)}.org' for _ in range(2000)]
+        known = [rng.choice(popular) for _ in range(LOOKUPS)]
+        subdomain = [f"{rng.choice(('www.', 'app.', 'm.'))}{rng.choice(popular)}:443" for _ in range(LOOKUPS)]
+        unknown = [f'{rng.getrandbits(40):x}.scan{rng.randrange(10 ** 6)}.net' for _ in range(LOOKUPS)]
+        mixed = known[:LOOKUPS // 2] + subdomain[:LOOKUPS // 4] + unknown[:LOOKUPS // 4]
+        rng.shuffle(mixed)
+
+        print(f"CustomDomainResolver ({LOOKUPS} lookups each)")
+        run('known hosts', resolver, known)
+        run('subdomains of known hosts', resolver, subdomain)
+        run('unknown (scanner) hosts', resolver, unknown)
+        run('mixed 50/25/25', resolver, mixed)
+
+        print("indexed query per request (no cache)")
+        resolve = uncached_resolve(path)
+        for label, hosts in (('known hosts', known), ('subdomains of known hosts', subdomain),
+                             ('unknown (scanner) hosts', unknown), ('mixed 50/25/25', mixed)):
+            start = time.perf_counter()
+            for host in hosts:
+                resolve(host)
+            elapsed = time.perf_counter() - start
+            print(f"  {label:28} {elapsed / len(hosts) * 1e6:8.2f} us/lookup {len(hosts):7d} queries")
+
+
+if __name__ == '__main__':
+    main()
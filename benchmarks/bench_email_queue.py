@@ -0,0 +1,101 @@
+"""
+Benchmark: outbound email queue throughput against a local SMTP stand-in
+
+Starts email_queue.SMTPSink on a free port, queues N messages spread over
+T tenants and drains them with EmailWorker:
+- reused connections (MESSAGES_PER_CONNECTION as configured)
+- a new connection per message, like sending inline from each request
+- reused connections with the sink refusing a share of messages with 451
+  (retries are made due immediately and drained until the queue is empty)
+
+Reports messages/s, SMTP connections opened and outcomes. Then queues D
+digest items per tenant and shows how many messages the digests become.
+
+Runs against a freshly migrated database in a temporary directory.
+
+Usage: python benchmarks/bench_email_queue.py [messages] [tenants] [senders]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+
+import email_queue
+from migrations import migrate
+
+
+def fill(conn, messages, tenants):
+    conn.execute('BEGIN')
+    for i in range(messages):
+        email_queue.enqueue(conn, f'tenant{i % tenants}.edgpt.ai', f'user{i}@example.com',
+                            f'Message {i}', 'Hello from the benchmark.\n' * 20)
+    conn.execute('COMMIT')
+
+
+def run(label, database, sink, messages, tenants, senders, fail_rate=0.0):
+    conn = email_queue.connect(database)
+    conn.execute('DELETE FROM email_outbox')
+    fill(conn, messages, tenants)
+    sink.messages = sink.connections = 0
+    sink.fail_rate = fail_rate
+
+    transport = lambda: email_queue.SMTPTransport('127.0.0.1', sink.server_address[1])
+    counts = {}
+    connections = 0
+    start = time.perf_counter()
+    while True:
+        worker = email_queue.EmailWorker(database, senders=senders, transport=transport,
+                                         tenant_rate=1000000)
+        for outcome, count in worker.drain().items():
+            counts[outcome] = counts.get(outcome, 0) + count
+        connections += worker.connections
+        # Make retries due now instead of waiting out the backoff
+        if not conn.execute("UPDATE email_outbox SET next_attempt_at = 0 WHERE status = 'pending'").rowcount:
+            break
+    elapsed = time.perf_counter() - start
+    sent = counts.get(email_queue.SENT, 0)
+    print(f"{label:28} {sent / elapsed:7.0f} msgs/s  {connections:5d} connections  "
+          f"{sink.messages:6d} accepted  {counts}")
+    conn.close()
+
+
+def main():
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    tenants = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    senders = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        database = 'edgpt_platform.db'
+        migrate(database)
+        sink = email_queue.SMTPSink(port=0)
+        threading.Thread(target=sink.serve_forever, daemon=True).start()
+        print(f"{messages} messages over {tenants} tenants, {senders} sender threads")
+
+        run('reused connections', database, sink, messages, tenants, senders)
+        per_connection = email_queue.MESSAGES_PER_CONNECTION
+        email_queue.MESSAGES_PER_CONNECTION = 1
+        run('connection per message', database, sink, messages, tenants, senders)
+        email_queue.MESSAGES_PER_CONNECTION = per_connection
+        run('reused, 10% 451 replies', database, sink, messages, tenants, senders, fail_rate=0.1)
+
+        conn = email_queue.connect(database)
+        items = 200
+        conn.execute('BEGIN')
+        for i in range(items * tenants):
+            email_queue.add_digest_item(conn, f'tenant{i % tenants}.edgpt.ai', 'admin@edgpt.ai',
+                                        'new_trial', f'Signup {i}')
+        conn.execute('COMMIT')
+        built = email_queue.build_digests(conn, window=0)
+        print(f"digests: {items * tenants} items -> {built} messages")
+        conn.close()
+        sink.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: /health/ready under aggressive polling
+
+Polls /health/ready from several threads, like a load balancer probing every
+worker every second but much harder, and reports
+- request throughput of the cached endpoint
+- how many times each dependency probe actually ran
+- the cost of one uncached run of every probe, for comparison
+
+Runs against a freshly migrated database in a temporary directory.
+
+Usage: python benchmarks/bench_health_probes.py [threads] [seconds]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        from migrations import migrate
+        migrate('edgpt_platform.db')
+        import main as app_module
+        app = app_module.app
+        probes = app_module.health_probes
+
+        start = time.perf_counter()
+        for probe in probes:
+            probe._run()
+        print(f"one uncached run of all probes: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        counts = []
+        deadline = time.perf_counter() + seconds
+
+        def poll():
+            client = app.test_client()
+            n = 0
+            while time.perf_counter() < deadline:
+                assert client.get('/health/ready').status_code == 200
+                n += 1
+            counts.append(n)
+
+        before = {probe.name: probe.runs for probe in probes}
+        workers = [threading.Thread(target=poll) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        total = sum(counts)
+        print(f"{threads} threads, {seconds:.0f}s: {total} requests, {total / seconds:.0f} requests/s")
+        for probe in probes:
+            print(f"  {probe.name:16} ran {probe.runs - before[probe.name]:4d} times")
+
+
+if __name__ == '__main__':
+    main()
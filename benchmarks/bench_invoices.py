@@ -0,0 +1,74 @@
+"""
+Benchmark: month-end invoice batch, rendered and zipped
+
+Builds N invoices over the six plans and streams them through
+render_batch() and zip_stream() like POST /api/invoices/batch:
+- cold cache, rendered in this process
+- cold cache, rendered by a pool of W processes (spawn start included)
+- warm cache: the same batch again, nothing rendered
+- warm cache with 5% of invoices changed
+
+Reports documents/s, documents rendered and zip size. Uses a temporary
+cache directory.
+
+Usage: python benchmarks/bench_invoices.py [invoices] [workers]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+
+import invoices as invoice_module
+from invoices import PLANS, normalize_invoice, render_batch, zip_stream
+
+
+def build(count, changed=0.0):
+    plans = list(PLANS)
+    batch = []
+    for i in range(count):
+        data = {
+            'number': f'INV-202610-{i:06d}', 'plan': plans[i % len(plans)],
+            'customer_name': f'Riverside School {i}', 'customer_email': f'billing{i}@school{i}.org',
+            'billing_contact': 'Pat Lee', 'billing_title': 'Business Manager',
+            'billing_address': f'{i} Main Street', 'billing_city': 'Austin', 'billing_state': 'TX',
+            'billing_zip': '78701', 'issue_date': '2026-10-31', 'service_start': '2026-11-01',
+        }
+        if i < count * changed:
+            data['purchase_order'] = f'PO-{i}'
+        batch.append(normalize_invoice(data)[0])
+    return batch
+
+
+def run(label, batch, workers, cache_dir):
+    rendered = [0]
+
+    def counted(results):
+        for invoice, path, cached in results:
+            rendered[0] += not cached
+            yield invoice, path, cached
+
+    start = time.perf_counter()
+    size = sum(len(chunk) for chunk in zip_stream(counted(render_batch(batch, workers, cache_dir))))
+    elapsed = time.perf_counter() - start
+    print(f"{label:30} {len(batch) / elapsed:7.0f} docs/s  {rendered[0]:6d} rendered  "
+          f"{elapsed:6.2f}s  zip {size / 1e6:5.1f} MB")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else invoice_module.INVOICE_WORKERS
+    print(f"{count} invoices, {workers} pool workers, {os.cpu_count()} CPUs")
+    batch = build(count)
+    with tempfile.TemporaryDirectory() as serial_cache, tempfile.TemporaryDirectory() as cache:
+        run('cold, in process', batch, 1, serial_cache)
+        run(f'cold, pool of {workers}', batch, workers, cache)
+        run('warm cache', batch, workers, cache)
+        run('warm, 5% changed', build(count, changed=0.05), workers, cache)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: SQL profiler overhead and what it finds in the admin queries
+
+1. Overhead: runs a point lookup (the login query) and a short-range read
+   N times on a plain connection and on a profiled one, and reports
+   microseconds per statement for each.
+2. Findings: loads a synthetic_data scale profile, runs the admin_dashboard and
+   /api/analytics statements through a profiled connection, and prints
+   the report: time, rows, full scans and temp B-trees.
+
+Runs against a freshly migrated database in a temporary directory.
+
+Usage: python benchmarks/bench_query_profiler.py [statements] [profile]
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+
+import query_profiler
+from migrations import migrate
+from synthetic_data import generate
+
+LOGIN_SQL = 'SELECT * FROM users WHERE email = ? AND password_hash = ?'
+RECENT_TRIALS_SQL = 'SELECT * FROM trial_requests ORDER BY created_at DESC LIMIT 10'
+DASHBOARD_SQL = [
+    '''SELECT domain, COUNT(*) as views, DATE(created_at) as date
+       FROM analytics GROUP BY domain, DATE(created_at) ORDER BY date DESC LIMIT 30''',
+    '''SELECT domain, COUNT(*) as views FROM analytics
+       WHERE created_at >= date('now', '-30 days') GROUP BY domain ORDER BY views DESC''',
+    '''SELECT DATE(created_at) as date, COUNT(*) as views FROM analytics
+       WHERE created_at >= date('now', '-30 days') GROUP BY DATE(created_at) ORDER BY date''',
+    RECENT_TRIALS_SQL,
+]
+
+
+def per_statement_us(conn, statements):
+    password_hash = hashlib.sha256(b'admin123').hexdigest()
+    start = time.perf_counter()
+    for i in range(statements):
+        if i % 2:
+            conn.execute(LOGIN_SQL, ('admin@edgpt.ai', password_hash)).fetchone()
+        else:
+            conn.execute(RECENT_TRIALS_SQL).fetchall()
+    return (time.perf_counter() - start) / statements * 1e6
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    profile = sys.argv[2] if len(sys.argv) > 2 else 'small'
+    profiler = query_profiler.profiler
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        migrate('edgpt_platform.db')
+
+        query_profiler.SQL_PROFILE = False
+        plain = query_profiler.connect('edgpt_platform.db')
+        query_profiler.SQL_PROFILE = True
+        profiled = query_profiler.connect('edgpt_platform.db')
+
+        off = per_statement_us(plain, statements)
+        on = per_statement_us(profiled, statements)
+        print(f"{statements} statements: disabled {off:6.2f} us/stmt, enabled {on:6.2f} us/stmt "
+              f"(+{on - off:5.2f} us)")
+
+        analytics_rows = generate('edgpt_platform.db', profile)['analytics']
+
+        profiler.reset()
+        for sql in DASHBOARD_SQL:
+            profiled.execute(sql).fetchall()
+        report = profiler.report()
+        print(f"admin queries over {analytics_rows} analytics rows (slow >= {report['slow_ms']} ms):")
+        for entry in report['statements']:
+            flags = ', '.join([f"full scan of {t}" for t in entry['full_scans']] +
+                              (['temp b-tree'] if entry['temp_btree'] else []))
+            print(f"  {entry['total_ms']:8.2f} ms {entry['rows']:6d} rows  {flags or '-':32} {entry['sql'][:70]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: per-request overhead of the shared token-bucket rate limiter
+
+Measures TokenBucketLimiter.hit() latency from a single process and from N
+concurrent processes sharing one limiter database, the way gunicorn workers
+do in production.
+
+Usage: python benchmarks/bench_rate_limit.py [calls_per_worker] [workers]
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from rate_limit import TokenBucketLimiter
+
+DOMAINS = ['edgpt.ai', 'gptsites.ai', 'lawfirmgpt.ai', 'cpafirm.ai', 'taxprepgpt.ai', 'businessbrokergpt.ai']
+CLASSES = ['public', 'api', 'auth', 'codegen']
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def worker(path, calls, worker_id, results):
+    limiter = TokenBucketLimiter(path)
+    samples = []
+    for i in range(calls):
+        ip = f'10.{worker_id}.{(i // 256) % 256}.{i % 256}'
+        start = time.perf_counter()
+        limiter.hit(CLASSES[i % len(CLASSES)], DOMAINS[i % len(DOMAINS)], ip)
+        samples.append(time.perf_counter() - start)
+    results.put(samples)
+
+
+def run(path, calls, workers):
+    results = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=worker, args=(path, calls, n, results)) for n in range(workers)]
+    start = time.perf_counter()
+    for proc in procs:
+        proc.start()
+    samples = []
+    for _ in procs:
+        samples.extend(results.get())
+    for proc in procs:
+        proc.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"{workers} worker(s): {len(samples) / elapsed:10.0f} checks/s  "
+          f"p50 {percentile(samples, 50) * 1e6:6.1f}us  "
+          f"p99 {percentile(samples, 99) * 1e6:7.1f}us  "
+          f"max {max(samples) * 1e6:8.1f}us")
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 4
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'ratelimit.db')
+        TokenBucketLimiter(path)
+        run(path, calls, 1)
+        run(path, calls, workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: admin reporting queries with and without the result cache
+
+Fills a scratch database with a synthetic_data scale profile and has several "admins" poll
+the three /api/analytics aggregates every POLL_INTERVAL, with and without
+QueryCache. The TTL is shortened so refreshes and stale-while-revalidate
+happen during the run. Reports DB executions, p50 request latency, hit rate
+and query time saved.
+
+Usage: python benchmarks/bench_reporting_cache.py [profile] [admins] [seconds]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from query_cache import QueryCache
+from synthetic_data import generate
+
+POLL_INTERVAL = 0.1
+
+QUERIES = [
+    ('''SELECT domain, COUNT(*) as views FROM analytics
+        WHERE created_at >= date('now', '-30 days') GROUP BY domain ORDER BY views DESC''', ()),
+    ('''SELECT DATE(created_at) as date, COUNT(*) as views FROM analytics
+        WHERE created_at >= date('now', '-30 days') GROUP BY DATE(created_at) ORDER BY date DESC''', ()),
+    ('''SELECT COUNT(*) as count FROM trial_requests
+        WHERE created_at >= date('now', '-30 days')''', ()),
+]
+
+
+def poll(path, admins, seconds, cache):
+    executions = [0]
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def admin():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            for sql, params in QUERIES:
+                # Like reporting_query(): stale refreshes run on another thread
+                def load(sql=sql, params=params):
+                    with lock:
+                        executions[0] += 1
+                    conn = sqlite3.connect(path)
+                    try:
+                        return tuple(conn.execute(sql, params).fetchall())
+                    finally:
+                        conn.close()
+                if cache is None:
+                    load()
+                else:
+                    cache.get(sql, params, load)
+            with lock:
+                latencies.append(time.perf_counter() - start)
+            time.sleep(POLL_INTERVAL)
+
+    threads = [threading.Thread(target=admin) for _ in range(admins)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return len(latencies), latencies[len(latencies) // 2], executions[0]
+
+
+def main():
+    profile = sys.argv[1] if len(sys.argv) > 1 else 'small'
+    admins = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 6
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'reporting.db')
+        rows = generate(path, profile)['analytics']
+        print(f"'{profile}' profile: {rows} analytics rows, {admins} admins polling /api/analytics "
+              f"for {seconds:.0f}s")
+
+        requests, p50, executions = poll(path, admins, seconds, None)
+        print(f"  uncached: {requests:5d} requests, p50 {p50 * 1000:8.2f} ms, {executions:5d} query executions")
+
+        cache = QueryCache(ttl=1, stale_ttl=2)
+        requests, p50, executions = poll(path, admins, seconds, cache)
+        stats = cache.stats()
+        print(f"  cached:   {requests:5d} requests, p50 {p50 * 1000:8.2f} ms, {executions:5d} query executions")
+        print(f"  hit rate {stats['hit_rate']:.4f}, query time {stats['query_seconds']:.2f}s, "
+              f"saved {stats['saved_seconds']:.2f}s ({stats['hits']} fresh, {stats['stale_hits']} stale, "
+              f"{stats['coalesced']} coalesced, {stats['misses']} misses)")
+
+
+if __name__ == '__main__':
+    main()
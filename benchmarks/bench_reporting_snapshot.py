@@ -0,0 +1,116 @@
+"""
+Benchmark: write latency while admin reports run
+
+Loads a synthetic_data scale profile, then for S seconds per scenario a writer
+commits page-view inserts one at a time (like log_analytics) and records
+each commit's latency, while reporter processes loop over the admin
+aggregate queries:
+- no reports
+- reports on the live database
+- reports on a SnapshotReplica (refreshed every 5s by one watcher process)
+
+Reports p50/p99/max commit latency, writes/s, reports completed and the
+largest WAL size seen. Reporters are separate processes, like gunicorn
+workers.
+
+Runs against a freshly migrated database in a temporary directory.
+
+Usage: python benchmarks/bench_reporting_snapshot.py [profile] [seconds] [reporters]
+"""
+
+import multiprocessing
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+
+from read_replica import SnapshotReplica
+from synthetic_data import generate
+
+REPORT_SQL = [
+    '''SELECT domain, COUNT(*) as views, DATE(created_at) as date FROM analytics
+       GROUP BY domain, DATE(created_at) ORDER BY date DESC, views DESC LIMIT 50''',
+    '''SELECT domain, COUNT(*) as views FROM analytics
+       WHERE created_at >= date('now', '-30 days') GROUP BY domain ORDER BY views DESC''',
+    '''SELECT DATE(created_at) as date, COUNT(*) as views FROM analytics
+       WHERE created_at >= date('now', '-30 days') GROUP BY DATE(created_at) ORDER BY date DESC''',
+]
+DOMAINS = ['edgpt.ai', 'lawfirmgpt.ai', 'cpafirm.ai', 'taxprepgpt.ai']
+
+
+def refresher(stop):
+    """What `read_replica.py watch` does, with a stop event"""
+    replica = SnapshotReplica('edgpt_platform.db', 'edgpt_reporting.db', interval=5)
+    while not stop.wait(1.0):
+        replica.refresh()
+
+
+def reporter(mode, stop, counter):
+    replica = SnapshotReplica('edgpt_platform.db', 'edgpt_reporting.db', interval=5)
+    while not stop.is_set():
+        conn = replica.connect() if mode == 'snapshot' else sqlite3.connect('edgpt_platform.db')
+        for sql in REPORT_SQL:
+            conn.execute(sql).fetchall()
+        conn.close()
+        with counter.get_lock():
+            counter.value += 1
+
+
+def run_scenario(mode, seconds, reporters):
+    stop = multiprocessing.Event()
+    counter = multiprocessing.Value('i', 0)
+    procs = [multiprocessing.Process(target=reporter, args=(mode, stop, counter))
+             for _ in range(reporters if mode != 'none' else 0)]
+    if mode == 'snapshot':
+        procs.append(multiprocessing.Process(target=refresher, args=(stop,)))
+    for proc in procs:
+        proc.start()
+    time.sleep(0.5)
+
+    conn = sqlite3.connect('edgpt_platform.db', timeout=30)
+    latencies = []
+    max_wal = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        conn.execute("INSERT INTO analytics (domain, page_path, ip_address) VALUES (?, '/', '127.0.0.1')",
+                     (random.choice(DOMAINS),))
+        conn.commit()
+        latencies.append((time.perf_counter() - start) * 1000)
+        if len(latencies) % 200 == 0 and os.path.exists('edgpt_platform.db-wal'):
+            max_wal = max(max_wal, os.path.getsize('edgpt_platform.db-wal'))
+    conn.close()
+    stop.set()
+    for proc in procs:
+        proc.join()
+
+    latencies.sort()
+    print(f"{mode:9} p50 {statistics.median(latencies):6.3f} ms  p99 {latencies[int(len(latencies) * 0.99)]:7.3f} ms  "
+          f"max {latencies[-1]:8.2f} ms  {len(latencies) / seconds:7.0f} writes/s  "
+          f"{counter.value:5d} reports  WAL max {max_wal / 1e6:6.1f} MB")
+
+
+def main():
+    profile = sys.argv[1] if len(sys.argv) > 1 else 'small'
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    reporters = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        rows = generate('edgpt_platform.db', profile)['analytics']
+        print(f"'{profile}' profile: {rows} analytics rows, {reporters} reporter processes, "
+              f"{seconds:.0f}s per scenario")
+        # Reporters only read; the first snapshot is taken before they start
+        SnapshotReplica('edgpt_platform.db', 'edgpt_reporting.db').refresh(force=True)
+        for mode in ('none', 'live', 'snapshot'):
+            run_scenario(mode, seconds, reporters)
+
+
+if __name__ == '__main__':
+    main()
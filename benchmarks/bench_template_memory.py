@@ -0,0 +1,110 @@
+"""
+Benchmark: compiled-template memory and cold-compile time per worker
+
+before: the five per-domain *_landing.html and five *_signup.html templates
+        (landing copies read from git history, signup copies from templates/)
+after:  the shared vertical_landing.html / vertical_signup.html layouts
+
+Each variant is compiled in a fresh Jinja environment, the way a new gunicorn
+worker starts, and rendered once for every vertical.
+
+Usage: python benchmarks/bench_template_memory.py
+"""
+
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from jinja2 import DictLoader, Environment, select_autoescape
+
+from vertical_content import LANDING_CONTENT, SIGNUP_CONTENT
+
+VERTICALS = ['gptsites', 'lawfirmgpt', 'cpafirm', 'taxprepgpt', 'businessbrokergpt']
+TITLES = {
+    'gptsites': 'Transform Your Business Website Into an Intelligent GPTsite',
+    'lawfirmgpt': 'Transform Your Law Firm Website Into an Intelligent GPTsite',
+    'cpafirm': 'Transform Your Accounting Firm Website Into an Intelligent GPTsite',
+    'taxprepgpt': 'Transform Your Tax Preparation Website Into an Intelligent GPTsite',
+    'businessbrokergpt': 'Transform Your Business Brokerage Website Into an Intelligent GPTsite',
+}
+
+
+def git_show(path):
+    """Read a file removed from the tree from the last revision that had it"""
+    rev = subprocess.run(['git', 'rev-list', '-1', 'HEAD', '--', path], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout.strip()
+    for candidate in (f'{rev}:{path}', f'{rev}^:{path}'):
+        result = subprocess.run(['git', 'show', candidate], cwd=ROOT, capture_output=True, text=True)
+        if result.returncode == 0:
+            return result.stdout
+    raise FileNotFoundError(path)
+
+
+def read(path):
+    with open(os.path.join(ROOT, path), encoding='utf-8') as f:
+        return f.read()
+
+
+def domain_config(vertical):
+    domain = f'{vertical}.ai'
+    return {'title': TITLES[vertical], 'landing': LANDING_CONTENT[domain], 'signup': SIGNUP_CONTENT[domain]}
+
+
+def compile_all(sources):
+    env = Environment(loader=DictLoader(sources), autoescape=select_autoescape(['html']))
+    env.globals['asset_url'] = lambda name: f'/static/{name}'
+    for name in sources:
+        env.get_template(name)
+    return env
+
+
+def measure(label, sources, pages, repeat=5):
+    compile_time = min(timed(compile_all, sources) for _ in range(repeat))
+
+    tracemalloc.start()
+    env = compile_all(sources)
+    compiled_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for name, vertical in pages:
+        env.get_template(name).render(domain_config=domain_config(vertical))
+    render_time = time.perf_counter() - start
+
+    print(f"{label:7} {len(sources):3d} templates  cold compile {compile_time * 1000:7.1f} ms  "
+          f"compiled memory {compiled_bytes / 1024:8.1f} KiB  first render {render_time * 1000:6.1f} ms")
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    before = {}
+    before_pages = []
+    for vertical in VERTICALS:
+        landing = f'{vertical}_landing.html'
+        signup = f'{vertical}_signup.html'
+        before[landing] = git_show(f'src/templates/{landing}')
+        before[signup] = read(f'templates/{signup}')
+        before_pages += [(landing, vertical), (signup, vertical)]
+
+    after = {
+        'vertical_landing.html': read('src/templates/vertical_landing.html'),
+        'vertical_signup.html': read('src/templates/vertical_signup.html'),
+    }
+    after_pages = [(name, vertical) for vertical in VERTICALS for name in after]
+
+    measure('before', before, before_pages)
+    measure('after', after, after_pages)
+
+
+if __name__ == '__main__':
+    main()
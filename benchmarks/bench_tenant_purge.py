@@ -0,0 +1,120 @@
+"""
+Benchmark: deleting a large account while the site keeps writing
+
+Loads a synthetic_data scale profile, gives a customer account the
+verified custom domain school.example and moves the cpafirm.ai page views
+(~12% of analytics) onto it, then cancels the account's trial. Only the
+account's own verified host is purged; cpafirm.ai itself is a tenant
+domain and never matched.
+A writer process commits page-view inserts for other domains one at a
+time (like log_analytics) while the account is deleted:
+- one transaction deleting every PURGE_STEPS table at once
+- the purge job: keyset batches of B rows with PURGE_PAUSE between them
+
+Reports rows deleted, elapsed time, the longest write-lock hold and the
+writer's p50/p99/max commit latency. Each scenario runs on its own copy of
+the database in a temporary directory.
+
+Usage: python benchmarks/bench_tenant_purge.py [profile] [batch size]
+"""
+
+import multiprocessing
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+
+import account_deletion
+from account_deletion import PURGE_STEPS, queue_purge
+from synthetic_data import generate
+
+
+def writer(database, ready, stop, results):
+    conn = sqlite3.connect(database, timeout=30)
+    latencies = []
+    ready.set()
+    while not stop.is_set():
+        start = time.perf_counter()
+        conn.execute("INSERT INTO analytics (domain, page_path) VALUES ('edgpt.ai', '/')")
+        conn.commit()
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.002)
+    conn.close()
+    results.put(latencies)
+
+
+def single_transaction(database):
+    conn = sqlite3.connect(database, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    job = conn.execute('SELECT * FROM purge_jobs').fetchone()
+    params = {'signup_id': job['signup_id'], 'email': job['email'], 'hosts': job['hosts']}
+    conn.execute('BEGIN IMMEDIATE')
+    start = time.perf_counter()
+    rows = sum(conn.execute(f'DELETE FROM {table} WHERE {condition}', params).rowcount
+               for table, condition in PURGE_STEPS)
+    conn.execute('COMMIT')
+    lock_ms = (time.perf_counter() - start) * 1000
+    conn.close()
+    return {'rows': rows, 'batches': 1, 'max_lock_ms': lock_ms}
+
+
+def chunked(database, batch_size):
+    finished = account_deletion.drain(database, batch_size=batch_size)
+    return next(iter(finished.values()))
+
+
+def run(label, database, purge):
+    ready, stop, results = multiprocessing.Event(), multiprocessing.Event(), multiprocessing.Queue()
+    process = multiprocessing.Process(target=writer, args=(database, ready, stop, results))
+    process.start()
+    ready.wait()
+    time.sleep(0.5)
+    start = time.perf_counter()
+    totals = purge(database)
+    elapsed = time.perf_counter() - start
+    time.sleep(0.5)
+    stop.set()
+    latencies = sorted(results.get())
+    process.join()
+    p99 = latencies[int(len(latencies) * 0.99)]
+    print(f"{label:28} {totals['rows']:8d} rows {elapsed:6.2f}s  {totals['batches']:5d} batches  "
+          f"lock max {totals['max_lock_ms']:7.1f} ms  writer p50 {statistics.median(latencies) * 1000:5.1f} "
+          f"p99 {p99 * 1000:6.1f} max {latencies[-1] * 1000:7.1f} ms")
+
+
+def main():
+    profile = sys.argv[1] if len(sys.argv) > 1 else 'small'
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else account_deletion.PURGE_BATCH_SIZE
+    os.chdir(tempfile.mkdtemp())
+    generate('edgpt_platform.db', profile)
+    conn = sqlite3.connect('edgpt_platform.db')
+    conn.row_factory = sqlite3.Row
+    conn.execute("UPDATE analytics SET domain = 'school.example' WHERE domain = 'cpafirm.ai'")
+    user_id = conn.execute("INSERT INTO users (email, password_hash) VALUES ('owner@school.example', '!') "
+                           "RETURNING id").fetchone()[0]
+    trial = conn.execute("INSERT INTO trial_requests (email, website_url) "
+                         "VALUES ('owner@school.example', 'https://cpafirm.ai') "
+                         "RETURNING id, email, website_url").fetchone()
+    conn.execute("INSERT INTO custom_domains (host, tenant_domain, user_id, signup_id, status) "
+                 "VALUES ('school.example', 'cpafirm.ai', ?, ?, 'verified')", (user_id, trial['id']))
+    queue_purge(conn, trial, 'cpafirm.ai')
+    conn.commit()
+    for name in ('single.db', 'chunked.db'):
+        copy = sqlite3.connect(name)
+        conn.backup(copy)
+        copy.execute('PRAGMA journal_mode=WAL')
+        copy.close()
+    conn.close()
+
+    print(f"profile {profile}, batch size {batch_size}, pause {account_deletion.PURGE_PAUSE}s")
+    run('one transaction', 'single.db', single_transaction)
+    run(f'purge job, batches of {batch_size}', 'chunked.db', lambda database: chunked(database, batch_size))
+
+
+if __name__ == '__main__':
+    main()
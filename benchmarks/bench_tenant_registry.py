@@ -0,0 +1,101 @@
+"""
+Benchmark: tenant registry at scale
+
+Fills a scratch database with N tenants and measures
+- snapshot load (reload) time and memory
+- resolve() latency for exact, www-subdomain and unknown hosts, including the
+  per-request generation check
+- the same lookups with the old linear endswith() scan over a dict, for scale
+
+Usage: python benchmarks/bench_tenant_registry.py [tenants]
+"""
+
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tenant_registry import TenantRegistry, create_tenant_tables, upsert_tenant
+
+LOOKUPS = 20000
+
+
+def populate(path, count):
+    conn = sqlite3.connect(path)
+    create_tenant_tables(conn)
+    config = json.dumps({'name': 'Tenant', 'industry': 'Education', 'color': '#3B82F6', 'icon': '🎓',
+                         'title': 'Transform Your School Website', 'description': 'x' * 120})
+    conn.executemany('INSERT INTO tenants (domain, template, signup_template, config) VALUES (?, ?, ?, ?)',
+                     ((f'school{i}.edu', 'enhanced_landing_with_slideshow.html',
+                       'fixed_signup_template.html', config) for i in range(count)))
+    conn.execute("INSERT INTO tenants (domain, template, signup_template, config) VALUES "
+                 "('edgpt.ai', 'enhanced_landing_with_slideshow.html', 'fixed_signup_template.html', ?)", (config,))
+    conn.commit()
+    conn.close()
+
+
+def linear_resolve(tenants, host):
+    domain = host.split(':')[0]
+    if domain in tenants:
+        return tenants[domain]
+    for registered in tenants:
+        if domain.endswith(registered):
+            return tenants[registered]
+    return tenants['edgpt.ai']
+
+
+def time_lookups(label, resolve, hosts):
+    start = time.perf_counter()
+    for host in hosts:
+        resolve(host)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:34} {elapsed / len(hosts) * 1e6:9.2f} us/lookup")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rng = random.Random(31)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'tenants.db')
+        populate(path, count)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        registry = TenantRegistry(path)
+        load_time = time.perf_counter() - start
+        snapshot_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{count} tenants: snapshot load {load_time * 1000:.1f} ms, {snapshot_bytes / 1024 / 1024:.1f} MiB")
+
+        exact = [f'school{rng.randrange(count)}.edu' for _ in range(LOOKUPS)]
+        subdomain = [f'www.school{rng.randrange(count)}.edu:443' for _ in range(LOOKUPS)]
+        unknown = [f'scan{rng.randrange(10 ** 9)}.example.net' for _ in range(LOOKUPS)]
+
+        print("registry.resolve (with generation check)")
+        time_lookups('exact', registry.resolve, exact)
+        time_lookups('www subdomain', registry.resolve, subdomain)
+        time_lookups('unknown host', registry.resolve, unknown)
+
+        legacy = dict(registry.snapshot().tenants)
+        print("linear endswith scan (previous lookup)")
+        sample = LOOKUPS // 100
+        time_lookups('exact', lambda h: linear_resolve(legacy, h), exact[:sample])
+        time_lookups('www subdomain', lambda h: linear_resolve(legacy, h), subdomain[:sample])
+        time_lookups('unknown host', lambda h: linear_resolve(legacy, h), unknown[:sample])
+
+        start = time.perf_counter()
+        upsert_tenant(registry, 'new-school.edu', 'enhanced_landing_with_slideshow.html',
+                      'fixed_signup_template.html', {'name': 'New'})
+        registry.resolve('new-school.edu')
+        print(f"publish + reload on next request: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: transcript log append rate and per-conversation read latency
+
+Appends N chat turns (default 2,000,000) spread over conversations of
+~20 turns for one tenant, then times reading random conversations:
+- from sealed segments through their sparse indexes
+- after compaction, with compacted segments merged by size tier
+and reports bytes on disk before and after compaction. For comparison it
+times row-level INSERT + COMMIT of a sample into a WAL SQLite table, which
+is what storing turns in edgpt_platform.db would cost the shared writer.
+
+Runs in a temporary directory.
+
+Usage: python benchmarks/bench_transcripts.py [turns] [reads]
+"""
+
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+
+from transcripts import TranscriptLog
+
+TURNS_PER_CONVERSATION = 20
+SQLITE_SAMPLE = 20000
+TEXTS = ['What are your admission deadlines for the fall semester?',
+         'Do you offer payment plans for tuition?',
+         'Our office hours are Monday to Friday, 8am to 4pm.',
+         'You can apply online; the form takes about ten minutes.']
+
+
+def directory_bytes(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def read_latencies(log, conversations, reads):
+    latencies = []
+    for conversation_id in random.sample(conversations, reads):
+        start = time.perf_counter()
+        turns = log.read('edgpt.ai', conversation_id)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert len(turns) == TURNS_PER_CONVERSATION
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    reads = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    random.seed(7)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log = TranscriptLog(os.path.join(tmp, 'transcripts'), seal_interval=3600)
+        conversations = [f'conv{i:010d}' for i in range(turns // TURNS_PER_CONVERSATION)]
+
+        start = time.perf_counter()
+        for n in range(turns):
+            # Interleave conversations the way concurrent visitors would
+            conversation_id = conversations[(n * 7919) % len(conversations)]
+            log.append('edgpt.ai', conversation_id, 'user' if n % 2 else 'assistant', TEXTS[n % 4])
+        log.close()
+        elapsed = time.perf_counter() - start
+        directory = os.path.join(tmp, 'transcripts', 'edgpt.ai')
+        print(f"append: {turns} turns in {elapsed:6.2f}s, {turns / elapsed:9.0f} turns/s, "
+              f"{log.stats['sealed']} segments, {directory_bytes(directory) / 1e6:7.1f} MB")
+
+        p50, p99 = read_latencies(log, conversations, reads)
+        print(f"read, sealed segments:     p50 {p50:6.3f} ms  p99 {p99:6.3f} ms")
+
+        start = time.perf_counter()
+        merged = total = log.compact('edgpt.ai', min_age=0)
+        while merged:
+            merged = log.compact('edgpt.ai', min_age=0)
+            total += merged
+        segments = sum(name.endswith('.zseg') for name in os.listdir(directory))
+        print(f"compact: {total} segments into {segments} in {time.perf_counter() - start:6.2f}s, "
+              f"{directory_bytes(directory) / 1e6:7.1f} MB on disk")
+        p50, p99 = read_latencies(log, conversations, reads)
+        print(f"read, compacted segments:  p50 {p50:6.3f} ms  p99 {p99:6.3f} ms")
+
+        conn = sqlite3.connect(os.path.join(tmp, 'rows.db'))
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('CREATE TABLE turns (id INTEGER PRIMARY KEY, conversation_id TEXT, role TEXT, '
+                      'text TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)')
+        conn.execute('CREATE INDEX idx_turns_conversation ON turns(conversation_id)')
+        start = time.perf_counter()
+        for n in range(SQLITE_SAMPLE):
+            conn.execute('INSERT INTO turns (conversation_id, role, text) VALUES (?, ?, ?)',
+                         (conversations[n % len(conversations)], 'user', TEXTS[n % 4]))
+            conn.commit()
+        elapsed = time.perf_counter() - start
+        conn.close()
+        print(f"row INSERT + COMMIT per turn (SQLite WAL, {SQLITE_SAMPLE} sampled): "
+              f"{SQLITE_SAMPLE / elapsed:9.0f} turns/s")
+
+
+if __name__ == '__main__':
+    main()
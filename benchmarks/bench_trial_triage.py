@@ -0,0 +1,66 @@
+"""
+Benchmark: trial triage throughput
+
+Fills a scratch database with pending trial requests (10% repeat signups,
+5% malformed URLs) and drains it with TriagePool using the stub fetcher plus
+a simulated HEAD round trip. Reports trials triaged per second for several
+worker / HEAD-concurrency combinations.
+
+Usage: python benchmarks/bench_trial_triage.py [requests] [head_latency_ms]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from migrations import migrate
+from trial_triage import TriagePool, queue_status, stub_fetcher
+
+CONFIGS = [(1, 1), (1, 16), (4, 16), (4, 64), (8, 64)]
+
+
+def populate(path, count, rng):
+    migrate(path)
+    rows = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.05:
+            rows.append((f'user{i}@example.com', 'not a website'))
+        elif roll < 0.15 and rows:
+            rows.append(rng.choice(rows))
+        else:
+            rows.append((f'user{i}@example.com', f'www.school{i}.org/'))
+    conn = sqlite3.connect(path)
+    conn.executemany('INSERT INTO trial_requests (email, website_url) VALUES (?, ?)', rows)
+    conn.commit()
+    conn.close()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+
+    def fetcher(url, timeout=5):
+        time.sleep(latency)
+        return stub_fetcher(url, timeout)
+
+    print(f"{count} pending trial requests, {latency * 1000:.0f} ms simulated HEAD latency")
+    for workers, concurrency in CONFIGS:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'triage.db')
+            populate(path, count, random.Random(35))
+            start = time.perf_counter()
+            counts = TriagePool(path, workers=workers, concurrency=concurrency, fetcher=fetcher).drain()
+            elapsed = time.perf_counter() - start
+            assert 'pending' not in queue_status(path) and 'processing' not in queue_status(path)
+            print(f"  {workers} workers x {concurrency:2d} HEAD: {sum(counts.values()) / elapsed:8.0f} trials/s  "
+                  f"{dict(sorted(counts.items()))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark: knowledge base uploads and text extraction
+
+Streams an N MB handbook through POST /api/knowledge-base/uploads (the full
+Flask app, rate limiting off) and compares it with reading the whole body
+into memory before hashing and writing it, as request.get_data() or a
+multipart form would:
+- streamed upload, new file
+- the same file again (deduplicated; nothing new stored)
+- buffered body, for comparison
+
+Reports MB/s and the peak Python heap during each upload (tracemalloc).
+Text is extracted from the handbook and a 33-hour VTT transcript with a
+pool of W processes, reporting MB/s, how many progress values the blob
+rows showed and the children's peak RSS.
+
+Runs against a freshly migrated database in a temporary directory.
+
+Usage: python benchmarks/bench_uploads.py [MB] [workers]
+"""
+
+import hashlib
+import os
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+os.environ['RATE_LIMIT_ENABLED'] = '0'
+
+
+def write_handbook(path, megabytes):
+    line = b'Students must arrive by 8:05 am; late arrivals sign in at the front office. \xc3\xa9\n'
+    block = line * (1024 * 1024 // len(line) + 1)
+    with open(path, 'wb') as f:
+        for _ in range(megabytes):
+            f.write(block[:1024 * 1024])
+
+
+def write_transcript(path, cues):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('WEBVTT\n\n')
+        for i in range(cues):
+            start = i * 3
+            f.write(f"{i + 1}\n00:{start // 60 % 60:02d}:{start % 60:02d}.000 --> "
+                    f"00:{(start + 3) // 60 % 60:02d}:{(start + 3) % 60:02d}.000\n"
+                    f"Welcome back, families. Today we cover the new lunch schedule, part {i}.\n\n")
+
+
+def measure(label, megabytes, upload):
+    # Throughput and heap are measured in separate passes; tracemalloc slows allocation
+    start = time.perf_counter()
+    status = upload()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    upload()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:28} {megabytes / elapsed:7.0f} MB/s  peak heap {peak / 1e6:7.1f} MB  HTTP {status}")
+
+
+def buffered_store(path, upload_dir):
+    """The alternative: whole body in memory, then hash and write"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    target = os.path.join(upload_dir, 'buffered', digest)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'wb') as out:
+        out.write(data)
+        out.flush()
+        os.fsync(out.fileno())
+    return 'n/a'
+
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    os.chdir(tempfile.mkdtemp())
+    subprocess.run([sys.executable, os.path.join(SRC, 'migrations.py'), 'migrate'],
+                   check=True, stdout=subprocess.DEVNULL)
+    import main as app_module
+    import uploads
+
+    client = app_module.app.test_client()
+    client.post('/login', data={'username': 'admin@edgpt.ai', 'password': 'admin123'})
+    write_handbook('handbook.txt', megabytes)
+    write_transcript('tour.vtt', 40000)
+    size = os.path.getsize('handbook.txt')
+
+    def streamed(name):
+        def upload():
+            with open('handbook.txt', 'rb') as f:
+                return client.post(f'/api/knowledge-base/uploads?filename={name}', input_stream=f,
+                                   content_length=size, content_type='text/plain').status_code
+        return upload
+
+    print(f"{megabytes} MB handbook, chunks of {uploads.CHUNK_SIZE // 1024} KB")
+    measure('streamed, new file', megabytes, streamed('handbook.txt'))
+    measure('streamed, duplicate', megabytes, streamed('handbook-copy.txt'))
+    with open('tour.vtt', 'rb') as f:
+        client.post('/api/knowledge-base/uploads?filename=tour.vtt', input_stream=f,
+                    content_length=os.path.getsize('tour.vtt'))
+    conn = sqlite3.connect('edgpt_platform.db')
+    blobs, stored = conn.execute('SELECT COUNT(*), SUM(size) FROM knowledge_blobs').fetchone()
+    documents = conn.execute('SELECT COUNT(*) FROM knowledge_documents').fetchone()[0]
+    print(f"{documents} documents -> {blobs} blobs, {stored / 1e6:.0f} MB stored")
+
+    # Watch the progress column the way the upload page polls it
+    seen, done = set(), threading.Event()
+
+    def poll():
+        reader = sqlite3.connect('edgpt_platform.db')
+        while not done.is_set():
+            seen.update(reader.execute('SELECT sha256, progress FROM knowledge_blobs').fetchall())
+            time.sleep(0.05)
+        reader.close()
+
+    poller = threading.Thread(target=poll)
+    poller.start()
+    start = time.perf_counter()
+    counts = uploads.drain('edgpt_platform.db', workers=workers)
+    elapsed = time.perf_counter() - start
+    done.set()
+    poller.join()
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print(f"extraction, {workers} processes     {stored / 1e6 / elapsed:7.0f} MB/s  {counts}  "
+          f"{len(seen)} progress values seen  child peak RSS {children:.0f} MB")
+
+    # Last: the buffered body grows this process, and children forked after it would report that RSS
+    measure('buffered body', megabytes, lambda: buffered_store('handbook.txt', 'uploads'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: widget transfer bytes per customer page view
+
+Requests the embed snippet from /api/generate-code for every tenant, then
+walks a visitor through the loader's requests:
+- first view: snippet in the page + /widget/config/<site> + runtime script
+- repeat view within the config max-age: snippet only
+- repeat view after max-age: snippet + a 304 for the config
+
+Bytes are body bytes, raw and gzip-6 (what the page, config and runtime
+cost on the wire when compressed).
+
+Runs against a freshly migrated database in a temporary directory.
+
+Usage: python benchmarks/bench_widget.py
+"""
+
+import gzip
+import os
+import sys
+import tempfile
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+os.environ['RATE_LIMIT_ENABLED'] = '0'
+
+
+def sizes(data):
+    return len(data), len(gzip.compress(data, 6, mtime=0)) if data else 0
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        from migrations import migrate
+        migrate('edgpt_platform.db')
+        import main as app_module
+        client = app_module.app.test_client()
+
+        print(f"{'site':22} {'snippet':>13} {'first view':>13} {'cached view':>13} {'revalidated':>13}")
+        for site in sorted(app_module.DOMAIN_TEMPLATES):
+            snippet = client.post('/api/generate-code', json={'domain': site}).get_json()['html'].encode()
+            config = client.get(f'/widget/config/{site}')
+            runtime = client.get(config.get_json()['runtime'].replace('http://localhost', ''))
+            revalidated = client.get(f'/widget/config/{site}', headers={'If-None-Match': config.headers['ETag']})
+            assert revalidated.status_code == 304
+
+            snippet_raw, snippet_gz = sizes(snippet)
+            first = [a + b for a, b in zip(sizes(snippet), sizes(config.data))]
+            first = [a + b for a, b in zip(first, sizes(runtime.data))]
+            again = [a + b for a, b in zip(sizes(snippet), sizes(revalidated.data))]
+            print(f"{site:22} {snippet_raw:6d}/{snippet_gz:5d}B {first[0]:6d}/{first[1]:5d}B "
+                  f"{snippet_raw:6d}/{snippet_gz:5d}B {again[0]:6d}/{again[1]:5d}B")
+        print("(raw/gzip body bytes; the runtime is immutable and fetched once per browser)")
+
+
+if __name__ == '__main__':
+    main()
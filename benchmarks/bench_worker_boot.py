@@ -0,0 +1,99 @@
+"""
+Benchmark: database work at worker boot, import-time DDL vs read-only check
+
+Starts N worker processes at once against an already-initialized database,
+as gunicorn does on (re)start, while one extra process keeps inserting
+analytics rows like live traffic. Compares
+- legacy: every worker runs the old init_db() (CREATE TABLE IF NOT EXISTS,
+  ALTER check, admin INSERT, commit) under a write lock
+- check:  every worker only calls require_schema() (read-only)
+
+and reports per-worker boot time and the worst analytics insert latency seen
+by the traffic process during the boot window.
+
+Usage: python benchmarks/bench_worker_boot.py [workers ...]
+"""
+
+import multiprocessing
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from migrations import MIGRATIONS, migrate, require_schema
+
+ROUNDS = 5
+
+
+def legacy_init_db(database):
+    """What each worker did at import before migrations existed"""
+    conn = sqlite3.connect(database, timeout=30)
+    for _, _, apply in MIGRATIONS:
+        apply(conn)
+    conn.commit()
+    conn.close()
+
+
+def boot(mode, database, barrier, results):
+    barrier.wait()
+    start = time.perf_counter()
+    if mode == 'legacy':
+        legacy_init_db(database)
+    else:
+        require_schema(database)
+    results.put(time.perf_counter() - start)
+
+
+def traffic(database, stop, results):
+    conn = sqlite3.connect(database, timeout=30)
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        conn.execute("INSERT INTO analytics (domain, page_path) VALUES ('edgpt.ai', '/')")
+        conn.commit()
+        worst = max(worst, time.perf_counter() - start)
+    results.put(worst)
+    conn.close()
+
+
+def run(mode, database, workers):
+    boots, worst_inserts = [], []
+    for _ in range(ROUNDS):
+        barrier = multiprocessing.Barrier(workers)
+        results = multiprocessing.Queue()
+        stop = multiprocessing.Event()
+        writer = multiprocessing.Process(target=traffic, args=(database, stop, results))
+        writer.start()
+        time.sleep(0.05)
+        procs = [multiprocessing.Process(target=boot, args=(mode, database, barrier, results))
+                 for _ in range(workers)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        boots.extend(results.get() for _ in procs)
+        stop.set()
+        worst_inserts.append(results.get())
+        writer.join()
+    boots.sort()
+    print(f"  {mode:7} boot p50 {statistics.median(boots) * 1000:7.2f} ms  "
+          f"max {boots[-1] * 1000:7.2f} ms  worst traffic insert {max(worst_inserts) * 1000:7.2f} ms")
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [4, 8, 16]
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, 'boot.db')
+        migrate(database)
+        for workers in counts:
+            print(f"{workers} workers, {ROUNDS} rounds")
+            run('legacy', database, workers)
+            run('check', database, workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,6 +12,7 @@ APP_DIR="/var/www/edgpt"
 SERVICE_USER="www-data"
 PYTHON_VERSION="python3"
 PORT="8094"
+REPO_DIR="$(pwd)"
 
 # Colors for output
 RED='\033[0;31m'
@@ -50,12 +51,8 @@ mkdir -p $APP_DIR/static
 mkdir -p $APP_DIR/templates
 
 print_status "Copying application files..."
-# Copy backend
-cp -r backend/* $APP_DIR/
-# Copy templates
-cp -r templates/* $APP_DIR/templates/
-# Copy static files
-cp -r static/* $APP_DIR/static/ 2>/dev/null || true
+# Copy the application (src/main.py with its modules, templates and static files)
+cp -r src/* $APP_DIR/
 # Copy assets
 cp -r assets/* $APP_DIR/static/images/ 2>/dev/null || true
 
@@ -68,74 +65,17 @@ print_status "Installing Python dependencies..."
 pip install --upgrade pip
 pip install Flask==2.3.3 Flask-CORS==4.0.0 gunicorn==21.2.0
 
-print_status "Setting up database..."
-python3 -c "
-import sqlite3
-import hashlib
-
-# Initialize database
-conn = sqlite3.connect('edgpt_platform.db')
-
-# Create tables
-conn.execute('''
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        email TEXT UNIQUE NOT NULL,
-        password_hash TEXT NOT NULL,
-        website_url TEXT,
-        business_name TEXT,
-        phone TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        is_admin BOOLEAN DEFAULT FALSE
-    )
-''')
-
-conn.execute('''
-    CREATE TABLE IF NOT EXISTS trial_requests (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        email TEXT NOT NULL,
-        website_url TEXT NOT NULL,
-        business_name TEXT,
-        phone TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        status TEXT DEFAULT 'pending'
-    )
-''')
-
-conn.execute('''
-    CREATE TABLE IF NOT EXISTS analytics (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        domain TEXT NOT NULL,
-        page_path TEXT NOT NULL,
-        user_agent TEXT,
-        ip_address TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-''')
-
-# Create admin user
-admin_email = 'admin@edgpt.ai'
-admin_password = 'admin123'
-admin_hash = hashlib.sha256(admin_password.encode()).hexdigest()
-
-conn.execute('''
-    INSERT OR IGNORE INTO users (email, password_hash, is_admin, business_name)
-    VALUES (?, ?, ?, ?)
-''', (admin_email, admin_hash, True, 'EdGPT Admin'))
-
-conn.commit()
-conn.close()
-print('Database initialized successfully')
-"
-
 print_status "Setting up file permissions..."
 chown -R $SERVICE_USER:$SERVICE_USER $APP_DIR
-chmod +x $APP_DIR/app.py
+
+print_status "Applying database migrations..."
+# Workers refuse to start on an outdated schema, so this must run before gunicorn
+sudo -u $SERVICE_USER $APP_DIR/venv/bin/python migrations.py migrate
 
 print_status "Configuring Supervisor..."
 cat > /etc/supervisor/conf.d/edgpt.conf << EOF
 [program:edgpt]
-command=$APP_DIR/venv/bin/gunicorn --bind 127.0.0.1:$PORT --workers 4 --timeout 120 app:app
+command=$APP_DIR/venv/bin/gunicorn --bind 127.0.0.1:$PORT --workers 4 --timeout 120 main:app
 directory=$APP_DIR
 user=$SERVICE_USER
 autostart=true
@@ -148,7 +88,9 @@ environment=PATH="$APP_DIR/venv/bin"
 EOF
 
 print_status "Configuring Nginx..."
-cp config/nginx.conf /etc/nginx/sites-available/edgpt-domains
+# config/nginx.conf must be the generator's output, not a hand edit
+python3 "$REPO_DIR/src/nginx_config.py" check
+cp "$REPO_DIR/config/nginx.conf" /etc/nginx/sites-available/edgpt-domains
 ln -sf /etc/nginx/sites-available/edgpt-domains /etc/nginx/sites-enabled/
 rm -f /etc/nginx/sites-enabled/default
 
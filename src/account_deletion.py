@@ -0,0 +1,342 @@
+"""
+EdGPT Platform - Account Deletion
+One-time deletion codes and a chunked background purge of a cancelled account
+
+account_cancellation.html asks for a code by email before deleting an
+account. issue_otp() stores only a hash of the code with an expiry time in
+deletion_otps, so any worker can check it; a code is good for OTP_TTL
+seconds and OTP_MAX_ATTEMPTS guesses, and a new one can be sent every
+OTP_RESEND_INTERVAL seconds.
+
+Only the signed-in owner of a trial can ask for a code or use one. A
+verified code only marks the trial 'cancelled' and queues a purge_jobs
+row, so the request returns at once. The job records the verified custom
+domains the account owns (claimed by the signup or its login, never a
+tenant's own domain); their page views are purged with them. The
+website_url a signup typed in proves nothing and is never used to match
+rows. The purge worker deletes the
+account's rows table by table (PURGE_STEPS) in batches of
+PURGE_BATCH_SIZE: it finds the next batch by rowid with plain reads,
+outside any transaction, then deletes exactly those rowids in a short
+IMMEDIATE transaction that also records the checkpoint (step and last
+rowid). It sleeps PURGE_PAUSE seconds between batches so web workers get
+the write lock, and a worker that dies is resumed from the checkpoint by
+the next one. Each job records the longest time it held the write lock.
+
+Usage:
+    python src/account_deletion.py run       # purge queued accounts until none are left
+    python src/account_deletion.py watch     # keep purging every POLL_INTERVAL seconds
+    python src/account_deletion.py status    # jobs with progress and longest lock hold
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import socket
+import sqlite3
+import sys
+import time
+
+from email_queue import enqueue
+from tenant_registry import GenerationCounter, bump_generation
+from trial_triage import connect
+
+OTP_TTL = int(os.environ.get('DELETION_OTP_TTL', '600'))
+OTP_MAX_ATTEMPTS = 5
+OTP_RESEND_INTERVAL = 30
+OTP_DIGITS = 6
+
+PURGE_BATCH_SIZE = int(os.environ.get('PURGE_BATCH_SIZE', '500'))
+PURGE_PAUSE = float(os.environ.get('PURGE_PAUSE', '0.05'))
+# Rowids examined per read while looking for the next batch
+PURGE_SCAN_ROWS = 50000
+CLAIM_TIMEOUT = 300
+POLL_INTERVAL = 10
+
+# Other live trials under the same email keep the login and its mail
+SOLE_ACCOUNT = '''NOT EXISTS (
+    SELECT 1 FROM trial_requests other
+    WHERE other.email = :email AND other.id != :signup_id
+      AND COALESCE(other.duplicate_of, 0) != :signup_id AND other.status != 'cancelled')'''
+
+# Custom domains the account owns: claimed by this signup, or by its login when
+# no other live trial shares it. A tenant's own domain is never one of them.
+ACCOUNT_DOMAINS = f'''(signup_id = :signup_id OR (user_id IN (
+        SELECT id FROM users WHERE email = :email AND NOT COALESCE(is_admin, 0)) AND {SOLE_ACCOUNT}))
+    AND host NOT IN (SELECT domain FROM tenants)'''
+
+# (table, rows of the account), deleted in this order; custom domains go
+# first so the customer's hostname stops resolving while the rest is purged.
+# Page views are matched on the verified hosts recorded when the job was queued.
+# Uploaded files no document refers to any more are removed by `uploads.py gc`.
+PURGE_STEPS = (
+    ('custom_domains', ACCOUNT_DOMAINS),
+    ('analytics', 'domain IN (SELECT value FROM json_each(:hosts))'),
+    ('email_outbox', f'recipient = :email AND {SOLE_ACCOUNT}'),
+    ('knowledge_documents', 'user_id IN (SELECT id FROM users WHERE email = :email '
+                            f'AND NOT COALESCE(is_admin, 0)) AND {SOLE_ACCOUNT}'),
+    ('email_settings', 'user_id IN (SELECT id FROM users WHERE email = :email '
+                       f'AND NOT COALESCE(is_admin, 0)) AND {SOLE_ACCOUNT}'),
+    ('email_subscriptions', 'user_id IN (SELECT id FROM users WHERE email = :email '
+                            f'AND NOT COALESCE(is_admin, 0)) AND {SOLE_ACCOUNT}'),
+    ('users', f'email = :email AND NOT COALESCE(is_admin, 0) AND {SOLE_ACCOUNT}'),
+    ('deletion_otps', 'signup_id = :signup_id'),
+    ('trial_requests', 'id = :signup_id OR duplicate_of = :signup_id'),
+)
+
+CLAIM_SQL = '''
+    UPDATE purge_jobs SET status = 'running', claimed_by = ?, claimed_at = ?
+    WHERE id = (SELECT id FROM purge_jobs WHERE status = 'pending' ORDER BY id LIMIT 1)
+    RETURNING *
+'''
+
+
+def create_deletion_tables(conn):
+    """Pending deletion codes and the purge job queue with its checkpoints"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS deletion_otps (
+            signup_id INTEGER PRIMARY KEY,
+            code_hash TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            sent_at REAL NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS purge_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            signup_id INTEGER NOT NULL,
+            email TEXT NOT NULL,
+            host TEXT,
+            tenant TEXT NOT NULL,
+            reason TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            step TEXT,
+            last_rowid INTEGER NOT NULL DEFAULT 0,
+            rows_deleted INTEGER NOT NULL DEFAULT 0,
+            batches INTEGER NOT NULL DEFAULT 0,
+            max_lock_ms REAL NOT NULL DEFAULT 0,
+            claimed_by TEXT,
+            claimed_at REAL,
+            last_error TEXT,
+            created_at REAL NOT NULL,
+            finished_at REAL
+        )
+    ''')
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_purge_jobs_signup ON purge_jobs(signup_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_purge_jobs_status ON purge_jobs(status)')
+
+
+def add_purge_hosts_column(conn):
+    """Hosts whose page views a job purges, as a JSON list; replaces matching on website_url"""
+    conn.execute("ALTER TABLE purge_jobs ADD COLUMN hosts TEXT NOT NULL DEFAULT '[]'")
+
+
+def otp_hash(signup_id, code):
+    return hashlib.sha256(f"{signup_id}:{code}".encode()).hexdigest()
+
+
+def issue_otp(conn, signup_id, now=None):
+    """New code for `signup_id` in the caller's transaction, or None if one was sent too recently"""
+    now = now or time.time()
+    conn.execute('DELETE FROM deletion_otps WHERE expires_at < ?', (now,))
+    row = conn.execute('SELECT sent_at FROM deletion_otps WHERE signup_id = ?', (signup_id,)).fetchone()
+    if row and now - row[0] < OTP_RESEND_INTERVAL:
+        return None
+    code = f"{secrets.randbelow(10 ** OTP_DIGITS):0{OTP_DIGITS}d}"
+    conn.execute('''
+        INSERT OR REPLACE INTO deletion_otps (signup_id, code_hash, expires_at, attempts, sent_at)
+        VALUES (?, ?, ?, 0, ?)
+    ''', (signup_id, otp_hash(signup_id, code), now + OTP_TTL, now))
+    return code
+
+
+def verify_otp(conn, signup_id, code, now=None):
+    """True once for the current unexpired code; every call counts as an attempt"""
+    now = now or time.time()
+    row = conn.execute('''
+        UPDATE deletion_otps SET attempts = attempts + 1
+        WHERE signup_id = ? AND expires_at >= ? AND attempts < ?
+        RETURNING code_hash
+    ''', (signup_id, now, OTP_MAX_ATTEMPTS)).fetchone()
+    if row is None or not hmac.compare_digest(row[0], otp_hash(signup_id, str(code).strip())):
+        return False
+    conn.execute('DELETE FROM deletion_otps WHERE signup_id = ?', (signup_id,))
+    return True
+
+
+def account_hosts(conn, signup_id, email):
+    """Verified custom domains the account owns, with their www. names"""
+    hosts = [row[0] for row in conn.execute(
+        f"SELECT host FROM custom_domains WHERE status = 'verified' AND {ACCOUNT_DOMAINS} ORDER BY host",
+        {'signup_id': signup_id, 'email': email})]
+    return hosts + [f'www.{host}' for host in hosts]
+
+
+def queue_purge(conn, trial, tenant, reason=None):
+    """Cancel the trial and queue its purge in the caller's transaction; returns the job id"""
+    hosts = account_hosts(conn, trial['id'], trial['email'])
+    conn.execute("UPDATE trial_requests SET status = 'cancelled' WHERE id = ?", (trial['id'],))
+    conn.execute('''
+        INSERT OR IGNORE INTO purge_jobs (signup_id, email, host, hosts, tenant, reason, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', (trial['id'], trial['email'], hosts[0] if hosts else None, json.dumps(hosts), tenant, reason,
+          time.time()))
+    return conn.execute('SELECT id FROM purge_jobs WHERE signup_id = ?', (trial['id'],)).fetchone()[0]
+
+
+def claim_job(conn, worker_id):
+    return conn.execute(CLAIM_SQL, (worker_id, time.time())).fetchone()
+
+
+def release_stale_claims(conn, timeout=CLAIM_TIMEOUT):
+    """Return jobs whose worker stopped checkpointing to the queue; they resume where they were"""
+    return conn.execute('''
+        UPDATE purge_jobs SET status = 'pending', claimed_by = NULL, claimed_at = NULL
+        WHERE status = 'running' AND claimed_at < ?
+    ''', (time.time() - timeout,)).rowcount
+
+
+def next_batch(conn, table, condition, params, after, end, size, scan_rows=PURGE_SCAN_ROWS):
+    """(rowids, scanned_to) of the next `size` matching rows after `after`; reads only"""
+    rowids = []
+    while after < end and len(rowids) < size:
+        until = min(after + scan_rows, end)
+        found = [row[0] for row in conn.execute(f'''
+            SELECT rowid FROM {table}
+            WHERE rowid > :after AND rowid <= :until AND ({condition})
+            ORDER BY rowid LIMIT :limit
+        ''', dict(params, after=after, until=until, limit=size - len(rowids)))]
+        rowids.extend(found)
+        after = found[-1] if len(rowids) == size else until
+    return rowids, after
+
+
+def delete_batch(conn, job_id, table, condition, params, rowids, scanned_to, max_lock_ms):
+    """Delete `rowids` and checkpoint in one IMMEDIATE transaction; (deleted, generation, lock_ms)"""
+    conn.execute('BEGIN IMMEDIATE')
+    start = time.perf_counter()
+    try:
+        # Re-check the condition: a rowid may have been reused since it was read
+        deleted = conn.execute(f'''
+            DELETE FROM {table} WHERE rowid IN ({','.join(str(int(r)) for r in rowids)}) AND ({condition})
+        ''', params).rowcount
+        generation = bump_generation(conn) if table == 'custom_domains' and deleted else None
+        conn.execute('''
+            UPDATE purge_jobs
+            SET step = ?, last_rowid = ?, rows_deleted = rows_deleted + ?, batches = batches + 1,
+                max_lock_ms = MAX(max_lock_ms, ?), claimed_at = ?
+            WHERE id = ?
+        ''', (table, scanned_to, deleted, max_lock_ms, time.time(), job_id))
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+    return deleted, generation, (time.perf_counter() - start) * 1000
+
+
+def run_job(conn, job, batch_size=PURGE_BATCH_SIZE, pause=PURGE_PAUSE, publish=None):
+    """Purge one claimed job from its checkpoint; returns {'rows', 'batches', 'max_lock_ms'}"""
+    params = {'signup_id': job['signup_id'], 'email': job['email'], 'hosts': job['hosts']}
+    names = [table for table, _ in PURGE_STEPS]
+    first = names.index(job['step']) if job['step'] in names else 0
+    rows, batches, max_lock_ms = 0, 0, job['max_lock_ms']
+
+    for table, condition in PURGE_STEPS[first:]:
+        after = job['last_rowid'] if table == job['step'] else 0
+        end = conn.execute(f'SELECT COALESCE(MAX(rowid), 0) FROM {table}').fetchone()[0]
+        while after < end:
+            rowids, after = next_batch(conn, table, condition, params, after, end, batch_size)
+            if not rowids:
+                break
+            deleted, generation, lock_ms = delete_batch(conn, job['id'], table, condition, params,
+                                                        rowids, after, max_lock_ms)
+            if generation and publish:
+                publish(generation)
+            rows += deleted
+            batches += 1
+            max_lock_ms = max(max_lock_ms, lock_ms)
+            # Let the web workers' writes in before taking the lock again
+            time.sleep(pause)
+
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        conn.execute('''
+            UPDATE purge_jobs
+            SET status = 'done', step = NULL, last_rowid = 0, max_lock_ms = MAX(max_lock_ms, ?),
+                finished_at = ?, last_error = NULL
+            WHERE id = ?
+        ''', (max_lock_ms, time.time(), job['id']))
+        enqueue(conn, job['tenant'], job['email'], 'Your EdGPT account has been deleted',
+                'Your EdGPT trial account and its data have been deleted as you requested.\n\n'
+                'You are welcome to start a new trial at any time.\n')
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+    return {'rows': rows, 'batches': batches, 'max_lock_ms': round(max_lock_ms, 1)}
+
+
+def drain(database, batch_size=PURGE_BATCH_SIZE, pause=PURGE_PAUSE):
+    """Purge queued accounts one at a time until none are pending; returns {job_id: totals}"""
+    conn = connect(database)
+    conn.row_factory = sqlite3.Row
+    counter = GenerationCounter(f"{database}.tenants")
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    finished = {}
+    try:
+        release_stale_claims(conn)
+        while True:
+            job = claim_job(conn, worker_id)
+            if job is None:
+                return finished
+            try:
+                finished[job['id']] = run_job(conn, job, batch_size, pause,
+                                             lambda generation: counter.sync(database))
+            except sqlite3.Error as e:
+                # Stays claimed; release_stale_claims() resumes it from the checkpoint later
+                print(f"Purge error in job {job['id']}: {e}")
+                conn.execute('UPDATE purge_jobs SET last_error = ? WHERE id = ?', (str(e), job['id']))
+                return finished
+    finally:
+        conn.close()
+
+
+def job_status(database):
+    conn = sqlite3.connect(database)
+    conn.row_factory = sqlite3.Row
+    try:
+        return [dict(row) for row in conn.execute('''
+            SELECT id, signup_id, hosts, status, step, rows_deleted, batches, max_lock_ms, last_error
+            FROM purge_jobs ORDER BY id DESC LIMIT 50
+        ''')]
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    database = os.environ.get('DATABASE', 'edgpt_platform.db')
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    if command in ('run', 'watch'):
+        while True:
+            start = time.perf_counter()
+            finished = drain(database)
+            for job_id, totals in finished.items():
+                print(f"✅ Purge job {job_id}: {totals['rows']} rows in {totals['batches']} batches, "
+                      f"longest write lock {totals['max_lock_ms']:.1f} ms")
+            if command == 'run':
+                print(f"Purged {len(finished)} accounts in {time.perf_counter() - start:.1f}s")
+                break
+            time.sleep(POLL_INTERVAL)
+    elif command == 'status':
+        for job in job_status(database):
+            hosts = ', '.join(json.loads(job['hosts'])) or 'no custom domain'
+            print(f"   • job {job['id']} (signup {job['signup_id']}, {hosts}): {job['status']}"
+                  f"{' at ' + job['step'] if job['step'] else ''}, {job['rows_deleted']} rows, "
+                  f"{job['batches']} batches, longest lock {job['max_lock_ms']:.1f} ms"
+                  f"{' - ' + job['last_error'] if job['last_error'] else ''}")
+    else:
+        print(__doc__)
+        sys.exit(1)
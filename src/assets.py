@@ -0,0 +1,178 @@
+"""
+EdGPT Platform - Static Asset Pipeline
+Minified, content-hashed CSS/JS bundles and the asset_url() template helper
+
+Source stylesheets and scripts live in static/css and static/js. The build
+step writes minified copies named by content hash to static/dist together
+with a manifest.json, which nginx serves from /static/ with immutable cache
+headers. Templates reference assets through asset_url('css/<name>.css');
+without a manifest (local development) the unminified sources are served.
+Each bundle also gets precompressed .gz (and, with brotli installed, .br)
+siblings.
+
+Usage:
+    python src/assets.py build     # write static/dist and manifest.json
+    python src/assets.py report    # HTML bytes saved per page
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+
+from flask import url_for
+
+from compression import precompress
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, 'static')
+TEMPLATE_DIR = os.path.join(BASE_DIR, 'templates')
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+SOURCE_DIRS = ('css', 'js')
+
+CSS_STRING = re.compile(r'''("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')''')
+CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+ASSET_TAG = re.compile(r'''(<(?:link|script)[^>]*asset_url\('([^']+)'\)[^>]*>(?:</script>)?)''')
+
+
+def minify_css(text):
+    """Strip comments and insignificant whitespace, leaving string literals untouched"""
+    parts = CSS_STRING.split(text)
+    for i in range(0, len(parts), 2):
+        chunk = CSS_COMMENT.sub('', parts[i])
+        chunk = re.sub(r'\s+', ' ', chunk)
+        chunk = re.sub(r'\s*([{};,>])\s*', r'\1', chunk)
+        chunk = re.sub(r':\s+', ':', chunk)
+        parts[i] = chunk.replace(';}', '}')
+    return ''.join(parts).strip()
+
+
+def minify_js(text):
+    """Conservative line-level JS minifier
+
+    Drops indentation, blank lines and whole-line // comments. Lines inside
+    multi-line template literals are kept verbatim since their whitespace is
+    part of the string value.
+    """
+    output = []
+    in_template = False
+    for line in text.split('\n'):
+        if in_template:
+            output.append(line)
+        else:
+            stripped = line.strip()
+            if stripped and not stripped.startswith('//'):
+                output.append(stripped)
+        if line.count('`') % 2 == 1:
+            in_template = not in_template
+    return '\n'.join(output)
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def build_assets(static_dir=STATIC_DIR):
+    """Minify and fingerprint every source asset; returns the manifest"""
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    os.makedirs(dist_dir, exist_ok=True)
+    manifest = {}
+
+    for source_dir in SOURCE_DIRS:
+        directory = os.path.join(static_dir, source_dir)
+        if not os.path.isdir(directory):
+            continue
+        for filename in sorted(os.listdir(directory)):
+            stem, ext = os.path.splitext(filename)
+            if ext not in MINIFIERS:
+                continue
+            with open(os.path.join(directory, filename), encoding='utf-8') as f:
+                minified = MINIFIERS[ext](f.read()).encode('utf-8')
+            digest = hashlib.sha256(minified).hexdigest()[:12]
+            output_name = f"{stem}.{digest}.min{ext}"
+            output_path = os.path.join(dist_dir, output_name)
+            with open(output_path, 'wb') as f:
+                f.write(minified)
+            # .gz/.br siblings for nginx gzip_static and CompressionMiddleware
+            precompress(output_path)
+            manifest[f"{source_dir}/{filename}"] = f"{DIST_DIR}/{output_name}"
+
+    # Write the manifest last so a half-finished build is never picked up
+    manifest_path = os.path.join(dist_dir, MANIFEST_NAME)
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return manifest
+
+
+def load_manifest(static_dir=STATIC_DIR):
+    """Load the build manifest, or an empty one when assets were not built"""
+    try:
+        with open(os.path.join(static_dir, DIST_DIR, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+_manifest = {}
+
+
+def asset_url(name):
+    """URL of the fingerprinted bundle for a source asset name"""
+    return url_for('static', filename=_manifest.get(name, name))
+
+
+def register_asset_helper(app, static_dir=STATIC_DIR):
+    """Load the manifest once per worker and expose asset_url() to templates"""
+    global _manifest
+    _manifest = load_manifest(static_dir)
+    app.jinja_env.globals['asset_url'] = asset_url
+    return _manifest
+
+
+def page_savings(template_dir=TEMPLATE_DIR, static_dir=STATIC_DIR):
+    """Per template: (bytes now, bytes with assets inlined, cacheable bundle bytes)"""
+    manifest = load_manifest(static_dir)
+    rows = []
+    for filename in sorted(os.listdir(template_dir)):
+        if not filename.endswith('.html'):
+            continue
+        with open(os.path.join(template_dir, filename), encoding='utf-8') as f:
+            html = f.read()
+        tags = ASSET_TAG.findall(html)
+        if not tags:
+            continue
+        html_bytes = len(html.encode('utf-8'))
+        inline_bytes = html_bytes
+        bundle_bytes = 0
+        for tag, name in tags:
+            # <style>...</style> / <script>...</script> replaced the reference tag
+            wrapper = len('<style></style>') if name.endswith('.css') else len('<script></script>')
+            inline_bytes += os.path.getsize(os.path.join(static_dir, name)) + wrapper - len(tag)
+            built = manifest.get(name)
+            bundle_bytes += os.path.getsize(os.path.join(static_dir, built if built else name))
+        rows.append((filename, html_bytes, inline_bytes, bundle_bytes))
+    return rows
+
+
+def print_report(rows):
+    print(f"{'page':48} {'inline':>9} {'now':>9} {'saved':>9} {'bundles':>9}")
+    total_saved = 0
+    for filename, html_bytes, inline_bytes, bundle_bytes in rows:
+        saved = inline_bytes - html_bytes
+        total_saved += saved
+        print(f"{filename:48} {inline_bytes:9d} {html_bytes:9d} {saved:9d} {bundle_bytes:9d}")
+    print(f"{'total HTML bytes saved per full page set':48} {total_saved:39d}")
+
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'build'
+    if command == 'build':
+        built = build_assets()
+        print(f"✅ Built {len(built)} assets into {os.path.join(STATIC_DIR, DIST_DIR)}")
+    elif command == 'report':
+        print_report(page_savings())
+    else:
+        print(__doc__)
+        sys.exit(1)
@@ -0,0 +1,136 @@
+"""
+EdGPT Platform - Beacon Analytics Collector
+Page views reported by navigator.sendBeacon to /collect, written in batches
+
+Landing, signup and conversion pages no longer log from their handlers, so
+nginx can serve them from proxy_cache. Instead static/js/beacon.js posts
+{"path": location.pathname} to /collect once per view. The endpoint answers
+204 immediately and appends the view to an in-process buffer; a background
+thread per worker interns the User-Agents and inserts the buffered rows in
+one transaction every FLUSH_INTERVAL seconds or BATCH_SIZE views.
+
+The buffer is bounded: under sustained overload views are dropped and
+counted, never allowed to build up memory or block requests.
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+from collections import deque
+
+from flask import request
+
+from rate_limit import client_ip
+from ua_registry import classify_user_agent, intern_user_agent
+
+FLUSH_INTERVAL = float(os.environ.get('ANALYTICS_FLUSH_INTERVAL', '1'))
+BATCH_SIZE = 500
+MAX_BUFFER = 50000
+MAX_PATH_LENGTH = 512
+MAX_PAYLOAD = 2048
+
+
+class AnalyticsBatcher:
+    """Per-worker buffer of page views flushed to SQLite by a background thread"""
+
+    def __init__(self, database, flush_interval=FLUSH_INTERVAL, batch_size=BATCH_SIZE,
+                 max_buffer=MAX_BUFFER):
+        self.database = database
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._buffer = deque(maxlen=max_buffer)
+        self._wakeup = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread_pid = None
+        self.stats = {'queued': 0, 'written': 0, 'dropped': 0, 'flushes': 0}
+        atexit.register(self.flush)
+
+    def add(self, domain, page_path, user_agent, ip_address):
+        self._ensure_thread()
+        if len(self._buffer) == self._buffer.maxlen:
+            self.stats['dropped'] += 1
+            return
+        self._buffer.append((domain, page_path, user_agent, ip_address))
+        self.stats['queued'] += 1
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def depth(self):
+        return len(self._buffer)
+
+    def _ensure_thread(self):
+        # Started lazily so each forked gunicorn worker gets its own thread
+        if self._thread_pid != os.getpid():
+            self._thread_pid = os.getpid()
+            threading.Thread(target=self._run, name='analytics-flush', daemon=True).start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print(f"Analytics flush error: {e}")
+
+    def flush(self):
+        """Write everything buffered so far; returns rows inserted"""
+        with self._flush_lock:
+            views = []
+            while self._buffer:
+                views.append(self._buffer.popleft())
+            if not views:
+                return 0
+            conn = sqlite3.connect(self.database, timeout=30)
+            try:
+                rows = []
+                for domain, page_path, user_agent, ip_address in views:
+                    ua_id, _, _ = intern_user_agent(conn, user_agent)
+                    rows.append((domain, page_path, ua_id, ip_address))
+                conn.executemany('''
+                    INSERT INTO analytics (domain, page_path, user_agent_id, ip_address)
+                    VALUES (?, ?, ?, ?)
+                ''', rows)
+                conn.commit()
+            finally:
+                conn.close()
+            self.stats['written'] += len(rows)
+            self.stats['flushes'] += 1
+            return len(rows)
+
+
+def parse_beacon(body):
+    """Page path from a sendBeacon body, or None for anything malformed"""
+    if not body or len(body) > MAX_PAYLOAD:
+        return None
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return None
+    path = payload.get('path') if isinstance(payload, dict) else None
+    if not isinstance(path, str) or not path.startswith('/') or len(path) > MAX_PATH_LENGTH:
+        return None
+    return path
+
+
+def register_collector(app, batcher, should_record_bot):
+    """Add the /collect beacon endpoint feeding `batcher`"""
+
+    @app.route('/collect', methods=['POST'])
+    def collect():
+        # Anonymous endpoint: refuse large bodies before reading, and never read more than needed
+        if (request.content_length or 0) > MAX_PAYLOAD:
+            return '', 413
+        # sendBeacon posts text/plain, so read the raw body rather than get_json()
+        path = parse_beacon(request.stream.read(MAX_PAYLOAD + 1))
+        if path is None:
+            return '', 400
+        user_agent = request.headers.get('User-Agent', '')
+        is_bot, _family = classify_user_agent(user_agent)
+        if not is_bot or should_record_bot():
+            batcher.add(request.host, path, user_agent, client_ip())
+        return '', 204
+
+    return batcher
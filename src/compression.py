@@ -0,0 +1,245 @@
+"""
+EdGPT Platform - Response Compression
+WSGI middleware for gzip/brotli when the app is reached without nginx
+
+Responses are compressed when the client accepts it, the content type is
+textual and the body is at least COMPRESS_MIN_SIZE bytes. Bodies are
+compressed chunk by chunk as the app yields them, so large pages are never
+buffered whole. Static files with a precompressed sibling (app.css.br,
+app.css.gz, written by `python src/assets.py build`) are served from the
+sibling instead of being compressed per request.
+
+Brotli is optional; without the `brotli` package only gzip is offered.
+"""
+
+import gzip
+import os
+import zlib
+
+from werkzeug.wsgi import wrap_file
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', '1') == '1'
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', '1024'))
+COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', '6'))
+COMPRESS_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', '4'))
+
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript',
+                      'application/xml', 'image/svg+xml')
+# Compressing these would hold events back until a compressor block fills
+STREAMING_TYPES = ('text/event-stream',)
+PRECOMPRESSED_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.html', '.txt')
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def accepted_encodings(header):
+    """Encodings from an Accept-Encoding header with q > 0, in our preference order"""
+    accepted = set()
+    for part in (header or '').lower().split(','):
+        name, _, params = part.strip().partition(';')
+        q = 1.0
+        if params.strip().startswith('q='):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted.add(name.strip())
+    offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return [name for name in offered if name in accepted or '*' in accepted]
+
+
+def precompress(path, gzip_level=9, brotli_quality=11):
+    """Write max-effort .gz (and .br) siblings next to a static file"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    written = []
+    outputs = [('.gz', gzip.compress(data, compresslevel=gzip_level, mtime=0))]
+    if brotli is not None:
+        outputs.append(('.br', brotli.compress(data, quality=brotli_quality)))
+    for suffix, compressed in outputs:
+        if len(compressed) < len(data):
+            with open(path + suffix, 'wb') as f:
+                f.write(compressed)
+            written.append(path + suffix)
+    return written
+
+
+class _Compressor:
+    def __init__(self, encoding, gzip_level, brotli_quality):
+        if encoding == 'br':
+            self._c = brotli.Compressor(quality=brotli_quality)
+            self.compress, self.flush = self._c.process, self._c.finish
+        else:
+            # wbits 31 = gzip container
+            self._c = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self.compress, self.flush = self._c.compress, self._c.flush
+
+
+def _set_header(headers, name, value):
+    lower = name.lower()
+    headers[:] = [(k, v) for k, v in headers if k.lower() != lower]
+    if value is not None:
+        headers.append((name, value))
+
+
+def _get_header(headers, name):
+    lower = name.lower()
+    return next((v for k, v in headers if k.lower() == lower), None)
+
+
+def _add_vary(headers):
+    vary = _get_header(headers, 'Vary')
+    if not vary:
+        _set_header(headers, 'Vary', 'Accept-Encoding')
+    elif 'accept-encoding' not in vary.lower():
+        _set_header(headers, 'Vary', f'{vary}, Accept-Encoding')
+
+
+class CompressionMiddleware:
+    """Negotiate gzip/brotli for app responses and precompressed static files"""
+
+    def __init__(self, app, static_dir=None, static_url_path='/static',
+                 min_size=COMPRESS_MIN_SIZE, gzip_level=COMPRESS_LEVEL,
+                 brotli_quality=COMPRESS_BROTLI_QUALITY):
+        self.app = app
+        self.static_dir = static_dir
+        self.static_prefix = static_url_path.rstrip('/') + '/'
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _static_sibling(self, path, encodings):
+        if not self.static_dir or not path.startswith(self.static_prefix):
+            return None, None
+        relative = path[len(self.static_prefix):]
+        if not relative.endswith(PRECOMPRESSED_EXTENSIONS):
+            return None, None
+        original = os.path.normpath(os.path.join(self.static_dir, relative))
+        if not original.startswith(os.path.normpath(self.static_dir) + os.sep):
+            return None, None
+        for encoding in encodings:
+            sibling = original + SUFFIXES[encoding]
+            try:
+                if os.stat(sibling).st_mtime >= os.stat(original).st_mtime:
+                    return encoding, sibling
+            except OSError:
+                continue
+        return None, None
+
+    def __call__(self, environ, start_response):
+        encodings = accepted_encodings(environ.get('HTTP_ACCEPT_ENCODING'))
+        if not encodings or environ.get('REQUEST_METHOD') == 'HEAD':
+            return self.app(environ, start_response)
+
+        sibling_encoding, sibling = self._static_sibling(environ.get('PATH_INFO', ''), encodings)
+        captured = {}
+        pending = []
+
+        def capture(status, headers, exc_info=None):
+            captured['status'], captured['headers'], captured['exc_info'] = status, list(headers), exc_info
+            return pending.append
+
+        body = self.app(environ, capture)
+        status, headers = captured['status'], captured['headers']
+        content_type = _get_header(headers, 'Content-Type') or ''
+        compressible = (
+            status.startswith('200')
+            and _get_header(headers, 'Content-Encoding') is None
+            and content_type.startswith(COMPRESSIBLE_TYPES)
+            and not content_type.startswith(STREAMING_TYPES)
+        )
+        if not compressible:
+            start_response(status, headers, captured['exc_info'])
+            return self._chain(pending, body)
+
+        if sibling:
+            # Let the app build the headers (type, ETag, caching), then swap the body
+            if hasattr(body, 'close'):
+                body.close()
+            _set_header(headers, 'Content-Encoding', sibling_encoding)
+            _set_header(headers, 'Content-Length', str(os.path.getsize(sibling)))
+            # ETag kept as-is (like nginx gzip_static) so If-None-Match still yields 304
+            _add_vary(headers)
+            start_response(status, headers)
+            return wrap_file(environ, open(sibling, 'rb'))
+
+        length = _get_header(headers, 'Content-Length')
+        if length is not None and int(length) < self.min_size:
+            _add_vary(headers)
+            start_response(status, headers)
+            return self._chain(pending, body)
+        return self._compress(encodings[0], status, headers, pending, body, start_response, length is None)
+
+    @staticmethod
+    def _chain(pending, body):
+        if not pending:
+            return body
+        return _ClosingIterator(pending + list(body), body)
+
+    def _compress(self, encoding, status, headers, pending, body, start_response, unknown_length):
+        iterator = iter(body)
+        head = list(pending)
+        if unknown_length:
+            # Streaming responses: look at the first bytes before committing
+            size = sum(len(chunk) for chunk in head)
+            for chunk in iterator:
+                head.append(chunk)
+                size += len(chunk)
+                if size >= self.min_size:
+                    break
+            else:
+                _add_vary(headers)
+                start_response(status, headers)
+                return _ClosingIterator(head, body)
+
+        _set_header(headers, 'Content-Encoding', encoding)
+        _set_header(headers, 'Content-Length', None)
+        etag = _get_header(headers, 'ETag')
+        if etag and not etag.startswith('W/'):
+            _set_header(headers, 'ETag', 'W/' + etag)
+        _add_vary(headers)
+        start_response(status, headers)
+
+        compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+
+        def generate():
+            for chunk in head:
+                data = compressor.compress(chunk)
+                if data:
+                    yield data
+            for chunk in iterator:
+                data = compressor.compress(chunk)
+                if data:
+                    yield data
+            yield compressor.flush()
+
+        return _ClosingIterator(generate(), body)
+
+
+class _ClosingIterator:
+    """Iterate `iterable`, closing the app's original body when done (PEP 3333)"""
+
+    def __init__(self, iterable, body):
+        self._iterable = iterable
+        self._body = body
+
+    def __iter__(self):
+        return iter(self._iterable)
+
+    def close(self):
+        if hasattr(self._body, 'close'):
+            self._body.close()
+
+
+def register_compression(app):
+    """Wrap the app's WSGI callable; no-op when COMPRESSION_ENABLED=0"""
+    if not COMPRESSION_ENABLED:
+        return None
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app, static_dir=app.static_folder,
+                                         static_url_path=app.static_url_path)
+    return app.wsgi_app
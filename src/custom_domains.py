@@ -0,0 +1,385 @@
+"""
+EdGPT Platform - Custom Domain Resolution
+Maps customer-owned hostnames onto platform tenants
+
+Signed-in customers claim their own hostname for a published GPTsite
+through /api/custom-domain. A claim starts 'pending' with a random token the
+customer publishes as a TXT record at _edgpt-verification.<host>; once the
+record is found (or an admin approves the claim) it becomes 'verified'. Only
+verified hosts resolve, at most one verified claim per host, and pending
+claims by other accounts never block the real owner. Request-time
+resolution goes through:
+
+1. a bounded LRU cache with separate TTLs for hits and misses, and
+2. an in-process set of 64-bit hashes of every registered host, so Host
+   headers that cannot possibly match (scanners, random names) are answered
+   as misses without touching SQLite or crowding real hosts out of the cache.
+
+The hash set reloads when the tenant registry generation changes, which
+verifying a domain (or deleting a verified one) bumps; unverified claims do
+not touch the generation.
+
+TXT lookups need the optional dnspython package; without it claims are
+approved by an admin.
+
+Usage:
+    python src/custom_domains.py list              # claims with their status
+    python src/custom_domains.py check <host>      # look up TXT records for pending claims
+    python src/custom_domains.py approve <id>      # verify a claim without DNS
+"""
+
+import hashlib
+import os
+import re
+import secrets
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import dns.exception
+    import dns.resolver
+except ImportError:  # pragma: no cover - optional dependency
+    dns = None
+
+from tenant_registry import TenantRegistry, bump_generation
+
+POSITIVE_TTL = 300
+NEGATIVE_TTL = 60
+CACHE_SIZE = 50000
+DNS_TIMEOUT = 5
+VERIFICATION_PREFIX = '_edgpt-verification'
+
+HOSTNAME_PATTERN = re.compile(r'^(?=.{4,253}$)([a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,63}$')
+
+
+def create_custom_domain_table(conn):
+    """Create the custom_domains table and its host index"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS custom_domains (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            host TEXT NOT NULL,
+            tenant_domain TEXT NOT NULL,
+            conversion_id TEXT,
+            status TEXT DEFAULT 'pending',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_custom_domains_host ON custom_domains(host)')
+
+
+def add_ownership_columns(conn):
+    """Owner and verification state per claim; only verified hosts are unique"""
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(custom_domains)')}
+    for column, definition in (('user_id', 'INTEGER'), ('signup_id', 'INTEGER'),
+                               ('verification_token', 'TEXT'), ('verified_at', 'REAL')):
+        if column not in columns:
+            conn.execute(f'ALTER TABLE custom_domains ADD COLUMN {column} {definition}')
+    conn.execute('DROP INDEX IF EXISTS idx_custom_domains_host')
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_custom_domains_verified "
+                 "ON custom_domains(host) WHERE status = 'verified'")
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_custom_domains_claim ON custom_domains(host, user_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_custom_domains_user ON custom_domains(user_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_custom_domains_signup ON custom_domains(signup_id)')
+
+
+class DomainTaken(ValueError):
+    """Another account has already verified this host"""
+
+
+def verification_record(host):
+    """DNS name the claim's TXT record is published under"""
+    return f"{VERIFICATION_PREFIX}.{host}"
+
+
+def verification_value(token):
+    return f"edgpt-verification={token}"
+
+
+def lookup_txt(name):
+    """TXT strings published at `name`; None when dnspython is not installed"""
+    if dns is None:
+        return None
+    try:
+        answer = dns.resolver.resolve(name, 'TXT', lifetime=DNS_TIMEOUT)
+    except dns.exception.DNSException:
+        return []
+    return [b''.join(record.strings).decode('utf-8', 'replace') for record in answer]
+
+
+def claim_domain(conn, host, tenant_domain, user_id, signup_id=None, conversion_id=None):
+    """Record a pending claim in the caller's transaction; returns (id, status, token)
+
+    Claiming a host again returns the same token. Raises DomainTaken when
+    another account already verified the host.
+    """
+    owner = conn.execute("SELECT user_id FROM custom_domains WHERE host = ? AND status = 'verified'",
+                         (host,)).fetchone()
+    if owner and owner[0] != user_id:
+        raise DomainTaken(host)
+    return conn.execute('''
+        INSERT INTO custom_domains (host, tenant_domain, conversion_id, user_id, signup_id, verification_token)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(host, user_id) DO UPDATE SET
+            tenant_domain = excluded.tenant_domain,
+            status = CASE status WHEN 'rejected' THEN 'pending' ELSE status END,
+            conversion_id = COALESCE(excluded.conversion_id, conversion_id),
+            signup_id = COALESCE(excluded.signup_id, signup_id)
+        RETURNING id, status, verification_token
+    ''', (host, tenant_domain, conversion_id, user_id, signup_id, secrets.token_urlsafe(24))).fetchone()
+
+
+def mark_verified(conn, claim_id):
+    """Verify a claim in the caller's transaction and reject rival claims; returns the new generation
+
+    Raises DomainTaken if another claim for the host was verified first.
+    """
+    row = conn.execute('SELECT host, status FROM custom_domains WHERE id = ?', (claim_id,)).fetchone()
+    if row is None:
+        return None
+    host, status = row
+    if status == 'verified':
+        return None
+    try:
+        conn.execute("UPDATE custom_domains SET status = 'verified', verified_at = ? WHERE id = ?",
+                     (time.time(), claim_id))
+    except sqlite3.IntegrityError:
+        raise DomainTaken(host)
+    conn.execute("UPDATE custom_domains SET status = 'rejected' WHERE host = ? AND id != ?",
+                 (host, claim_id))
+    return bump_generation(conn)
+
+
+def normalize_host(host):
+    """Lowercase, drop port, trailing dot and a leading www.; IDNA-encode"""
+    host = (host or '').strip().lower()
+    if host.startswith('[') or host.count(':') > 1:
+        return ''  # IPv6 literal, never a custom domain
+    host = host.split(':')[0].rstrip('.')
+    if host.startswith('www.'):
+        host = host[4:]
+    if not host.isascii():
+        try:
+            host = host.encode('idna').decode('ascii')
+        except UnicodeError:
+            return ''
+    return host
+
+
+def is_valid_hostname(host):
+    return bool(HOSTNAME_PATTERN.match(host))
+
+
+def host_key(host):
+    return int.from_bytes(hashlib.blake2b(host.encode('ascii'), digest_size=8).digest(), 'big')
+
+
+def candidate_hosts(host):
+    """The host and its parent domains down to two labels"""
+    labels = host.split('.')
+    return ['.'.join(labels[i:]) for i in range(0, max(1, len(labels) - 1))]
+
+
+class TTLCache:
+    """Bounded LRU with a per-entry expiry time"""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at < now:
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def put(self, key, value, ttl, now):
+        with self._lock:
+            self._entries[key] = (now + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CustomDomainResolver:
+    """Resolve customer hostnames to tenant domains with cached hits and misses"""
+
+    def __init__(self, database, registry):
+        self.database = database
+        self.registry = registry
+        self.cache = TTLCache()
+        self._keys = frozenset()
+        self._generation = None
+        self._reload_lock = threading.Lock()
+        self._local = threading.local()
+        self.stats = {'hits': 0, 'misses': 0, 'filtered': 0, 'queries': 0}
+        self._refresh()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.database, check_same_thread=False)
+        return conn
+
+    def _refresh(self):
+        generation = self.registry.counter.read()
+        conn = sqlite3.connect(self.database)
+        try:
+            keys = frozenset(host_key(row[0]) for row in conn.execute(
+                "SELECT host FROM custom_domains WHERE status = 'verified'"))
+        finally:
+            conn.close()
+        self._keys = keys
+        self.cache.clear()
+        self._generation = generation
+
+    def _maybe_refresh(self):
+        if self.registry.counter.read() != self._generation:
+            if self._reload_lock.acquire(blocking=False):
+                try:
+                    self._refresh()
+                finally:
+                    self._reload_lock.release()
+
+    def resolve(self, host):
+        """Tenant domain for a custom host, or None"""
+        self._maybe_refresh()
+        host = normalize_host(host)
+        if not host:
+            return None
+        now = time.monotonic()
+        found, tenant_domain = self.cache.get(host, now)
+        if found:
+            self.stats['hits' if tenant_domain else 'misses'] += 1
+            return tenant_domain
+
+        keys = self._keys
+        possible = [c for c in candidate_hosts(host) if host_key(c) in keys]
+        if not possible:
+            # Not cached: random scanner names would otherwise evict real hosts
+            self.stats['filtered'] += 1
+            return None
+
+        self.stats['queries'] += 1
+        placeholders = ', '.join('?' * len(possible))
+        row = self._connect().execute(f'''
+            SELECT tenant_domain FROM custom_domains
+            WHERE host IN ({placeholders}) AND status = 'verified'
+            ORDER BY LENGTH(host) DESC LIMIT 1
+        ''', possible).fetchone()
+
+        tenant_domain = row[0] if row else None
+        self.cache.put(host, tenant_domain, POSITIVE_TTL if tenant_domain else NEGATIVE_TTL, now)
+        return tenant_domain
+
+    def register(self, host, tenant_domain, user_id, conversion_id=None):
+        """Claim a custom host for `user_id`; returns (id, status, token), raises DomainTaken
+
+        Pending claims do not resolve, so nothing is published.
+        """
+        conn = sqlite3.connect(self.database)
+        try:
+            with conn:
+                return claim_domain(conn, host, tenant_domain, user_id, conversion_id=conversion_id)
+        finally:
+            conn.close()
+
+    def verify(self, host, user_id, lookup=lookup_txt):
+        """Check the TXT record for `user_id`'s claim on `host`; returns its status
+
+        Returns None when there is no such claim; raises RuntimeError when
+        DNS lookups are unavailable and DomainTaken if someone else won.
+        """
+        conn = sqlite3.connect(self.database)
+        try:
+            row = conn.execute(
+                'SELECT id, status, verification_token FROM custom_domains WHERE host = ? AND user_id = ?',
+                (host, user_id)).fetchone()
+            if row is None:
+                return None
+            if row[1] != 'pending':
+                return row[1]
+            records = lookup(verification_record(host))
+            if records is None:
+                raise RuntimeError('DNS verification is unavailable; ask support to approve the domain')
+            if verification_value(row[2]) not in records:
+                return 'pending'
+            with conn:
+                generation = mark_verified(conn, row[0])
+        finally:
+            conn.close()
+        if generation:
+            self.registry.publish()
+        self._maybe_refresh()
+        return 'verified'
+
+
+def approve(database, claim_id):
+    """Admin approval without DNS; returns the new generation or None"""
+    conn = sqlite3.connect(database)
+    try:
+        with conn:
+            generation = mark_verified(conn, claim_id)
+    finally:
+        conn.close()
+    return generation
+
+
+def list_claims(database):
+    conn = sqlite3.connect(database)
+    try:
+        return conn.execute('''
+            SELECT id, host, tenant_domain, status, user_id, signup_id, verification_token
+            FROM custom_domains ORDER BY host, id
+        ''').fetchall()
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    database = os.environ.get('DATABASE', 'edgpt_platform.db')
+    command = sys.argv[1] if len(sys.argv) > 1 else 'list'
+    if command == 'list':
+        for claim_id, host, tenant_domain, status, user_id, signup_id, _ in list_claims(database):
+            print(f"   • {claim_id:5d} {host} → {tenant_domain} [{status}] user {user_id} signup {signup_id}")
+    elif command == 'check' and len(sys.argv) == 3:
+        host = normalize_host(sys.argv[2])
+        found = lookup_txt(verification_record(host))
+        if found is None:
+            print("dnspython is not installed; use `approve <id>` instead")
+            sys.exit(1)
+        resolver = CustomDomainResolver(database, TenantRegistry(database))
+        for claim_id, claimed, _, status, user_id, _, _ in list_claims(database):
+            if claimed == host and status == 'pending':
+                status = resolver.verify(host, user_id, lambda name: found)
+                print(f"   • claim {claim_id} (user {user_id}): {status}")
+    elif command == 'approve' and len(sys.argv) == 3:
+        generation = approve(database, int(sys.argv[2]))
+        if generation:
+            TenantRegistry(database).publish()
+            print(f"✅ Claim {sys.argv[2]} verified, registry generation {generation}")
+        else:
+            print(f"Claim {sys.argv[2]} not found or already verified")
+    else:
+        print(__doc__)
+        sys.exit(1)
@@ -0,0 +1,600 @@
+"""
+EdGPT Platform - Outbound Email Queue
+Persistent outbox sent by a worker over reused SMTP connections
+
+Request handlers never talk to SMTP. Inside their own transaction they
+call enqueue() for a single message (signup confirmations, OTP codes) or
+queue_digest() for notifications that are batched per tenant and topic
+(new trial signups; new widget messages are counted by the transcript
+compactor, one line per tenant per pass). Digests go to the tenant's
+subscribers in email_subscriptions, not to every admin. The worker then:
+
+- folds the digest items of each (tenant, recipient, topic) into one
+  message once the oldest item is EMAIL_DIGEST_WINDOW seconds old
+- claims due messages in batches with UPDATE ... RETURNING, so two worker
+  processes never send the same message
+- sends from EMAIL_SENDERS threads, each keeping one SMTP connection open
+  and reconnecting when the server drops it or after
+  MESSAGES_PER_CONNECTION messages
+- limits each tenant to EMAIL_TENANT_RATE messages a minute with the
+  shared token buckets from rate_limit.py; messages over the limit are put
+  back for later without counting as an attempt
+- retries 4xx replies and connection errors with exponential backoff and
+  jitter, up to MAX_ATTEMPTS; a 5xx reply fails the message at once
+
+EMAIL_TRANSPORT=smtp sends through SMTP_HOST:SMTP_PORT; console prints the
+messages instead. `sink` runs a local SMTP stand-in that accepts and
+counts everything (SINK_FAIL_RATE answers that share of messages with 451).
+
+Usage:
+    python src/email_queue.py run           # send until nothing is due
+    python src/email_queue.py watch         # keep sending every POLL_INTERVAL seconds
+    python src/email_queue.py status        # messages per state
+    python src/email_queue.py subscribe <email> <tenant>    # send <tenant>'s digests to <email>
+    python src/email_queue.py unsubscribe <email> <tenant>
+    python src/email_queue.py sink [port]   # local SMTP stand-in (default 8025)
+"""
+
+import os
+import random
+import smtplib
+import socket
+import socketserver
+import sqlite3
+import ssl
+import sys
+import threading
+import time
+from email.header import Header
+from email.mime.text import MIMEText
+from email.utils import formatdate, make_msgid
+
+from rate_limit import TokenBucketLimiter
+
+PENDING = 'pending'
+SENDING = 'sending'
+SENT = 'sent'
+FAILED = 'failed'
+
+EMAIL_TRANSPORT = os.environ.get('EMAIL_TRANSPORT', 'smtp')
+EMAIL_FROM = os.environ.get('EMAIL_FROM', 'EdGPT Platform <noreply@edgpt.ai>')
+EMAIL_SENDERS = int(os.environ.get('EMAIL_SENDERS', '2'))
+EMAIL_TENANT_RATE = int(os.environ.get('EMAIL_TENANT_RATE', '60'))
+EMAIL_DIGEST_WINDOW = float(os.environ.get('EMAIL_DIGEST_WINDOW', '900'))
+SMTP_HOST = os.environ.get('SMTP_HOST', 'localhost')
+SMTP_PORT = int(os.environ.get('SMTP_PORT', '25'))
+SMTP_USERNAME = os.environ.get('SMTP_USERNAME', '')
+SMTP_PASSWORD = os.environ.get('SMTP_PASSWORD', '')
+SMTP_STARTTLS = os.environ.get('SMTP_STARTTLS', '0') == '1'
+SMTP_TIMEOUT = 30
+SINK_PORT = 8025
+SINK_FAIL_RATE = float(os.environ.get('SINK_FAIL_RATE', '0'))
+
+BATCH_SIZE = 50
+MESSAGES_PER_CONNECTION = 100
+MAX_ATTEMPTS = 8
+RETRY_BASE = 30
+RETRY_MAX = 3600
+CLAIM_TIMEOUT = 600
+POLL_INTERVAL = 10
+DIGEST_MAX_LINES = 50
+
+# Notification preferences shown on the user dashboard; all on by default
+SETTINGS = ('daily_email_enabled', 'weekly_report_enabled', 'trial_reminder_enabled')
+
+DIGEST_TOPICS = {
+    'new_trial': 'New trial signups',
+    'new_message': 'New widget messages',
+}
+
+CLAIM_SQL = '''
+    UPDATE email_outbox
+    SET status = 'sending', claimed_by = ?, claimed_at = ?
+    WHERE id IN (
+        SELECT id FROM email_outbox
+        WHERE status = 'pending' AND next_attempt_at <= ?
+        ORDER BY next_attempt_at
+        LIMIT ?
+    )
+    RETURNING id, tenant, recipient, subject, body, attempts
+'''
+
+
+def create_email_tables(conn):
+    """Outbox, pending digest items and per-user notification settings"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS email_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tenant TEXT NOT NULL,
+            recipient TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            body TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL,
+            claimed_by TEXT,
+            claimed_at REAL,
+            last_error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            sent_at TIMESTAMP
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_email_outbox_status_due '
+                 'ON email_outbox(status, next_attempt_at)')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS email_digest_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tenant TEXT NOT NULL,
+            recipient TEXT NOT NULL,
+            topic TEXT NOT NULL,
+            line TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_email_digest_items_group '
+                 'ON email_digest_items(tenant, recipient, topic)')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS email_settings (
+            user_id INTEGER PRIMARY KEY,
+            daily_email_enabled BOOLEAN NOT NULL DEFAULT 1,
+            weekly_report_enabled BOOLEAN NOT NULL DEFAULT 1,
+            trial_reminder_enabled BOOLEAN NOT NULL DEFAULT 1,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def create_subscription_table(conn):
+    """Which users receive each tenant's digests"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS email_subscriptions (
+            tenant TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (tenant, user_id)
+        )
+    ''')
+
+
+def get_email_settings(conn, user_id):
+    """{setting: bool} for a user; users who never changed anything get the defaults"""
+    row = conn.execute(f'SELECT {", ".join(SETTINGS)} FROM email_settings WHERE user_id = ?',
+                       (user_id,)).fetchone()
+    return {name: bool(row[i]) if row else True for i, name in enumerate(SETTINGS)}
+
+
+def update_email_settings(conn, user_id, changes):
+    """Store the known settings in `changes` (others are ignored); returns all settings"""
+    conn.execute('INSERT OR IGNORE INTO email_settings (user_id) VALUES (?)', (user_id,))
+    for name in SETTINGS:
+        if name in changes:
+            conn.execute(f'UPDATE email_settings SET {name} = ?, updated_at = CURRENT_TIMESTAMP '
+                         f'WHERE user_id = ?', (bool(changes[name]), user_id))
+    return get_email_settings(conn, user_id)
+
+
+def digest_recipients(conn, tenant, setting='daily_email_enabled'):
+    """Addresses subscribed to `tenant`'s digests that have `setting` switched on"""
+    return [row[0] for row in conn.execute(f'''
+        SELECT users.email FROM email_subscriptions
+        JOIN users ON users.id = email_subscriptions.user_id
+        LEFT JOIN email_settings ON email_settings.user_id = users.id
+        WHERE email_subscriptions.tenant = ? AND COALESCE(email_settings.{setting}, 1)
+    ''', (tenant,))]
+
+
+def subscribe(conn, email, tenant, subscribed=True):
+    """Add or remove a user's subscription to a tenant's digests; False for an unknown email"""
+    user = conn.execute('SELECT id FROM users WHERE email = ?', (email,)).fetchone()
+    if user is None:
+        return False
+    if subscribed:
+        conn.execute('INSERT OR IGNORE INTO email_subscriptions (tenant, user_id) VALUES (?, ?)',
+                     (tenant, user[0]))
+    else:
+        conn.execute('DELETE FROM email_subscriptions WHERE tenant = ? AND user_id = ?', (tenant, user[0]))
+    return True
+
+
+def enqueue(conn, tenant, recipient, subject, body, delay=0):
+    """Queue one message in the caller's transaction; returns its outbox id"""
+    return conn.execute('''
+        INSERT INTO email_outbox (tenant, recipient, subject, body, next_attempt_at)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (tenant, recipient, subject, body, time.time() + delay)).lastrowid
+
+
+def add_digest_item(conn, tenant, recipient, topic, line):
+    """Queue one line for the next (tenant, recipient, topic) digest"""
+    conn.execute('''
+        INSERT INTO email_digest_items (tenant, recipient, topic, line, created_at)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (tenant, recipient, topic, line, time.time()))
+
+
+def queue_digest(conn, tenant, topic, line):
+    """Add a line to the next digest of each of the tenant's subscribers"""
+    for recipient in digest_recipients(conn, tenant):
+        add_digest_item(conn, tenant, recipient, topic, line)
+
+
+def digest_message(tenant, topic, lines):
+    """(subject, body) for a digest of `lines`"""
+    label = DIGEST_TOPICS.get(topic, topic)
+    subject = f"{label} on {tenant}: {len(lines)}"
+    body = [f"{label} on {tenant} since the last digest:", '']
+    body.extend(f"- {line}" for line in lines[:DIGEST_MAX_LINES])
+    if len(lines) > DIGEST_MAX_LINES:
+        body.append(f"...and {len(lines) - DIGEST_MAX_LINES} more")
+    return subject, '\n'.join(body) + '\n'
+
+
+def build_digests(conn, window=EMAIL_DIGEST_WINDOW, now=None):
+    """Turn digest items whose oldest line is `window` seconds old into outbox messages"""
+    now = time.time() if now is None else now
+    built = 0
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        groups = conn.execute('''
+            SELECT tenant, recipient, topic, MAX(id) FROM email_digest_items
+            GROUP BY tenant, recipient, topic
+            HAVING MIN(created_at) <= ?
+        ''', (now - window,)).fetchall()
+        for tenant, recipient, topic, last_id in groups:
+            key = (tenant, recipient, topic, last_id)
+            lines = [row[0] for row in conn.execute('''
+                SELECT line FROM email_digest_items
+                WHERE tenant = ? AND recipient = ? AND topic = ? AND id <= ? ORDER BY id
+            ''', key)]
+            conn.execute('''
+                DELETE FROM email_digest_items
+                WHERE tenant = ? AND recipient = ? AND topic = ? AND id <= ?
+            ''', key)
+            enqueue(conn, tenant, recipient, *digest_message(tenant, topic, lines))
+            built += 1
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+    return built
+
+
+def build_message(recipient, subject, body):
+    """Plain-text message; MIMEText is several times cheaper to build than EmailMessage"""
+    message = MIMEText(body, 'plain', 'utf-8')
+    message['From'] = EMAIL_FROM
+    message['To'] = recipient
+    message['Subject'] = subject if subject.isascii() else Header(subject, 'utf-8')
+    message['Date'] = formatdate(localtime=True)
+    message['Message-ID'] = make_msgid(domain='edgpt.ai')
+    return message
+
+
+class SMTPTransport:
+    """One SMTP connection, opened on first use and kept open between messages"""
+
+    def __init__(self, host=SMTP_HOST, port=SMTP_PORT, username=SMTP_USERNAME,
+                 password=SMTP_PASSWORD, starttls=SMTP_STARTTLS, timeout=SMTP_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.connections = 0
+        self._smtp = None
+        self._sent = 0
+
+    def _open(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                smtp.starttls(context=ssl.create_default_context())
+            if self.username:
+                smtp.login(self.username, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        self._smtp = smtp
+        self._sent = 0
+        self.connections += 1
+
+    def send(self, message):
+        if self._smtp is not None and self._sent >= MESSAGES_PER_CONNECTION:
+            self.close()
+        if self._smtp is None:
+            self._open()
+        try:
+            self._smtp.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # Servers drop idle connections; retry once on a fresh one
+            self.close()
+            self._open()
+            self._smtp.send_message(message)
+        self._sent += 1
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                self._smtp.close()
+            self._smtp = None
+
+
+class ConsoleTransport:
+    """Development stand-in that prints messages instead of sending them"""
+
+    connections = 0
+
+    def send(self, message):
+        print(f"📧 To: {message['To']} | {message['Subject']}")
+
+    def close(self):
+        pass
+
+
+TRANSPORTS = {'smtp': SMTPTransport, 'console': ConsoleTransport}
+
+
+def is_permanent(error):
+    """5xx replies will fail again; connection errors and 4xx are worth retrying"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+def retry_delay(attempts):
+    """Exponential backoff with jitter so retries from a burst spread out"""
+    delay = min(RETRY_BASE * 2 ** (attempts - 1), RETRY_MAX)
+    return delay * (0.5 + random.random() / 2)
+
+
+def connect(database):
+    conn = sqlite3.connect(database, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute('PRAGMA busy_timeout=30000')
+    return conn
+
+
+def claim_batch(conn, worker_id, size=BATCH_SIZE, now=None):
+    """Atomically move up to `size` due messages to sending"""
+    now = time.time() if now is None else now
+    return conn.execute(CLAIM_SQL, (worker_id, now, now, size)).fetchall()
+
+
+def release_stale_claims(conn, timeout=CLAIM_TIMEOUT):
+    """Return messages claimed by a worker that died back to the queue"""
+    return conn.execute('''
+        UPDATE email_outbox SET status = 'pending', claimed_by = NULL, claimed_at = NULL
+        WHERE status = 'sending' AND claimed_at < ?
+    ''', (time.time() - timeout,)).rowcount
+
+
+def record_results(conn, results):
+    """Write one batch's outcomes in a single transaction"""
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        for outcome, row_id, attempts, next_attempt_at, error in results:
+            if outcome == SENT:
+                conn.execute('''
+                    UPDATE email_outbox SET status = 'sent', attempts = ?, claimed_by = NULL,
+                        last_error = NULL, sent_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                ''', (attempts, row_id))
+            elif outcome == FAILED:
+                conn.execute('''
+                    UPDATE email_outbox SET status = 'failed', attempts = ?, claimed_by = NULL,
+                        last_error = ?
+                    WHERE id = ?
+                ''', (attempts, error, row_id))
+            else:
+                # 'retry' and 'deferred' both go back to pending at a later time
+                conn.execute('''
+                    UPDATE email_outbox SET status = 'pending', attempts = ?, claimed_by = NULL,
+                        next_attempt_at = ?, last_error = COALESCE(?, last_error)
+                    WHERE id = ?
+                ''', (attempts, next_attempt_at, error, row_id))
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+
+
+class EmailWorker:
+    """Sender threads draining the outbox, one SMTP connection each"""
+
+    def __init__(self, database, senders=EMAIL_SENDERS, transport=None, limiter=None,
+                 tenant_rate=EMAIL_TENANT_RATE, batch_size=BATCH_SIZE):
+        self.database = database
+        self.senders = senders
+        self.transport = transport or TRANSPORTS[EMAIL_TRANSPORT]
+        self.limiter = limiter or TokenBucketLimiter(limits={'email': (tenant_rate, 60)})
+        self.batch_size = batch_size
+        self.counts = {}
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def _allowed(self, tenant):
+        """(allowed, seconds until the tenant has budget again)"""
+        try:
+            allowed, _, _, _, retry_after = self.limiter.hit('email', tenant, 'outbox')
+        except sqlite3.Error as e:
+            # Fail open, like the request limiter
+            print(f"Email rate limiter error: {e}")
+            return True, 0
+        return allowed, retry_after
+
+    def send_batch(self, transport, rows):
+        """Send claimed rows; returns [(outcome, id, attempts, next_attempt_at, error)]"""
+        results = []
+        for row_id, tenant, recipient, subject, body, attempts in rows:
+            allowed, retry_after = self._allowed(tenant)
+            if not allowed:
+                results.append(('deferred', row_id, attempts, time.time() + retry_after, None))
+                continue
+            attempts += 1
+            try:
+                transport.send(build_message(recipient, subject, body))
+            except (smtplib.SMTPException, OSError) as e:
+                error = f"{type(e).__name__}: {e}"[:500]
+                if is_permanent(e) or attempts >= MAX_ATTEMPTS:
+                    results.append((FAILED, row_id, attempts, None, error))
+                else:
+                    results.append(('retry', row_id, attempts, time.time() + retry_delay(attempts), error))
+                    # The connection may be in an unknown state; start the next message on a new one
+                    transport.close()
+            else:
+                results.append((SENT, row_id, attempts, None, None))
+        return results
+
+    def _work(self, worker_id):
+        conn = connect(self.database)
+        transport = self.transport()
+        try:
+            while True:
+                rows = claim_batch(conn, worker_id, self.batch_size)
+                if not rows:
+                    return
+                results = self.send_batch(transport, rows)
+                try:
+                    record_results(conn, results)
+                except sqlite3.Error as e:
+                    # Sent rows stay claimed and are retried after CLAIM_TIMEOUT
+                    print(f"Email queue error in {worker_id}: {e}")
+                    return
+                with self._lock:
+                    for outcome, *_ in results:
+                        self.counts[outcome] = self.counts.get(outcome, 0) + 1
+        finally:
+            transport.close()
+            conn.close()
+            with self._lock:
+                self.connections += transport.connections
+
+    def drain(self):
+        """Build due digests and send until nothing is due; returns {outcome: count}"""
+        conn = connect(self.database)
+        try:
+            release_stale_claims(conn)
+            build_digests(conn)
+        finally:
+            conn.close()
+
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        threads = [threading.Thread(target=self._work, args=(f"{prefix}:{i}",))
+                   for i in range(self.senders)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return dict(self.counts)
+
+
+def queue_status(database):
+    conn = sqlite3.connect(database)
+    try:
+        status = dict(conn.execute('SELECT status, COUNT(*) FROM email_outbox GROUP BY status').fetchall())
+        status['digest items'] = conn.execute('SELECT COUNT(*) FROM email_digest_items').fetchone()[0]
+        return status
+    finally:
+        conn.close()
+
+
+class SinkHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: every command succeeds, DATA is counted"""
+
+    def reply(self, text):
+        self.wfile.write(text.encode() + b'\r\n')
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply('220 edgpt-sink ESMTP')
+        in_data = False
+        for line in self.rfile:
+            if in_data:
+                if line in (b'.\r\n', b'.\n'):
+                    in_data = False
+                    if random.random() < server.fail_rate:
+                        self.reply('451 4.3.0 Try again later')
+                    else:
+                        with server.lock:
+                            server.messages += 1
+                        self.reply('250 2.0.0 Queued')
+                continue
+            command = line[:4].upper()
+            if command == b'EHLO':
+                self.reply('250-edgpt-sink\r\n250 8BITMIME')
+            elif command in (b'HELO', b'MAIL', b'RCPT', b'RSET', b'NOOP'):
+                self.reply('250 OK')
+            elif command == b'DATA':
+                in_data = True
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+            elif command == b'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """Local SMTP stand-in that accepts and counts messages"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port=SINK_PORT, fail_rate=SINK_FAIL_RATE, host='127.0.0.1'):
+        super().__init__((host, port), SinkHandler)
+        self.fail_rate = fail_rate
+        self.messages = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+
+
+if __name__ == '__main__':
+    database = os.environ.get('DATABASE', 'edgpt_platform.db')
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    if command == 'run':
+        start = time.perf_counter()
+        worker = EmailWorker(database)
+        counts = worker.drain()
+        elapsed = time.perf_counter() - start
+        sent = counts.get(SENT, 0)
+        print(f"✅ Sent {sent} emails in {elapsed:.1f}s ({sent / elapsed if elapsed else 0:.0f}/s) "
+              f"over {worker.connections} connections")
+        for outcome, count in sorted(counts.items()):
+            print(f"   • {outcome}: {count}")
+    elif command == 'watch':
+        while True:
+            counts = EmailWorker(database).drain()
+            if counts:
+                print(f"Email queue: {counts}")
+            time.sleep(POLL_INTERVAL)
+    elif command == 'status':
+        for state, count in sorted(queue_status(database).items()):
+            print(f"   • {state}: {count}")
+    elif command in ('subscribe', 'unsubscribe') and len(sys.argv) == 4:
+        conn = sqlite3.connect(database)
+        try:
+            with conn:
+                found = subscribe(conn, sys.argv[2], sys.argv[3].lower(), command == 'subscribe')
+        finally:
+            conn.close()
+        if not found:
+            print(f"❌ No user {sys.argv[2]}")
+            sys.exit(1)
+        action = 'subscribed to' if command == 'subscribe' else 'unsubscribed from'
+        print(f"✅ {sys.argv[2]} {action} {sys.argv[3]} digests")
+    elif command == 'sink':
+        sink = SMTPSink(int(sys.argv[2]) if len(sys.argv) > 2 else SINK_PORT)
+        print(f"📭 SMTP sink on 127.0.0.1:{sink.server_address[1]} (fail rate {sink.fail_rate})")
+        try:
+            sink.serve_forever()
+        except KeyboardInterrupt:
+            print(f"\n{sink.messages} messages over {sink.connections} connections")
+    else:
+        print(__doc__)
+        sys.exit(1)
@@ -0,0 +1,157 @@
+"""
+EdGPT Platform - Liveness and Readiness Probes
+/health/live and /health/ready for load balancers
+
+/health/live only proves the worker answers requests. /health/ready runs
+dependency probes:
+- database read latency (write-lock contention is reported, not failed on)
+- free disk space
+- writer backlog (WAL size, buffered analytics, pending trial triage)
+- whether the landing templates compile
+
+Each probe result is cached for HEALTH_CACHE_TTL seconds behind a
+single-flight guard. Only one thread per worker re-runs an expired probe;
+concurrent pollers get the previous result instead of piling on, so
+polling every worker every second stays cheap.
+"""
+
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from flask import jsonify
+
+HEALTH_CACHE_TTL = float(os.environ.get('HEALTH_CACHE_TTL', '2'))
+HEALTH_DB_LATENCY_MS = float(os.environ.get('HEALTH_DB_LATENCY_MS', '250'))
+HEALTH_MIN_FREE_MB = int(os.environ.get('HEALTH_MIN_FREE_MB', '100'))
+HEALTH_MAX_WAL_MB = int(os.environ.get('HEALTH_MAX_WAL_MB', '64'))
+
+
+class CachedProbe:
+    """A probe function whose (ok, detail) result is cached with single-flight refresh"""
+
+    def __init__(self, name, check, ttl=HEALTH_CACHE_TTL):
+        self.name = name
+        self.check = check
+        self.ttl = ttl
+        self.runs = 0
+        self._result = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            ok, detail = self.check()
+        except Exception as e:
+            ok, detail = False, {'error': str(e)}
+        detail = dict(detail, latency_ms=round((time.perf_counter() - start) * 1000, 2))
+        self.runs += 1
+        self._result = (ok, detail)
+        self._checked_at = time.monotonic()
+
+    def result(self):
+        """(ok, detail, age_seconds) from cache, refreshing at most once per TTL"""
+        if self._result is None or time.monotonic() - self._checked_at >= self.ttl:
+            if self._lock.acquire(blocking=self._result is None):
+                try:
+                    # Another thread may have refreshed while we waited
+                    if self._result is None or time.monotonic() - self._checked_at >= self.ttl:
+                        self._run()
+                finally:
+                    self._lock.release()
+        ok, detail = self._result
+        return ok, detail, round(time.monotonic() - self._checked_at, 3)
+
+
+def database_probe(database):
+    """Latency of a real read; whether a writer holds the lock is detail only
+
+    Provisioning chunks, analytics flushes, purge batches and migrations all
+    hold the write lock for a while, and they do it for every worker at once.
+    Failing readiness on that would drain the whole fleet together.
+    """
+    def check():
+        conn = sqlite3.connect(database, timeout=HEALTH_DB_LATENCY_MS / 1000, isolation_level=None)
+        try:
+            start = time.perf_counter()
+            conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+            read_ms = (time.perf_counter() - start) * 1000
+            # Never wait for the lock: just note whether someone is writing
+            conn.execute('PRAGMA busy_timeout = 0')
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                conn.execute('ROLLBACK')
+                write_lock = 'free'
+            except sqlite3.OperationalError:
+                write_lock = 'busy'
+        finally:
+            conn.close()
+        return read_ms < HEALTH_DB_LATENCY_MS, {'read_ms': round(read_ms, 2), 'write_lock': write_lock}
+    return check
+
+
+def disk_probe(path):
+    def check():
+        free_mb = shutil.disk_usage(os.path.dirname(os.path.abspath(path))).free // (1024 * 1024)
+        return free_mb >= HEALTH_MIN_FREE_MB, {'free_mb': free_mb}
+    return check
+
+
+def writer_backlog_probe(database, queue_depth=None):
+    """Uncheckpointed WAL bytes, buffered writes and trial requests waiting for triage"""
+    def check():
+        wal_path = database + '-wal'
+        wal_bytes = os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+        conn = sqlite3.connect(f"file:{database}?mode=ro", uri=True, timeout=1)
+        try:
+            pending = conn.execute(
+                "SELECT COUNT(*) FROM trial_requests WHERE status = 'pending'").fetchone()[0]
+        finally:
+            conn.close()
+        detail = {'wal_bytes': wal_bytes, 'pending_trials': pending}
+        if queue_depth is not None:
+            detail['queued_writes'] = queue_depth()
+        return wal_bytes < HEALTH_MAX_WAL_MB * 1024 * 1024, detail
+    return check
+
+
+def template_probe(app, template_names):
+    """Load every template the tenants use, warming this worker's Jinja cache"""
+    def check():
+        names = sorted(set(template_names()))
+        for name in names:
+            app.jinja_env.get_template(name)
+        cache = app.jinja_env.cache
+        return True, {'templates': len(names), 'cached': len(cache) if cache is not None else 0}
+    return check
+
+
+def register_health_checks(app, probes):
+    """Add /health/live and /health/ready backed by a list of CachedProbe"""
+
+    @app.route('/health/live')
+    def health_live():
+        return jsonify({'status': 'alive', 'pid': os.getpid()})
+
+    @app.route('/health/ready')
+    def health_ready():
+        checks = {}
+        ready = True
+        for probe in probes:
+            ok, detail, age = probe.result()
+            checks[probe.name] = dict(detail, ok=ok, age_s=age)
+            ready = ready and ok
+        response = jsonify({
+            'status': 'ready' if ready else 'unavailable',
+            'timestamp': datetime.now().isoformat(),
+            'checks': checks
+        })
+        response.status_code = 200 if ready else 503
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+
+    return probes
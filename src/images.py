@@ -0,0 +1,126 @@
+"""
+EdGPT Platform - Logo Variants
+Precomputed, content-hashed logo variants with an on-disk resize cache
+
+Source images in assets/ are resized to fixed breakpoint widths and encoded
+as WebP and PNG. Variant file names carry a hash of the source bytes, so
+they can be served with a one-year immutable Cache-Control and never need
+invalidating. Sources are never upscaled.
+
+No template displays a logo yet, so nothing serves the variants; routes and
+a srcset helper belong with the first page that does. Pillow is optional and
+only needed to build.
+
+Usage:
+    python src/images.py build     # pre-generate every variant
+"""
+
+import hashlib
+import os
+import sys
+import threading
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGE_SOURCE_DIR = os.environ.get('IMAGE_SOURCE_DIR', os.path.join(BASE_DIR, '..', 'assets'))
+IMAGE_CACHE_DIR = os.environ.get('IMAGE_CACHE_DIR', os.path.join(BASE_DIR, 'image_cache'))
+
+BREAKPOINTS = (32, 64, 128, 256, 512)
+FORMATS = ('webp', 'png')
+
+_digests = {}
+_digest_lock = threading.Lock()
+
+
+def source_path(name):
+    """Absolute path of a source image, or None when it does not exist"""
+    if os.path.basename(name) != name:
+        return None
+    path = os.path.join(IMAGE_SOURCE_DIR, name)
+    return path if os.path.isfile(path) else None
+
+
+def source_digest(path):
+    """Content hash of a source image, memoized on (mtime, size)"""
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    with _digest_lock:
+        digest = _digests.get(key)
+    if digest is None:
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:12]
+        with _digest_lock:
+            _digests[key] = digest
+    return digest
+
+
+def source_width(path):
+    if Image is None:
+        return None
+    with Image.open(path) as img:
+        return img.width
+
+
+def variant_name(name, digest, width, fmt):
+    stem = os.path.splitext(name)[0]
+    return f"{stem}.{digest}.{width}w.{fmt}"
+
+
+def ensure_variant(name, width, fmt):
+    """Return the cached variant path, generating it on first use"""
+    path = source_path(name)
+    digest = source_digest(path)
+    target = os.path.join(IMAGE_CACHE_DIR, variant_name(name, digest, width, fmt))
+    if os.path.exists(target):
+        return target
+
+    os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+    with Image.open(path) as img:
+        # Never upscale: a breakpoint wider than the source is stored at source size
+        width = min(width, img.width)
+        height = max(1, round(img.height * width / img.width))
+        resized = img.convert('RGBA').resize((width, height), Image.LANCZOS)
+        tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if fmt == 'webp':
+            resized.save(tmp, 'WEBP', quality=85, method=6)
+        else:
+            resized.save(tmp, 'PNG', optimize=True)
+    # Concurrent workers may race here; the variants are identical so last rename wins
+    os.replace(tmp, target)
+    return target
+
+
+def available_widths(path):
+    """Breakpoints no wider than the source (the smallest one for tiny sources)"""
+    width = source_width(path)
+    return [w for w in BREAKPOINTS if width is None or w <= width] or [BREAKPOINTS[0]]
+
+
+def build_variants():
+    """Pre-generate every variant so workers never resize on the request path"""
+    built = []
+    for name in sorted(os.listdir(IMAGE_SOURCE_DIR)):
+        path = source_path(name)
+        if not path or not name.lower().endswith('.png'):
+            continue
+        for width in available_widths(path):
+            for fmt in FORMATS:
+                built.append(ensure_variant(name, width, fmt))
+    return built
+
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'build'
+    if Image is None:
+        print("Pillow is not installed; image variants are unavailable")
+        sys.exit(1)
+    if command == 'build':
+        variants = build_variants()
+        print(f"✅ Generated {len(variants)} image variants in {IMAGE_CACHE_DIR}")
+    else:
+        print(__doc__)
+        sys.exit(1)
@@ -0,0 +1,296 @@
+"""
+EdGPT Platform - Invoice Rendering
+Batch invoice documents from a process pool with a content-addressed cache
+
+Invoices are printable HTML documents rendered from
+templates/invoice_document.html. The cache key of an invoice is a hash of
+everything the template is given (the normalized invoice, its line items,
+total and period, the seller and the due date) together with the template
+source and RENDER_VERSION; it names the file under INVOICE_CACHE_DIR. An
+invoice whose document would not change is never rendered again, while a
+price, seller or template change re-renders everything it affects.
+
+render_batch() yields cached invoices straight away and sends the rest to
+a pool of INVOICE_WORKERS processes in tasks of TASK_SIZE invoices, so
+month-end runs use every core and small batches skip the pool entirely.
+Workers write the files; zip_stream() turns the results into a zip as they
+complete, without holding the archive in memory.
+
+Usage:
+    python src/invoices.py render invoices.ndjson invoices.zip
+"""
+
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date, timedelta
+
+from jinja2 import Environment, FileSystemLoader
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_DIR = os.path.join(BASE_DIR, 'templates')
+INVOICE_TEMPLATE = 'invoice_document.html'
+INVOICE_CACHE_DIR = os.environ.get('INVOICE_CACHE_DIR', os.path.join(BASE_DIR, 'invoice_cache'))
+INVOICE_WORKERS = int(os.environ.get('INVOICE_WORKERS', str(os.cpu_count() or 2)))
+TASK_SIZE = 50
+# Part of every cache key: bump when render_context() changes in a way its output does not show
+RENDER_VERSION = 1
+MAX_FIELD_LENGTH = 500
+NET_DAYS = 30
+
+SELLER = {
+    'name': 'EdGPT Platform',
+    'address': 'Billing Department',
+    'email': 'billing@edgpt.ai',
+}
+
+# Same plans and prices as the dashboard; school plans are annual and prorated
+PLANS = {
+    'small': {'plan_name': 'Small School', 'price': 299, 'annual': True, 'student_range': '1-1000 students'},
+    'medium': {'plan_name': 'Medium School', 'price': 599, 'annual': True, 'student_range': '1001-2500 students'},
+    'large': {'plan_name': 'Large School', 'price': 999, 'annual': True, 'student_range': '2501+ students'},
+    'silver': {'plan_name': 'Silver', 'price': 49, 'annual': False},
+    'gold': {'plan_name': 'Gold', 'price': 99, 'annual': False},
+    'platinum': {'plan_name': 'Platinum', 'price': 149, 'annual': False},
+}
+
+REQUIRED_FIELDS = ('number', 'plan', 'customer_name', 'customer_email')
+# The billing fields of invoice_request.html
+OPTIONAL_FIELDS = ('billing_contact', 'billing_title', 'billing_email', 'billing_address', 'billing_city',
+                   'billing_state', 'billing_zip', 'purchase_order', 'special_instructions')
+INVOICE_NUMBER = re.compile(r'^[A-Za-z0-9][A-Za-z0-9-]{0,39}$')
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+_environment = None
+
+
+def parse_date(value, default):
+    if value in (None, ''):
+        return default
+    return date.fromisoformat(str(value))
+
+
+def fiscal_year_end(day):
+    """June 30 that ends the school fiscal year (July 1 - June 30) containing `day`"""
+    return date(day.year if day.month <= 6 else day.year + 1, 6, 30)
+
+
+def normalize_invoice(data, today=None):
+    """(invoice, None) with every field the document depends on, or (None, error)"""
+    if not isinstance(data, dict):
+        return None, 'Expected a JSON object'
+    invoice = {}
+    for name in REQUIRED_FIELDS + OPTIONAL_FIELDS:
+        value = data.get(name)
+        value = '' if value is None else str(value).strip()
+        if len(value) > MAX_FIELD_LENGTH:
+            return None, f'{name} is too long'
+        if not value and name in REQUIRED_FIELDS:
+            return None, f'{name} is required'
+        invoice[name] = value
+    if not INVOICE_NUMBER.match(invoice['number']):
+        return None, 'number may only contain letters, digits and dashes'
+    if invoice['plan'] not in PLANS:
+        return None, f"plan must be one of: {', '.join(PLANS)}"
+    for name in ('customer_email', 'billing_email'):
+        if invoice[name] and not EMAIL_PATTERN.match(invoice[name]):
+            return None, f'{name} is not a valid email'
+    try:
+        issue_date = parse_date(data.get('issue_date'), today or date.today())
+        service_start = parse_date(data.get('service_start'), issue_date)
+    except ValueError:
+        return None, 'Dates must be YYYY-MM-DD'
+    invoice['issue_date'] = issue_date.isoformat()
+    invoice['service_start'] = service_start.isoformat()
+    return invoice, None
+
+
+def line_items(invoice):
+    """(items, total, period) for an invoice: annual plans are prorated to June 30"""
+    plan = PLANS[invoice['plan']]
+    start = date.fromisoformat(invoice['service_start'])
+    if plan['annual']:
+        end = fiscal_year_end(start)
+        year_days = (end - date(end.year - 1, 6, 30)).days
+        days = (end - start).days + 1
+        amount = round(plan['price'] * days / year_days, 2)
+        detail = f"{plan['student_range']}; ${plan['price']}/year prorated for {days} of {year_days} days"
+    else:
+        end = (start.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        amount = float(plan['price'])
+        detail = f"${plan['price']}/month"
+    items = [{'description': f"{plan['plan_name']} plan", 'detail': detail, 'amount': amount}]
+    return items, amount, f"{start.isoformat()} to {end.isoformat()}"
+
+
+def template_digest():
+    """Hash of the template source; part of every cache key"""
+    with open(os.path.join(TEMPLATE_DIR, INVOICE_TEMPLATE), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def render_context(invoice):
+    """Everything invoice_document.html is rendered from"""
+    items, total, period = line_items(invoice)
+    issue_date = date.fromisoformat(invoice['issue_date'])
+    return {'invoice': invoice, 'seller': SELLER, 'items': items, 'total': total, 'period': period,
+            'due_date': (issue_date + timedelta(days=NET_DAYS)).isoformat(), 'net_days': NET_DAYS}
+
+
+def invoice_digest(invoice, template_hash):
+    """Content address of a rendered invoice: its render context plus the template and RENDER_VERSION"""
+    payload = json.dumps(render_context(invoice), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(f"{RENDER_VERSION}\n{template_hash}\n{payload}".encode()).hexdigest()
+
+
+def cache_path(digest, cache_dir=INVOICE_CACHE_DIR):
+    return os.path.join(cache_dir, digest[:2], digest + '.html')
+
+
+def render_invoice(invoice):
+    """Rendered HTML of one normalized invoice"""
+    global _environment
+    if _environment is None:
+        _environment = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=True)
+    return _environment.get_template(INVOICE_TEMPLATE).render(**render_context(invoice))
+
+
+def render_task(jobs, cache_dir):
+    """Pool task: render [(digest, invoice)] into the cache; returns the digests written"""
+    for digest, invoice in jobs:
+        path = cache_path(digest, cache_dir)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(render_invoice(invoice))
+        os.replace(tmp, path)
+    return [digest for digest, _ in jobs]
+
+
+def render_batch(invoices, workers=INVOICE_WORKERS, cache_dir=INVOICE_CACHE_DIR, task_size=TASK_SIZE):
+    """Yield (invoice, path, cached) for normalized invoices as their documents become available"""
+    template_hash = template_digest()
+    pending = {}
+    for invoice in invoices:
+        digest = invoice_digest(invoice, template_hash)
+        if digest in pending:
+            # Same inputs twice in one batch: render once
+            pending[digest].append(invoice)
+        elif os.path.exists(cache_path(digest, cache_dir)):
+            yield invoice, cache_path(digest, cache_dir), True
+        else:
+            pending[digest] = [invoice]
+
+    jobs = [(digest, group[0]) for digest, group in pending.items()]
+    tasks = [jobs[i:i + task_size] for i in range(0, len(jobs), task_size)]
+    if len(tasks) <= 1 or workers <= 1:
+        # Starting processes costs more than rendering a handful of invoices
+        done = (render_task(task, cache_dir) for task in tasks)
+        for digests in done:
+            for digest in digests:
+                for invoice in pending[digest]:
+                    yield invoice, cache_path(digest, cache_dir), False
+        return
+
+    # spawn, not fork: the web worker calling this has background threads
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), mp_context=context) as pool:
+        futures = {pool.submit(render_task, task, cache_dir) for task in tasks}
+        try:
+            while futures:
+                finished, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    for digest in future.result():
+                        for invoice in pending[digest]:
+                            yield invoice, cache_path(digest, cache_dir), False
+        finally:
+            # Client went away or a task failed: drop the work not yet started
+            for future in futures:
+                future.cancel()
+
+
+class ZipBuffer(io.RawIOBase):
+    """Write-only sink that lets a ZipFile be drained chunk by chunk"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def zip_stream(results):
+    """Zip file bytes for render_batch() results, yielded as each document is added"""
+    buffer = ZipBuffer()
+    manifest = []
+    # Level 1 is ~30% faster than 6 on invoice HTML for a ~7% larger archive
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        for invoice, path, cached in results:
+            name = f"invoice-{invoice['number']}.html"
+            archive.write(path, name)
+            manifest.append({'number': invoice['number'], 'file': name, 'cached': cached,
+                             'digest': os.path.basename(path)[:-len('.html')]})
+            data = buffer.drain()
+            if data:
+                yield data
+        archive.writestr('manifest.json', json.dumps(manifest, indent=1))
+    yield buffer.drain()
+
+
+def parse_ndjson(lines, today=None):
+    """(invoices, errors) for NDJSON lines; errors are {'line': n, 'error': message}"""
+    invoices, errors = [], []
+    for number, raw in enumerate(lines, 1):
+        if not raw.strip():
+            continue
+        try:
+            invoice, error = normalize_invoice(json.loads(raw), today)
+        except ValueError:
+            invoice, error = None, 'Invalid JSON'
+        if error:
+            errors.append({'line': number, 'error': error})
+        else:
+            invoices.append(invoice)
+    return invoices, errors
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 4 or sys.argv[1] != 'render':
+        print(__doc__)
+        sys.exit(1)
+    with open(sys.argv[2], 'rb') as f:
+        invoices, errors = parse_ndjson(f)
+    for error in errors:
+        print(f"❌ line {error['line']}: {error['error']}")
+    if errors:
+        sys.exit(1)
+    start = time.perf_counter()
+    cached = [0]
+
+    def counted(results):
+        for invoice, path, was_cached in results:
+            cached[0] += was_cached
+            yield invoice, path, was_cached
+
+    with open(sys.argv[3], 'wb') as out:
+        for chunk in zip_stream(counted(render_batch(invoices))):
+            out.write(chunk)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {len(invoices)} invoices ({cached[0]} from cache) in {elapsed:.1f}s "
+          f"({len(invoices) / elapsed if elapsed else 0:.0f}/s) -> {sys.argv[3]}")
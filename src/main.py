@@ -10,107 +10,117 @@ Features:
 - Mobile-responsive design with proper logos
 """
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session
+from flask import Flask, render_template, request, jsonify, redirect, url_for, session, make_response, stream_with_context, g
 from flask_cors import CORS
 import sqlite3
 import hashlib
-import secrets
+import json
 from datetime import datetime
 import os
+import random
+import time
+
+from account_deletion import OTP_TTL, issue_otp, queue_purge, verify_otp
+from assets import register_asset_helper
+from collector import AnalyticsBatcher, register_collector
+from compression import register_compression
+from custom_domains import (CustomDomainResolver, DomainTaken, is_valid_hostname, normalize_host,
+                            verification_record, verification_value)
+from email_queue import (SETTINGS as EMAIL_SETTINGS, enqueue, get_email_settings, queue_digest,
+                         update_email_settings)
+from health import (CachedProbe, database_probe, disk_probe, register_health_checks,
+                    template_probe, writer_backlog_probe)
+from invoices import parse_ndjson as parse_invoices, render_batch, zip_stream
+from migrations import require_schema
+from provisioning import provision
+from query_cache import QueryCache
+from query_profiler import connect as connect_db, profiler as sql_profiler
+from rate_limit import register_rate_limiting
+from read_replica import SnapshotNotReady, SnapshotReplica
+from sessions import register_sessions
+from tenant_registry import TenantRegistry, seed_tenants, tenants_match
+from transcripts import CONVERSATION_ID, TranscriptLog, register_transcript_routes
+from ua_registry import classify_user_agent, intern_user_agent
+from uploads import (EXTENSIONS as UPLOAD_EXTENSIONS, UPLOAD_MAX_MB, UploadTooLarge, add_document,
+                     clean_filename, file_kind, get_document, list_documents, store_stream)
+from vertical_content import LANDING_CONTENT, SIGNUP_CONTENT
+from widget import embed_snippet, register_widget_routes
 
 app = Flask(__name__, template_folder='templates')
 CORS(app)
-app.secret_key = secrets.token_hex(16)
+
+# Server-side sessions shared by all workers; signing key from SECRET_KEY
+register_sessions(app)
+
+# Fingerprinted CSS/JS bundles (python src/assets.py build)
+register_asset_helper(app)
+
+# gzip/brotli for direct (non-nginx) traffic; uses precompressed static siblings
+register_compression(app)
 
 # Database setup
 DATABASE = 'edgpt_platform.db'
 
+# Bot traffic handling at ingestion: 'keep', 'drop' or 'sample'
+BOT_TRAFFIC_POLICY = os.environ.get('BOT_TRAFFIC_POLICY', 'keep')
+BOT_SAMPLE_RATE = float(os.environ.get('BOT_SAMPLE_RATE', '0.01'))
+
 def get_db_connection():
-    """Get database connection with row factory"""
-    conn = sqlite3.connect(DATABASE)
+    """Get database connection with row factory (profiled when SQL_PROFILE=1)"""
+    conn = connect_db(DATABASE)
     conn.row_factory = sqlite3.Row
     return conn
 
-def init_db():
-    """Initialize the database with required tables"""
-    conn = get_db_connection()
-    
-    # Users table
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            website_url TEXT,
-            business_name TEXT,
-            phone TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            is_admin BOOLEAN DEFAULT FALSE
-        )
-    ''')
-    
-    # Trial requests table
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS trial_requests (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT NOT NULL,
-            website_url TEXT NOT NULL,
-            business_name TEXT,
-            phone TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            status TEXT DEFAULT 'pending'
-        )
-    ''')
-    
-    # Analytics table
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS analytics (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            domain TEXT NOT NULL,
-            page_path TEXT NOT NULL,
-            user_agent TEXT,
-            ip_address TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Create admin user if it doesn't exist
-    admin_email = 'admin@edgpt.ai'
-    admin_password = 'admin123'
-    admin_hash = hashlib.sha256(admin_password.encode()).hexdigest()
-    
-    try:
-        conn.execute('''
-            INSERT OR IGNORE INTO users (email, password_hash, is_admin, business_name)
-            VALUES (?, ?, ?, ?)
-        ''', (admin_email, admin_hash, True, 'EdGPT Admin'))
-        conn.commit()
-    except Exception as e:
-        print(f"Admin user creation error: {e}")
-    
-    conn.close()
+# Admin reports read a snapshot, never the live database; workers only read it,
+# one `python src/read_replica.py watch` per host keeps it fresh
+reporting_replica = SnapshotReplica(DATABASE)
 
-# Initialize database
-init_db()
+# Admin reporting results, shared by every admin polling this worker
+REPORTING_CACHE_TTL = int(os.environ.get('REPORTING_CACHE_TTL', '30'))
+reporting_cache = QueryCache(ttl=REPORTING_CACHE_TTL, stale_ttl=REPORTING_CACHE_TTL * 4)
 
-# Domain-specific template mapping
+def reporting_query(sql, params=()):
+    """Run an admin reporting query on the snapshot through the single-flight result cache"""
+    def load():
+        conn = reporting_replica.connect()
+        try:
+            taken_at = reporting_replica.taken_at()
+            return taken_at, tuple(dict(row) for row in conn.execute(sql, params).fetchall())
+        finally:
+            conn.close()
+    taken_at, rows = reporting_cache.get(sql, params, load)
+    # Responses report the age of the oldest data they include
+    g.reporting_as_of = min(getattr(g, 'reporting_as_of', taken_at), taken_at)
+    return rows
+
+def reporting_age():
+    """Seconds since the snapshot behind this request's reports was taken"""
+    as_of = getattr(g, 'reporting_as_of', None)
+    return None if as_of is None else round(max(time.time() - as_of, 0.0), 1)
+
+# Schema is owned by `python src/migrations.py migrate`, run once before the
+# workers start; importing the app only checks the version (read-only)
+require_schema(DATABASE)
+
+# Domain-specific template mapping; the industry verticals share one
+# layout and take their copy from DOMAIN_CONFIGS[domain]['landing']
 DOMAIN_TEMPLATES = {
     'edgpt.ai': 'enhanced_landing_with_slideshow.html',
-    'gptsites.ai': 'gptsites_landing.html', 
-    'lawfirmgpt.ai': 'lawfirmgpt_landing.html',
-    'cpafirm.ai': 'cpafirm_landing.html',
-    'taxprepgpt.ai': 'taxprepgpt_landing.html',
-    'businessbrokergpt.ai': 'businessbrokergpt_landing.html'
+    'gptsites.ai': 'vertical_landing.html', 
+    'lawfirmgpt.ai': 'vertical_landing.html',
+    'cpafirm.ai': 'vertical_landing.html',
+    'taxprepgpt.ai': 'vertical_landing.html',
+    'businessbrokergpt.ai': 'vertical_landing.html'
 }
 
-# Domain-specific signup template mapping
+# Domain-specific signup template mapping (verticals use DOMAIN_CONFIGS[domain]['signup'])
 DOMAIN_SIGNUP_TEMPLATES = {
     'edgpt.ai': 'fixed_signup_template.html',
-    'gptsites.ai': 'gptsites_signup.html',
-    'lawfirmgpt.ai': 'lawfirmgpt_signup.html',
-    'cpafirm.ai': 'cpafirm_signup.html',
-    'taxprepgpt.ai': 'taxprepgpt_signup.html',
-    'businessbrokergpt.ai': 'businessbrokergpt_signup.html'
+    'gptsites.ai': 'vertical_signup.html',
+    'lawfirmgpt.ai': 'vertical_signup.html',
+    'cpafirm.ai': 'vertical_signup.html',
+    'taxprepgpt.ai': 'vertical_signup.html',
+    'businessbrokergpt.ai': 'vertical_signup.html'
 }
 
 # Domain-specific configurations
@@ -129,7 +139,9 @@ DOMAIN_CONFIGS = {
         'color': '#3B82F6',
         'icon': '💼',
         'title': 'Transform Your Business Website Into an Intelligent GPTsite',
-        'description': 'Convert your business website into an AI assistant that provides instant answers to customers 24/7.'
+        'description': 'Convert your business website into an AI assistant that provides instant answers to customers 24/7.',
+        'landing': LANDING_CONTENT['gptsites.ai'],
+        'signup': SIGNUP_CONTENT['gptsites.ai']
     },
     'lawfirmgpt.ai': {
         'name': 'LawFirmGPT',
@@ -137,7 +149,9 @@ DOMAIN_CONFIGS = {
         'color': '#1E40AF',
         'icon': '⚖️',
         'title': 'Transform Your Law Firm Website Into an Intelligent GPTsite',
-        'description': 'Convert your law firm website into an AI assistant that provides instant answers to clients 24/7.'
+        'description': 'Convert your law firm website into an AI assistant that provides instant answers to clients 24/7.',
+        'landing': LANDING_CONTENT['lawfirmgpt.ai'],
+        'signup': SIGNUP_CONTENT['lawfirmgpt.ai']
     },
     'cpafirm.ai': {
         'name': 'CPAFirm',
@@ -145,7 +159,9 @@ DOMAIN_CONFIGS = {
         'color': '#059669',
         'icon': '🧮',
         'title': 'Transform Your Accounting Firm Website Into an Intelligent GPTsite',
-        'description': 'Convert your accounting firm website into an AI assistant that provides instant answers to clients 24/7.'
+        'description': 'Convert your accounting firm website into an AI assistant that provides instant answers to clients 24/7.',
+        'landing': LANDING_CONTENT['cpafirm.ai'],
+        'signup': SIGNUP_CONTENT['cpafirm.ai']
     },
     'taxprepgpt.ai': {
         'name': 'TaxPrepGPT',
@@ -153,7 +169,9 @@ DOMAIN_CONFIGS = {
         'color': '#059669',
         'icon': '💰',
         'title': 'Transform Your Tax Preparation Website Into an Intelligent GPTsite',
-        'description': 'Convert your tax preparation website into an AI assistant that provides instant answers to taxpayers 24/7.'
+        'description': 'Convert your tax preparation website into an AI assistant that provides instant answers to taxpayers 24/7.',
+        'landing': LANDING_CONTENT['taxprepgpt.ai'],
+        'signup': SIGNUP_CONTENT['taxprepgpt.ai']
     },
     'businessbrokergpt.ai': {
         'name': 'BusinessBrokerGPT',
@@ -161,74 +179,112 @@ DOMAIN_CONFIGS = {
         'color': '#7C3AED',
         'icon': '🏢',
         'title': 'Transform Your Business Brokerage Website Into an Intelligent GPTsite',
-        'description': 'Convert your business brokerage website into an AI assistant that provides instant answers to buyers and sellers 24/7.'
+        'description': 'Convert your business brokerage website into an AI assistant that provides instant answers to buyers and sellers 24/7.',
+        'landing': LANDING_CONTENT['businessbrokergpt.ai'],
+        'signup': SIGNUP_CONTENT['businessbrokergpt.ai']
     }
 }
 
+def init_tenant_registry():
+    """Seed or update the built-in verticals and load this worker's snapshot"""
+    registry = TenantRegistry(DATABASE)
+    if not tenants_match(registry.snapshot(), DOMAIN_TEMPLATES, DOMAIN_SIGNUP_TEMPLATES, DOMAIN_CONFIGS):
+        # Only after a deploy that changed them; otherwise starting a worker takes no write lock
+        conn = get_db_connection()
+        seed_tenants(conn, DOMAIN_TEMPLATES, DOMAIN_SIGNUP_TEMPLATES, DOMAIN_CONFIGS)
+        conn.commit()
+        conn.close()
+        registry.publish()
+    return registry
+
+# Tenants are read from SQLite; the dicts above seed the built-in verticals
+# and win over registry edits to them on the next boot.
+# Workers pick up added domains without a restart (src/tenant_registry.py).
+tenant_registry = init_tenant_registry()
+
+# Customer-owned hostnames mapped onto tenants once verified (/api/custom-domain)
+custom_domains = CustomDomainResolver(DATABASE, tenant_registry)
+
+def match_tenant(host):
+    """Tenant for a request host: platform domains first, then custom domains; None if unknown"""
+    snapshot = tenant_registry.snapshot()
+    tenant = snapshot.match(host)
+    if tenant is None:
+        tenant_domain = custom_domains.resolve(host)
+        if tenant_domain:
+            tenant = snapshot.tenants.get(tenant_domain)
+    return tenant
+
+def resolve_tenant(host):
+    """Tenant for a request host, or the default tenant for unknown hosts"""
+    return match_tenant(host) or tenant_registry.snapshot().default
+
+# Token-bucket rate limits shared across workers (see docs/API_DOCUMENTATION.md),
+# keyed by the resolved tenant so made-up Host headers all share one bucket
+register_rate_limiting(app, tenant_of=match_tenant)
+
+# Embedded chat widget: /widget/config/<site> and the hashed runtime script
+register_widget_routes(app, lambda site: tenant_registry.snapshot().match(site))
+
+# Widget chat turns go to per-tenant segment files, not the main database; the
+# transcript compactor counts them into the new-message digests
+transcript_log = register_transcript_routes(app, TranscriptLog(),
+                                            lambda site: tenant_registry.snapshot().match(site))
+
 def get_template_for_domain(host):
     """Get the appropriate template based on the request domain"""
-    # Remove port if present
-    domain = host.split(':')[0]
-    
-    # Check for exact domain match
-    if domain in DOMAIN_TEMPLATES:
-        return DOMAIN_TEMPLATES[domain]
-    
-    # Check for subdomain matches (e.g., www.edgpt.ai)
-    for registered_domain in DOMAIN_TEMPLATES:
-        if domain.endswith(registered_domain):
-            return DOMAIN_TEMPLATES[registered_domain]
-    
-    # Default to EdGPT template
-    return DOMAIN_TEMPLATES['edgpt.ai']
+    tenant = resolve_tenant(host)
+    return tenant.template if tenant else DOMAIN_TEMPLATES['edgpt.ai']
 
 def get_signup_template_for_domain(host):
     """Get the appropriate signup template based on the request domain"""
-    # Remove port if present
-    domain = host.split(':')[0]
-    
-    # Check for exact domain match
-    if domain in DOMAIN_SIGNUP_TEMPLATES:
-        return DOMAIN_SIGNUP_TEMPLATES[domain]
-    
-    # Check for subdomain matches (e.g., www.edgpt.ai)
-    for registered_domain in DOMAIN_SIGNUP_TEMPLATES:
-        if domain.endswith(registered_domain):
-            return DOMAIN_SIGNUP_TEMPLATES[registered_domain]
-    
-    # Default to EdGPT signup template
-    return DOMAIN_SIGNUP_TEMPLATES['edgpt.ai']
+    tenant = resolve_tenant(host)
+    return tenant.signup_template if tenant else DOMAIN_SIGNUP_TEMPLATES['edgpt.ai']
 
 def get_domain_config(host):
     """Get domain-specific configuration"""
-    domain = host.split(':')[0]
-    
-    # Check for exact domain match
-    if domain in DOMAIN_CONFIGS:
-        return DOMAIN_CONFIGS[domain]
-    
-    # Check for subdomain matches
-    for registered_domain in DOMAIN_CONFIGS:
-        if domain.endswith(registered_domain):
-            return DOMAIN_CONFIGS[registered_domain]
-    
-    # Default to EdGPT config
-    return DOMAIN_CONFIGS['edgpt.ai']
+    tenant = resolve_tenant(host)
+    return tenant.config if tenant else DOMAIN_CONFIGS['edgpt.ai']
+
+def should_record_bot():
+    """Apply BOT_TRAFFIC_POLICY to a request classified as a bot"""
+    if BOT_TRAFFIC_POLICY == 'keep':
+        return True
+    if BOT_TRAFFIC_POLICY == 'sample':
+        return random.random() < BOT_SAMPLE_RATE
+    return False
 
 def log_analytics(domain, page_path):
     """Log page view analytics"""
     try:
+        # Dropped bots are classified without interning, so scanner agents never reach user_agents
+        user_agent = request.headers.get('User-Agent', '')
+        is_bot, _family = classify_user_agent(user_agent)
+        if is_bot and not should_record_bot():
+            return
         conn = get_db_connection()
+        ua_id, _, _ = intern_user_agent(conn, user_agent)
         conn.execute('''
-            INSERT INTO analytics (domain, page_path, user_agent, ip_address)
+            INSERT INTO analytics (domain, page_path, user_agent_id, ip_address)
             VALUES (?, ?, ?, ?)
-        ''', (domain, page_path, request.headers.get('User-Agent', ''), 
-              request.remote_addr))
+        ''', (domain, page_path, ua_id, request.remote_addr))
         conn.commit()
         conn.close()
     except Exception as e:
         print(f"Analytics logging error: {e}")
 
+# Page views from static/js/beacon.js, buffered and written in batches
+analytics_batcher = register_collector(app, AnalyticsBatcher(DATABASE), should_record_bot)
+
+# Public pages without per-view work; nginx proxy_cache may serve them
+PAGE_CACHE_MAX_AGE = int(os.environ.get('PAGE_CACHE_MAX_AGE', '60'))
+
+def cacheable_page(html):
+    """Response that nginx proxy_cache and browsers may reuse for PAGE_CACHE_MAX_AGE"""
+    response = make_response(html)
+    response.headers['Cache-Control'] = f'public, max-age={PAGE_CACHE_MAX_AGE}'
+    return response
+
 @app.route('/')
 def home():
     """Main landing page with domain-specific templates and logos"""
@@ -237,11 +293,9 @@ def home():
         template_name = get_template_for_domain(request.host)
         domain_config = get_domain_config(request.host)
         
-        # Log analytics
-        log_analytics(request.host, '/')
-        
+        # Views are counted by the /collect beacon so this page stays cacheable
         print(f"🌐 Domain: {request.host} → Template: {template_name}")
-        return render_template(template_name, domain_config=domain_config)
+        return cacheable_page(render_template(template_name, domain_config=domain_config))
     except Exception as e:
         # Fallback to EdGPT template if there's an error
         print(f"Template error for {request.host}: {str(e)}")
@@ -254,9 +308,20 @@ def health():
     return jsonify({
         "status": "healthy", 
         "timestamp": datetime.now().isoformat(),
-        "domains": list(DOMAIN_TEMPLATES.keys())
+        "domains": list(DOMAIN_TEMPLATES.keys()),
+        "tenants": len(tenant_registry.snapshot().tenants)
     })
 
+# Load balancer probes; each check is cached briefly and refreshed single-flight
+health_probes = register_health_checks(app, [
+    CachedProbe('database', database_probe(DATABASE)),
+    CachedProbe('disk', disk_probe(DATABASE)),
+    CachedProbe('writer_backlog', writer_backlog_probe(DATABASE, analytics_batcher.depth)),
+    CachedProbe('templates', template_probe(app, lambda: [
+        name for tenant in tenant_registry.snapshot().tenants.values()
+        for name in (tenant.template, tenant.signup_template)])),
+])
+
 @app.route('/signup', methods=['GET', 'POST'])
 def signup():
     """Trial signup page and form processing"""
@@ -265,10 +330,9 @@ def signup():
             # Get the appropriate signup template based on the request domain
             signup_template = get_signup_template_for_domain(request.host)
             domain_config = get_domain_config(request.host)
-            log_analytics(request.host, '/signup')
             
             print(f"🌐 Signup Domain: {request.host} → Template: {signup_template}")
-            return render_template(signup_template, domain_config=domain_config)
+            return cacheable_page(render_template(signup_template, domain_config=domain_config))
         except Exception as e:
             print(f"Signup template error for {request.host}: {str(e)}")
             return f"Template error: {str(e)}", 500
@@ -295,6 +359,10 @@ def signup():
                 INSERT INTO trial_requests (email, website_url, business_name, phone)
                 VALUES (?, ?, ?, ?)
             ''', (email, website_url, business_name, phone))
+            # Subscribers get one digest per tenant instead of an email per signup
+            tenant = resolve_tenant(request.host)
+            queue_digest(conn, tenant.domain if tenant else 'edgpt.ai', 'new_trial',
+                         f"{business_name or email} - {website_url}")
             conn.commit()
             conn.close()
             
@@ -313,8 +381,7 @@ def conversion_process():
     """Website conversion process page"""
     try:
         domain_config = get_domain_config(request.host)
-        log_analytics(request.host, '/conversion')
-        return render_template('conversion_process_fixed.html', domain_config=domain_config)
+        return cacheable_page(render_template('conversion_process_fixed.html', domain_config=domain_config))
     except Exception as e:
         return f"Template error: {str(e)}", 500
 
@@ -387,16 +454,19 @@ def admin_dashboard():
         domain_config = get_domain_config(request.host)
         log_analytics(request.host, '/admin/dashboard')
         
-        # Get analytics data
-        conn = get_db_connection()
-        analytics = conn.execute('''
-            SELECT domain, COUNT(*) as views, DATE(created_at) as date
-            FROM analytics 
-            GROUP BY domain, DATE(created_at)
-            ORDER BY date DESC, views DESC
-            LIMIT 50
-        ''').fetchall()
+        # Get analytics data (none until the first reporting snapshot is taken)
+        try:
+            analytics = reporting_query('''
+                SELECT domain, COUNT(*) as views, DATE(created_at) as date
+                FROM analytics 
+                GROUP BY domain, DATE(created_at)
+                ORDER BY date DESC, views DESC
+                LIMIT 50
+            ''')
+        except SnapshotNotReady:
+            analytics = ()
         
+        conn = get_db_connection()
         trial_requests = conn.execute('''
             SELECT * FROM trial_requests 
             ORDER BY created_at DESC 
@@ -408,6 +478,7 @@ def admin_dashboard():
         return render_template('admin_dashboard.html', 
                              domain_config=domain_config,
                              analytics=analytics,
+                             snapshot_age=reporting_age(),
                              trial_requests=trial_requests)
     except Exception as e:
         return f"Template error: {str(e)}", 500
@@ -421,118 +492,17 @@ def generate_integration_code():
         customization = data.get('customization', {})
         
         # Get domain configuration
-        config = DOMAIN_CONFIGS.get(domain, DOMAIN_CONFIGS['edgpt.ai'])
+        tenant = tenant_registry.snapshot().tenants.get(domain)
+        config = tenant.config if tenant else DOMAIN_CONFIGS['edgpt.ai']
         
         # Apply customizations
         widget_color = customization.get('color', config['color'])
         widget_position = customization.get('position', 'bottom-right')
         widget_size = customization.get('size', 'medium')
         
-        # Generate the integration code using string formatting instead of f-strings
-        html_code = '''<!-- {name} Chat Widget -->
-<div id="{name_lower}-chat-widget"></div>
-<script>
-(function() {{
-    // Widget configuration
-    const config = {{
-        domain: '{domain}',
-        name: '{name}',
-        color: '{color}',
-        position: '{position}',
-        size: '{size}',
-        poweredBy: '{name}'
-    }};
-    
-    // Create widget container
-    const widget = document.createElement('div');
-    widget.id = 'gptsite-widget';
-    widget.style.cssText = `
-        position: fixed;
-        {pos_right}: 20px;
-        {pos_top}: 20px;
-        width: {width};
-        height: 500px;
-        background: white;
-        border-radius: 12px;
-        box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-        z-index: 10000;
-        display: none;
-        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-    `;
-    
-    // Create chat interface
-    widget.innerHTML = `
-        <div style="background: {color}; color: white; padding: 15px; border-radius: 12px 12px 0 0; display: flex; justify-content: space-between; align-items: center;">
-            <div style="display: flex; align-items: center; gap: 8px;">
-                <span style="font-size: 20px;">{icon}</span>
-                <span style="font-weight: 600;">{name} Assistant</span>
-            </div>
-            <button onclick="toggleWidget()" style="background: none; border: none; color: white; font-size: 18px; cursor: pointer;">×</button>
-        </div>
-        <div style="padding: 20px; height: 380px; overflow-y: auto;">
-            <div style="background: #f3f4f6; padding: 12px; border-radius: 8px; margin-bottom: 15px;">
-                Hi! I'm your {industry_lower} assistant. I can help you with information about our services. What would you like to know?
-            </div>
-        </div>
-        <div style="padding: 15px; border-top: 1px solid #e5e7eb;">
-            <div style="display: flex; gap: 8px;">
-                <input type="text" placeholder="Type your message..." style="flex: 1; padding: 10px; border: 1px solid #d1d5db; border-radius: 6px; outline: none;">
-                <button style="background: {color}; color: white; border: none; padding: 10px 15px; border-radius: 6px; cursor: pointer;">Send</button>
-            </div>
-            <div style="text-align: center; margin-top: 8px; font-size: 12px; color: #6b7280;">
-                Powered by <a href="https://{domain}" target="_blank" style="color: {color}; text-decoration: none;">{name}</a>
-            </div>
-        </div>
-    `;
-    
-    // Create toggle button
-    const toggleBtn = document.createElement('button');
-    toggleBtn.id = 'gptsite-toggle';
-    toggleBtn.style.cssText = `
-        position: fixed;
-        {pos_right}: 20px;
-        {pos_top}: 20px;
-        width: 60px;
-        height: 60px;
-        background: {color};
-        border: none;
-        border-radius: 50%;
-        color: white;
-        font-size: 24px;
-        cursor: pointer;
-        box-shadow: 0 4px 16px rgba(0,0,0,0.2);
-        z-index: 10001;
-        transition: transform 0.2s;
-    `;
-    toggleBtn.innerHTML = '{icon}';
-    toggleBtn.onclick = function() {{ toggleWidget(); }};
-    
-    // Toggle function
-    window.toggleWidget = function() {{
-        const isVisible = widget.style.display !== 'none';
-        widget.style.display = isVisible ? 'none' : 'block';
-        toggleBtn.style.transform = isVisible ? 'scale(1)' : 'scale(0.9)';
-    }};
-    
-    // Append to page
-    document.body.appendChild(widget);
-    document.body.appendChild(toggleBtn);
-    
-    console.log('{name} widget loaded successfully');
-}})();
-</script>'''.format(
-            name=config['name'],
-            name_lower=config['name'].lower(),
-            domain=domain,
-            color=widget_color,
-            position=widget_position,
-            size=widget_size,
-            pos_right=widget_position.split('-')[1],
-            pos_top=widget_position.split('-')[0],
-            width={'small': '300px', 'medium': '350px', 'large': '400px'}[widget_size],
-            icon=config['icon'],
-            industry_lower=config['industry'].lower()
-        )
+        # Two-line loader; the widget itself is fetched and cached separately
+        html_code = embed_snippet(domain, request.host_url, customization.get('color'),
+                                  widget_position, widget_size)
         
         css_code = '''/* {name} Widget Styles */
 #{name_lower}-chat-widget {{
@@ -573,13 +543,130 @@ def generate_integration_code():
             'success': True,
             'html': html_code,
             'css': css_code,
-            'config': config,
+            'config': {key: value for key, value in config.items() if key not in ('landing', 'signup')},
             'customization': customization
         })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/custom-domain', methods=['POST'])
+def register_custom_domain():
+    """Claim a customer-owned hostname for the signed-in account; it resolves once verified"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Please log in to set up a custom domain'}), 401
+    
+    try:
+        data = request.get_json(silent=True) or {}
+        host = normalize_host(data.get('domain', ''))
+        if not is_valid_hostname(host):
+            return jsonify({'success': False, 'message': 'Please enter a valid domain name'}), 400
+        if tenant_registry.snapshot().match(host):
+            return jsonify({'success': False, 'message': 'This domain is reserved'}), 400
+        
+        tenant = resolve_tenant(request.host)
+        _, status, token = custom_domains.register(host, tenant.domain, session['user_id'],
+                                                   data.get('conversion_id'))
+        
+        return jsonify({
+            'success': True,
+            'domain': host,
+            'status': status,
+            'cname_target': tenant.domain,
+            'verification': {
+                'type': 'TXT',
+                'name': verification_record(host),
+                'value': verification_value(token)
+            }
+        })
+        
+    except DomainTaken:
+        return jsonify({'success': False, 'message': 'This domain is already registered'}), 409
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@app.route('/api/custom-domain/verify', methods=['POST'])
+def verify_custom_domain():
+    """Look up the TXT record for the signed-in account's claim on a hostname"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Please log in to set up a custom domain'}), 401
+    
+    data = request.get_json(silent=True) or {}
+    host = normalize_host(data.get('domain', ''))
+    try:
+        status = custom_domains.verify(host, session['user_id'])
+    except DomainTaken:
+        return jsonify({'success': False, 'message': 'This domain is already registered'}), 409
+    except RuntimeError as e:
+        return jsonify({'success': False, 'message': str(e)}), 503
+    
+    if status is None:
+        return jsonify({'success': False, 'message': 'No claim for this domain'}), 404
+    if status != 'verified':
+        return jsonify({'success': False, 'domain': host, 'status': status,
+                        'message': f'TXT record not found at {verification_record(host)} yet'}), 409
+    return jsonify({'success': True, 'domain': host, 'status': status})
+
+@app.route('/api/provision', methods=['POST'])
+def bulk_provision():
+    """Provision many sites from an NDJSON body; streams one NDJSON result per line"""
+    if 'user_id' not in session or not session.get('is_admin'):
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    snapshot = tenant_registry.snapshot()
+    results = provision(DATABASE, request.stream, set(snapshot.tenants),
+                        lambda host: snapshot.match(host) is not None)
+    
+    def generate():
+        for result in results:
+            yield json.dumps(result) + '\n'
+    
+    return app.response_class(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/invoices/batch', methods=['POST'])
+def render_invoices():
+    """Render invoices from an NDJSON body; streams back a zip of the documents"""
+    if 'user_id' not in session or not session.get('is_admin'):
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    invoices, errors = parse_invoices(request.stream)
+    if errors or not invoices:
+        return jsonify({'error': 'Invalid invoices' if errors else 'No invoices',
+                        'invalid': len(errors), 'lines': errors[:100]}), 400
+    
+    response = app.response_class(stream_with_context(zip_stream(render_batch(invoices))),
+                                  mimetype='application/zip')
+    response.headers['Content-Disposition'] = f'attachment; filename=invoices-{datetime.now():%Y%m%d-%H%M%S}.zip'
+    return response
+
+@app.route('/api/transcripts/<site>/<conversation_id>')
+def get_transcript(site, conversation_id):
+    """Every turn of one widget conversation"""
+    if 'user_id' not in session or not session.get('is_admin'):
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    tenant = tenant_registry.snapshot().match(site.lower())
+    if tenant is None or not CONVERSATION_ID.match(conversation_id):
+        return jsonify({'error': 'Unknown conversation'}), 404
+    turns = transcript_log.read(tenant.domain, conversation_id)
+    return jsonify({'site': tenant.domain, 'conversation_id': conversation_id, 'turns': turns})
+
+@app.route('/admin/queries')
+def admin_query_report():
+    """SQL profiler report: slowest statements and their query plans"""
+    if 'user_id' not in session or not session.get('is_admin'):
+        return redirect(url_for('login'))
+    return render_template('query_report.html', report=sql_profiler.report())
+
+@app.route('/api/admin/queries')
+def get_query_report():
+    """SQL profiler statistics for this worker as JSON"""
+    if 'user_id' not in session or not session.get('is_admin'):
+        return jsonify({'error': 'Unauthorized'}), 401
+    response = jsonify(sql_profiler.report(limit=request.args.get('limit', 50, type=int)))
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
 @app.route('/api/analytics')
 def get_analytics():
     """Get analytics data for admin dashboard"""
@@ -587,44 +674,223 @@ def get_analytics():
         return jsonify({'error': 'Unauthorized'}), 401
     
     try:
-        conn = get_db_connection()
-        
         # Domain views
-        domain_views = conn.execute('''
+        domain_views = reporting_query('''
             SELECT domain, COUNT(*) as views
             FROM analytics 
             WHERE created_at >= date('now', '-30 days')
             GROUP BY domain
             ORDER BY views DESC
-        ''').fetchall()
+        ''')
         
         # Daily views
-        daily_views = conn.execute('''
+        daily_views = reporting_query('''
             SELECT DATE(created_at) as date, COUNT(*) as views
             FROM analytics 
             WHERE created_at >= date('now', '-30 days')
             GROUP BY DATE(created_at)
             ORDER BY date DESC
-        ''').fetchall()
+        ''')
         
         # Trial signups
-        trial_signups = conn.execute('''
+        trial_signups = reporting_query('''
             SELECT COUNT(*) as count
             FROM trial_requests 
             WHERE created_at >= date('now', '-30 days')
-        ''').fetchone()
-        
-        conn.close()
+        ''')[0]
         
         return jsonify({
-            'domain_views': [dict(row) for row in domain_views],
-            'daily_views': [dict(row) for row in daily_views],
-            'trial_signups': trial_signups['count']
+            'domain_views': list(domain_views),
+            'daily_views': list(daily_views),
+            'trial_signups': trial_signups['count'],
+            'cache': reporting_cache.stats(),
+            'snapshot_age_s': reporting_age()
         })
         
+    except SnapshotNotReady as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/get-email-settings')
+def get_email_settings_api():
+    """Notification settings of the logged-in user"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    conn = get_db_connection()
+    settings = get_email_settings(conn, session['user_id'])
+    conn.close()
+    return jsonify(settings)
+
+@app.route('/api/update-email-settings', methods=['POST'])
+def update_email_settings_api():
+    """Change one or more notification settings of the logged-in user"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    changes = request.get_json(silent=True)
+    if not isinstance(changes, dict) or not any(name in changes for name in EMAIL_SETTINGS):
+        return jsonify({'success': False, 'error': f"Expected one of: {', '.join(EMAIL_SETTINGS)}"}), 400
+    
+    conn = get_db_connection()
+    settings = update_email_settings(conn, session['user_id'], changes)
+    conn.commit()
+    conn.close()
+    return jsonify({'success': True, **settings})
+
+@app.route('/knowledge-base')
+def knowledge_base():
+    """Knowledge base: documents, calendars, videos and uploads"""
+    if 'user_id' not in session:
+        return redirect(url_for('login'))
+    
+    try:
+        domain_config = get_domain_config(request.host)
+        return render_template('knowledge_base.html', domain_config=domain_config)
+    except Exception as e:
+        return f"Template error: {str(e)}", 500
+
+@app.route('/api/knowledge-base/uploads', methods=['POST'])
+def upload_document():
+    """Store one file streamed as the raw request body (?filename=...); text is extracted later"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    filename = clean_filename(request.args.get('filename'))
+    allowed, _ = file_kind(filename)
+    if not filename or not allowed:
+        return jsonify({'success': False, 'error': 'Unsupported file type',
+                        'supported': sorted(UPLOAD_EXTENSIONS)}), 400
+    if (request.content_length or 0) > UPLOAD_MAX_MB * 1024 * 1024:
+        return jsonify({'success': False, 'error': f'Uploads are limited to {UPLOAD_MAX_MB} MB'}), 413
+    
+    # Hashed and written to disk in chunks; never held in memory
+    try:
+        digest, size, _created = store_stream(request.stream)
+    except UploadTooLarge as e:
+        return jsonify({'success': False, 'error': str(e)}), 413
+    if size == 0:
+        return jsonify({'success': False, 'error': 'Empty file'}), 400
+    
+    tenant = resolve_tenant(request.host)
+    tenant_domain = tenant.domain if tenant else 'edgpt.ai'
+    conn = get_db_connection()
+    document_id = add_document(conn, tenant_domain, session['user_id'], filename,
+                               request.mimetype or None, digest, size)
+    conn.commit()
+    # Whether another tenant already had the same file is not revealed
+    document = get_document(conn, tenant_domain, session['user_id'], document_id)
+    conn.close()
+    return jsonify({'success': True, 'document': document}), 201
+
+@app.route('/api/knowledge-base/uploads')
+def list_uploads():
+    """Uploaded documents of the logged-in user with their text extraction state"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    tenant = resolve_tenant(request.host)
+    conn = get_db_connection()
+    documents = list_documents(conn, tenant.domain if tenant else 'edgpt.ai', session['user_id'])
+    conn.close()
+    return jsonify({'documents': documents})
+
+@app.route('/api/knowledge-base/uploads/<int:document_id>')
+def get_upload(document_id):
+    """One uploaded document; poll for extraction progress"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    tenant = resolve_tenant(request.host)
+    conn = get_db_connection()
+    document = get_document(conn, tenant.domain if tenant else 'edgpt.ai', session['user_id'], document_id)
+    conn.close()
+    if document is None:
+        return jsonify({'error': 'Document not found'}), 404
+    return jsonify(document)
+
+def get_trial(conn, signup_id):
+    """The signed-in user's trial request if it can still be cancelled, or None"""
+    return conn.execute('''
+        SELECT trial_requests.id, trial_requests.email, trial_requests.website_url
+        FROM trial_requests JOIN users ON users.email = trial_requests.email
+        WHERE trial_requests.id = ? AND users.id = ? AND trial_requests.status != 'cancelled'
+    ''', (signup_id, session['user_id'])).fetchone()
+
+def mask_email(email):
+    """j•••@example.com: recognisable to its owner without showing the address"""
+    local, _, domain = email.partition('@')
+    return f"{local[:1]}•••@{domain}"
+
+@app.route('/cancel-account/<int:signup_id>')
+def cancel_account(signup_id):
+    """Account cancellation page: extend the trial or delete the account with an emailed code"""
+    if 'user_id' not in session:
+        return redirect(url_for('login'))
+    
+    conn = get_db_connection()
+    signup = get_trial(conn, signup_id)
+    conn.close()
+    # Someone else's trial looks the same as a missing one
+    if signup is None:
+        return jsonify({'error': 'Account not found'}), 404
+    return render_template('account_cancellation.html', masked_email=mask_email(signup['email']),
+                           signup_id=signup_id)
+
+@app.route('/send-deletion-otp/<int:signup_id>', methods=['POST'])
+def send_deletion_otp(signup_id):
+    """Email a one-time code confirming the deletion of an account"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'Please log in'}), 401
+    
+    conn = get_db_connection()
+    signup = get_trial(conn, signup_id)
+    if signup is None:
+        conn.close()
+        return jsonify({'success': False, 'error': 'Account not found'}), 404
+    
+    code = issue_otp(conn, signup_id)
+    if code is None:
+        conn.close()
+        return jsonify({'success': False, 'error': 'A code was sent moments ago'}), 429
+    # Sent by the email worker; only a hash of the code is stored
+    tenant = resolve_tenant(request.host)
+    enqueue(conn, tenant.domain if tenant else 'edgpt.ai', signup['email'],
+            'Your EdGPT account deletion code',
+            f"Your verification code is {code}.\n\n"
+            f"It expires in {OTP_TTL // 60} minutes. If you did not ask to delete your account, "
+            "ignore this email.\n")
+    conn.commit()
+    conn.close()
+    return jsonify({'success': True})
+
+@app.route('/verify-deletion-otp/<int:signup_id>', methods=['POST'])
+def verify_deletion_otp(signup_id):
+    """Check the emailed code and queue the account for a background purge"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'error': 'Please log in'}), 401
+    
+    data = request.get_json(silent=True) or {}
+    conn = get_db_connection()
+    signup = get_trial(conn, signup_id)
+    if signup is None:
+        conn.close()
+        return jsonify({'success': False, 'error': 'Account not found'}), 404
+    
+    if not verify_otp(conn, signup_id, data.get('otp_code', '')):
+        # Keep the counted attempt
+        conn.commit()
+        conn.close()
+        return jsonify({'success': False, 'error': 'Invalid or expired code'}), 400
+    # The data itself is deleted in batches by `python src/account_deletion.py watch`
+    tenant = resolve_tenant(request.host)
+    job_id = queue_purge(conn, signup, tenant.domain if tenant else 'edgpt.ai',
+                         str(data.get('cancellation_reason', 'not_specified'))[:100])
+    conn.commit()
+    conn.close()
+    return jsonify({'success': True, 'purge_job': job_id})
+
 @app.route('/logout')
 def logout():
     """User logout"""
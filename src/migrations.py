@@ -0,0 +1,200 @@
+"""
+EdGPT Platform - Schema Migrations
+Numbered migrations applied once, before the web workers start
+
+Each migration is a function taking a connection; the runner applies the
+pending ones in order, each in its own IMMEDIATE transaction together with
+its schema_version row, so concurrent runners serialize and a failed
+migration leaves the previous version intact. Web workers never run DDL:
+they call require_schema(), a read-only check that the database is at
+LATEST_VERSION.
+
+The early migrations are idempotent so databases created by the old
+import-time init_db() are adopted without changes.
+
+Usage:
+    python src/migrations.py migrate    # apply pending migrations
+    python src/migrations.py status     # current vs latest version
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+
+from account_deletion import add_purge_hosts_column, create_deletion_tables
+from custom_domains import add_ownership_columns, create_custom_domain_table
+from email_queue import create_email_tables, create_subscription_table
+from tenant_registry import create_tenant_tables
+from trial_triage import create_triage_columns
+from ua_registry import create_user_agent_table, rekey_user_agents
+from uploads import add_document_state_columns, create_upload_tables
+
+
+class SchemaError(RuntimeError):
+    """The database schema is missing or older than this code expects"""
+
+
+def initial_schema(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            website_url TEXT,
+            business_name TEXT,
+            phone TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_admin BOOLEAN DEFAULT FALSE
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS trial_requests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT NOT NULL,
+            website_url TEXT NOT NULL,
+            business_name TEXT,
+            phone TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            status TEXT DEFAULT 'pending'
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS analytics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            domain TEXT NOT NULL,
+            page_path TEXT NOT NULL,
+            user_agent TEXT,
+            ip_address TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def default_admin(conn):
+    admin_hash = hashlib.sha256('admin123'.encode()).hexdigest()
+    conn.execute('''
+        INSERT OR IGNORE INTO users (email, password_hash, is_admin, business_name)
+        VALUES (?, ?, ?, ?)
+    ''', ('admin@edgpt.ai', admin_hash, True, 'EdGPT Admin'))
+
+
+def tenant_tables(conn):
+    create_tenant_tables(conn)
+    create_custom_domain_table(conn)
+
+
+def user_agent_table(conn):
+    create_user_agent_table(conn)
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(analytics)')]
+    if 'user_agent_id' not in columns:
+        conn.execute('ALTER TABLE analytics ADD COLUMN user_agent_id INTEGER')
+
+
+def reporting_indexes(conn):
+    # Admin dashboard and /api/analytics filter and group on these
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_analytics_created_at ON analytics(created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_trial_requests_created_at ON trial_requests(created_at)')
+
+
+MIGRATIONS = [
+    (1, 'initial schema', initial_schema),
+    (2, 'default admin user', default_admin),
+    (3, 'tenant registry and custom domains', tenant_tables),
+    (4, 'user agent lookup table', user_agent_table),
+    (5, 'reporting indexes', reporting_indexes),
+    (6, 'trial triage queue', create_triage_columns),
+    (7, 'outbound email queue', create_email_tables),
+    (8, 'account deletion codes and purge jobs', create_deletion_tables),
+    (9, 'knowledge base uploads', create_upload_tables),
+    (10, 'custom domain ownership and verification', add_ownership_columns),
+    (11, 'per-tenant digest subscriptions', create_subscription_table),
+    (12, 'purge jobs match verified hosts', add_purge_hosts_column),
+    (13, 'per-document extraction state', add_document_state_columns),
+    (14, 'user agents unique on the string', rekey_user_agents),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn):
+    """Highest applied version, 0 for a database without schema_version"""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'").fetchone()
+    if not exists:
+        return 0
+    return conn.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version').fetchone()[0]
+
+
+def migrate(database, migrations=MIGRATIONS):
+    """Apply pending migrations; returns the list of versions applied"""
+    conn = sqlite3.connect(database, timeout=30, isolation_level=None)
+    applied = []
+    try:
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        for version, name, apply in migrations:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                # Re-read under the write lock: another runner may have got here first
+                if version <= current_version(conn):
+                    conn.execute('ROLLBACK')
+                    continue
+                apply(conn)
+                conn.execute('INSERT INTO schema_version (version, name) VALUES (?, ?)', (version, name))
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            applied.append(version)
+    finally:
+        conn.close()
+    return applied
+
+
+def schema_status(database):
+    """Current schema version, read-only; 0 if the database does not exist"""
+    if not os.path.exists(database):
+        return 0
+    conn = sqlite3.connect(f"file:{database}?mode=ro", uri=True)
+    try:
+        return current_version(conn)
+    finally:
+        conn.close()
+
+
+def require_schema(database):
+    """Startup check for web workers: raise SchemaError unless fully migrated"""
+    version = schema_status(database)
+    if version < LATEST_VERSION:
+        raise SchemaError(
+            f"{database} is at schema version {version}, code expects {LATEST_VERSION}; "
+            f"run `python src/migrations.py migrate` before starting workers")
+    return version
+
+
+if __name__ == '__main__':
+    database = os.environ.get('DATABASE', 'edgpt_platform.db')
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    if command == 'migrate':
+        applied = migrate(database)
+        if applied:
+            for version, name, _ in MIGRATIONS:
+                if version in applied:
+                    print(f"   • {version:03d} {name}")
+            print(f"✅ {database} migrated to version {LATEST_VERSION}")
+        else:
+            print(f"✅ {database} already at version {LATEST_VERSION}")
+    elif command == 'status':
+        version = schema_status(database)
+        print(f"{database}: schema version {version}, latest {LATEST_VERSION}")
+        sys.exit(0 if version == LATEST_VERSION else 1)
+    else:
+        print(__doc__)
+        sys.exit(1)
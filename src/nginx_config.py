@@ -0,0 +1,261 @@
+"""
+EdGPT Platform - Nginx Config Generator
+Renders config/nginx.conf from the tenant domain list
+
+One HTTPS server block is rendered per tenant domain, plus a shared
+HTTP->HTTPS redirect. Every block proxies to a keepalive upstream pool
+instead of opening a new connection to gunicorn per request. Anonymous GETs
+of the landing, signup and conversion pages are micro-cached; requests with
+a session cookie bypass the cache. Static files are served from disk,
+preferring the precompressed .gz siblings written by `src/assets.py build`.
+
+Document uploads and the batch endpoints (provisioning, invoices) get their
+own locations: a body limit that matches the application's instead of
+nginx's 1MB default, and request buffering off so the body streams through
+to gunicorn rather than being spooled to disk first. Verified custom domains
+get a server block of their own (their own certificate) proxying to the same
+upstream; the app maps them to their tenant. A custom domain whose
+certificate has not been issued yet is left out, since one missing
+certificate makes `nginx -t` fail and blocks the reload for every site;
+`generate` lists those hosts with the certbot command to run.
+
+config/nginx.conf is the golden file for the built-in domains: `check`
+re-renders it and fails on any difference, so template changes show up as a
+reviewable diff instead of hand edits to six copies.
+
+Usage:
+    python src/nginx_config.py generate [output]    # domains and verified custom domains from the registry
+    python src/nginx_config.py check [golden]       # built-in domains vs config/nginx.conf
+"""
+
+import difflib
+import os
+import sqlite3
+import sys
+
+from uploads import UPLOAD_MAX_MB
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_PATH = os.path.join(BASE_DIR, '..', 'config', 'nginx.conf')
+
+# The verticals main.py seeds into an empty tenant registry
+BUILTIN_DOMAINS = ('edgpt.ai', 'gptsites.ai', 'lawfirmgpt.ai', 'cpafirm.ai',
+                   'taxprepgpt.ai', 'businessbrokergpt.ai')
+
+CERT_DIR = '/etc/letsencrypt/live'
+UPSTREAM_SERVERS = ('127.0.0.1:8082',)
+UPSTREAM_KEEPALIVE = 32
+STATIC_ROOT = '/var/www/edgpt/static/'
+CACHE_DIR = '/var/cache/nginx/edgpt'
+MICROCACHE_SECONDS = 5
+CACHED_PAGES = ('/', '/signup', '/conversion')
+BATCH_MAX_MB = 64
+
+# Streaming endpoints -> body limit in MB
+STREAMED_BODIES = (
+    ('/api/knowledge-base/uploads', UPLOAD_MAX_MB),
+    ('/api/provision', BATCH_MAX_MB),
+    ('/api/invoices/batch', BATCH_MAX_MB),
+)
+
+SECURITY_HEADERS = (
+    ('X-Frame-Options', 'SAMEORIGIN'),
+    ('X-XSS-Protection', '1; mode=block'),
+    ('X-Content-Type-Options', 'nosniff'),
+    ('Referrer-Policy', 'no-referrer-when-downgrade'),
+    ('Content-Security-Policy', "default-src 'self' http: https: data: blob: 'unsafe-inline'"),
+)
+
+PROXY_HEADERS = '''\
+        proxy_http_version 1.1;
+        proxy_set_header Connection "";
+        proxy_set_header Host $host;
+        proxy_set_header X-Real-IP $remote_addr;
+        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+        proxy_set_header X-Forwarded-Proto $scheme;
+        proxy_redirect off;'''
+
+
+def security_headers(indent):
+    return '\n'.join(f'{indent}add_header {name} "{value}" always;' for name, value in SECURITY_HEADERS)
+
+
+def render_http_block(domains):
+    names = ' '.join(f'{d} www.{d}' for d in domains)
+    return f'''\
+server {{
+    listen 80;
+    server_name {names};
+
+    # Redirect HTTP to HTTPS
+    return 301 https://$host$request_uri;
+}}
+'''
+
+
+def render_streamed_locations():
+    return '\n'.join(f'''\
+    location = {path} {{
+        proxy_pass http://edgpt_app;
+{PROXY_HEADERS}
+
+        client_max_body_size {limit}m;
+        proxy_request_buffering off;
+        proxy_buffering off;
+    }}
+''' for path, limit in STREAMED_BODIES)
+
+
+def render_server_block(domain, comment=None):
+    pages = '|'.join(p.strip('/') for p in CACHED_PAGES if p != '/')
+    return f'''\
+# {comment or domain}
+server {{
+    listen 443 ssl http2;
+    server_name {domain} www.{domain};
+
+    ssl_certificate {CERT_DIR}/{domain}/fullchain.pem;
+    ssl_certificate_key {CERT_DIR}/{domain}/privkey.pem;
+
+{security_headers('    ')}
+
+    # Landing, signup and conversion pages: micro-cached for anonymous GETs
+    location ~ ^/({pages})?$ {{
+        proxy_pass http://edgpt_app;
+{PROXY_HEADERS}
+
+        proxy_cache edgpt_pages;
+        proxy_cache_key $scheme$host$request_uri;
+        proxy_cache_valid 200 {MICROCACHE_SECONDS}s;
+        proxy_ignore_headers Cache-Control Expires;
+        proxy_cache_bypass $cookie_session;
+        proxy_no_cache $cookie_session;
+        proxy_cache_use_stale error timeout updating;
+        proxy_cache_background_update on;
+        proxy_cache_lock on;
+    }}
+
+    # Uploads and batches: large bodies streamed to the app, streamed responses
+{render_streamed_locations()}
+    location / {{
+        proxy_pass http://edgpt_app;
+{PROXY_HEADERS}
+    }}
+
+    location /static/ {{
+        alias {STATIC_ROOT};
+        gzip_static on;
+        expires 1y;
+        add_header Cache-Control "public, immutable";
+        # add_header in a location replaces the server-level ones
+{security_headers('        ')}
+    }}
+}}
+'''
+
+
+def render_config(domains, custom_domains=()):
+    """Full nginx config for the given tenant domains and verified (host, tenant) pairs"""
+    domains = sorted(set(domains), key=lambda d: (d not in BUILTIN_DOMAINS,
+                                                  BUILTIN_DOMAINS.index(d) if d in BUILTIN_DOMAINS else 0, d))
+    custom_domains = sorted(set(custom_domains))
+    servers = '\n'.join(f'    server {server};' for server in UPSTREAM_SERVERS)
+    blocks = '\n'.join([render_server_block(domain) for domain in domains] +
+                       [render_server_block(host, f"{host} (custom domain of {tenant})")
+                        for host, tenant in custom_domains])
+    return f'''\
+# EdGPT Platform - Nginx Configuration
+# Generated by src/nginx_config.py; do not edit by hand.
+# Regenerate: python src/nginx_config.py generate config/nginx.conf
+# Place this file in /etc/nginx/sites-available/edgpt-domains
+# Enable with: sudo ln -s /etc/nginx/sites-available/edgpt-domains /etc/nginx/sites-enabled/
+
+# gunicorn workers; idle connections are kept open and reused
+upstream edgpt_app {{
+{servers}
+    keepalive {UPSTREAM_KEEPALIVE};
+    keepalive_requests 1000;
+    keepalive_timeout 60s;
+}}
+
+# Micro-cache for public pages. Views are counted by the /collect beacon,
+# so cached pages still show up in analytics. Responses with Set-Cookie
+# are never stored.
+proxy_cache_path {CACHE_DIR} levels=1:2 keys_zone=edgpt_pages:10m max_size=256m inactive=10m use_temp_path=off;
+
+{render_http_block(domains + [host for host, _ in custom_domains])}
+{blocks}'''
+
+
+def registry_domains(database):
+    """Tenant domains from the registry, read-only"""
+    conn = sqlite3.connect(f"file:{database}?mode=ro", uri=True)
+    try:
+        return [row[0] for row in conn.execute('SELECT domain FROM tenants')]
+    finally:
+        conn.close()
+
+
+def registry_custom_domains(database):
+    """Verified (host, tenant domain) pairs, read-only; pending claims are never served"""
+    conn = sqlite3.connect(f"file:{database}?mode=ro", uri=True)
+    try:
+        return conn.execute(
+            "SELECT host, tenant_domain FROM custom_domains WHERE status = 'verified'").fetchall()
+    except sqlite3.OperationalError:
+        return []  # database from before custom domains
+    finally:
+        conn.close()
+
+
+def split_issued(custom_domains, cert_dir=CERT_DIR):
+    """(issued, missing) (host, tenant) pairs by whether the host has a certificate yet"""
+    issued, missing = [], []
+    for host, tenant in custom_domains:
+        has_cert = os.path.isfile(os.path.join(cert_dir, host, 'fullchain.pem'))
+        (issued if has_cert else missing).append((host, tenant))
+    return issued, missing
+
+
+def check_golden(path=GOLDEN_PATH, domains=BUILTIN_DOMAINS):
+    """Unified diff between the golden file and a fresh render; empty when equal"""
+    with open(path) as f:
+        golden = f.read()
+    rendered = render_config(domains)
+    return ''.join(difflib.unified_diff(
+        golden.splitlines(True), rendered.splitlines(True), 'golden', 'rendered'))
+
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'check'
+    if command == 'generate':
+        database = os.environ.get('DATABASE', 'edgpt_platform.db')
+        try:
+            domains = registry_domains(database)
+            custom_domains = registry_custom_domains(database)
+        except sqlite3.Error:
+            domains, custom_domains = [], []
+        custom_domains, missing = split_issued(custom_domains)
+        for host, tenant in missing:
+            # stderr: stdout may be the config itself
+            print(f"⚠️ Skipped {host} (custom domain of {tenant}): no certificate yet; run "
+                  f"sudo certbot certonly --nginx -d {host} -d www.{host}, then generate again",
+                  file=sys.stderr)
+        config = render_config(domains or BUILTIN_DOMAINS, custom_domains)
+        if len(sys.argv) > 2:
+            with open(sys.argv[2], 'w') as f:
+                f.write(config)
+            print(f"✅ Wrote {sys.argv[2]} for {len(domains or BUILTIN_DOMAINS)} domains")
+        else:
+            sys.stdout.write(config)
+    elif command == 'check':
+        diff = check_golden(sys.argv[2] if len(sys.argv) > 2 else GOLDEN_PATH)
+        if diff:
+            sys.stdout.write(diff)
+            print("❌ nginx config differs from the generator output; "
+                  "run `python src/nginx_config.py generate config/nginx.conf`")
+            sys.exit(1)
+        print("✅ nginx config matches the generator output")
+    else:
+        print(__doc__)
+        sys.exit(1)
@@ -0,0 +1,221 @@
+"""
+EdGPT Platform - Bulk Site Provisioning
+Onboard many customer sites from NDJSON in chunked transactions
+
+Agencies and school districts send one JSON object per line:
+
+    {"email": "it@district.org", "website_url": "district.org",
+     "business_name": "...", "phone": "...", "vertical": "edgpt.ai",
+     "custom_domain": "chat.district.org",
+     "customization": {"color": "#1E40AF", "position": "bottom-right", "size": "medium"}}
+
+Only email and website_url are required. Lines are validated as they are
+read; valid sites are written CHUNK_SIZE at a time, each chunk in a single
+transaction: a user (reused when the email exists), a pending trial request
+for the triage workers, and an optional custom domain claim owned by that
+user. Claims stay pending, and do not resolve, until the customer publishes
+the TXT record in the result or an admin approves them. Each site gets a
+savepoint, so a conflict (e.g. a custom domain another account verified)
+fails that line only. Every line yields one result with its embed code or
+its error.
+
+No tenants rows are written. A tenant is a vertical with its own templates
+and config, and `vertical` must already be one. A provisioned site belongs to
+that tenant: its widget loads from the vertical, and its custom domain
+resolves to the vertical through custom_domains once verified.
+
+Usage:
+    python src/provisioning.py sites.ndjson    # results as NDJSON on stdout
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+
+from custom_domains import (DomainTaken, claim_domain, is_valid_hostname, normalize_host,
+                            verification_record, verification_value)
+from trial_triage import normalize_url
+from widget import POSITIONS, SIZES, embed_snippet
+
+CHUNK_SIZE = int(os.environ.get('PROVISION_CHUNK_SIZE', '500'))
+MAX_LINE_BYTES = 8192
+DEFAULT_VERTICAL = 'edgpt.ai'
+# Never equal to a sha256 hex digest: the account cannot log in until a password is set
+DISABLED_PASSWORD = '!'
+
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+COLOR_PATTERN = re.compile(r'^#[0-9a-fA-F]{3,8}$')
+
+
+def validate_site(raw, verticals, is_reserved):
+    """(site, None) for a valid NDJSON line, or (None, error message)"""
+    if len(raw) > MAX_LINE_BYTES:
+        return None, 'Line too long'
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return None, 'Invalid JSON'
+    if not isinstance(data, dict):
+        return None, 'Expected a JSON object'
+
+    email = str(data.get('email') or '').strip().lower()
+    if not EMAIL_PATTERN.match(email):
+        return None, 'A valid email is required'
+    website_url = str(data.get('website_url') or '').strip()
+    if not normalize_url(website_url):
+        return None, 'A valid website URL is required'
+    vertical = str(data.get('vertical') or DEFAULT_VERTICAL).strip().lower()
+    if vertical not in verticals:
+        return None, f'Unknown vertical: {vertical}'
+
+    custom_domain = None
+    if data.get('custom_domain'):
+        custom_domain = normalize_host(str(data['custom_domain']))
+        if not is_valid_hostname(custom_domain):
+            return None, 'Invalid custom domain'
+        if is_reserved(custom_domain):
+            return None, 'Custom domain is reserved'
+
+    customization = data.get('customization') or {}
+    if not isinstance(customization, dict):
+        return None, 'customization must be an object'
+    color = customization.get('color')
+    if color is not None and not COLOR_PATTERN.match(str(color)):
+        return None, 'Invalid color'
+    position = customization.get('position', 'bottom-right')
+    size = customization.get('size', 'medium')
+    if position not in POSITIONS or size not in SIZES:
+        return None, 'Invalid position or size'
+
+    return {
+        'email': email,
+        'website_url': website_url,
+        'business_name': str(data.get('business_name') or '').strip(),
+        'phone': str(data.get('phone') or '').strip(),
+        'vertical': vertical,
+        'custom_domain': custom_domain,
+        'color': color,
+        'position': position,
+        'size': size,
+    }, None
+
+
+def write_chunk(conn, chunk):
+    """Insert a chunk of (line, site) in one transaction; returns the results"""
+    results = []
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        for line, site in chunk:
+            conn.execute('SAVEPOINT site')
+            try:
+                conn.execute('''
+                    INSERT OR IGNORE INTO users (email, password_hash, website_url, business_name, phone)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (site['email'], DISABLED_PASSWORD, site['website_url'],
+                      site['business_name'], site['phone']))
+                trial_id = conn.execute('''
+                    INSERT INTO trial_requests (email, website_url, business_name, phone)
+                    VALUES (?, ?, ?, ?) RETURNING id
+                ''', (site['email'], site['website_url'], site['business_name'],
+                      site['phone'])).fetchone()[0]
+                verification = None
+                if site['custom_domain']:
+                    user_id = conn.execute('SELECT id FROM users WHERE email = ?',
+                                           (site['email'],)).fetchone()[0]
+                    _, status, token = claim_domain(conn, site['custom_domain'], site['vertical'],
+                                                    user_id, signup_id=trial_id)
+                    if status != 'verified':
+                        verification = {'type': 'TXT', 'name': verification_record(site['custom_domain']),
+                                        'value': verification_value(token)}
+                conn.execute('RELEASE site')
+            except DomainTaken:
+                conn.execute('ROLLBACK TO site')
+                conn.execute('RELEASE site')
+                results.append({'line': line, 'ok': False,
+                                'error': 'Custom domain is already registered'})
+                continue
+            results.append({
+                'line': line, 'ok': True, 'trial_id': trial_id, 'vertical': site['vertical'],
+                'custom_domain': site['custom_domain'], 'verification': verification,
+                'embed': embed_snippet(site['vertical'], f"https://{site['vertical']}",
+                                       site['color'], site['position'], site['size']),
+            })
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+    return results
+
+
+def provision(database, lines, verticals, is_reserved, chunk_size=CHUNK_SIZE):
+    """Validate and write NDJSON lines; yields one result per non-blank line, then a summary
+
+    Results for valid lines are yielded after their chunk commits.
+    """
+    start = time.perf_counter()
+    counts = {'received': 0, 'provisioned': 0, 'failed': 0}
+    conn = sqlite3.connect(database, timeout=30, isolation_level=None)
+    try:
+        chunk = []
+        seen_domains = set()
+        for number, raw in enumerate(lines, start=1):
+            if isinstance(raw, bytes):
+                raw = raw.decode('utf-8', 'replace')
+            if not raw.strip():
+                continue
+            counts['received'] += 1
+            site, error = validate_site(raw, verticals, is_reserved)
+            if site and site['custom_domain']:
+                if site['custom_domain'] in seen_domains:
+                    site, error = None, 'Custom domain appears earlier in this batch'
+                else:
+                    seen_domains.add(site['custom_domain'])
+            if error:
+                counts['failed'] += 1
+                yield {'line': number, 'ok': False, 'error': error}
+                continue
+            chunk.append((number, site))
+            if len(chunk) >= chunk_size:
+                yield from _flush(conn, chunk, counts)
+                chunk = []
+        if chunk:
+            yield from _flush(conn, chunk, counts)
+    finally:
+        conn.close()
+    yield {'summary': dict(counts, seconds=round(time.perf_counter() - start, 3))}
+
+
+def _flush(conn, chunk, counts):
+    results = write_chunk(conn, chunk)
+    for result in results:
+        counts['provisioned' if result['ok'] else 'failed'] += 1
+    return results
+
+
+def registry_verticals(database):
+    conn = sqlite3.connect(f"file:{database}?mode=ro", uri=True)
+    try:
+        return {row[0] for row in conn.execute('SELECT domain FROM tenants')}
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    database = os.environ.get('DATABASE', 'edgpt_platform.db')
+    verticals = registry_verticals(database)
+
+    def is_reserved(host):
+        return host in verticals or any(host.endswith('.' + domain) for domain in verticals)
+
+    with open(sys.argv[1], 'rb') as f:
+        for result in provision(database, f, verticals, is_reserved):
+            print(json.dumps(result))
+        summary = result['summary']
+    print(f"✅ Provisioned {summary['provisioned']} of {summary['received']} sites "
+          f"({summary['failed']} failed) in {summary['seconds']}s", file=sys.stderr)
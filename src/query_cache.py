@@ -0,0 +1,117 @@
+"""
+EdGPT Platform - Reporting Query Cache
+TTL result cache with stale-while-revalidate and single-flight loading
+
+Admin reporting queries are aggregates over the whole analytics table, and
+auto-refreshing dashboards repeat them every few seconds. Results are cached
+per (sql, params):
+
+- fresh  (age < ttl):                 served from cache
+- stale  (age < ttl + stale_ttl):     served from cache while one background
+                                      thread re-runs the query
+- missing or expired:                 loaded; concurrent identical requests
+                                      wait for that one execution instead of
+                                      running their own
+
+stats() reports the hit rate and the query time saved, estimated from how
+long each cached result took to compute.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Flight:
+    """One in-progress load that other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class QueryCache:
+    """Per-process cache of query results keyed by SQL text and parameters"""
+
+    def __init__(self, ttl=30, stale_ttl=120, maxsize=256):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()   # key -> (value, loaded_at, cost_seconds)
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'coalesced': 0,
+                       'query_seconds': 0.0, 'saved_seconds': 0.0}
+
+    def _load(self, key, loader, flight):
+        start = time.perf_counter()
+        try:
+            flight.value = loader()
+        except Exception as e:
+            flight.error = e
+        cost = time.perf_counter() - start
+        with self._lock:
+            self._flights.pop(key, None)
+            self._stats['query_seconds'] += cost
+            if flight.error is None:
+                self._entries[key] = (flight.value, time.monotonic(), cost)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        flight.done.set()
+
+    def get(self, sql, params, loader):
+        """Cached result of loader() for this query; loader runs the SQL"""
+        key = (sql, tuple(params))
+        with self._lock:
+            entry = self._entries.get(key)
+            flight = self._flights.get(key)
+            if entry is not None:
+                value, loaded_at, cost = entry
+                age = time.monotonic() - loaded_at
+                if age < self.ttl:
+                    self._stats['hits'] += 1
+                    self._stats['saved_seconds'] += cost
+                    return value
+                if age < self.ttl + self.stale_ttl:
+                    self._stats['stale_hits'] += 1
+                    self._stats['saved_seconds'] += cost
+                    if flight is None:
+                        flight = self._flights[key] = _Flight()
+                        threading.Thread(target=self._load, args=(key, loader, flight),
+                                         daemon=True).start()
+                    return value
+            if flight is not None:
+                self._stats['coalesced'] += 1
+                leader = False
+            else:
+                self._stats['misses'] += 1
+                flight = self._flights[key] = _Flight()
+                leader = True
+
+        if leader:
+            self._load(key, loader, flight)
+        else:
+            flight.done.wait()
+            if flight.error is None:
+                with self._lock:
+                    self._stats['saved_seconds'] += self._entries.get(key, (None, 0, 0))[2]
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        served = stats['hits'] + stats['stale_hits'] + stats['coalesced']
+        requests = served + stats['misses']
+        stats['hit_rate'] = round(served / requests, 4) if requests else 0.0
+        stats['query_seconds'] = round(stats['query_seconds'], 4)
+        stats['saved_seconds'] = round(stats['saved_seconds'], 4)
+        return stats
@@ -0,0 +1,208 @@
+"""
+EdGPT Platform - SQL Query Profiler
+Per-statement timings, row counts and EXPLAIN QUERY PLAN for slow queries
+
+With SQL_PROFILE=1, get_db_connection() returns a ProfiledConnection. Every
+statement is recorded under its normalized text (literals and IN lists
+collapsed) with call count, total and max time, and rows returned or
+changed. Time spent fetching rows counts towards the statement that
+produced them. The first time an execution exceeds SQL_SLOW_MS, the
+statement's EXPLAIN QUERY PLAN is captured and full table scans and
+temporary sort B-trees are flagged.
+
+When profiling is off, get_db_connection() returns a plain sqlite3
+connection, so the only cost is one boolean check per connection.
+
+Statistics are per worker process, like the query cache.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+
+SQL_PROFILE = os.environ.get('SQL_PROFILE', '0') == '1'
+SQL_SLOW_MS = float(os.environ.get('SQL_SLOW_MS', '50'))
+SLOW_LOG_SIZE = 100
+MAX_STATEMENT_TEXTS = 10000
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.I)
+WHITESPACE = re.compile(r'\s+')
+# "SCAN analytics" is a full table scan; "SCAN analytics USING INDEX ..." is not
+FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?!.*\bUSING\b)')
+EXPLAINABLE = ('SELECT', 'WITH', 'UPDATE', 'DELETE', 'INSERT')
+
+
+def normalize_sql(sql):
+    """Statement text with literals replaced by ? and whitespace collapsed"""
+    sql = STRING_LITERAL.sub('?', sql)
+    sql = NUMBER_LITERAL.sub('?', sql)
+    sql = IN_LIST.sub('IN (...)', sql)
+    return WHITESPACE.sub(' ', sql).strip()
+
+
+def analyze_plan(rows):
+    """(plan lines, tables scanned in full, uses a temp B-tree)"""
+    lines = [row[3] for row in rows]
+    full_scans = sorted({m.group(1) for m in (FULL_SCAN.match(line) for line in lines) if m})
+    temp_btree = any('TEMP B-TREE' in line for line in lines)
+    return lines, full_scans, temp_btree
+
+
+class QueryProfiler:
+    """Aggregated statement statistics and a log of recent slow executions"""
+
+    def __init__(self, slow_ms=SQL_SLOW_MS):
+        self.slow_ms = slow_ms
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._statements = {}
+        self._by_text = {}
+        self._slow = deque(maxlen=SLOW_LOG_SIZE)
+
+    def entry(self, sql):
+        # Raw statement text repeats, so normalize each distinct string once
+        entry = self._by_text.get(sql)
+        if entry is not None:
+            return entry
+        key = normalize_sql(sql)
+        with self._lock:
+            entry = self._statements.get(key)
+            if entry is None:
+                entry = self._statements[key] = {
+                    'sql': key, 'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0,
+                    'slow_calls': 0, 'plan': None, 'full_scans': [], 'temp_btree': False}
+            if len(self._by_text) < MAX_STATEMENT_TEXTS:
+                self._by_text[sql] = entry
+            return entry
+
+    def record(self, entry, elapsed_ms, rows, execution_ms, new_call):
+        with self._lock:
+            if new_call:
+                entry['calls'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['rows'] += rows
+            if execution_ms > entry['max_ms']:
+                entry['max_ms'] = execution_ms
+
+    def slow(self, conn, entry, sql, params, execution_ms):
+        """Note a slow execution; captures the query plan once per statement"""
+        if entry['plan'] is None and sql.lstrip().upper().startswith(EXPLAINABLE):
+            try:
+                rows = sqlite3.Connection.execute(conn, 'EXPLAIN QUERY PLAN ' + sql, params).fetchall()
+                plan, full_scans, temp_btree = analyze_plan(rows)
+            except sqlite3.Error as e:
+                plan, full_scans, temp_btree = [f'EXPLAIN failed: {e}'], [], False
+            with self._lock:
+                entry.update(plan=plan, full_scans=full_scans, temp_btree=temp_btree)
+        with self._lock:
+            entry['slow_calls'] += 1
+            self._slow.append({'sql': entry['sql'], 'ms': round(execution_ms, 2),
+                               'full_scans': entry['full_scans'], 'at': time.time()})
+
+    def report(self, limit=50):
+        """Statements by total time, plus recent slow executions"""
+        with self._lock:
+            statements = [dict(entry) for entry in self._statements.values()]
+            slow = list(self._slow)
+        statements.sort(key=lambda entry: entry['total_ms'], reverse=True)
+        for entry in statements:
+            entry['avg_ms'] = round(entry['total_ms'] / entry['calls'], 3) if entry['calls'] else 0.0
+            entry['total_ms'] = round(entry['total_ms'], 3)
+            entry['max_ms'] = round(entry['max_ms'], 3)
+        return {
+            'enabled': SQL_PROFILE,
+            'pid': os.getpid(),
+            'since': self.started_at,
+            'slow_ms': self.slow_ms,
+            'statements': statements[:limit],
+            'slow': slow[::-1],
+        }
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self._by_text.clear()
+            self._slow.clear()
+            self.started_at = time.time()
+
+
+profiler = QueryProfiler()
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor that times execute and fetch calls against the current statement"""
+
+    _entry = None
+
+    def _timed(self, call, sql=None, params=()):
+        start = time.perf_counter()
+        result = call()
+        elapsed = (time.perf_counter() - start) * 1000
+        if sql is not None:
+            self._entry = profiler.entry(sql)
+            self._sql, self._params, self._elapsed, self._flagged = sql, params, 0.0, False
+        return result, elapsed
+
+    def _account(self, elapsed, rows, new_call=False):
+        entry = self._entry
+        if entry is None:
+            return
+        self._elapsed += elapsed
+        profiler.record(entry, elapsed, rows, self._elapsed, new_call)
+        if not self._flagged and self._elapsed >= profiler.slow_ms:
+            self._flagged = True
+            profiler.slow(self.connection, entry, self._sql, self._params, self._elapsed)
+
+    def execute(self, sql, params=()):
+        _, elapsed = self._timed(lambda: super(ProfiledCursor, self).execute(sql, params), sql, params)
+        self._account(elapsed, max(self.rowcount, 0), new_call=True)
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        _, elapsed = self._timed(lambda: super(ProfiledCursor, self).executemany(sql, seq_of_params), sql)
+        self._account(elapsed, max(self.rowcount, 0), new_call=True)
+        return self
+
+    def fetchone(self):
+        row, elapsed = self._timed(super().fetchone)
+        self._account(elapsed, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows, elapsed = self._timed(lambda: super(ProfiledCursor, self).fetchmany(
+            self.arraysize if size is None else size))
+        self._account(elapsed, len(rows))
+        return rows
+
+    def fetchall(self):
+        rows, elapsed = self._timed(super().fetchall)
+        self._account(elapsed, len(rows))
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """sqlite3 connection whose statements are recorded by the profiler"""
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.cursor().executemany(sql, seq_of_params)
+
+
+def connect(database, **kwargs):
+    """sqlite3.connect, profiled when SQL_PROFILE is on"""
+    if SQL_PROFILE:
+        kwargs['factory'] = ProfiledConnection
+    return sqlite3.connect(database, **kwargs)
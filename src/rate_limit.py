@@ -0,0 +1,185 @@
+"""
+EdGPT Platform - Shared Rate Limiter
+Token-bucket rate limiting shared across gunicorn worker processes
+
+Buckets live in a small SQLite database (WAL, synchronous=OFF) next to the
+main database. Each check is a single UPSERT ... RETURNING statement, so the
+refill, the decrement and the allow/deny decision happen atomically under
+SQLite's write lock no matter which worker serves the request.
+"""
+
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from flask import g, jsonify, request
+
+RATE_LIMIT_DATABASE = os.environ.get('RATE_LIMIT_DATABASE', 'edgpt_ratelimit.db')
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', '1') == '1'
+
+# Endpoint class -> (requests, window seconds); mirrors docs/API_DOCUMENTATION.md
+RATE_LIMITS = {
+    'public': (100, 60),
+    'api': (60, 60),
+    'admin': (30, 60),
+    'auth': (20, 60),
+    'codegen': (10, 60),
+    # Page-view beacons and widget configs: several per page load, each cheap
+    'beacon': (600, 60),
+}
+
+# Bucket for Host headers that match no tenant; random hosts must not mint buckets
+UNKNOWN_TENANT = '*'
+
+# Paths that are never limited: load balancer probes, and static files and the
+# content-hashed widget runtime, which a page load fetches many of at once
+EXEMPT_PATHS = ('/health', '/health/live', '/health/ready')
+EXEMPT_PREFIXES = ('/static/', '/widget/v/')
+
+# Buckets idle this long are full again and can be dropped
+PRUNE_AFTER = 3600
+PRUNE_PROBABILITY = 0.001
+
+TOKEN_BUCKET_SQL = '''
+    INSERT INTO rate_buckets (bucket, tokens, updated_at, allowed)
+    VALUES (:bucket, :capacity - 1, :now, 1)
+    ON CONFLICT(bucket) DO UPDATE SET
+        tokens = CASE
+            WHEN MIN(:capacity, tokens + (:now - updated_at) * :rate) >= 1
+            THEN MIN(:capacity, tokens + (:now - updated_at) * :rate) - 1
+            ELSE MIN(:capacity, tokens + (:now - updated_at) * :rate)
+        END,
+        allowed = MIN(:capacity, tokens + (:now - updated_at) * :rate) >= 1,
+        updated_at = :now
+    RETURNING tokens, allowed
+'''
+
+
+def classify_endpoint(method, path):
+    """Map a request to one of the RATE_LIMITS endpoint classes"""
+    if path == '/api/generate-code':
+        return 'codegen'
+    if path == '/collect' or path.startswith('/widget/config/'):
+        return 'beacon'
+    if method == 'POST' and (path in ('/signup', '/login') or
+                             path.startswith(('/send-deletion-otp/', '/verify-deletion-otp/'))):
+        return 'auth'
+    if path.startswith('/admin') or path == '/api/analytics':
+        return 'admin'
+    if path.startswith('/api/'):
+        return 'api'
+    return 'public'
+
+
+def client_ip():
+    """Client address, trusting X-Real-IP only when proxied by local nginx"""
+    remote = request.remote_addr or ''
+    if remote in ('127.0.0.1', '::1'):
+        return request.headers.get('X-Real-IP', remote)
+    return remote
+
+
+class TokenBucketLimiter:
+    """Token buckets keyed by endpoint class, tenant and client IP"""
+
+    def __init__(self, path=RATE_LIMIT_DATABASE, limits=None):
+        self.path = path
+        self.limits = dict(limits or RATE_LIMITS)
+        self._local = threading.local()
+        conn = sqlite3.connect(path, timeout=5)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS rate_buckets (
+                    bucket TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    allowed BOOLEAN NOT NULL
+                ) WITHOUT ROWID
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self):
+        # Connections are opened lazily so none are inherited across a fork
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute('PRAGMA synchronous=OFF')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def hit(self, endpoint_class, domain, ip, now=None):
+        """Consume one token; returns (allowed, limit, remaining, reset_epoch, retry_after)"""
+        capacity, window = self.limits[endpoint_class]
+        rate = capacity / window
+        now = time.time() if now is None else now
+        bucket = f"{endpoint_class}:{domain}:{ip}"
+
+        conn = self._connect()
+        tokens, allowed = conn.execute(TOKEN_BUCKET_SQL, {
+            'bucket': bucket, 'capacity': capacity, 'rate': rate, 'now': now
+        }).fetchone()
+
+        if random.random() < PRUNE_PROBABILITY:
+            conn.execute('DELETE FROM rate_buckets WHERE updated_at < ?', (now - PRUNE_AFTER,))
+
+        reset = int(now + (capacity - tokens) / rate) + 1
+        retry_after = 0 if allowed else int((1 - tokens) / rate) + 1
+        return bool(allowed), capacity, int(tokens), reset, retry_after
+
+
+def register_rate_limiting(app, limiter=None, tenant_of=None):
+    """Enforce rate limits before each request and emit X-RateLimit-* headers
+
+    `tenant_of(host)` returns the tenant a Host header belongs to, or None;
+    every unknown host shares the UNKNOWN_TENANT bucket.
+    """
+    if not RATE_LIMIT_ENABLED:
+        return None
+    limiter = limiter or TokenBucketLimiter()
+
+    @app.before_request
+    def enforce_rate_limit():
+        if request.path in EXEMPT_PATHS or request.path.startswith(EXEMPT_PREFIXES):
+            return None
+        endpoint_class = classify_endpoint(request.method, request.path)
+        # The Host header is client-controlled: key on the resolved tenant, not the raw value
+        tenant = tenant_of(request.host) if tenant_of else None
+        domain = tenant.domain if tenant else UNKNOWN_TENANT
+        try:
+            allowed, limit, remaining, reset, retry_after = limiter.hit(endpoint_class, domain, client_ip())
+        except sqlite3.Error as e:
+            # Fail open: a locked limiter database must not take the site down
+            print(f"Rate limiter error: {e}")
+            return None
+
+        g.rate_limit = (limit, remaining, reset)
+        if not allowed:
+            response = jsonify({
+                'success': False,
+                'error': 'Rate limit exceeded',
+                'code': 'RATE_LIMIT_EXCEEDED',
+                'retry_after': retry_after
+            })
+            response.status_code = 429
+            response.headers['Retry-After'] = str(retry_after)
+            return response
+        return None
+
+    @app.after_request
+    def add_rate_limit_headers(response):
+        rate_limit = g.get('rate_limit')
+        if rate_limit:
+            limit, remaining, reset = rate_limit
+            response.headers['X-RateLimit-Limit'] = str(limit)
+            response.headers['X-RateLimit-Remaining'] = str(remaining)
+            response.headers['X-RateLimit-Reset'] = str(reset)
+        return response
+
+    return limiter
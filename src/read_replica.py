@@ -0,0 +1,157 @@
+"""
+EdGPT Platform - Reporting Snapshot
+Periodically refreshed read-only copy of the database for admin reports
+
+Admin aggregates scan the whole analytics table. Run against
+edgpt_platform.db, they compete with page-view inserts and signups for
+I/O and the page cache, and they hold read marks that stop WAL
+checkpoints, so the WAL and commit latency grow while a report runs.
+
+Reports instead read a snapshot copied with the sqlite3 backup API. The
+copy is taken in a single step: in WAL mode that is one read transaction,
+which never blocks writers. A stepped backup would restart every time a
+page view is committed mid-copy. The copy is written to a temporary file,
+switched to rollback journal mode and renamed over the previous snapshot.
+The snapshot file never changes in place, so readers open it with
+immutable=1 and take no locks at all.
+
+Web workers never copy the database. One `watch` process per host refreshes
+the snapshot every REPORTING_SNAPSHOT_INTERVAL seconds, and only when the
+database or its WAL changed since the last copy; otherwise it just marks the
+snapshot current. Refreshes hold an flock, so a manual `run` never
+overlaps the watcher. Workers see the new file on their next query, and
+connect() raises SnapshotNotReady until the first snapshot exists. Snapshot
+age is the file's mtime.
+
+Usage:
+    python src/read_replica.py run       # take a snapshot now
+    python src/read_replica.py watch     # refresh every REPORTING_SNAPSHOT_INTERVAL seconds
+    python src/read_replica.py status    # snapshot age
+"""
+
+import fcntl
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from query_profiler import connect as connect_db
+
+REPORTING_SNAPSHOT = os.environ.get('REPORTING_SNAPSHOT', 'edgpt_reporting.db')
+REPORTING_SNAPSHOT_INTERVAL = float(os.environ.get('REPORTING_SNAPSHOT_INTERVAL', '60'))
+
+
+class SnapshotNotReady(RuntimeError):
+    """No snapshot has been taken yet; `python src/read_replica.py watch` takes them"""
+
+
+class SnapshotReplica:
+    """Read-only reporting snapshot of a SQLite database"""
+
+    def __init__(self, database, path=REPORTING_SNAPSHOT, interval=REPORTING_SNAPSHOT_INTERVAL):
+        self.database = database
+        self.path = path
+        self.interval = interval
+        self._refresh_lock = threading.Lock()
+        self.stats = {'refreshes': 0, 'last_refresh_seconds': None}
+
+    def taken_at(self):
+        """Wall-clock time of the current snapshot, or None if there is none"""
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def age(self):
+        taken_at = self.taken_at()
+        return None if taken_at is None else max(time.time() - taken_at, 0.0)
+
+    def source_signature(self):
+        """(mtime, size) of the database and its WAL; any commit changes it"""
+        signature = []
+        for path in (self.database, self.database + '-wal'):
+            try:
+                stat = os.stat(path)
+                signature.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+            except OSError:
+                signature.append('-')
+        return ' '.join(signature)
+
+    def refresh(self, force=False):
+        """Copy the database into a new snapshot if it is due and the database changed"""
+        with self._refresh_lock, open(self.path + '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            age = self.age()
+            if not force and age is not None and age < self.interval:
+                return False
+            signature = self.source_signature()
+            if not force and age is not None and signature == self._copied_signature():
+                # Nothing committed since the last copy: the snapshot is still current
+                os.utime(self.path)
+                return False
+            start = time.perf_counter()
+            tmp = f'{self.path}.{os.getpid()}.tmp'
+            source = sqlite3.connect(self.database, timeout=30)
+            target = sqlite3.connect(tmp)
+            try:
+                source.backup(target)
+                target.execute('PRAGMA journal_mode=DELETE')
+            finally:
+                target.close()
+                source.close()
+            os.replace(tmp, self.path)
+            with open(self.path + '.source', 'w') as f:
+                f.write(signature)
+            self.stats['refreshes'] += 1
+            self.stats['last_refresh_seconds'] = round(time.perf_counter() - start, 3)
+            return True
+
+    def _copied_signature(self):
+        try:
+            with open(self.path + '.source') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def connect(self):
+        """Read-only connection to the snapshot; raises SnapshotNotReady before the first one"""
+        if self.taken_at() is None:
+            raise SnapshotNotReady('Reporting snapshot has not been taken yet, try again shortly')
+        conn = connect_db(f'file:{self.path}?mode=ro&immutable=1', uri=True)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def status(self):
+        age = self.age()
+        return {'snapshot_age_s': None if age is None else round(age, 1),
+                'refresh_interval_s': self.interval, **self.stats}
+
+    def watch(self):
+        """Refresh forever; run one per host"""
+        while True:
+            try:
+                if self.refresh():
+                    print(f"Reporting snapshot refreshed in {self.stats['last_refresh_seconds']}s")
+            except (OSError, sqlite3.Error) as e:
+                print(f"Reporting snapshot refresh error: {e}")
+            age = self.age()
+            time.sleep(max(self.interval - (age or 0.0), 1.0))
+
+
+if __name__ == '__main__':
+    database = os.environ.get('DATABASE', 'edgpt_platform.db')
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    replica = SnapshotReplica(database)
+    if command == 'run':
+        replica.refresh(force=True)
+        print(f"✅ {replica.path} taken in {replica.stats['last_refresh_seconds']}s")
+    elif command == 'watch':
+        replica.watch()
+    elif command == 'status':
+        age = replica.age()
+        print(f"{replica.path}: " + ('no snapshot yet' if age is None else f"{age:.0f}s old") +
+              f", refreshed every {replica.interval:.0f}s")
+    else:
+        print(__doc__)
+        sys.exit(1)
@@ -0,0 +1,245 @@
+"""
+EdGPT Platform - Server-Side Sessions
+SQLite session store shared by every gunicorn worker
+
+Flask's default cookie sessions are only valid for the worker whose random
+secret signed them. Here the cookie carries just a signed session id. The
+session data itself lives in a WAL-mode SQLite database, so any worker can
+serve any user.
+
+- Each worker keeps a small read-through cache (CACHE_TTL seconds) so
+  repeated requests in one page load do not hit SQLite.
+- Sliding expiry is refreshed lazily, at most once per REFRESH_INTERVAL.
+- A daemon thread in each worker deletes expired rows every SWEEP_INTERVAL.
+- When the signed-in identity (IDENTITY_KEY) changes, e.g. at login, the
+  session gets a new id and the old row is deleted, so an id planted
+  before login is worthless afterwards.
+
+The signing key comes from SECRET_KEY. Without it, a random key is stored
+once in the session database so all workers still agree on it.
+"""
+
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+SESSION_DATABASE = os.environ.get('SESSION_DATABASE', 'edgpt_sessions.db')
+SESSION_LIFETIME = int(os.environ.get('SESSION_LIFETIME', str(7 * 24 * 3600)))
+REFRESH_INTERVAL = 300
+SWEEP_INTERVAL = 600
+CACHE_TTL = 5
+CACHE_SIZE = 10000
+# Session key naming the signed-in user; a change rotates the session id
+IDENTITY_KEY = 'user_id'
+
+serializer = TaggedJSONSerializer()
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """Session dict that remembers its id and whether it was changed"""
+
+    def __init__(self, initial=None, sid=None, new=False, expires_at=0):
+        def on_update(self):
+            self.modified = True
+            self.accessed = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.expires_at = expires_at
+        self.loaded_identity = self.get(IDENTITY_KEY)
+        self.modified = False
+        self.accessed = False
+
+
+class SessionStore:
+    """sessions table in its own WAL database, one connection per thread"""
+
+    def __init__(self, path=SESSION_DATABASE):
+        self.path = path
+        self._local = threading.local()
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._sweeper_pid = None
+        conn = sqlite3.connect(path, timeout=5)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS sessions (
+                    sid TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                ) WITHOUT ROWID
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at)')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS session_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self):
+        # Connections are opened lazily so none are inherited across a fork
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def shared_secret(self):
+        """Random signing key generated once and shared through the database"""
+        conn = self._connect()
+        conn.execute('INSERT OR IGNORE INTO session_meta (key, value) VALUES (?, ?)',
+                     ('secret_key', secrets.token_hex(32)))
+        return conn.execute("SELECT value FROM session_meta WHERE key = 'secret_key'").fetchone()[0]
+
+    def _cache_put(self, sid, entry):
+        with self._cache_lock:
+            self._cache[sid] = entry
+            self._cache.move_to_end(sid)
+            while len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def load(self, sid, now):
+        """(data, expires_at) for a live session, or None"""
+        with self._cache_lock:
+            entry = self._cache.get(sid)
+        if entry is not None and entry[0] > now:
+            _, data, expires_at = entry
+        else:
+            row = self._connect().execute(
+                'SELECT data, expires_at FROM sessions WHERE sid = ?', (sid,)).fetchone()
+            if row is None:
+                with self._cache_lock:
+                    self._cache.pop(sid, None)
+                return None
+            data, expires_at = row
+            self._cache_put(sid, (now + CACHE_TTL, data, expires_at))
+        if expires_at <= now:
+            return None
+        return data, expires_at
+
+    def save(self, sid, data, expires_at, now):
+        self._connect().execute('''
+            INSERT INTO sessions (sid, data, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT(sid) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at
+        ''', (sid, data, expires_at))
+        self._cache_put(sid, (now + CACHE_TTL, data, expires_at))
+
+    def touch(self, sid, data, expires_at, now):
+        """Extend a session's expiry without rewriting its data"""
+        self._connect().execute('UPDATE sessions SET expires_at = ? WHERE sid = ?', (expires_at, sid))
+        self._cache_put(sid, (now + CACHE_TTL, data, expires_at))
+
+    def delete(self, sid):
+        self._connect().execute('DELETE FROM sessions WHERE sid = ?', (sid,))
+        with self._cache_lock:
+            self._cache.pop(sid, None)
+
+    def sweep(self, now=None):
+        """Delete expired sessions; returns rows removed"""
+        now = time.time() if now is None else now
+        return self._connect().execute('DELETE FROM sessions WHERE expires_at <= ?', (now,)).rowcount
+
+    def start_sweeper(self):
+        """Start the expiry sweeper once per worker process"""
+        if self._sweeper_pid == os.getpid():
+            return
+        self._sweeper_pid = os.getpid()
+
+        def run():
+            while True:
+                time.sleep(SWEEP_INTERVAL)
+                try:
+                    self.sweep()
+                except sqlite3.Error as e:
+                    print(f"Session sweep error: {e}")
+
+        threading.Thread(target=run, name='session-sweeper', daemon=True).start()
+
+
+class SQLiteSessionInterface(SessionInterface):
+    """Signed session id cookie backed by SessionStore"""
+
+    session_class = ServerSideSession
+
+    def __init__(self, store, lifetime=SESSION_LIFETIME):
+        self.store = store
+        self.lifetime = lifetime
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt='edgpt-session')
+
+    def open_session(self, app, request):
+        self.store.start_sweeper()
+        now = time.time()
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid = self._signer(app).unsign(cookie).decode('ascii')
+            except BadSignature:
+                sid = None
+            loaded = self.store.load(sid, now) if sid else None
+            if loaded:
+                data, expires_at = loaded
+                return self.session_class(serializer.loads(data), sid=sid, expires_at=expires_at)
+        return self.session_class(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        now = time.time()
+        expires_at = now + self.lifetime
+        if not session.new and session.get(IDENTITY_KEY) != session.loaded_identity:
+            # Login or user switch: never keep a session id that existed before it
+            self.store.delete(session.sid)
+            session.sid = secrets.token_urlsafe(32)
+            session.modified = True
+        if session.modified or session.new:
+            self.store.save(session.sid, serializer.dumps(dict(session)), expires_at, now)
+        elif session.expires_at - now < self.lifetime - REFRESH_INTERVAL:
+            # Lazy sliding expiry: at most one write per session per interval
+            self.store.touch(session.sid, serializer.dumps(dict(session)), expires_at, now)
+        else:
+            return
+
+        response.set_cookie(
+            name, self._signer(app).sign(session.sid).decode('ascii'),
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app), domain=domain, path=path,
+            secure=self.get_cookie_secure(app), samesite=self.get_cookie_samesite(app))
+
+
+def register_sessions(app, store=None):
+    """Use the shared SQLite session store; signing key from SECRET_KEY"""
+    store = store or SessionStore()
+    secret_key = os.environ.get('SECRET_KEY')
+    if not secret_key:
+        print("⚠️ SECRET_KEY is not set; using a generated key stored in the session database")
+        secret_key = store.shared_secret()
+    app.secret_key = secret_key
+    app.session_interface = SQLiteSessionInterface(store)
+    return store
@@ -0,0 +1,84 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const conversionId = document.getElementById('conversionId').value;
+
+    // Fetch conversion data
+    fetch(`/api/conversion-status/${conversionId}`)
+        .then(response => response.json())
+        .then(data => {
+            // Update school information
+            if (data.data && data.data.school_name) {
+                document.getElementById('schoolName').textContent = data.data.school_name;
+            }
+
+            if (data.data && data.data.website_url) {
+                document.getElementById('websiteUrl').textContent = data.data.website_url;
+            }
+
+            if (data.site_info && data.site_info.pages) {
+                document.getElementById('pagesProcessed').textContent = data.site_info.pages;
+            }
+        })
+        .catch(error => {
+            console.error('Error fetching conversion data:', error);
+        });
+
+    // Handle form submission
+    const form = document.getElementById('accountForm');
+    const submitBtn = document.getElementById('submitBtn');
+    const submitSpinner = document.getElementById('submitSpinner');
+
+    form.addEventListener('submit', function(e) {
+        e.preventDefault();
+
+        const username = document.getElementById('username').value;
+        const password = document.getElementById('password').value;
+        const confirmPassword = document.getElementById('confirmPassword').value;
+
+        // Validate inputs
+        if (!username || !password) {
+            alert('Please fill in all required fields');
+            return;
+        }
+
+        if (password !== confirmPassword) {
+            alert('Passwords do not match');
+            return;
+        }
+
+        // Disable button and show spinner
+        submitBtn.disabled = true;
+        submitSpinner.style.display = 'inline-block';
+
+        // Submit account creation request
+        fetch('/api/create-account', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                conversion_id: conversionId,
+                username: username,
+                password: password
+            })
+        })
+        .then(response => response.json())
+        .then(result => {
+            if (result.success) {
+                // Redirect to GPTsite
+                window.location.href = `/gptsite/${conversionId}`;
+            } else {
+                // Show error message
+                alert('Error creating account: ' + (result.message || 'Unknown error'));
+                submitBtn.disabled = false;
+                submitSpinner.style.display = 'none';
+            }
+        })
+        .catch(error => {
+            console.error('Error creating account:', error);
+            alert('An error occurred. Please try again.');
+            submitBtn.disabled = false;
+            submitSpinner.style.display = 'none';
+        });
+    });
+});
+
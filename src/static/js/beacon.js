@@ -0,0 +1,10 @@
+// Page view beacon: analytics are recorded by POST /collect so the page itself can be cached
+(function () {
+    var payload = JSON.stringify({ path: window.location.pathname });
+    if (navigator.sendBeacon && navigator.sendBeacon('/collect', payload)) {
+        return;
+    }
+    if (window.fetch) {
+        fetch('/collect', { method: 'POST', body: payload, keepalive: true, credentials: 'omit' });
+    }
+})();
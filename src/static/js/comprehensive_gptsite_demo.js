@@ -0,0 +1,381 @@
+let voiceEnabled = false;
+let isListening = false;
+let recognition = null;
+let synthesis = window.speechSynthesis;
+
+// Initialize speech recognition if available
+if ('webkitSpeechRecognition' in window || 'SpeechRecognition' in window) {
+    const SpeechRecognition = window.SpeechRecognition || window.webkitSpeechRecognition;
+    recognition = new SpeechRecognition();
+    recognition.continuous = false;
+    recognition.interimResults = false;
+    recognition.lang = 'en-US';
+
+    recognition.onresult = function(event) {
+        const transcript = event.results[0][0].transcript;
+        document.getElementById('chatInput').value = transcript;
+        sendMessage();
+    };
+
+    recognition.onend = function() {
+        isListening = false;
+        document.getElementById('voiceBtn').classList.remove('listening');
+    };
+}
+
+function toggleVoice() {
+    voiceEnabled = !voiceEnabled;
+    const toggle = document.getElementById('voiceToggle');
+    const status = document.getElementById('voiceStatus');
+
+    if (voiceEnabled) {
+        toggle.textContent = '🔇 Disable Voice Conversation';
+        toggle.classList.add('active');
+        status.textContent = 'Voice conversation enabled - EdGPT will speak responses to your voice queries';
+    } else {
+        toggle.textContent = '🎤 Enable Voice Conversation';
+        toggle.classList.remove('active');
+        status.textContent = 'Professional American female voice will respond to your spoken queries';
+    }
+}
+
+function toggleVoiceInput() {
+    if (!recognition) {
+        alert('Speech recognition is not supported in your browser');
+        return;
+    }
+
+    if (isListening) {
+        recognition.stop();
+        isListening = false;
+        document.getElementById('voiceBtn').classList.remove('listening');
+    } else {
+        recognition.start();
+        isListening = true;
+        document.getElementById('voiceBtn').classList.add('listening');
+    }
+}
+
+function handleKeyPress(event) {
+    if (event.key === 'Enter') {
+        sendMessage();
+    }
+}
+
+function sendQuickMessage(type) {
+    const messages = {
+        'enrollment': 'I need help with student enrollment',
+        'school hours': 'What are the school hours?',
+        'forms': 'What forms are available?',
+        'events': 'What events are coming up?',
+        'lunch menu': 'What\'s on the lunch menu today?',
+        'contact staff': 'I need to contact a staff member'
+    };
+
+    const message = messages[type] || type;
+    document.getElementById('chatInput').value = message;
+    sendMessage();
+}
+
+function sendMessage() {
+    const input = document.getElementById('chatInput');
+    const message = input.value.trim();
+
+    if (!message) return;
+
+    // Add user message
+    addMessage(message, 'user');
+    input.value = '';
+
+    // Show typing indicator
+    showTypingIndicator();
+
+    // Simulate API call delay
+    setTimeout(() => {
+        hideTypingIndicator();
+        handleResponse(message);
+    }, 1500);
+}
+
+function addMessage(content, sender) {
+    const messagesContainer = document.getElementById('chatMessages');
+    const messageDiv = document.createElement('div');
+    messageDiv.className = `message ${sender}`;
+
+    const avatar = sender === 'user' ? '👤' : '🤖';
+
+    messageDiv.innerHTML = `
+        <div class="message-avatar">${avatar}</div>
+        <div class="message-content">${content}</div>
+    `;
+
+    messagesContainer.appendChild(messageDiv);
+    messagesContainer.scrollTop = messagesContainer.scrollHeight;
+}
+
+function showTypingIndicator() {
+    document.getElementById('typingIndicator').style.display = 'block';
+    const messagesContainer = document.getElementById('chatMessages');
+    messagesContainer.scrollTop = messagesContainer.scrollHeight;
+}
+
+function hideTypingIndicator() {
+    document.getElementById('typingIndicator').style.display = 'none';
+}
+
+function handleResponse(message) {
+    const messageLower = message.toLowerCase();
+    let response = "Thank you for your question! I'm EdGPT, your school's intelligent assistant. I can help you with enrollment forms, permission slips, staff contacts, school information, and much more. I can also connect you directly with our staff for personalized assistance. How can I help you today?";
+    let showForm = false;
+    let formType = '';
+
+    // Enhanced responses with form integration
+    if (messageLower.includes('enrollment') || messageLower.includes('enroll')) {
+        response = "I'd be happy to help you with enrollment! I can provide you with our enrollment form right here. Would you like me to show you the enrollment application form? I can also connect you with our admissions office for personalized assistance.";
+        showForm = true;
+        formType = 'enrollment';
+    } else if (messageLower.includes('form') || messageLower.includes('forms')) {
+        response = "I can help you access all the forms you need! EdGPT has integrated forms for enrollment, field trip permissions, lunch applications, transportation requests, and more. Which specific form are you looking for?";
+    } else if (messageLower.includes('field trip') || messageLower.includes('permission')) {
+        response = "I can help you with field trip permission forms! Our upcoming Science Museum trip on March 15th needs permission slips. Would you like me to show you the permission form?";
+        showForm = true;
+        formType = 'field_trip';
+    } else if (messageLower.includes('lunch') && messageLower.includes('application')) {
+        response = "I can help you with our lunch program application! Would you like me to show you the free/reduced lunch application form?";
+        showForm = true;
+        formType = 'lunch_application';
+    } else if (messageLower.includes('school hours') || messageLower.includes('hours')) {
+        response = "Our school hours are Monday-Friday, 8:00 AM to 3:30 PM. Early drop-off is available starting at 7:30 AM for working parents, and our after-school care program extends until 6:00 PM.";
+    } else if (messageLower.includes('lunch menu') || messageLower.includes('menu')) {
+        response = "Today's lunch features grilled chicken with rice, fresh vegetables, and fruit. We also have vegetarian options. All meals meet USDA nutrition standards. Would you like me to show you our lunch application form?";
+    } else if (messageLower.includes('events') || messageLower.includes('calendar')) {
+        response = "Upcoming events include Parent-Teacher Conferences (March 15-17), Spring Science Fair (March 22), and Field Day (April 5). I can also show you permission forms for upcoming field trips.";
+    } else if (messageLower.includes('staff') || messageLower.includes('contact')) {
+        response = "Our dedicated staff includes Principal Johnson and 24 certified teachers. I can connect you directly with any staff member through our message system. Who would you like to reach?";
+    } else if (messageLower.includes('safety') || messageLower.includes('emergency')) {
+        response = "Student safety is our top priority. We have secure entry systems and regular safety drills. I can provide you with our complete safety handbook and emergency procedures.";
+    } else if (messageLower.includes('transportation') || messageLower.includes('bus')) {
+        response = "We provide bus transportation for students living more than 1 mile from school. Would you like me to show you our transportation request form?";
+    } else if (messageLower.includes('volunteer')) {
+        response = "We welcome parent volunteers! I can provide you with our volunteer application form and background check requirements right here.";
+    }
+
+    addMessage(response, 'assistant');
+
+    // Speak response if voice is enabled and this was a voice query
+    if (voiceEnabled && isListening) {
+        speakResponse(response);
+    }
+
+    // Show form if applicable
+    if (showForm) {
+        setTimeout(() => {
+            showForm(formType);
+        }, 1000);
+    }
+}
+
+function speakResponse(text) {
+    if (synthesis) {
+        // Cancel any ongoing speech
+        synthesis.cancel();
+
+        const utterance = new SpeechSynthesisUtterance(text);
+
+        // Try to use a female voice
+        const voices = synthesis.getVoices();
+        const femaleVoice = voices.find(voice =>
+            voice.name.includes('Female') ||
+            voice.name.includes('Zira') ||
+            voice.name.includes('Samantha') ||
+            voice.gender === 'female'
+        );
+
+        if (femaleVoice) {
+            utterance.voice = femaleVoice;
+        }
+
+        utterance.rate = 0.9;
+        utterance.pitch = 1.1;
+        utterance.volume = 0.8;
+
+        synthesis.speak(utterance);
+    }
+}
+
+function showForm(formType) {
+    // Get form data from API
+    fetch(`/api/get_form/${formType}`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                displayForm(data.form);
+            } else {
+                alert('Form not available at the moment');
+            }
+        })
+        .catch(error => {
+            console.error('Error loading form:', error);
+            alert('Error loading form');
+        });
+}
+
+function displayForm(form) {
+    document.getElementById('formTitle').textContent = form.name;
+
+    const fieldsContainer = document.getElementById('formFields');
+    fieldsContainer.innerHTML = '';
+
+    // Add form description
+    if (form.description) {
+        const description = document.createElement('p');
+        description.style.marginBottom = '20px';
+        description.style.color = '#718096';
+        description.textContent = form.description;
+        fieldsContainer.appendChild(description);
+    }
+
+    // Add form fields
+    form.fields.forEach(field => {
+        const fieldDiv = document.createElement('div');
+        fieldDiv.className = 'form-field';
+
+        const label = document.createElement('label');
+        label.textContent = field.label + (field.required ? ' *' : '');
+        fieldDiv.appendChild(label);
+
+        let input;
+        if (field.type === 'select') {
+            input = document.createElement('select');
+            field.options.forEach(option => {
+                const optionElement = document.createElement('option');
+                optionElement.value = option;
+                optionElement.textContent = option;
+                input.appendChild(optionElement);
+            });
+        } else if (field.type === 'textarea') {
+            input = document.createElement('textarea');
+        } else if (field.type === 'radio') {
+            const radioContainer = document.createElement('div');
+            field.options.forEach(option => {
+                const radioDiv = document.createElement('div');
+                radioDiv.style.marginBottom = '8px';
+
+                const radioInput = document.createElement('input');
+                radioInput.type = 'radio';
+                radioInput.name = field.name;
+                radioInput.value = option;
+                radioInput.id = `${field.name}_${option}`;
+
+                const radioLabel = document.createElement('label');
+                radioLabel.htmlFor = radioInput.id;
+                radioLabel.textContent = option;
+                radioLabel.style.marginLeft = '8px';
+
+                radioDiv.appendChild(radioInput);
+                radioDiv.appendChild(radioLabel);
+                radioContainer.appendChild(radioDiv);
+            });
+            fieldDiv.appendChild(radioContainer);
+            fieldsContainer.appendChild(fieldDiv);
+            return;
+        } else {
+            input = document.createElement('input');
+            input.type = field.type;
+        }
+
+        input.name = field.name;
+        input.required = field.required;
+
+        if (field.placeholder) {
+            input.placeholder = field.placeholder;
+        }
+
+        if (field.value) {
+            input.value = field.value;
+        }
+
+        if (field.readonly) {
+            input.readOnly = true;
+            input.style.backgroundColor = '#f7fafc';
+        }
+
+        fieldDiv.appendChild(input);
+        fieldsContainer.appendChild(fieldDiv);
+    });
+
+    // Add submit button
+    const submitBtn = document.createElement('button');
+    submitBtn.className = 'form-submit';
+    submitBtn.textContent = 'Submit Form';
+    submitBtn.onclick = () => submitForm(form.name);
+    fieldsContainer.appendChild(submitBtn);
+
+    // Show modal
+    document.getElementById('formModal').style.display = 'flex';
+}
+
+function closeForm() {
+    document.getElementById('formModal').style.display = 'none';
+}
+
+function submitForm(formName) {
+    const formData = {};
+    const inputs = document.querySelectorAll('#formFields input, #formFields select, #formFields textarea');
+
+    inputs.forEach(input => {
+        if (input.type === 'radio') {
+            if (input.checked) {
+                formData[input.name] = input.value;
+            }
+        } else {
+            formData[input.name] = input.value;
+        }
+    });
+
+    // Submit form data
+    fetch('/api/submit_form', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+            form_name: formName,
+            form_data: formData,
+            submitter_info: {
+                name: formData.parent_name || formData.student_name || 'Demo User',
+                email: formData.parent_email || formData.email || 'demo@example.com',
+                phone: formData.parent_phone || formData.phone || ''
+            }
+        })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            alert(data.message);
+            closeForm();
+            addMessage(`Great! Your ${formName} has been submitted successfully. You'll receive a confirmation email shortly.`, 'assistant');
+        } else {
+            alert('Error submitting form: ' + data.message);
+        }
+    })
+    .catch(error => {
+        console.error('Error submitting form:', error);
+        alert('Error submitting form');
+    });
+}
+
+// Close modal when clicking outside
+document.getElementById('formModal').addEventListener('click', function(e) {
+    if (e.target === this) {
+        closeForm();
+    }
+});
+
+// Load voices when available
+if (synthesis) {
+    synthesis.onvoiceschanged = function() {
+        // Voices are now loaded
+    };
+}
+
@@ -0,0 +1,52 @@
+function selectPlan(planId, paymentType) {
+    const modal = document.getElementById('paymentModal');
+    const modalContent = document.getElementById('modalContent');
+    const confirmButton = document.getElementById('confirmButton');
+
+    if (paymentType === 'card') {
+        modalContent.innerHTML = `
+            <p class="text-gray-700 mb-4">You'll be redirected to our secure payment processor to complete your subscription.</p>
+            <div class="bg-green-50 p-4 rounded-lg">
+                <p class="text-green-800 text-sm">✅ Secure payment processing</p>
+                <p class="text-green-800 text-sm">✅ Instant activation</p>
+                <p class="text-green-800 text-sm">✅ 30-day money-back guarantee</p>
+            </div>
+        `;
+        confirmButton.textContent = 'Continue to Payment';
+        confirmButton.onclick = () => {
+            // Redirect to Stripe payment link
+            window.location.href = `/payment/stripe/${planId}`;
+        };
+    } else {
+        modalContent.innerHTML = `
+            <p class="text-gray-700 mb-4">We'll generate an invoice for your school's accounting department.</p>
+            <div class="bg-blue-50 p-4 rounded-lg">
+                <p class="text-blue-800 text-sm">📄 Professional invoice generated</p>
+                <p class="text-blue-800 text-sm">💼 Perfect for purchase orders</p>
+                <p class="text-blue-800 text-sm">📧 Sent to your email within 24 hours</p>
+            </div>
+        `;
+        confirmButton.textContent = 'Request Invoice';
+        confirmButton.onclick = () => {
+            // Redirect to invoice request
+            window.location.href = `/invoice/request/${planId}`;
+        };
+    }
+
+    modal.classList.remove('hidden');
+    modal.classList.add('flex');
+}
+
+function closeModal() {
+    const modal = document.getElementById('paymentModal');
+    modal.classList.add('hidden');
+    modal.classList.remove('flex');
+}
+
+// Close modal on outside click
+document.getElementById('paymentModal').addEventListener('click', function(e) {
+    if (e.target === this) {
+        closeModal();
+    }
+});
+
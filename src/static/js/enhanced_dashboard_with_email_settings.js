@@ -0,0 +1,74 @@
+function updateEmailSetting(toggleId, setting) {
+    const toggle = document.getElementById(toggleId);
+    toggle.classList.toggle('active');
+
+    // Send AJAX request to update setting
+    fetch('/api/update-email-settings', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+            [setting]: toggle.classList.contains('active')
+        })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (!data.success) {
+            throw new Error(data.error || 'Update failed');
+        }
+        showSuccessMessage();
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        // Revert toggle on error
+        toggle.classList.toggle('active');
+    });
+}
+
+function toggleDailyEmail() {
+    updateEmailSetting('daily-email-toggle', 'daily_email_enabled');
+}
+
+function toggleWeeklyReport() {
+    updateEmailSetting('weekly-report-toggle', 'weekly_report_enabled');
+}
+
+function toggleTrialReminder() {
+    updateEmailSetting('trial-reminder-toggle', 'trial_reminder_enabled');
+}
+
+function showSuccessMessage() {
+    const message = document.getElementById('success-message');
+    message.style.display = 'block';
+    setTimeout(() => {
+        message.style.display = 'none';
+    }, 3000);
+}
+
+function selectPlan(planType) {
+    // Redirect to payment page or show payment modal
+    window.location.href = `/payment?plan=${planType}`;
+}
+
+// Initialize toggles based on user preferences
+document.addEventListener('DOMContentLoaded', function() {
+    // Load user preferences and set toggle states
+    fetch('/api/get-email-settings')
+        .then(response => response.json())
+        .then(data => {
+            if (!data.daily_email_enabled) {
+                document.getElementById('daily-email-toggle').classList.remove('active');
+            }
+            if (!data.weekly_report_enabled) {
+                document.getElementById('weekly-report-toggle').classList.remove('active');
+            }
+            if (!data.trial_reminder_enabled) {
+                document.getElementById('trial-reminder-toggle').classList.remove('active');
+            }
+        })
+        .catch(error => {
+            console.error('Error loading settings:', error);
+        });
+});
+
@@ -0,0 +1,127 @@
+let currentSlideIndex = 0;
+let chatDemoStarted = false;
+let questionCount = 0;
+const maxQuestions = 4;
+
+const demoData = {
+    greeting: "Hi! Welcome to Riverside Elementary School. I'm your EdGPT receptionist. How may I help you find what you're looking for?",
+    questions: [
+        "What are your school hours?",
+        "How do I enroll my child?",
+        "What's for lunch today?",
+        "When is the next parent meeting?"
+    ],
+    answers: [
+        "Our school hours are 8:00 AM to 3:00 PM, Monday through Friday. Early drop-off is available starting at 7:30 AM.",
+        "To enroll your child, please visit our main office with your child's birth certificate, immunization records, and proof of residence. We're open for enrollment Monday-Friday 8 AM to 4 PM.",
+        "Today's lunch menu includes chicken nuggets, fresh fruit, vegetables, and milk. You can view the full weekly menu on our website or nutrition page.",
+        "Our next parent meeting is scheduled for Thursday, March 15th at 6:30 PM in the school auditorium. We'll be discussing the upcoming spring activities and fundraising events."
+    ]
+};
+
+function scrollToDemo() {
+    document.getElementById('demo').scrollIntoView({ behavior: 'smooth' });
+}
+
+function changeSlide(direction) {
+    const slides = document.querySelectorAll('.slide');
+    const indicators = document.querySelectorAll('.indicator');
+
+    slides[currentSlideIndex].classList.remove('active');
+    indicators[currentSlideIndex].classList.remove('active');
+
+    currentSlideIndex += direction;
+
+    if (currentSlideIndex >= slides.length) {
+        currentSlideIndex = 0;
+    } else if (currentSlideIndex < 0) {
+        currentSlideIndex = slides.length - 1;
+    }
+
+    slides[currentSlideIndex].classList.add('active');
+    indicators[currentSlideIndex].classList.add('active');
+}
+
+function currentSlide(index) {
+    const slides = document.querySelectorAll('.slide');
+    const indicators = document.querySelectorAll('.indicator');
+
+    slides[currentSlideIndex].classList.remove('active');
+    indicators[currentSlideIndex].classList.remove('active');
+
+    currentSlideIndex = index - 1;
+
+    slides[currentSlideIndex].classList.add('active');
+    indicators[currentSlideIndex].classList.add('active');
+}
+
+function startChatDemo() {
+    if (chatDemoStarted) return;
+
+    chatDemoStarted = true;
+    const messagesContainer = document.getElementById('chatMessages');
+    const questionButtons = document.getElementById('questionButtons');
+
+    messagesContainer.innerHTML = '';
+
+    // Add AI greeting
+    setTimeout(() => {
+        addMessage(demoData.greeting, 'ai');
+        questionButtons.style.display = 'grid';
+    }, 500);
+}
+
+function addMessage(text, sender) {
+    const messagesContainer = document.getElementById('chatMessages');
+    const messageDiv = document.createElement('div');
+    messageDiv.className = `message ${sender}`;
+
+    const bubbleDiv = document.createElement('div');
+    bubbleDiv.className = 'message-bubble';
+    bubbleDiv.textContent = text;
+
+    messageDiv.appendChild(bubbleDiv);
+    messagesContainer.appendChild(messageDiv);
+    messagesContainer.scrollTop = messagesContainer.scrollHeight;
+}
+
+function askQuestion(index) {
+    if (questionCount >= maxQuestions) return;
+
+    const question = demoData.questions[index];
+    const answer = demoData.answers[index];
+
+    // Add user question
+    addMessage(question, 'user');
+
+    // Add AI response after delay
+    setTimeout(() => {
+        addMessage(answer, 'ai');
+        questionCount++;
+
+        // After 4 questions, show final CTA
+        if (questionCount >= maxQuestions) {
+            setTimeout(() => {
+                addMessage("I hope this demo shows how EdGPT can help your school! Ready to see how your school's website would look as an intelligent EdGPT?", 'ai');
+
+                // Add CTA button
+                setTimeout(() => {
+                    const messagesContainer = document.getElementById('chatMessages');
+                    const ctaDiv = document.createElement('div');
+                    ctaDiv.className = 'text-center mt-4';
+                    ctaDiv.innerHTML = '<a href="/signup" class="bg-blue-600 text-white px-6 py-3 rounded-full font-semibold hover:bg-blue-700 transition duration-300">🚀 Transform My School Now</a>';
+                    messagesContainer.appendChild(ctaDiv);
+                    messagesContainer.scrollTop = messagesContainer.scrollHeight;
+                }, 1000);
+            }, 2000);
+        }
+    }, 1500);
+}
+
+// Auto-advance slideshow
+setInterval(() => {
+    if (currentSlideIndex !== 3) { // Don't auto-advance on chat demo slide
+        changeSlide(1);
+    }
+}, 8000);
+
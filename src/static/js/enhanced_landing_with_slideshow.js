@@ -0,0 +1,199 @@
+// Domain-specific chat demo configuration for EdGPT
+const DOMAIN_CHAT_CONFIG = {
+    'edgpt.ai': {
+        title: 'Experience Your EdGPT',
+        subtitle: 'See how parents interact with your intelligent school site',
+        primaryColor: '#667eea',
+        secondaryColor: '#764ba2',
+        ctaText: 'See How Your School Looks as an EdGPT',
+        conversations: [
+            {
+                user: "What time does school start tomorrow?",
+                ai: "School starts at 8:00 AM tomorrow. The doors open at 7:45 AM for early arrival. Would you like me to send you our daily schedule?",
+                delay: 1500
+            },
+            {
+                user: "What's for lunch today?",
+                ai: "Today's lunch menu includes pizza, garden salad, fresh fruit, and milk. We also have a vegetarian option available. Would you like to see the full weekly menu?",
+                delay: 1800
+            },
+            {
+                user: "When is the next PTA meeting?",
+                ai: "The next PTA meeting is scheduled for Thursday, March 15th at 7:00 PM in the school library. The agenda includes budget discussions and upcoming events. Should I add this to your calendar?",
+                delay: 2000
+            }
+        ],
+        questions: [
+            "What time does school start?",
+            "What's for lunch today?",
+            "When is the next PTA meeting?",
+            "How do I enroll my child?",
+            "What are the school hours?",
+            "Is there after-school care?"
+        ]
+    }
+};
+
+// Chat demo functionality
+let chatDemoActive = false;
+let currentConversation = 0;
+
+function startChatDemo() {
+    if (chatDemoActive) return;
+
+    chatDemoActive = true;
+    const domain = window.location.hostname;
+    const config = DOMAIN_CHAT_CONFIG[domain] || DOMAIN_CHAT_CONFIG['edgpt.ai'];
+
+    // Hide start button
+    document.getElementById('startDemo').style.display = 'none';
+
+    // Update chat header
+    document.getElementById('chatTitle').textContent = config.title;
+
+    // Clear messages and show first conversation
+    const messagesContainer = document.getElementById('chatMessages');
+    messagesContainer.innerHTML = '<div class="message-bubble ai">Hi! I\'m your school\'s EdGPT assistant. I can help you with enrollment information, school schedules, lunch menus, and much more. What would you like to know?</div>';
+
+    // Start conversation sequence
+    currentConversation = 0;
+    setTimeout(() => showNextConversation(config), 2000);
+}
+
+function showNextConversation(config) {
+    if (currentConversation >= config.conversations.length) {
+        showQuestionButtons(config);
+        return;
+    }
+
+    const conversation = config.conversations[currentConversation];
+    const messagesContainer = document.getElementById('chatMessages');
+
+    // Add user message
+    setTimeout(() => {
+        addMessage(conversation.user, 'user');
+
+        // Show typing indicator
+        setTimeout(() => {
+            showTypingIndicator();
+
+            // Add AI response
+            setTimeout(() => {
+                hideTypingIndicator();
+                addMessage(conversation.ai, 'ai');
+                currentConversation++;
+                setTimeout(() => showNextConversation(config), 2000);
+            }, conversation.delay);
+        }, 500);
+    }, 1000);
+}
+
+function addMessage(text, sender) {
+    const messagesContainer = document.getElementById('chatMessages');
+    const messageDiv = document.createElement('div');
+    messageDiv.className = `message-bubble ${sender}`;
+    messageDiv.textContent = text;
+    messagesContainer.appendChild(messageDiv);
+    messagesContainer.scrollTop = messagesContainer.scrollHeight;
+}
+
+function showTypingIndicator() {
+    const messagesContainer = document.getElementById('chatMessages');
+    const typingDiv = document.createElement('div');
+    typingDiv.className = 'typing-indicator';
+    typingDiv.id = 'typing';
+    typingDiv.innerHTML = '<div class="typing-dots"><div class="typing-dot"></div><div class="typing-dot"></div><div class="typing-dot"></div></div>';
+    messagesContainer.appendChild(typingDiv);
+    messagesContainer.scrollTop = messagesContainer.scrollHeight;
+}
+
+function hideTypingIndicator() {
+    const typing = document.getElementById('typing');
+    if (typing) typing.remove();
+}
+
+function showQuestionButtons(config) {
+    const questionsContainer = document.getElementById('questionButtons');
+    questionsContainer.innerHTML = '';
+
+    config.questions.forEach(question => {
+        const button = document.createElement('button');
+        button.className = 'question-btn';
+        button.textContent = question;
+        button.onclick = () => askQuestion(question, config);
+        questionsContainer.appendChild(button);
+    });
+
+    questionsContainer.style.display = 'grid';
+}
+
+function askQuestion(question, config) {
+    addMessage(question, 'user');
+
+    setTimeout(() => {
+        showTypingIndicator();
+
+        setTimeout(() => {
+            hideTypingIndicator();
+            const responses = [
+                "I'd be happy to help you with that! Let me get you the most current information.",
+                "Great question! This is exactly the kind of information parents need quickly.",
+                "I can provide you with detailed information about that right away.",
+                "That's a common question from parents. Here's what you need to know..."
+            ];
+            const randomResponse = responses[Math.floor(Math.random() * responses.length)];
+            addMessage(randomResponse, 'ai');
+        }, 1500);
+    }, 500);
+}
+
+// Slideshow functionality
+let slideIndex = 1;
+
+function changeSlide(n) {
+    showSlide(slideIndex += n);
+}
+
+function currentSlide(n) {
+    showSlide(slideIndex = n);
+}
+
+function showSlide(n) {
+    const slides = document.querySelectorAll('.slide');
+    const indicators = document.querySelectorAll('.indicator');
+
+    if (n > slides.length) { slideIndex = 1; }
+    if (n < 1) { slideIndex = slides.length; }
+
+    slides.forEach(slide => slide.classList.remove('active'));
+    indicators.forEach(indicator => indicator.classList.remove('active'));
+
+    if (slides[slideIndex - 1]) {
+        slides[slideIndex - 1].classList.add('active');
+    }
+    if (indicators[slideIndex - 1]) {
+        indicators[slideIndex - 1].classList.add('active');
+    }
+}
+
+// Auto-advance slideshow
+setInterval(() => {
+    changeSlide(1);
+}, 8000);
+
+// Initialize chat demo configuration on page load
+document.addEventListener('DOMContentLoaded', function() {
+    const domain = window.location.hostname;
+    const config = DOMAIN_CHAT_CONFIG[domain] || DOMAIN_CHAT_CONFIG['edgpt.ai'];
+
+    // Set CSS custom properties for domain colors
+    document.documentElement.style.setProperty('--primary-color', config.primaryColor);
+    document.documentElement.style.setProperty('--secondary-color', config.secondaryColor);
+
+    // Update CTA text
+    const ctaElement = document.getElementById('ctaText');
+    if (ctaElement) {
+        ctaElement.textContent = config.ctaText;
+    }
+});
+
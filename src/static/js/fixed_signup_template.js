@@ -0,0 +1,55 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('signupForm');
+    const submitBtn = document.getElementById('submitBtn');
+    const submitSpinner = document.getElementById('submitSpinner');
+
+    form.addEventListener('submit', function(e) {
+        e.preventDefault();
+
+        // Disable button and show spinner
+        submitBtn.disabled = true;
+        submitSpinner.style.display = 'inline-block';
+
+        // Collect form data
+        const formData = {
+            school_name: document.getElementById('schoolName').value,
+            admin_name: document.getElementById('adminName').value,
+            admin_title: document.getElementById('adminTitle').value,
+            email: document.getElementById('email').value,
+            website_url: document.getElementById('websiteUrl').value,
+            student_count: document.getElementById('studentCount').value,
+            staff_name: document.getElementById('staffName').value,
+            staff_department: document.getElementById('staffDepartment').value,
+            staff_email: document.getElementById('staffEmail').value,
+            staff_phone: document.getElementById('staffPhone').value
+        };
+
+        // Send data to server
+        fetch('/convert', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(formData)
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                // Redirect to conversion process page
+                window.location.href = data.redirect_url;
+            } else {
+                // Show error message
+                alert('Error: ' + (data.message || 'Unknown error occurred'));
+                submitBtn.disabled = false;
+                submitSpinner.style.display = 'none';
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert('An error occurred. Please try again.');
+            submitBtn.disabled = false;
+            submitSpinner.style.display = 'none';
+        });
+    });
+});
+
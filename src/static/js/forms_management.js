@@ -0,0 +1,57 @@
+function showTab(tabName) {
+    // Hide all tabs
+    document.querySelectorAll('.tab-content').forEach(tab => {
+        tab.style.display = 'none';
+    });
+
+    // Remove active class from all tab buttons
+    document.querySelectorAll('.tab-btn').forEach(btn => {
+        btn.classList.remove('active');
+    });
+
+    // Show selected tab
+    document.getElementById(tabName + '-tab').style.display = 'block';
+
+    // Add active class to clicked button
+    event.target.classList.add('active');
+}
+
+function addNewForm() {
+    alert('Opening form builder interface...');
+    // In a real implementation, this would open a form builder modal or redirect to a form creation page
+}
+
+function editForm(formId) {
+    alert(`Opening form editor for form ${formId}`);
+}
+
+function previewForm(formId) {
+    alert(`Opening form preview for form ${formId}`);
+}
+
+function duplicateForm(formId) {
+    alert(`Creating duplicate of form ${formId}`);
+}
+
+function deactivateForm(formId) {
+    if (confirm('Are you sure you want to deactivate this form?')) {
+        alert(`Deactivating form ${formId}`);
+    }
+}
+
+function activateForm(formId) {
+    alert(`Activating form ${formId}`);
+}
+
+function viewSubmission(submissionId) {
+    alert(`Opening submission details for ${submissionId}`);
+}
+
+function approveSubmission(submissionId) {
+    alert(`Approving submission ${submissionId}`);
+}
+
+function contactSubmitter(submissionId) {
+    alert(`Opening contact interface for submission ${submissionId}`);
+}
+
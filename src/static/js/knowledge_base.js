@@ -0,0 +1,109 @@
+function showCategory(category) {
+    // Update active category button
+    document.querySelectorAll('.category-btn').forEach(btn => btn.classList.remove('active'));
+    event.target.classList.add('active');
+
+    // Show/hide category sections
+    const sections = document.querySelectorAll('.category-section');
+    sections.forEach(section => {
+        if (category === 'all') {
+            section.style.display = 'block';
+        } else {
+            const sectionCategory = section.dataset.category;
+            section.style.display = category === sectionCategory ? 'block' : 'none';
+        }
+    });
+}
+
+function addNewContent() {
+    alert('Opening content upload interface...');
+    // In a real implementation, this would open a content upload modal
+}
+
+function openUploadDialog() {
+    const input = document.createElement('input');
+    input.type = 'file';
+    input.multiple = true;
+    input.accept = '.pdf,.doc,.docx,.txt,.md,.csv,.html,.htm,.vtt,.srt,.ics,.mp4,.mov,.mp3,.wav,.m4a';
+    input.addEventListener('change', () => uploadFiles(Array.from(input.files)));
+    input.click();
+}
+
+function setUploadStatus(text) {
+    let status = uploadArea.querySelector('.upload-status');
+    if (!status) {
+        status = document.createElement('p');
+        status.className = 'upload-status';
+        status.style.cssText = 'color: #4a5568; margin-top: 10px; font-weight: 600;';
+        uploadArea.appendChild(status);
+    }
+    status.textContent = text;
+}
+
+// The file is sent as the raw request body, so the server can stream it to disk
+function uploadFile(file) {
+    return new Promise((resolve, reject) => {
+        const xhr = new XMLHttpRequest();
+        xhr.open('POST', `/api/knowledge-base/uploads?filename=${encodeURIComponent(file.name)}`);
+        xhr.setRequestHeader('Content-Type', file.type || 'application/octet-stream');
+        xhr.upload.onprogress = (e) => {
+            if (e.lengthComputable) {
+                setUploadStatus(`Uploading ${file.name}: ${Math.round(e.loaded * 100 / e.total)}%`);
+            }
+        };
+        xhr.onload = () => {
+            const data = JSON.parse(xhr.responseText || '{}');
+            xhr.status === 201 ? resolve(data.document) : reject(new Error(data.error || 'Upload failed'));
+        };
+        xhr.onerror = () => reject(new Error('Upload failed'));
+        xhr.send(file);
+    });
+}
+
+function watchExtraction(doc) {
+    fetch(`/api/knowledge-base/uploads/${doc.id}`)
+        .then(response => response.json())
+        .then(current => {
+            if (current.text_status === 'pending' || current.text_status === 'extracting') {
+                setUploadStatus(`Reading ${current.filename}: ${current.progress}%`);
+                setTimeout(() => watchExtraction(current), 2000);
+            } else {
+                setUploadStatus(`${current.filename}: ${current.text_status === 'done' ? 'ready' : current.text_status}`);
+            }
+        });
+}
+
+async function uploadFiles(files) {
+    for (const file of files) {
+        try {
+            watchExtraction(await uploadFile(file));
+        } catch (error) {
+            setUploadStatus(`${file.name}: ${error.message}`);
+        }
+    }
+}
+
+function playVideo(videoId) {
+    alert(`Playing video: ${videoId}`);
+    // In a real implementation, this would open a video player modal
+}
+
+// Drag and drop functionality
+const uploadArea = document.querySelector('.upload-area');
+
+uploadArea.addEventListener('dragover', (e) => {
+    e.preventDefault();
+    uploadArea.classList.add('dragover');
+});
+
+uploadArea.addEventListener('dragleave', () => {
+    uploadArea.classList.remove('dragover');
+});
+
+uploadArea.addEventListener('drop', (e) => {
+    e.preventDefault();
+    uploadArea.classList.remove('dragover');
+
+    uploadFiles(Array.from(e.dataTransfer.files));
+});
+
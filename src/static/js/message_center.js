@@ -0,0 +1,47 @@
+function filterMessages(filter) {
+    // Update active filter button
+    document.querySelectorAll('.filter-btn').forEach(btn => btn.classList.remove('active'));
+    event.target.classList.add('active');
+
+    // Show/hide messages based on filter
+    const messages = document.querySelectorAll('.message-item');
+    messages.forEach(message => {
+        if (filter === 'all') {
+            message.style.display = 'block';
+        } else {
+            const status = message.dataset.status;
+            const priority = message.dataset.priority;
+
+            if (filter === 'urgent' && priority === 'urgent') {
+                message.style.display = 'block';
+            } else if (filter === status) {
+                message.style.display = 'block';
+            } else {
+                message.style.display = 'none';
+            }
+        }
+    });
+}
+
+function respondToMessage(messageId) {
+    // In a real implementation, this would open a response modal or redirect to a response page
+    alert(`Opening response interface for message ${messageId}`);
+}
+
+function markAsResolved(messageId) {
+    // In a real implementation, this would make an API call to update the message status
+    alert(`Marking message ${messageId} as resolved`);
+}
+
+function assignToStaff(messageId) {
+    // In a real implementation, this would open a staff assignment modal
+    alert(`Opening staff assignment for message ${messageId}`);
+}
+
+function deleteMessage(messageId) {
+    if (confirm('Are you sure you want to delete this message?')) {
+        // In a real implementation, this would make an API call to delete the message
+        alert(`Deleting message ${messageId}`);
+    }
+}
+
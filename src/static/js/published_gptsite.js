@@ -0,0 +1,74 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const conversionId = document.getElementById('conversionId').value;
+
+    // Fetch conversion data
+    fetch(`/api/conversion-status/${conversionId}`)
+        .then(response => response.json())
+        .then(data => {
+            // Update school information
+            if (data.data && data.data.school_name) {
+                document.getElementById('schoolName').textContent = data.data.school_name;
+            }
+
+            // Update GPTsite URL
+            if (data.gptsite_url) {
+                document.getElementById('gpsiteUrl').textContent = data.gptsite_url;
+                document.getElementById('gpsiteLink').href = data.gptsite_url;
+            }
+        })
+        .catch(error => {
+            console.error('Error fetching conversion data:', error);
+        });
+
+    // Handle domain form submission
+    const form = document.getElementById('domainForm');
+    const submitBtn = document.getElementById('submitBtn');
+    const submitSpinner = document.getElementById('submitSpinner');
+
+    form.addEventListener('submit', function(e) {
+        e.preventDefault();
+
+        const domain = document.getElementById('customDomain').value;
+
+        if (!domain) {
+            alert('Please enter a domain name');
+            return;
+        }
+
+        // Disable button and show spinner
+        submitBtn.disabled = true;
+        submitSpinner.style.display = 'inline-block';
+
+        // Submit custom domain request
+        fetch('/api/custom-domain', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                conversion_id: conversionId,
+                domain: domain
+            })
+        })
+        .then(response => response.json())
+        .then(result => {
+            if (result.success) {
+                // The domain goes live once the TXT record proves ownership
+                alert(`Custom domain claimed! Point ${result.domain} at ${result.cname_target} with a CNAME record, ` +
+                      `then add a TXT record ${result.verification.name} with the value ${result.verification.value}. ` +
+                      'It may take up to 24 hours for DNS changes to propagate.');
+            } else {
+                alert('Error setting up domain: ' + (result.message || 'Unknown error'));
+            }
+            submitBtn.disabled = false;
+            submitSpinner.style.display = 'none';
+        })
+        .catch(error => {
+            console.error('Error setting up domain:', error);
+            alert('An error occurred. Please try again.');
+            submitBtn.disabled = false;
+            submitSpinner.style.display = 'none';
+        });
+    });
+});
+
@@ -0,0 +1,395 @@
+let currentSlide = 0;
+const slides = document.querySelectorAll('.slide');
+
+function showSlide(n) {
+    slides[currentSlide].classList.remove('active');
+    currentSlide = (n + slides.length) % slides.length;
+    slides[currentSlide].classList.add('active');
+}
+
+function changeSlide(direction) {
+    showSlide(currentSlide + direction);
+}
+
+// Auto-advance slides
+setInterval(() => {
+    changeSlide(1);
+}, 8000);
+
+// Smooth scrolling for anchor links
+document.querySelectorAll('a[href^="#"]').forEach(anchor => {
+    anchor.addEventListener('click', function (e) {
+        e.preventDefault();
+        const target = document.querySelector(this.getAttribute('href'));
+        if (target) {
+            target.scrollIntoView({
+                behavior: 'smooth',
+                block: 'start'
+            });
+        }
+    });
+});
+
+
+// Mobile-specific fixes for chat demo
+function isMobile() {
+    return window.innerWidth <= 768;
+}
+
+// Ensure chat demo is visible on mobile
+document.addEventListener('DOMContentLoaded', function() {
+    if (isMobile()) {
+        const chatDemoSlide = document.querySelector('.chat-demo-slide');
+        if (chatDemoSlide) {
+            chatDemoSlide.style.display = 'block';
+            chatDemoSlide.style.visibility = 'visible';
+        }
+
+        // Ensure slideshow navigation works on mobile
+        const slideNavs = document.querySelectorAll('.slide-nav');
+        slideNavs.forEach(nav => {
+            nav.style.display = 'block';
+            nav.style.visibility = 'visible';
+        });
+
+        // Ensure slide indicators work on mobile
+        const indicators = document.querySelectorAll('.indicator');
+        indicators.forEach(indicator => {
+            indicator.style.display = 'block';
+            indicator.style.visibility = 'visible';
+        });
+    }
+});
+
+
+// Domain-specific chat demo configurations
+const domainConfigs = {
+    'edgpt.ai': {
+        title: 'Riverside Elementary School EdGPT',
+        greeting: 'Hi! Welcome to Riverside Elementary. I\'m your school\'s EdGPT assistant. How can I help you today?',
+        questions: [
+            'What are your school hours?',
+            'How do I enroll my child?',
+            'What\'s for lunch today?',
+            'When is the next parent meeting?'
+        ],
+        answers: [
+            'Our school hours are 8:00 AM to 3:30 PM, Monday through Friday. Early drop-off is available starting at 7:30 AM, and after-school care runs until 6:00 PM.',
+            'You can enroll your child by visiting our main office with birth certificate, immunization records, and proof of residence. Online pre-registration is also available on our website.',
+            'Today\'s lunch includes chicken nuggets, mac and cheese, fresh fruit, and milk. We also have a vegetarian option with veggie burgers. All meals meet USDA nutrition standards.',
+            'Our next PTA meeting is Thursday, March 15th at 7:00 PM in the school library. We\'ll be discussing the spring fundraiser and upcoming field trips.'
+        ],
+        cta: 'See How Your School\'s Website Looks in EdGPT',
+        colors: {
+            primary: '#3B82F6',
+            secondary: '#1E40AF'
+        }
+    },
+    'gptsites.ai': {
+        title: 'Your Business GPTsite Demo',
+        greeting: 'Hello! Welcome to our business. I\'m your intelligent assistant. How can I help you today?',
+        questions: [
+            'Do you offer website design services?',
+            'What are your pricing options?',
+            'How long does it take to build a website?',
+            'Do you provide ongoing maintenance?'
+        ],
+        answers: [
+            'Yes, we provide custom website design, development, and digital marketing services. Our packages include responsive design, SEO optimization, and ongoing support. Would you like to see our portfolio?',
+            'Our packages start at $2,500 for basic websites and $5,000+ for e-commerce solutions. We offer payment plans and can schedule a consultation to discuss your specific needs and budget.',
+            'Typical websites take 4-8 weeks from start to launch. This includes design, development, content creation, and testing. Rush projects can be accommodated for an additional fee.',
+            'Absolutely! We offer monthly maintenance plans starting at $150/month, including security updates, backups, content updates, and technical support.'
+        ],
+        cta: 'Transform Your Business Website Into a GPTsite',
+        colors: {
+            primary: '#7C3AED',
+            secondary: '#0D9488'
+        }
+    },
+    'lawfirmgpt.ai': {
+        title: 'Law Firm GPTsite Demo',
+        greeting: 'Welcome to our law firm. I\'m here to help answer your legal questions and connect you with our attorneys. How may I assist you?',
+        questions: [
+            'I was injured in a car accident. Do I have a case?',
+            'How long do I have to file a lawsuit?',
+            'What are your legal fees?',
+            'Can you help with my divorce?'
+        ],
+        answers: [
+            'Based on your description, you may have grounds for a personal injury claim. We\'ll need to review the accident details, medical records, and insurance information to assess your case strength. Would you like to schedule a free consultation?',
+            'In most states, the statute of limitations for personal injury cases is 2-3 years from the date of the accident. It\'s important to act quickly to preserve evidence and witness testimony.',
+            'We work on a contingency fee basis for personal injury cases, meaning you pay nothing unless we win your case. Our fee is typically 33-40% of the settlement or judgment.',
+            'Yes, we handle family law matters including divorce, child custody, and property division. We offer both collaborative and litigation approaches depending on your situation.'
+        ],
+        cta: 'Transform Your Law Firm Website Into a GPTsite',
+        colors: {
+            primary: '#1E3A8A',
+            secondary: '#D97706'
+        }
+    },
+    'cpafirm.ai': {
+        title: 'CPA Firm GPTsite Demo',
+        greeting: 'Hello! Welcome to our accounting firm. I\'m here to help with your tax and accounting questions. How can I assist you today?',
+        questions: [
+            'Can I deduct my home office expenses?',
+            'When are quarterly tax payments due?',
+            'Should I incorporate my business?',
+            'What records should I keep for taxes?'
+        ],
+        answers: [
+            'Yes, if you use part of your home exclusively for business, you can deduct home office expenses. You can choose between the simplified method ($5 per square foot, up to 300 sq ft) or actual expense method.',
+            'Quarterly estimated tax payments for 2024 are due: Q1 - April 15, Q2 - June 17, Q3 - September 16, Q4 - January 15, 2025. Missing payments may result in penalties.',
+            'Incorporation depends on your business size, liability concerns, and tax situation. LLCs offer flexibility and protection, while S-Corps can provide tax savings for profitable businesses.',
+            'Keep receipts for all business expenses, bank statements, invoices, payroll records, and previous tax returns for at least 7 years. Digital storage is acceptable for most documents.'
+        ],
+        cta: 'Transform Your Accounting Firm Website Into a GPTsite',
+        colors: {
+            primary: '#065F46',
+            secondary: '#D97706'
+        }
+    },
+    'taxprepgpt.ai': {
+        title: 'Tax Preparation GPTsite Demo',
+        greeting: 'Welcome to our tax preparation service! I\'m here to help with your tax questions and guide you through the process. How can I help?',
+        questions: [
+            'I just got married. How does this affect my taxes?',
+            'Can I still contribute to my IRA?',
+            'What tax documents do I need?',
+            'When will I get my tax refund?'
+        ],
+        answers: [
+            'Congratulations! Marriage can significantly impact your taxes. You can now file jointly or separately. Joint filing often provides better tax benefits, including higher standard deductions and access to more tax credits.',
+            'Yes, for 2024 you can contribute up to $7,000 to a traditional or Roth IRA ($8,000 if you\'re 50 or older). Income limits may apply for Roth IRAs and deductible traditional IRA contributions.',
+            'You\'ll need W-2s from employers, 1099s for other income, receipts for deductions, previous year\'s tax return, and bank account information for direct deposit of your refund.',
+            'E-filed returns with direct deposit typically receive refunds within 21 days. Paper returns take 6-8 weeks. You can track your refund status on the IRS website using your SSN and refund amount.'
+        ],
+        cta: 'Transform Your Tax Preparation Website Into a GPTsite',
+        colors: {
+            primary: '#1E40AF',
+            secondary: '#EA580C'
+        }
+    },
+    'businessbrokergpt.ai': {
+        title: 'Business Brokerage GPTsite Demo',
+        greeting: 'Welcome to our business brokerage firm. I\'m here to help with buying or selling businesses. How can I assist you today?',
+        questions: [
+            'I\'m thinking of selling my business. What\'s it worth?',
+            'How long does the sale process take?',
+            'What information do buyers need?',
+            'Should I tell my employees about the sale?'
+        ],
+        answers: [
+            'Business valuations typically range from 3-6x EBITDA for most companies, depending on factors like market position, growth trends, and operational efficiency. I\'ll need to review your financials to provide a more accurate estimate.',
+            'The typical business sale process takes 6-12 months from listing to closing. This includes preparation, marketing, due diligence, and negotiations. Proper preparation can significantly reduce this timeline.',
+            'Buyers typically require 3-5 years of financial statements, tax returns, customer contracts, employee agreements, equipment lists, and operational procedures. We help prepare a comprehensive information package.',
+            'This depends on your situation. Many owners wait until a letter of intent is signed to minimize disruption. We can help you develop a communication strategy that protects your business during the process.'
+        ],
+        cta: 'Transform Your Business Brokerage Website Into a GPTsite',
+        colors: {
+            primary: '#374151',
+            secondary: '#D97706'
+        }
+    }
+};
+
+// Chat demo variables
+let chatDemoStarted = false;
+let questionCount = 0;
+let maxQuestions = 4;
+let currentConfig = null;
+
+// Initialize chat demo based on current domain
+function initializeChatDemo() {
+    const hostname = window.location.hostname;
+    currentConfig = domainConfigs[hostname] || domainConfigs['gptsites.ai'];
+
+    // Update UI elements
+    const chatTitle = document.getElementById('chatTitle');
+    const ctaText = document.getElementById('ctaText');
+
+    if (chatTitle) chatTitle.textContent = currentConfig.title;
+    if (ctaText) ctaText.textContent = currentConfig.cta;
+
+    // Set CSS custom properties for colors
+    document.documentElement.style.setProperty('--primary-color', currentConfig.colors.primary);
+    document.documentElement.style.setProperty('--secondary-color', currentConfig.colors.secondary);
+
+    // Populate question buttons
+    const questionButtons = document.getElementById('questionButtons');
+    if (questionButtons) {
+        questionButtons.innerHTML = '';
+        currentConfig.questions.forEach((question, index) => {
+            const button = document.createElement('button');
+            button.className = 'question-btn';
+            button.textContent = question;
+            button.onclick = () => askQuestion(index);
+            questionButtons.appendChild(button);
+        });
+    }
+}
+
+function startChatDemo() {
+    if (chatDemoStarted) return;
+
+    chatDemoStarted = true;
+    const messagesContainer = document.getElementById('chatMessages');
+    const questionButtons = document.getElementById('questionButtons');
+
+    if (!messagesContainer || !questionButtons) return;
+
+    messagesContainer.innerHTML = '';
+
+    // Add AI greeting with typing effect
+    setTimeout(() => {
+        addTypingIndicator();
+        setTimeout(() => {
+            removeTypingIndicator();
+            addMessage(currentConfig.greeting, 'ai');
+            questionButtons.style.display = 'grid';
+        }, 2000);
+    }, 500);
+}
+
+function addMessage(text, sender) {
+    const messagesContainer = document.getElementById('chatMessages');
+    if (!messagesContainer) return;
+
+    const messageDiv = document.createElement('div');
+    messageDiv.className = `message ${sender}`;
+
+    const bubbleDiv = document.createElement('div');
+    bubbleDiv.className = 'message-bubble';
+
+    messageDiv.appendChild(bubbleDiv);
+    messagesContainer.appendChild(messageDiv);
+
+    // Typing animation
+    let i = 0;
+    const typeInterval = setInterval(() => {
+        bubbleDiv.textContent += text.charAt(i);
+        i++;
+
+        if (i >= text.length) {
+            clearInterval(typeInterval);
+        }
+
+        messagesContainer.scrollTop = messagesContainer.scrollHeight;
+    }, 30);
+}
+
+function addTypingIndicator() {
+    const messagesContainer = document.getElementById('chatMessages');
+    if (!messagesContainer) return;
+
+    const messageDiv = document.createElement('div');
+    messageDiv.className = 'message ai';
+    messageDiv.id = 'typingIndicator';
+
+    const typingDiv = document.createElement('div');
+    typingDiv.className = 'typing-indicator';
+
+    const dotsDiv = document.createElement('div');
+    dotsDiv.className = 'typing-dots';
+
+    for (let i = 0; i < 3; i++) {
+        const dot = document.createElement('div');
+        dot.className = 'typing-dot';
+        dotsDiv.appendChild(dot);
+    }
+
+    typingDiv.appendChild(dotsDiv);
+    messageDiv.appendChild(typingDiv);
+    messagesContainer.appendChild(messageDiv);
+    messagesContainer.scrollTop = messagesContainer.scrollHeight;
+}
+
+function removeTypingIndicator() {
+    const indicator = document.getElementById('typingIndicator');
+    if (indicator) {
+        indicator.remove();
+    }
+}
+
+function askQuestion(index) {
+    if (questionCount >= maxQuestions) return;
+
+    const question = currentConfig.questions[index];
+    const answer = currentConfig.answers[index];
+
+    // Disable the clicked button
+    const buttons = document.querySelectorAll('.question-btn');
+    if (buttons[index]) buttons[index].disabled = true;
+
+    // Add user question
+    addMessage(question, 'user');
+
+    // Add typing indicator
+    setTimeout(() => {
+        addTypingIndicator();
+
+        // Add AI response after delay
+        setTimeout(() => {
+            removeTypingIndicator();
+            addMessage(answer, 'ai');
+            questionCount++;
+
+            // After 4 questions, show final CTA
+            if (questionCount >= maxQuestions) {
+                setTimeout(() => {
+                    addTypingIndicator();
+                    setTimeout(() => {
+                        removeTypingIndicator();
+                        addMessage("I hope this demo shows how a GPTsite can help your business! Ready to transform your website?", 'ai');
+
+                        // Add CTA button
+                        setTimeout(() => {
+                            const messagesContainer = document.getElementById('chatMessages');
+                            if (messagesContainer) {
+                                const ctaDiv = document.createElement('div');
+                                ctaDiv.className = 'text-center mt-4';
+                                ctaDiv.innerHTML = `<a href="/signup" class="bg-gradient-to-r from-blue-600 to-purple-600 text-white px-6 py-3 rounded-full font-semibold hover:from-blue-700 hover:to-purple-700 transition duration-300 transform hover:scale-105">🚀 ${currentConfig.cta}</a>`;
+                                messagesContainer.appendChild(ctaDiv);
+                                messagesContainer.scrollTop = messagesContainer.scrollHeight;
+                            }
+                        }, 1000);
+                    }, 1500);
+                }, 2000);
+            }
+        }, 2500);
+    }, 1000);
+}
+
+// Initialize when page loads
+document.addEventListener('DOMContentLoaded', initializeChatDemo);
+
+
+        // Mobile-specific fixes for chat demo
+        function isMobile() {
+            return window.innerWidth <= 768;
+        }
+
+        // Ensure chat demo is visible on mobile
+        document.addEventListener('DOMContentLoaded', function() {
+            if (isMobile()) {
+                const chatDemoSlide = document.querySelector('.chat-demo-slide');
+                if (chatDemoSlide) {
+                    chatDemoSlide.style.display = 'block';
+                    chatDemoSlide.style.visibility = 'visible';
+                }
+
+                // Ensure slideshow navigation works on mobile
+                const slideNavs = document.querySelectorAll('.slide-nav');
+                slideNavs.forEach(nav => {
+                    nav.style.display = 'block';
+                    nav.style.visibility = 'visible';
+                });
+
+                // Ensure slide indicators work on mobile
+                const indicators = document.querySelectorAll('.indicator');
+                indicators.forEach(indicator => {
+                    indicator.style.display = 'block';
+                    indicator.style.visibility = 'visible';
+                });
+            }
+        });
+
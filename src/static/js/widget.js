@@ -0,0 +1,122 @@
+// GPTsite chat widget runtime, loaded by the two-line embed snippet.
+// window.gptsiteWidget holds the embed options; the loader adds the site
+// config fetched from /widget/config/<site> as window.gptsiteWidget.config.
+(function (w, d) {
+    var options = w.gptsiteWidget || {};
+    var config = options.config || {};
+    if (!config.site || d.getElementById('gptsite-widget')) {
+        return;
+    }
+    var SIZES = { small: '300px', medium: '350px', large: '400px' };
+    var color = options.color || config.color;
+    var position = (options.position || 'bottom-right').split('-');
+    var vertical = position[0] === 'top' ? 'top' : 'bottom';
+    var horizontal = position[1] === 'left' ? 'left' : 'right';
+
+    function el(tag, css, text) {
+        var node = d.createElement(tag);
+        if (css) {
+            node.style.cssText = css;
+        }
+        if (text) {
+            node.textContent = text;
+        }
+        return node;
+    }
+
+    var widget = el('div', 'position:fixed;' + horizontal + ':20px;' + vertical + ':90px;' +
+        'width:' + (SIZES[options.size] || SIZES.medium) + ';height:500px;background:white;' +
+        'border-radius:12px;box-shadow:0 8px 32px rgba(0,0,0,0.1);z-index:10000;display:none;' +
+        "font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;");
+    widget.id = 'gptsite-widget';
+
+    var header = el('div', 'background:' + color + ';color:white;padding:15px;border-radius:12px 12px 0 0;' +
+        'display:flex;justify-content:space-between;align-items:center;');
+    var title = el('div', 'display:flex;align-items:center;gap:8px;');
+    title.appendChild(el('span', 'font-size:20px;', config.icon));
+    title.appendChild(el('span', 'font-weight:600;', config.name + ' Assistant'));
+    var close = el('button', 'background:none;border:none;color:white;font-size:18px;cursor:pointer;', '×');
+    header.appendChild(title);
+    header.appendChild(close);
+
+    var messages = el('div', 'padding:20px;height:380px;overflow-y:auto;');
+    messages.appendChild(el('div', 'background:#f3f4f6;padding:12px;border-radius:8px;margin-bottom:15px;',
+        config.greeting));
+
+    var footer = el('div', 'padding:15px;border-top:1px solid #e5e7eb;');
+    var row = el('div', 'display:flex;gap:8px;');
+    var input = el('input', 'flex:1;padding:10px;border:1px solid #d1d5db;border-radius:6px;outline:none;');
+    input.type = 'text';
+    input.placeholder = 'Type your message...';
+    var send = el('button', 'background:' + color + ';color:white;border:none;padding:10px 15px;' +
+        'border-radius:6px;cursor:pointer;', 'Send');
+    row.appendChild(input);
+    row.appendChild(send);
+    var powered = el('div', 'text-align:center;margin-top:8px;font-size:12px;color:#6b7280;', 'Powered by ');
+    var link = el('a', 'color:' + color + ';text-decoration:none;', config.name);
+    link.href = 'https://' + config.site;
+    link.target = '_blank';
+    link.rel = 'noopener';
+    powered.appendChild(link);
+    footer.appendChild(row);
+    footer.appendChild(powered);
+
+    widget.appendChild(header);
+    widget.appendChild(messages);
+    widget.appendChild(footer);
+
+    var toggle = el('button', 'position:fixed;' + horizontal + ':20px;' + vertical + ':20px;width:60px;height:60px;' +
+        'background:' + color + ';border:none;border-radius:50%;color:white;font-size:24px;cursor:pointer;' +
+        'box-shadow:0 4px 16px rgba(0,0,0,0.2);z-index:10001;transition:transform 0.2s;', config.icon);
+    toggle.id = 'gptsite-toggle';
+
+    function toggleWidget() {
+        var isVisible = widget.style.display !== 'none';
+        widget.style.display = isVisible ? 'none' : 'block';
+        toggle.style.transform = isVisible ? 'scale(1)' : 'scale(0.9)';
+    }
+    toggle.onclick = toggleWidget;
+    close.onclick = toggleWidget;
+
+    function conversationId() {
+        var key = 'gptsite-conversation';
+        var id = null;
+        try {
+            id = w.sessionStorage.getItem(key);
+        } catch (e) {}
+        if (!id) {
+            id = Date.now().toString(36) + Math.random().toString(36).slice(2, 12);
+            try {
+                w.sessionStorage.setItem(key, id);
+            } catch (e) {}
+        }
+        return id;
+    }
+
+    // Each turn is appended to the site's transcript log (text/plain, so no CORS preflight)
+    function sendMessage() {
+        var text = input.value.trim();
+        if (!text) {
+            return;
+        }
+        messages.appendChild(el('div', 'background:' + color + ';color:white;padding:12px;border-radius:8px;' +
+            'margin:0 0 15px 40px;', text));
+        messages.scrollTop = messages.scrollHeight;
+        input.value = '';
+        fetch(options.base + '/widget/messages/' + config.site, {
+            method: 'POST',
+            body: JSON.stringify({ conversation_id: conversationId(), role: 'user', text: text }),
+            keepalive: true,
+            credentials: 'omit'
+        });
+    }
+    send.onclick = sendMessage;
+    input.onkeydown = function (event) {
+        if (event.key === 'Enter') {
+            sendMessage();
+        }
+    };
+
+    d.body.appendChild(widget);
+    d.body.appendChild(toggle);
+})(window, document);
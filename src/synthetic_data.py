@@ -0,0 +1,347 @@
+"""
+EdGPT Platform - Synthetic Data Generator
+Fills a database with production-shaped analytics, trial requests and users
+
+The checked-in database is nearly empty, so query plans and latencies seen
+in development say little about production. This generator adds rows with
+the shapes that matter to the reporting queries and indexes:
+
+- analytics: page views across the six domains and their pages, weighted
+  towards edgpt.ai and the landing page, with a diurnal curve (peak in the
+  afternoon, quiet at night), quieter weekends and slow growth over the
+  period; user agents follow a long-tailed mix of browser versions plus a
+  small share of bots, interned through ua_registry
+- trial_requests: signups following the same daily pattern, triaged like
+  trial_triage.py would (the last day stays pending) with some duplicates
+- users: accounts created from a sample of qualified trials
+
+Rows come from random.Random(seed), so a seed always produces the same
+data, dated so that the last day of the profile is `end` (default today,
+UTC). Each table is written in one transaction with executemany, in
+created_at order so index pages are appended rather than split.
+
+The target defaults to SYNTHETIC_DATABASE, never the application database:
+rows are added to whatever the target already holds.
+
+Usage:
+    python src/synthetic_data.py profiles                            # list scale profiles
+    python src/synthetic_data.py generate <profile> [database] [seed]
+"""
+
+import math
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+
+from migrations import migrate
+from ua_registry import UserAgentCache, intern_user_agent
+
+SYNTHETIC_DATABASE = 'edgpt_synthetic.db'
+
+# Named sizes shared by the benchmarks; rows are added to what is already there
+SCALE_PROFILES = {
+    'smoke': {'days': 7, 'analytics': 20000, 'trial_requests': 1000, 'users': 500},
+    'small': {'days': 45, 'analytics': 300000, 'trial_requests': 20000, 'users': 10000},
+    'medium': {'days': 90, 'analytics': 3000000, 'trial_requests': 200000, 'users': 100000},
+    'large': {'days': 180, 'analytics': 10000000, 'trial_requests': 500000, 'users': 250000},
+}
+DEFAULT_SEED = 1
+CHUNK_SIZE = 100000
+
+DOMAIN_WEIGHTS = {
+    'edgpt.ai': 38,
+    'gptsites.ai': 20,
+    'lawfirmgpt.ai': 15,
+    'cpafirm.ai': 12,
+    'taxprepgpt.ai': 9,
+    'businessbrokergpt.ai': 6,
+}
+PATH_WEIGHTS = {
+    '/': 58,
+    '/signup': 16,
+    '/conversion': 9,
+    '/login': 8,
+    '/dashboard': 7,
+    '/admin/dashboard': 1,
+    '/health': 1,
+}
+
+# (template, share of traffic, newest version, versions seen); newer versions are more common
+USER_AGENT_FAMILIES = [
+    ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+     'Chrome/{v}.0.0.0 Safari/537.36', 30, 131, 24),
+    ('Mozilla/5.0 (iPhone; CPU iPhone OS {v}_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) '
+     'Version/{v}.0 Mobile/15E148 Safari/604.1', 18, 18, 6),
+    ('Mozilla/5.0 (Linux; Android 14; K) AppleWebKit/537.36 (KHTML, like Gecko) '
+     'Chrome/{v}.0.0.0 Mobile Safari/537.36', 13, 131, 20),
+    ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) '
+     'Chrome/{v}.0.0.0 Safari/537.36', 11, 131, 16),
+    ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+     'Chrome/{v}.0.0.0 Safari/537.36 Edg/{v}.0.0.0', 7, 131, 12),
+    ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) '
+     'Version/{v}.0 Safari/605.1.15', 5, 18, 5),
+    ('Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:{v}.0) Gecko/20100101 Firefox/{v}.0', 4, 133, 12),
+    ('Mozilla/5.0 (Linux; Android 14; SM-S918B) AppleWebKit/537.36 (KHTML, like Gecko) '
+     'SamsungBrowser/{v}.0 Chrome/125.0.0.0 Mobile Safari/537.36', 2, 26, 5),
+    ('Mozilla/5.0 (compatible; Googlebot/2.{v}; +http://www.google.com/bot.html)', 2.5, 1, 1),
+    ('Mozilla/5.0 (compatible; bingbot/2.{v}; +http://www.bing.com/bingbot.htm)', 1, 0, 1),
+    ('Mozilla/5.0 (compatible; AhrefsBot/7.{v}; +http://ahrefs.com/robot/)', 0.7, 0, 1),
+    ('Mozilla/5.0+(compatible; UptimeRobot/2.{v}; http://www.uptimerobot.com/)', 0.5, 0, 1),
+    ('python-requests/2.{v}.0', 0.3, 32, 4),
+]
+
+# Relative traffic by hour of day (UTC): trough around 03:00, peak around 15:00
+HOUR_WEIGHTS = [1 + 0.8 * math.sin(2 * math.pi * (hour - 9) / 24) for hour in range(24)]
+HOUR_CUM_WEIGHTS = list(accumulate(HOUR_WEIGHTS))
+WEEKEND_FACTOR = 0.55
+# Traffic at the start of the period relative to the end
+GROWTH_START = 0.7
+
+TRIAGE_OUTCOMES = {'qualified': 72, 'unreachable': 14, 'invalid': 7, 'duplicate': 7}
+BUSINESS_NAMES = {
+    'edgpt.ai': (['Lincoln', 'Riverside', 'Oak Grove', 'Westfield', 'Maple', 'Summit', 'Cedar'],
+                 ['High School', 'Elementary', 'Academy', 'Middle School', 'School District']),
+    'gptsites.ai': (['Blue Harbor', 'Acme', 'Northwind', 'Brightside', 'Evergreen', 'Pioneer'],
+                    ['Dental', 'Plumbing', 'Realty', 'Fitness', 'Consulting', 'Bakery']),
+    'lawfirmgpt.ai': (['Smith', 'Garcia', 'Johnson', 'Patel', 'Nguyen', 'Miller'],
+                      ['& Associates', 'Law Group', 'Legal', '& Partners LLP']),
+    'cpafirm.ai': (['Harbor', 'Keystone', 'Granite', 'Lakeside', 'Sterling'],
+                   ['CPA Group', 'Accounting', '& Co CPAs', 'Advisors']),
+    'taxprepgpt.ai': (['Quick', 'Main Street', 'Family', 'Liberty', 'Capitol'],
+                      ['Tax Service', 'Tax Prep', 'Tax & Bookkeeping']),
+    'businessbrokergpt.ai': (['Meridian', 'Crossroads', 'Anchor', 'Legacy', 'Frontier'],
+                             ['Business Brokers', 'M&A Advisors', 'Capital Partners']),
+}
+FIRST_NAMES = ['james', 'maria', 'wei', 'aisha', 'john', 'sofia', 'raj', 'emma', 'omar', 'linda']
+LAST_NAMES = ['smith', 'garcia', 'chen', 'khan', 'brown', 'rossi', 'patel', 'jones', 'ali', 'kim']
+TLDS = ['com', 'org', 'net', 'edu', 'us']
+IP_POOL_SIZE = 50000
+# Never equal to a sha256 hex digest, like provisioned accounts without a password
+DISABLED_PASSWORD = '!'
+
+
+def user_agent_mix():
+    """[(user agent, weight)]: each family spread over its versions with a Zipf tail"""
+    mix = []
+    for template, share, newest, versions in USER_AGENT_FAMILIES:
+        ranks = [1 / (rank + 1) ** 1.3 for rank in range(versions)]
+        total = sum(ranks)
+        for rank, weight in enumerate(ranks):
+            mix.append((template.format(v=newest - rank), share * weight / total))
+    return mix
+
+
+def day_weights(days, end):
+    """Relative traffic of each day from end - days + 1 to end"""
+    weights = []
+    for i in range(days):
+        day = end - timedelta(days=days - 1 - i)
+        weight = GROWTH_START + (1 - GROWTH_START) * i / max(days - 1, 1)
+        if day.weekday() >= 5:
+            weight *= WEEKEND_FACTOR
+        weights.append((day, weight))
+    return weights
+
+
+def spread(total, weights):
+    """Split `total` rows over days in proportion to their weights"""
+    weight_sum = sum(weight for _, weight in weights)
+    counts, assigned = [], 0
+    for day, weight in weights:
+        count = round(total * weight / weight_sum)
+        counts.append((day, count))
+        assigned += count
+    day, count = counts[-1]
+    counts[-1] = (day, max(count + total - assigned, 0))
+    return counts
+
+
+def timestamps(rng, day, count):
+    """`count` sorted 'YYYY-MM-DD HH:MM:SS' strings on `day` following HOUR_WEIGHTS"""
+    hours = rng.choices(range(24), cum_weights=HOUR_CUM_WEIGHTS, k=count)
+    rand = rng.random
+    seconds = sorted(hour * 3600 + int(rand() * 3600) for hour in hours)
+    prefix = day.isoformat()
+    return [f"{prefix} {s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in seconds]
+
+
+def intern_user_agents(conn):
+    """([user_agent_id], cumulative weights) for user_agent_mix()"""
+    cache = UserAgentCache(maxsize=1024)
+    mix = user_agent_mix()
+    ids = [intern_user_agent(conn, user_agent, cache)[0] for user_agent, _ in mix]
+    return ids, list(accumulate(weight for _, weight in mix))
+
+
+def analytics_rows(rng, ua_ids, ua_cum, count, days, end):
+    """Page view rows in created_at order"""
+    domains, domain_cum = list(DOMAIN_WEIGHTS), list(accumulate(DOMAIN_WEIGHTS.values()))
+    paths, path_cum = list(PATH_WEIGHTS), list(accumulate(PATH_WEIGHTS.values()))
+    ips = [f"{rng.randrange(1, 224)}.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}"
+           for _ in range(IP_POOL_SIZE)]
+
+    for day, day_count in spread(count, day_weights(days, end)):
+        # Draw whole days at once: choices(k=n) is much faster than n single draws
+        yield from zip(rng.choices(domains, cum_weights=domain_cum, k=day_count),
+                       rng.choices(paths, cum_weights=path_cum, k=day_count),
+                       rng.choices(ua_ids, cum_weights=ua_cum, k=day_count),
+                       rng.choices(ips, k=day_count),
+                       timestamps(rng, day, day_count))
+
+
+def business(rng, vertical):
+    first, second = BUSINESS_NAMES[vertical]
+    return f"{rng.choice(first)} {rng.choice(second)}"
+
+
+def next_id(conn, table):
+    """Id the next INSERT into an AUTOINCREMENT table will get"""
+    row = conn.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (table,)).fetchone()
+    largest = conn.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}').fetchone()[0]
+    return max(row[0] if row else 0, largest) + 1
+
+
+def trial_rows(rng, count, days, end, first_id=1):
+    """Trial request rows in created_at order, triaged except on the last day
+
+    Rows must be inserted in order starting at id `first_id`, which
+    duplicate_of refers to.
+    """
+    domains, domain_cum = list(DOMAIN_WEIGHTS), list(accumulate(DOMAIN_WEIGHTS.values()))
+    outcomes, outcome_cum = list(TRIAGE_OUTCOMES), list(accumulate(TRIAGE_OUTCOMES.values()))
+    originals = []
+    row_id = first_id - 1
+    for day, day_count in spread(count, day_weights(days, end)):
+        pending = day == end
+        for created_at in timestamps(rng, day, day_count):
+            row_id += 1
+            vertical = rng.choices(domains, cum_weights=domain_cum)[0]
+            status = 'pending' if pending else rng.choices(outcomes, cum_weights=outcome_cum)[0]
+            duplicate_of = None
+            if status == 'duplicate' and originals:
+                # The same person signing up again for the same site
+                duplicate_of, email, website_url, name, normalized_url = rng.choice(originals)
+            else:
+                if status == 'duplicate':
+                    status = 'qualified'
+                name = business(rng, vertical)
+                slug = ''.join(c for c in name.lower() if c.isalnum())
+                host = f"{slug}{row_id}.{rng.choice(TLDS)}"
+                email = f"{rng.choice(FIRST_NAMES)}.{rng.choice(LAST_NAMES)}{row_id}@{host}"
+                normalized_url = f"https://www.{host}"
+                website_url = f"{slug} website" if status == 'invalid' else f"www.{host}"
+            if status in ('pending', 'invalid'):
+                normalized_url = None
+            if status == 'qualified':
+                originals.append((row_id, email, website_url, name, normalized_url))
+            yield (email, website_url, name, f"555-{rng.randrange(10000):04d}", created_at, status,
+                   normalized_url, 200 if status == 'qualified' else None,
+                   None if pending else created_at, duplicate_of)
+
+
+def user_rows(rng, count, qualified, end):
+    """Accounts for a sample of qualified trials, a few days after their signup"""
+    last = datetime.combine(end, datetime.max.time()).replace(microsecond=0)
+    sample = sorted(rng.sample(qualified, min(count, len(qualified))), key=lambda row: row[3])
+    for email, website_url, name, created_at in sample:
+        created = datetime.fromisoformat(created_at) + timedelta(hours=rng.randrange(1, 96))
+        yield (email, DISABLED_PASSWORD, website_url, name, f"555-{rng.randrange(10000):04d}",
+               min(created, last).isoformat(' '))
+    for i in range(count - len(sample)):
+        yield (f"user{i}@example.com", DISABLED_PASSWORD, None, None, None, last.isoformat(' '))
+
+
+def bulk_insert(conn, sql, rows, label, progress):
+    """executemany in CHUNK_SIZE slices inside one write transaction; returns rows inserted
+
+    `rows` may be a generator: it is first advanced after the write lock is
+    taken, so it can read ids that no other writer will take meanwhile.
+    """
+    start = time.perf_counter()
+    conn.execute('BEGIN IMMEDIATE')
+    changes = conn.total_changes
+    try:
+        while True:
+            chunk = [row for _, row in zip(range(CHUNK_SIZE), rows)]
+            if not chunk:
+                break
+            conn.executemany(sql, chunk)
+        total = conn.total_changes - changes
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+    if progress:
+        elapsed = time.perf_counter() - start
+        progress(f"   • {label}: {total:,} rows in {elapsed:.1f}s ({total / elapsed if elapsed else 0:,.0f} rows/s)")
+    return total
+
+
+def generate(database, profile='small', seed=DEFAULT_SEED, end=None, progress=None):
+    """Migrate `database` if needed and add a profile's worth of rows; returns {table: rows}"""
+    sizes = SCALE_PROFILES[profile] if isinstance(profile, str) else profile
+    end = end or datetime.now(timezone.utc).date()
+    rng = random.Random(seed)
+    migrate(database)
+
+    conn = sqlite3.connect(database, isolation_level=None)
+    try:
+        # Bulk load settings for this connection only; the database stays in WAL mode
+        conn.execute('PRAGMA synchronous=OFF')
+        conn.execute('PRAGMA cache_size=-262144')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        counts = {}
+
+        conn.execute('BEGIN')
+        ua_ids, ua_cum = intern_user_agents(conn)
+        conn.execute('COMMIT')
+        counts['analytics'] = bulk_insert(conn, '''
+            INSERT INTO analytics (domain, page_path, user_agent_id, ip_address, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', analytics_rows(rng, ua_ids, ua_cum, sizes['analytics'], sizes['days'], end),
+            'analytics', progress)
+
+        qualified = []
+
+        def trials():
+            # Runs inside bulk_insert's IMMEDIATE transaction, so the ids are ours
+            first_id = next_id(conn, 'trial_requests')
+            for row in trial_rows(rng, sizes['trial_requests'], sizes['days'], end, first_id):
+                if row[5] == 'qualified':
+                    qualified.append((row[0], row[1], row[2], row[4]))
+                yield row
+
+        counts['trial_requests'] = bulk_insert(conn, '''
+            INSERT INTO trial_requests (email, website_url, business_name, phone, created_at, status,
+                                        normalized_url, http_status, triaged_at, duplicate_of)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', trials(), 'trial_requests', progress)
+
+        counts['users'] = bulk_insert(conn, '''
+            INSERT OR IGNORE INTO users (email, password_hash, website_url, business_name, phone, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', user_rows(rng, sizes['users'], qualified, end), 'users', progress)
+        return counts
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'profiles'
+    if command == 'profiles':
+        for name, sizes in SCALE_PROFILES.items():
+            print(f"   • {name:7} {sizes['analytics']:>11,} analytics  {sizes['trial_requests']:>8,} trials  "
+                  f"{sizes['users']:>8,} users over {sizes['days']} days")
+    elif command == 'generate' and len(sys.argv) > 2 and sys.argv[2] in SCALE_PROFILES:
+        profile = sys.argv[2]
+        database = sys.argv[3] if len(sys.argv) > 3 else SYNTHETIC_DATABASE
+        seed = int(sys.argv[4]) if len(sys.argv) > 4 else DEFAULT_SEED
+        start = time.perf_counter()
+        generate(database, profile, seed, progress=print)
+        print(f"✅ {database}: added the '{profile}' profile (seed {seed}) in {time.perf_counter() - start:.1f}s")
+    else:
+        print(__doc__)
+        sys.exit(1)
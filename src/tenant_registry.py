@@ -0,0 +1,288 @@
+"""
+EdGPT Platform - Tenant Registry
+Hot-reloadable domain -> (template, signup template, config) registry
+
+Tenants live in the `tenants` table of the main database. Each worker holds an
+immutable TenantSnapshot and resolves hosts against it without locks. Writers
+bump a generation number in SQLite and mirror it into a small memory-mapped
+counter file; on the next request each worker sees a number different from
+its snapshot's and swaps in a freshly loaded snapshot, so new domains go live
+without a restart. The counter always holds the database's committed
+generation, copied under an exclusive lock, so a restored or reset database
+is picked up once rather than reloaded on every request.
+
+The built-in verticals are seeded from code on boot and updated whenever
+their templates or config in code change.
+
+Usage:
+    python src/tenant_registry.py list
+    python src/tenant_registry.py add <domain> <template> <signup_template> '<config json>'
+    python src/tenant_registry.py remove <domain>
+"""
+
+import fcntl
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from types import MappingProxyType
+
+DEFAULT_DOMAIN = 'edgpt.ai'
+COUNTER = struct.Struct('<Q')
+
+Tenant = namedtuple('Tenant', ['domain', 'template', 'signup_template', 'config'])
+
+
+def create_tenant_tables(conn):
+    """Create the tenants table and its generation counter row"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS tenants (
+            domain TEXT PRIMARY KEY,
+            template TEXT NOT NULL,
+            signup_template TEXT NOT NULL,
+            config TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS tenant_registry_meta (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            generation INTEGER NOT NULL
+        )
+    ''')
+    conn.execute('INSERT OR IGNORE INTO tenant_registry_meta (id, generation) VALUES (1, 1)')
+
+
+def bump_generation(conn):
+    """Increment the registry generation inside the caller's transaction"""
+    conn.execute('UPDATE tenant_registry_meta SET generation = generation + 1 WHERE id = 1')
+    return read_generation(conn)
+
+
+def read_generation(conn):
+    return conn.execute('SELECT generation FROM tenant_registry_meta WHERE id = 1').fetchone()[0]
+
+
+def seed_tenants(conn, templates, signup_templates, configs):
+    """Insert the built-in tenants or update them to match the code; returns rows changed"""
+    changed = 0
+    for domain, config in configs.items():
+        cursor = conn.execute('''
+            INSERT INTO tenants (domain, template, signup_template, config)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(domain) DO UPDATE SET
+                template = excluded.template,
+                signup_template = excluded.signup_template,
+                config = excluded.config,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE template != excluded.template OR signup_template != excluded.signup_template
+               OR config != excluded.config
+        ''', (domain, templates[domain], signup_templates[domain], json.dumps(config)))
+        changed += cursor.rowcount
+    if changed:
+        bump_generation(conn)
+    return changed
+
+
+def tenants_match(snapshot, templates, signup_templates, configs):
+    """True when every built-in tenant in `snapshot` matches the code (no seeding needed)"""
+    for domain, config in configs.items():
+        tenant = snapshot.tenants.get(domain)
+        if (tenant is None or tenant.template != templates[domain]
+                or tenant.signup_template != signup_templates[domain]
+                or dict(tenant.config) != json.loads(json.dumps(config))):
+            return False
+    return True
+
+
+class TenantSnapshot:
+    """Immutable view of every tenant at one registry generation"""
+
+    __slots__ = ('generation', 'tenants', 'default')
+
+    def __init__(self, generation, tenants, default_domain=DEFAULT_DOMAIN):
+        self.generation = generation
+        self.tenants = MappingProxyType(tenants)
+        self.default = tenants.get(default_domain)
+
+    def match(self, host):
+        """Exact match, then parent domains label by label (www.x.ai -> x.ai)"""
+        domain = host.split(':')[0].lower().rstrip('.')
+        tenants = self.tenants
+        tenant = tenants.get(domain)
+        while tenant is None:
+            dot = domain.find('.')
+            if dot < 0:
+                return None
+            domain = domain[dot + 1:]
+            tenant = tenants.get(domain)
+        return tenant
+
+    def resolve(self, host):
+        """Matching tenant, or the default tenant for unknown hosts"""
+        return self.match(host) or self.default
+
+
+class GenerationCounter:
+    """Memory-mapped 8-byte counter shared by every worker on the host"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o644), 'r+b')
+        with self._locked():
+            if os.fstat(self._file.fileno()).st_size < COUNTER.size:
+                self._file.write(COUNTER.pack(0))
+                self._file.flush()
+        self._map = mmap.mmap(self._file.fileno(), COUNTER.size)
+
+    @contextmanager
+    def _locked(self):
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def read(self):
+        return COUNTER.unpack_from(self._map, 0)[0]
+
+    def sync(self, database):
+        """Copy the database's committed generation into the counter; returns it
+
+        The read and the write happen under an exclusive lock, so publishers
+        that race store generations in commit order and the counter ends at
+        the latest one, even when that is lower than before (a restore).
+        """
+        with self._locked():
+            conn = sqlite3.connect(database)
+            try:
+                generation = read_generation(conn)
+            finally:
+                conn.close()
+            COUNTER.pack_into(self._map, 0, generation)
+        return generation
+
+
+class TenantRegistry:
+    """Per-worker holder of the current snapshot with lock-free reads"""
+
+    def __init__(self, database, counter_path=None):
+        self.database = database
+        self.counter = GenerationCounter(counter_path or f"{database}.tenants")
+        self._reload_lock = threading.Lock()
+        self._snapshot = self._load()
+        if self.counter.read() != self._snapshot.generation:
+            self.counter.sync(database)
+
+    def _load(self):
+        conn = sqlite3.connect(self.database)
+        try:
+            # One read transaction so the generation matches the rows
+            conn.execute('BEGIN')
+            generation = read_generation(conn)
+            rows = conn.execute(
+                'SELECT domain, template, signup_template, config FROM tenants').fetchall()
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+        tenants = {
+            domain: Tenant(domain, template, signup_template, MappingProxyType(json.loads(config)))
+            for domain, template, signup_template, config in rows
+        }
+        return TenantSnapshot(generation, tenants)
+
+    def snapshot(self):
+        """Current snapshot, reloading first if another process published changes"""
+        snapshot = self._snapshot
+        if self.counter.read() != snapshot.generation:
+            # Only one thread reloads; the others keep serving the old snapshot
+            if self._reload_lock.acquire(blocking=False):
+                try:
+                    snapshot = self._snapshot = self._load()
+                    if self.counter.read() != snapshot.generation:
+                        # Counter out of step with the database (restored, reset or
+                        # a publisher died mid-way): repair it instead of reloading forever
+                        self.counter.sync(self.database)
+                finally:
+                    self._reload_lock.release()
+        return snapshot
+
+    def resolve(self, host):
+        return self.snapshot().resolve(host)
+
+    def publish(self):
+        """Make committed changes visible to every worker
+
+        The counter takes the database's current generation, which is at
+        least any generation committed before this call.
+        """
+        return self.counter.sync(self.database)
+
+
+def upsert_tenant(registry, domain, template, signup_template, config):
+    """Add or replace a tenant and publish the new generation"""
+    conn = sqlite3.connect(registry.database)
+    try:
+        with conn:
+            conn.execute('''
+                INSERT INTO tenants (domain, template, signup_template, config)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(domain) DO UPDATE SET
+                    template = excluded.template,
+                    signup_template = excluded.signup_template,
+                    config = excluded.config,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', (domain.lower(), template, signup_template, json.dumps(config)))
+            generation = bump_generation(conn)
+    finally:
+        conn.close()
+    registry.publish()
+    return generation
+
+
+def remove_tenant(registry, domain):
+    """Delete a tenant and publish the new generation
+
+    The default tenant serves every host that matches no other, so it can be
+    replaced but never removed.
+    """
+    if domain.lower() == DEFAULT_DOMAIN:
+        raise ValueError(f"{DEFAULT_DOMAIN} is the default tenant and cannot be removed")
+    conn = sqlite3.connect(registry.database)
+    try:
+        with conn:
+            conn.execute('DELETE FROM tenants WHERE domain = ?', (domain.lower(),))
+            generation = bump_generation(conn)
+    finally:
+        conn.close()
+    registry.publish()
+    return generation
+
+
+if __name__ == '__main__':
+    database = os.environ.get('DATABASE', 'edgpt_platform.db')
+    command = sys.argv[1] if len(sys.argv) > 1 else 'list'
+    registry = TenantRegistry(database)
+    if command == 'list':
+        snapshot = registry.snapshot()
+        print(f"generation {snapshot.generation}, {len(snapshot.tenants)} tenants")
+        for tenant in sorted(snapshot.tenants.values()):
+            print(f"   • {tenant.domain} → {tenant.template} / {tenant.signup_template}")
+    elif command == 'add' and len(sys.argv) == 6:
+        generation = upsert_tenant(registry, sys.argv[2], sys.argv[3], sys.argv[4], json.loads(sys.argv[5]))
+        print(f"✅ {sys.argv[2]} saved, registry generation {generation}")
+    elif command == 'remove' and len(sys.argv) == 3:
+        try:
+            generation = remove_tenant(registry, sys.argv[2])
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"✅ {sys.argv[2]} removed, registry generation {generation}")
+    else:
+        print(__doc__)
+        sys.exit(1)
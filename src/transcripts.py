@@ -0,0 +1,625 @@
+"""
+EdGPT Platform - Conversation Transcript Log
+Append-only, per-tenant segment files for widget chat turns
+
+Chat turns never touch edgpt_platform.db, so they cannot contend with the
+analytics and signup writers. Each tenant has a directory under
+TRANSCRIPT_DIR:
+
+    active-<pid>.log       segment the worker <pid> is appending to
+    s-<ns>-<pid>.log/.idx  sealed segment and its index
+    c-<first>-<last>.zseg  compacted segment replacing the sealed ones in
+    c-<first>-<last>.zidx  that <ns> range, one zlib block per conversation
+
+Records are length-prefixed: <u32 length><u32 crc32><JSON payload>. An
+index file holds fixed-size (conversation hash, offset, length) entries
+sorted by hash. Only every INDEX_STRIDE-th hash is kept in memory, and a
+lookup reads one stride of entries from disk. Every worker appends to its
+own active segment with single write() calls; readers index active
+segments incrementally from the last byte they saw.
+
+Sealed segments are merged, grouped per conversation and compressed by a
+separate compactor process (`watch`), never inside a web worker; workers
+only seal their own idle segments. Compacted segments are merged again
+once TIER_FANOUT adjacent ones share a size tier, so the number of
+segments a read probes grows with the log of the data, not with time.
+Merges walk the sorted indexes and hold one conversation in memory at a
+time. Reading a conversation costs one index probe and one read per
+segment, never a scan of the segment.
+
+Compacting sealed segments is also when new messages are announced: the
+`watch` compactor adds one "N new messages in M conversations" line per
+tenant per pass to the tenant's new-message digest, so chat traffic never
+writes to edgpt_platform.db.
+
+Usage:
+    python src/transcripts.py compact [tenant]    # compact sealed segments now
+    python src/transcripts.py watch               # compact every TRANSCRIPT_COMPACT_INTERVAL seconds
+    python src/transcripts.py stats               # segments and bytes per tenant
+"""
+
+import atexit
+import bisect
+import fcntl
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import re
+import struct
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from operator import itemgetter
+
+from flask import request
+
+from email_queue import queue_digest
+
+TRANSCRIPT_DIR = os.environ.get('TRANSCRIPT_DIR', 'transcripts')
+SEGMENT_BYTES = int(os.environ.get('TRANSCRIPT_SEGMENT_MB', '16')) * 1024 * 1024
+SEGMENT_MAX_AGE = float(os.environ.get('TRANSCRIPT_SEGMENT_MAX_AGE', '3600'))
+COMPACT_INTERVAL = float(os.environ.get('TRANSCRIPT_COMPACT_INTERVAL', '300'))
+SEAL_INTERVAL = 60
+# Sealed segments younger than this are left alone, so a rename still in
+# flight in another worker can never fall inside a compacted range
+COMPACT_MIN_AGE = 60
+COMPACT_MAX_BYTES = 256 * 1024 * 1024
+# Compacted segments below TIER_BASE_BYTES are tier 0; each tier is TIER_FANOUT times larger
+TIER_BASE_BYTES = 1024 * 1024
+TIER_FANOUT = 4
+INDEX_STRIDE = 64
+INDEX_CACHE_SIZE = 256
+MAX_TEXT = 8000
+# MAX_TEXT characters, even \u-escaped, plus the JSON envelope
+MAX_PAYLOAD = 6 * MAX_TEXT + 1024
+
+RECORD_HEADER = struct.Struct('<II')
+INDEX_ENTRY = struct.Struct('<QQI')
+ACTIVE_NAME = re.compile(r'^active-(\d+)\.log$')
+SEALED_NAME = re.compile(r'^s-(\d+)-(\d+)\.log$')
+COMPACTED_NAME = re.compile(r'^c-(\d+)-(\d+)\.zseg$')
+TENANT_NAME = re.compile(r'^[a-z0-9.-]+$')
+CONVERSATION_ID = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+
+
+def conversation_key(conversation_id):
+    return int.from_bytes(hashlib.blake2b(conversation_id.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def encode_record(payload):
+    data = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return RECORD_HEADER.pack(len(data), zlib.crc32(data)) + data
+
+
+def iter_records(buffer, start=0):
+    """(offset, length, payload) for each complete record; stops at a torn tail"""
+    offset = start
+    while offset + RECORD_HEADER.size <= len(buffer):
+        length, crc = RECORD_HEADER.unpack_from(buffer, offset)
+        end = offset + RECORD_HEADER.size + length
+        if end > len(buffer):
+            break
+        data = bytes(buffer[offset + RECORD_HEADER.size:end])
+        if zlib.crc32(data) != crc:
+            break
+        yield offset, end - offset, json.loads(data)
+        offset = end
+
+
+def iter_index(path):
+    """Every (key, offset, length) entry of an index file, in key order"""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(INDEX_STRIDE * 64 * INDEX_ENTRY.size)
+            if not chunk:
+                return
+            yield from INDEX_ENTRY.iter_unpack(chunk)
+
+
+def size_tier(size):
+    tier = 0
+    while size >= TIER_BASE_BYTES:
+        size //= TIER_FANOUT
+        tier += 1
+    return tier
+
+
+def split_compacted(names):
+    """(visible, superseded) compacted (first, last, name) segments
+
+    A merge writes its output before removing its inputs, so for a moment
+    (or for good, after a crash) a range can sit inside a wider one; only
+    the widest is read.
+    """
+    ranges = []
+    for name in names:
+        match = COMPACTED_NAME.match(name)
+        if match:
+            ranges.append((int(match[1]), int(match[2]), name))
+    visible, superseded, covered = [], [], -1
+    for first, last, name in sorted(ranges, key=lambda r: (r[0], -r[1])):
+        if last <= covered:
+            superseded.append((first, last, name))
+        else:
+            visible.append((first, last, name))
+            covered = last
+    return visible, superseded
+
+
+class SegmentIndex:
+    """Sorted (key, offset, length) entries on disk with every INDEX_STRIDE-th key in memory"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            self.count = f.tell() // INDEX_ENTRY.size
+            self.sparse = []
+            for i in range(0, self.count, INDEX_STRIDE):
+                f.seek(i * INDEX_ENTRY.size)
+                self.sparse.append(INDEX_ENTRY.unpack(f.read(INDEX_ENTRY.size))[0])
+
+    @staticmethod
+    def write(path, entries):
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            for entry in sorted(entries):
+                f.write(INDEX_ENTRY.pack(*entry))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def lookup(self, key):
+        """[(offset, length)] for a conversation key"""
+        # The stride before the first sparse key >= key may hold earlier matches
+        block = max(bisect.bisect_left(self.sparse, key) - 1, 0)
+        found = []
+        with open(self.path, 'rb') as f:
+            f.seek(block * INDEX_STRIDE * INDEX_ENTRY.size)
+            while True:
+                chunk = f.read(INDEX_STRIDE * INDEX_ENTRY.size)
+                if not chunk:
+                    return found
+                for entry_key, offset, length in INDEX_ENTRY.iter_unpack(chunk):
+                    if entry_key > key:
+                        return found
+                    if entry_key == key:
+                        found.append((offset, length))
+
+
+class TailIndex:
+    """Conversation offsets in a growing active segment, indexed from the last byte seen"""
+
+    def __init__(self, path):
+        self.path = path
+        self.indexed = 0
+        self.offsets = {}
+
+    def add(self, key, offset, length):
+        self.offsets.setdefault(key, []).append((offset, length))
+
+    def catch_up(self):
+        with open(self.path, 'rb') as f:
+            f.seek(self.indexed)
+            tail = f.read()
+        end = 0
+        for offset, length, payload in iter_records(tail):
+            self.add(conversation_key(payload['c']), self.indexed + offset, length)
+            end = offset + length
+        self.indexed += end
+
+
+class TranscriptLog:
+    """Per-tenant transcript segments for one worker process"""
+
+    def __init__(self, root=TRANSCRIPT_DIR, segment_bytes=SEGMENT_BYTES,
+                 segment_max_age=SEGMENT_MAX_AGE, seal_interval=SEAL_INTERVAL):
+        self.root = root
+        self.segment_bytes = segment_bytes
+        self.segment_max_age = segment_max_age
+        self.seal_interval = seal_interval
+        self._sealer_pid = None
+        self._lock = threading.Lock()
+        self._active = {}
+        self._tails = {}
+        self._indexes = OrderedDict()
+        self._pid = os.getpid()
+        self.stats = {'appended': 0, 'sealed': 0, 'compacted': 0}
+        atexit.register(self.close)
+
+    def tenant_dir(self, tenant):
+        if not TENANT_NAME.match(tenant):
+            raise ValueError(f'Invalid tenant name: {tenant}')
+        path = os.path.join(self.root, tenant)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    # Writing
+
+    def append(self, tenant, conversation_id, role, text):
+        """Append one chat turn; returns its timestamp"""
+        ts = time.time()
+        record = encode_record({'c': conversation_id, 'r': role, 't': text[:MAX_TEXT], 'ts': ts})
+        self._ensure_sealer()
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked worker: never append to the parent's segment
+                self._pid, self._active, self._tails = os.getpid(), {}, {}
+            active = self._active.get(tenant)
+            if active is None:
+                active = self._open_active(tenant)
+            fd, tail, opened_at = active
+            offset = os.lseek(fd, 0, os.SEEK_END)
+            os.write(fd, record)
+            tail.add(conversation_key(conversation_id), offset, len(record))
+            tail.indexed = offset + len(record)
+            self.stats['appended'] += 1
+            if tail.indexed >= self.segment_bytes or time.monotonic() - opened_at >= self.segment_max_age:
+                self._seal(tenant)
+        return ts
+
+    def _open_active(self, tenant):
+        path = os.path.join(self.tenant_dir(tenant), f'active-{os.getpid()}.log')
+        if os.path.exists(path):
+            # Left by a previous worker with this pid; seal it before reuse
+            self._seal_file(path)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        tail = TailIndex(path)
+        self._tails[path] = tail
+        self._active[tenant] = (fd, tail, time.monotonic())
+        return self._active[tenant]
+
+    def _seal(self, tenant):
+        fd, tail, _ = self._active.pop(tenant)
+        os.fsync(fd)
+        os.close(fd)
+        self._seal_file(tail.path, tail)
+
+    def _seal_file(self, path, tail=None):
+        if tail is None:
+            tail = TailIndex(path)
+            tail.catch_up()
+        base = os.path.join(os.path.dirname(path), f's-{time.time_ns()}-{os.getpid()}')
+        entries = [(key, offset, length) for key, positions in tail.offsets.items()
+                   for offset, length in positions]
+        # Index first, then the atomic rename: a sealed .log always has its .idx
+        SegmentIndex.write(base + '.idx', entries)
+        os.truncate(path, tail.indexed)
+        os.rename(path, base + '.log')
+        self._tails.pop(path, None)
+        self.stats['sealed'] += 1
+
+    def close(self):
+        """Seal every active segment (worker shutdown)"""
+        with self._lock:
+            for tenant in list(self._active):
+                self._seal(tenant)
+
+    # Reading
+
+    def _segment_index(self, path):
+        # LRU: compacted-away segments fall out instead of piling up
+        with self._lock:
+            index = self._indexes.get(path)
+            if index is not None:
+                self._indexes.move_to_end(path)
+                return index
+        index = SegmentIndex(path)
+        with self._lock:
+            self._indexes[path] = index
+            if len(self._indexes) > INDEX_CACHE_SIZE:
+                self._indexes.popitem(last=False)
+        return index
+
+    def _listing(self, directory):
+        names = os.listdir(directory)
+        compacted, _ = split_compacted(names)
+        sealed = []
+        for name in names:
+            match = SEALED_NAME.match(name)
+            if match and not any(first <= int(match[1]) <= last for first, last, _ in compacted):
+                sealed.append((int(match[1]), name))
+        active = [name for name in names if ACTIVE_NAME.match(name)]
+        return compacted, sorted(sealed), active
+
+    def read(self, tenant, conversation_id):
+        """Every turn of a conversation, oldest first"""
+        directory = self.tenant_dir(tenant)
+        key = conversation_key(conversation_id)
+        for _ in range(3):
+            try:
+                turns = self._read(directory, key)
+                break
+            except FileNotFoundError:
+                # A segment was sealed or compacted under us; list again
+                continue
+        else:
+            turns = self._read(directory, key)
+        turns = [turn for turn in turns if turn['c'] == conversation_id]
+        turns.sort(key=lambda turn: turn['ts'])
+        return [{'role': t['r'], 'text': t['t'], 'ts': t['ts']} for t in turns]
+
+    def _read(self, directory, key):
+        compacted, sealed, active = self._listing(directory)
+        turns = []
+        for _, _, name in compacted:
+            path = os.path.join(directory, name)
+            positions = self._segment_index(path[:-len('.zseg')] + '.zidx').lookup(key)
+            with open(path, 'rb') as f:
+                for offset, length in positions:
+                    f.seek(offset)
+                    block = zlib.decompress(f.read(length))
+                    turns.extend(payload for _, _, payload in iter_records(block))
+        for _, name in sealed:
+            path = os.path.join(directory, name)
+            positions = self._segment_index(path[:-len('.log')] + '.idx').lookup(key)
+            turns.extend(read_positions(path, positions))
+        for name in active:
+            path = os.path.join(directory, name)
+            with self._lock:
+                tail = self._tails.get(path)
+                if tail is None:
+                    tail = self._tails[path] = TailIndex(path)
+                tail.catch_up()
+                positions = list(tail.offsets.get(key, ()))
+            turns.extend(read_positions(path, positions))
+        live = {os.path.join(directory, name) for name in active}
+        with self._lock:
+            for path in [p for p in self._tails if p.startswith(directory + os.sep) and p not in live]:
+                del self._tails[path]
+        return turns
+
+    # Compaction
+
+    def compact(self, tenant, min_age=COMPACT_MIN_AGE, on_compacted=None):
+        """Compact sealed segments, then merge compacted ones by tier; returns segments merged
+
+        `on_compacted(tenant, turns, conversations)` is called with the
+        number of turns newly moved out of sealed segments.
+        """
+        directory = self.tenant_dir(tenant)
+        with open(os.path.join(directory, '.compact.lock'), 'w') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return 0  # another process is compacting this tenant
+            self._seal_orphans(directory)
+            self._remove_superseded(directory)
+            merged = self._compact_sealed(directory, min_age, tenant, on_compacted)
+            while True:
+                count = self._merge_tier(directory)
+                if not count:
+                    return merged
+                merged += count
+
+    def _compact_sealed(self, directory, min_age, tenant, on_compacted):
+        cutoff = time.time_ns() - int(min_age * 1e9)
+        _, sealed, _ = self._listing(directory)
+        # Oldest first, bounded so one pass never rewrites more than COMPACT_MAX_BYTES
+        batch, total = [], 0
+        for ns, name in sealed:
+            total += os.path.getsize(os.path.join(directory, name))
+            if ns > cutoff or (batch and total > COMPACT_MAX_BYTES):
+                break
+            batch.append((ns, name))
+        if not batch:
+            return 0
+        stems = [os.path.join(directory, name[:-len('.log')]) for _, name in batch]
+        turns, conversations = self._write_merged(
+            os.path.join(directory, f'c-{batch[0][0]}-{batch[-1][0]}'),
+            [(stem + '.log', stem + '.idx', False) for stem in stems])
+        self._remove(stem + ext for stem in stems for ext in ('.log', '.idx'))
+        self.stats['compacted'] += len(batch)
+        if on_compacted is not None and turns:
+            on_compacted(tenant, turns, conversations)
+        return len(batch)
+
+    def _merge_tier(self, directory):
+        """Merge the oldest TIER_FANOUT adjacent compacted segments of one size tier"""
+        compacted, _, _ = self._listing(directory)
+        tiers = [size_tier(os.path.getsize(os.path.join(directory, name))) for _, _, name in compacted]
+        for i in range(len(compacted) - TIER_FANOUT + 1):
+            if len(set(tiers[i:i + TIER_FANOUT])) == 1:
+                run = compacted[i:i + TIER_FANOUT]
+                break
+        else:
+            return 0
+        stems = [os.path.join(directory, name[:-len('.zseg')]) for _, _, name in run]
+        self._write_merged(os.path.join(directory, f'c-{run[0][0]}-{run[-1][1]}'),
+                           [(stem + '.zseg', stem + '.zidx', True) for stem in stems])
+        self._remove(stem + ext for stem in stems for ext in ('.zseg', '.zidx'))
+        self.stats['compacted'] += len(run)
+        return len(run)
+
+    def _write_merged(self, base, sources):
+        """Write base.zseg/.zidx from (segment, index, compressed) sources in index order
+
+        The indexes are sorted by conversation key, so a k-way merge of them
+        yields every conversation's records together and only one
+        conversation is held in memory at a time. Returns (index entries
+        read, conversations written); for sealed sources that is turns.
+        """
+        def entries(n, index_path):
+            for key, offset, length in iter_index(index_path):
+                yield key, n, offset, length
+
+        files = [open(path, 'rb') for path, _, _ in sources]
+        entries_read = conversations = 0
+        try:
+            merged = heapq.merge(*(entries(n, index_path) for n, (_, index_path, _) in enumerate(sources)))
+            with open(base + '.zseg.tmp', 'wb') as out, open(base + '.zidx.tmp', 'wb') as index:
+                for key, group in itertools.groupby(merged, key=itemgetter(0)):
+                    parts = []
+                    for _, n, offset, length in group:
+                        entries_read += 1
+                        files[n].seek(offset)
+                        data = files[n].read(length)
+                        parts.append(zlib.decompress(data) if sources[n][2] else data)
+                    block = zlib.compress(b''.join(parts), 6)
+                    index.write(INDEX_ENTRY.pack(key, out.tell(), len(block)))
+                    out.write(block)
+                    conversations += 1
+                for f in (out, index):
+                    f.flush()
+                    os.fsync(f.fileno())
+        finally:
+            for f in files:
+                f.close()
+        os.replace(base + '.zidx.tmp', base + '.zidx')
+        # The .zseg name is what readers look for, so it goes last
+        os.replace(base + '.zseg.tmp', base + '.zseg')
+        return entries_read, conversations
+
+    def _remove(self, paths):
+        for path in paths:
+            os.remove(path)
+            with self._lock:
+                self._indexes.pop(path, None)
+
+    def _remove_superseded(self, directory):
+        """Delete inputs a crashed compaction left behind next to its output"""
+        names = os.listdir(directory)
+        visible, superseded = split_compacted(names)
+        stale = [name[:-len('.zseg')] + ext for _, _, name in superseded for ext in ('.zseg', '.zidx')]
+        for name in names:
+            match = SEALED_NAME.match(name)
+            if match and any(first <= int(match[1]) <= last for first, last, _ in visible):
+                stale += [name, name[:-len('.log')] + '.idx']
+        self._remove(os.path.join(directory, name) for name in stale
+                     if os.path.exists(os.path.join(directory, name)))
+
+    def _seal_orphans(self, directory):
+        """Seal active segments left behind by workers that have exited"""
+        for name in os.listdir(directory):
+            match = ACTIVE_NAME.match(name)
+            if not match or int(match[1]) == os.getpid():
+                continue
+            try:
+                os.kill(int(match[1]), 0)
+            except ProcessLookupError:
+                self._seal_file(os.path.join(directory, name))
+            except PermissionError:
+                pass  # alive, owned by another user
+
+    def tenants(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.isdir(os.path.join(self.root, name)))
+
+    def _ensure_sealer(self):
+        # Started lazily so each forked gunicorn worker gets its own thread
+        if self._sealer_pid != os.getpid():
+            self._sealer_pid = os.getpid()
+            threading.Thread(target=self._run_sealer, name='transcript-sealer', daemon=True).start()
+
+    def _run_sealer(self):
+        """Seal this worker's idle segments so the compactor can pick them up"""
+        while True:
+            time.sleep(self.seal_interval)
+            with self._lock:
+                for tenant, active in list(self._active.items()):
+                    if time.monotonic() - active[2] >= self.segment_max_age:
+                        try:
+                            self._seal(tenant)
+                        except OSError as e:
+                            print(f"Transcript seal error for {tenant}: {e}")
+
+
+def register_transcript_routes(app, log, find_tenant):
+    """Add POST /widget/messages/<site>, which the widget runtime calls for each turn"""
+
+    @app.route('/widget/messages/<site>', methods=['POST'])
+    def widget_message(site):
+        # Anonymous endpoint: refuse large bodies before reading, and never read more than needed
+        if (request.content_length or 0) > MAX_PAYLOAD:
+            return '', 413
+        body = request.stream.read(MAX_PAYLOAD + 1)
+        if len(body) > MAX_PAYLOAD:
+            return '', 413
+        tenant = find_tenant(site.lower())
+        # Sent as text/plain like the page beacon, so no CORS preflight
+        try:
+            data = json.loads(body or b'{}')
+        except ValueError:
+            data = None
+        if tenant is None or not isinstance(data, dict):
+            return '', 400
+        conversation_id = data.get('conversation_id')
+        text = data.get('text')
+        if not isinstance(conversation_id, str) or not CONVERSATION_ID.match(conversation_id):
+            return '', 400
+        # Visitors only ever write their own turns; assistant turns come from the server
+        if not isinstance(text, str) or not text.strip() or data.get('role', 'user') != 'user':
+            return '', 400
+        log.append(tenant.domain, conversation_id, 'user', text.strip())
+        return '', 204
+
+    return log
+
+
+def read_positions(path, positions):
+    turns = []
+    if positions:
+        with open(path, 'rb') as f:
+            for offset, length in positions:
+                f.seek(offset)
+                turns.extend(payload for _, _, payload in iter_records(f.read(length)))
+    return turns
+
+
+def message_notifier(database):
+    """on_compacted hook adding one new-message digest line per tenant and pass"""
+    def notify(tenant, turns, conversations):
+        conn = sqlite3.connect(database, timeout=30)
+        try:
+            with conn:
+                queue_digest(conn, tenant, 'new_message',
+                             f"{turns} new messages in {conversations} conversations")
+        except sqlite3.Error as e:
+            print(f"New-message digest error for {tenant}: {e}")
+        finally:
+            conn.close()
+    return notify
+
+
+def directory_stats(root=TRANSCRIPT_DIR):
+    """Per tenant: segment counts by kind and total bytes"""
+    rows = []
+    log = TranscriptLog(root)
+    for tenant in log.tenants():
+        directory = os.path.join(root, tenant)
+        compacted, sealed, active = log._listing(directory)
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        rows.append((tenant, len(active), len(sealed), len(compacted), size))
+    return rows
+
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    log = TranscriptLog()
+    notify = message_notifier(os.environ.get('DATABASE', 'edgpt_platform.db'))
+    if command == 'compact':
+        for tenant in sys.argv[2:] or log.tenants():
+            merged = log.compact(tenant, on_compacted=notify)
+            print(f"✅ {tenant}: merged {merged} segments")
+    elif command == 'watch':
+        while True:
+            for tenant in log.tenants():
+                try:
+                    log.compact(tenant, on_compacted=notify)
+                except OSError as e:
+                    print(f"Transcript compaction error for {tenant}: {e}")
+            time.sleep(COMPACT_INTERVAL)
+    elif command == 'stats':
+        print(f"{'tenant':28} {'active':>7} {'sealed':>7} {'compacted':>10} {'bytes':>12}")
+        for tenant, active, sealed, compacted, size in directory_stats():
+            print(f"{tenant:28} {active:7d} {sealed:7d} {compacted:10d} {size:12d}")
+    else:
+        print(__doc__)
+        sys.exit(1)
@@ -0,0 +1,313 @@
+"""
+EdGPT Platform - Trial Request Triage
+Worker pool that moves pending trial_requests through the triage states
+
+    pending -> processing -> qualified | unreachable | invalid | duplicate
+
+Workers claim the oldest pending rows in batches with a single
+UPDATE ... RETURNING, served by idx_trial_requests_status_created, so two
+workers never get the same row. Each batch normalizes the website URL,
+checks reachability with HEAD requests through a shared, bounded thread
+pool, and writes its results in one IMMEDIATE transaction. A signup whose
+email and normalized URL match an already-triaged request becomes a
+duplicate of it. Claims older than CLAIM_TIMEOUT (crashed worker) go back
+to pending.
+
+The fetcher is pluggable: TRIAGE_FETCHER=http sends real HEAD requests,
+TRIAGE_FETCHER=stub answers locally without network access. Signups are
+anonymous, so the HTTP fetcher only connects to publicly routable
+addresses: the host is resolved first, any loopback, private, link-local
+(cloud metadata) or reserved address makes the site unreachable, and the
+connection goes to the vetted address so a second DNS answer cannot swap
+it. Redirects are not followed; a 3xx already proves the site exists.
+
+Usage:
+    python src/trial_triage.py run        # triage until the queue is empty
+    python src/trial_triage.py watch      # keep draining every POLL_INTERVAL seconds
+    python src/trial_triage.py status     # rows per state
+"""
+
+import http.client
+import ipaddress
+import os
+import socket
+import sqlite3
+import ssl
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit
+
+from custom_domains import is_valid_hostname, normalize_host
+
+PENDING = 'pending'
+PROCESSING = 'processing'
+QUALIFIED = 'qualified'
+UNREACHABLE = 'unreachable'
+INVALID = 'invalid'
+DUPLICATE = 'duplicate'
+TRIAGED_STATES = (QUALIFIED, UNREACHABLE, INVALID)
+
+TRIAGE_FETCHER = os.environ.get('TRIAGE_FETCHER', 'http')
+TRIAGE_WORKERS = int(os.environ.get('TRIAGE_WORKERS', '4'))
+TRIAGE_CONCURRENCY = int(os.environ.get('TRIAGE_CONCURRENCY', '16'))
+BATCH_SIZE = 50
+HEAD_TIMEOUT = 5
+CLAIM_TIMEOUT = 600
+POLL_INTERVAL = 30
+
+CLAIM_SQL = '''
+    UPDATE trial_requests
+    SET status = 'processing', claimed_by = ?, claimed_at = ?
+    WHERE id IN (
+        SELECT id FROM trial_requests
+        WHERE status = 'pending'
+        ORDER BY created_at
+        LIMIT ?
+    )
+    RETURNING id, email, website_url
+'''
+
+
+def normalize_url(url):
+    """Canonical https URL for a submitted website, or None if it is not one"""
+    url = (url or '').strip()
+    if not url:
+        return None
+    if '://' not in url:
+        url = 'https://' + url
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    if parts.scheme.lower() not in ('http', 'https'):
+        return None
+    host = normalize_host(parts.netloc.rsplit('@', 1)[-1])
+    if not is_valid_hostname(host):
+        return None
+    path = parts.path.rstrip('/')
+    return urlunsplit(('https', host, path, parts.query, ''))
+
+
+def public_address(host, port):
+    """(family, sockaddr) to connect to, or None unless every address of `host` is public"""
+    try:
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except (OSError, UnicodeError):
+        return None
+    for _, _, _, _, sockaddr in infos:
+        address = ipaddress.ip_address(sockaddr[0].split('%')[0])
+        mapped = getattr(address, 'ipv4_mapped', None)
+        if not (mapped or address).is_global or address.is_multicast:
+            return None
+    return (infos[0][0], infos[0][4]) if infos else None
+
+
+class PinnedHTTPSConnection(http.client.HTTPSConnection):
+    """HTTPS to an already vetted address; the certificate is still checked against the host"""
+
+    def __init__(self, host, family, sockaddr, timeout):
+        super().__init__(host, timeout=timeout, context=ssl.create_default_context())
+        self._family = family
+        self._sockaddr = sockaddr
+
+    def connect(self):
+        sock = socket.socket(self._family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self._sockaddr)
+            self.sock = self._context.wrap_socket(sock, server_hostname=self.host)
+        except BaseException:
+            sock.close()
+            raise
+
+
+def http_fetcher(url, timeout=HEAD_TIMEOUT):
+    """HTTP status of a HEAD request, or None when the site cannot or may not be reached"""
+    parts = urlsplit(url)
+    if parts.scheme != 'https' or not parts.hostname:
+        return None
+    target = public_address(parts.hostname, parts.port or 443)
+    if target is None:
+        return None
+    conn = PinnedHTTPSConnection(parts.hostname, target[0], target[1], timeout)
+    path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+    try:
+        conn.request('HEAD', path, headers={'User-Agent': 'EdGPT-Triage/1.0'})
+        # Any status, 405 or a redirect included, proves the site exists
+        return conn.getresponse().status
+    except (OSError, http.client.HTTPException):
+        return None
+    finally:
+        conn.close()
+
+
+def stub_fetcher(url, timeout=HEAD_TIMEOUT):
+    """Local stand-in: every host answers 200 except *.invalid and *.test"""
+    host = urlsplit(url).hostname or ''
+    return None if host.endswith(('.invalid', '.test')) else 200
+
+
+FETCHERS = {'http': http_fetcher, 'stub': stub_fetcher}
+
+
+def create_triage_columns(conn):
+    """Columns and indexes the triage queue needs on trial_requests"""
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(trial_requests)')]
+    for name, ddl in (('normalized_url', 'TEXT'), ('http_status', 'INTEGER'),
+                      ('claimed_by', 'TEXT'), ('claimed_at', 'REAL'),
+                      ('triaged_at', 'TIMESTAMP'), ('duplicate_of', 'INTEGER')):
+        if name not in columns:
+            conn.execute(f'ALTER TABLE trial_requests ADD COLUMN {name} {ddl}')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_trial_requests_status_created '
+                 'ON trial_requests(status, created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_trial_requests_normalized_url '
+                 'ON trial_requests(normalized_url)')
+
+
+def connect(database):
+    conn = sqlite3.connect(database, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute('PRAGMA busy_timeout=30000')
+    return conn
+
+
+def claim_batch(conn, worker_id, size=BATCH_SIZE):
+    """Atomically move up to `size` of the oldest pending rows to processing"""
+    return conn.execute(CLAIM_SQL, (worker_id, time.time(), size)).fetchall()
+
+
+def release_stale_claims(conn, timeout=CLAIM_TIMEOUT):
+    """Return rows claimed by a worker that died back to the queue"""
+    return conn.execute('''
+        UPDATE trial_requests SET status = 'pending', claimed_by = NULL, claimed_at = NULL
+        WHERE status = 'processing' AND claimed_at < ?
+    ''', (time.time() - timeout,)).rowcount
+
+
+def triage_batch(conn, rows, head_pool, fetcher):
+    """Validate, check and dedupe one claimed batch; returns {state: count}"""
+    normalized = {row_id: normalize_url(url) for row_id, _, url in rows}
+    urls = sorted({url for url in normalized.values() if url})
+    # One HEAD per distinct URL, bounded by the shared pool
+    statuses = dict(zip(urls, head_pool.map(fetcher, urls)))
+
+    counts = {}
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        for row_id, email, _ in sorted(rows):
+            url = normalized[row_id]
+            status = statuses.get(url)
+            duplicate_of = None
+            if url is None:
+                state = INVALID
+            else:
+                # Checked under the write lock so concurrent batches see each other
+                original = conn.execute(f'''
+                    SELECT id FROM trial_requests
+                    WHERE normalized_url = ? AND lower(email) = lower(?) AND id != ?
+                      AND status IN ({', '.join('?' * len(TRIAGED_STATES))})
+                    ORDER BY id LIMIT 1
+                ''', (url, email, row_id, *TRIAGED_STATES)).fetchone()
+                if original:
+                    state, duplicate_of = DUPLICATE, original[0]
+                elif status is None or status >= 500:
+                    state = UNREACHABLE
+                else:
+                    state = QUALIFIED
+            conn.execute('''
+                UPDATE trial_requests
+                SET status = ?, normalized_url = ?, http_status = ?, duplicate_of = ?,
+                    triaged_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (state, url, status, duplicate_of, row_id))
+            counts[state] = counts.get(state, 0) + 1
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+    return counts
+
+
+class TriagePool:
+    """N claiming workers sharing one bounded pool of HEAD checks"""
+
+    def __init__(self, database, workers=TRIAGE_WORKERS, concurrency=TRIAGE_CONCURRENCY,
+                 fetcher=None, batch_size=BATCH_SIZE):
+        self.database = database
+        self.workers = workers
+        self.concurrency = concurrency
+        self.fetcher = fetcher or FETCHERS[TRIAGE_FETCHER]
+        self.batch_size = batch_size
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    def _work(self, worker_id, head_pool):
+        conn = connect(self.database)
+        try:
+            while True:
+                rows = claim_batch(conn, worker_id, self.batch_size)
+                if not rows:
+                    return
+                try:
+                    counts = triage_batch(conn, rows, head_pool, self.fetcher)
+                except Exception as e:
+                    # Leave the rows claimed; release_stale_claims() retries them later
+                    print(f"Triage error in {worker_id}: {e}")
+                    return
+                with self._lock:
+                    for state, count in counts.items():
+                        self.counts[state] = self.counts.get(state, 0) + count
+        finally:
+            conn.close()
+
+    def drain(self):
+        """Triage until no pending rows are left; returns {state: count}"""
+        conn = connect(self.database)
+        try:
+            release_stale_claims(conn)
+        finally:
+            conn.close()
+
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        with ThreadPoolExecutor(max_workers=self.concurrency) as head_pool:
+            threads = [threading.Thread(target=self._work, args=(f"{prefix}:{i}", head_pool))
+                       for i in range(self.workers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return dict(self.counts)
+
+
+def queue_status(database):
+    conn = sqlite3.connect(database)
+    try:
+        return dict(conn.execute('SELECT status, COUNT(*) FROM trial_requests GROUP BY status').fetchall())
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    database = os.environ.get('DATABASE', 'edgpt_platform.db')
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    if command == 'run':
+        start = time.perf_counter()
+        counts = TriagePool(database).drain()
+        elapsed = time.perf_counter() - start
+        total = sum(counts.values())
+        print(f"✅ Triaged {total} trial requests in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f}/s)")
+        for state, count in sorted(counts.items()):
+            print(f"   • {state}: {count}")
+    elif command == 'watch':
+        while True:
+            counts = TriagePool(database).drain()
+            if counts:
+                print(f"Triaged {sum(counts.values())}: {counts}")
+            time.sleep(POLL_INTERVAL)
+    elif command == 'status':
+        for state, count in sorted(queue_status(database).items()):
+            print(f"   • {state}: {count}")
+    else:
+        print(__doc__)
+        sys.exit(1)
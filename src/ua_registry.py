@@ -0,0 +1,143 @@
+"""
+EdGPT Platform - User-Agent Registry
+Interns User-Agent strings into a lookup table and classifies bot traffic
+
+Each distinct User-Agent is stored once in `user_agents`, unique on the
+string itself, and analytics rows reference it by integer id. A per-process LRU maps the raw string to
+(id, is_bot, family) so the hot path never touches the lookup table for
+agents we have already seen.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+# Checked before browser families; uptime checkers and HTTP libraries count as bots
+BOT_PATTERN = re.compile(
+    r'bot|crawl|spider|slurp|archiver|uptime|pingdom|statuscake|monitor|'
+    r'headless|lighthouse|facebookexternalhit|preview|curl/|wget/|'
+    r'python-requests|python-urllib|go-http-client|okhttp|java/|httpclient|'
+    r'axios/|node-fetch|scrapy|phantomjs',
+    re.IGNORECASE
+)
+
+# Order matters: Edge and Opera also advertise Chrome, Chrome advertises Safari
+FAMILY_PATTERNS = [
+    ('Edge', re.compile(r'Edg(e|A|iOS)?/')),
+    ('Opera', re.compile(r'OPR/|Opera')),
+    ('Samsung Internet', re.compile(r'SamsungBrowser/')),
+    ('Firefox', re.compile(r'Firefox/|FxiOS/')),
+    ('Chrome', re.compile(r'Chrome/|CriOS/')),
+    ('Safari', re.compile(r'Safari/')),
+    ('IE', re.compile(r'MSIE |Trident/')),
+]
+
+CACHE_SIZE = 4096
+
+
+def classify_user_agent(user_agent):
+    """Return (is_bot, family) for a raw User-Agent string"""
+    if not user_agent:
+        # Privacy tools and some embedded browsers send none; that alone is no sign of a bot
+        return False, 'Empty'
+    if BOT_PATTERN.search(user_agent):
+        return True, 'Bot'
+    for family, pattern in FAMILY_PATTERNS:
+        if pattern.search(user_agent):
+            return False, family
+    return False, 'Other'
+
+
+def create_user_agent_table(conn):
+    """Create the user_agents lookup table"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS user_agents (
+            id INTEGER PRIMARY KEY,
+            user_agent TEXT UNIQUE NOT NULL,
+            is_bot BOOLEAN NOT NULL DEFAULT FALSE,
+            family TEXT
+        )
+    ''')
+
+
+def rekey_user_agents(conn):
+    """Make the User-Agent string the unique key, keeping ids, and stop counting empty agents as bots"""
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(user_agents)')]
+    if 'ua_key' in columns:
+        # A 64-bit hash key let two agents share one id; rebuild unique on the string
+        conn.execute('ALTER TABLE user_agents RENAME TO user_agents_hashed')
+        create_user_agent_table(conn)
+        conn.execute('''
+            INSERT OR IGNORE INTO user_agents (id, user_agent, is_bot, family)
+            SELECT id, user_agent, is_bot, family FROM user_agents_hashed ORDER BY id
+        ''')
+        conn.execute('DROP TABLE user_agents_hashed')
+    conn.execute("UPDATE user_agents SET is_bot = FALSE WHERE user_agent = ''")
+
+
+class UserAgentCache:
+    """Bounded LRU from User-Agent string to (id, is_bot, family)"""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_agent):
+        with self._lock:
+            entry = self._entries.get(user_agent)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_agent)
+            self.hits += 1
+            return entry
+
+    def put(self, user_agent, entry):
+        with self._lock:
+            self._entries[user_agent] = entry
+            self._entries.move_to_end(user_agent)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+_cache = UserAgentCache()
+
+
+def intern_user_agent(conn, user_agent, cache=None):
+    """Return (id, is_bot, family) for a User-Agent, inserting it on first sight"""
+    cache = cache if cache is not None else _cache
+    user_agent = user_agent or ''
+
+    entry = cache.get(user_agent)
+    if entry is not None:
+        return entry
+
+    is_bot, family = classify_user_agent(user_agent)
+    conn.execute('''
+        INSERT OR IGNORE INTO user_agents (user_agent, is_bot, family)
+        VALUES (?, ?, ?)
+    ''', (user_agent, is_bot, family))
+    row = conn.execute('SELECT id, is_bot, family FROM user_agents WHERE user_agent = ?',
+                       (user_agent,)).fetchone()
+
+    entry = (row[0], bool(row[1]), row[2])
+    cache.put(user_agent, entry)
+    return entry
+
+
+def cache_stats():
+    """Hit/miss counters for the process-wide cache"""
+    return _cache.stats()
@@ -0,0 +1,524 @@
+"""
+EdGPT Platform - Knowledge Base Uploads
+Streaming, content-addressed document storage with background text extraction
+
+Uploads arrive as the raw request body (no multipart), read in CHUNK_SIZE
+pieces that are hashed and written to a temporary file at the same time,
+so a 500 MB handbook never sits in memory. The finished file is renamed to
+objects/<ab>/<cd>/<sha256> under UPLOAD_DIR; if that file already exists
+the upload is dropped, so the same document uploaded by any number of
+tenants is stored once. knowledge_documents keeps each tenant's filename
+for a blob, knowledge_blobs the blob itself and its extraction state.
+
+Documents carry their own copy of the extraction state, and that is all
+the API shows. A new document starts out pending even when its blob was
+extracted long ago; `watch` settles it from the blob on its next pass.
+That way no response shows whether another tenant already uploaded the same file.
+
+Text is extracted once per blob by `watch`, which keeps at most
+UPLOAD_EXTRACT_WORKERS blobs in a spawn process pool. Each child writes
+text/<ab>/<cd>/<sha256>.txt and reports its progress (0-100) to the blob
+and document rows as it goes, which GET /api/knowledge-base/uploads/<id> returns. Plain
+text, Markdown, CSV, calendars, captions (VTT/SRT), HTML and DOCX are read
+with the standard library; PDF needs the optional pypdf package. Video,
+audio and legacy DOC files are stored without text.
+
+Usage:
+    python src/uploads.py run       # extract text until nothing is pending
+    python src/uploads.py watch     # keep extracting every POLL_INTERVAL seconds
+    python src/uploads.py status    # blobs per extraction state
+    python src/uploads.py gc        # delete blobs no document refers to
+"""
+
+import codecs
+import hashlib
+import multiprocessing
+import os
+import re
+import socket
+import sqlite3
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from html.parser import HTMLParser
+from xml.etree.ElementTree import XMLPullParser
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pragma: no cover - optional dependency
+    PdfReader = None
+
+UPLOAD_DIR = os.environ.get('UPLOAD_DIR', 'uploads')
+UPLOAD_MAX_MB = int(os.environ.get('UPLOAD_MAX_MB', '1024'))
+EXTRACT_WORKERS = int(os.environ.get('UPLOAD_EXTRACT_WORKERS', '2'))
+CHUNK_SIZE = 1024 * 1024
+MAX_FILENAME = 255
+# Progress is written to the database at most this often
+PROGRESS_INTERVAL = 0.5
+CLAIM_TIMEOUT = 600
+POLL_INTERVAL = 10
+PART_MAX_AGE = 86400
+# gc leaves blobs alone for this long after their last upload
+GC_GRACE = 3600
+
+# Extension -> extractor; extensions mapped to None are stored without text
+EXTENSIONS = {
+    '.txt': 'text', '.md': 'text', '.csv': 'text', '.ics': 'text',
+    '.vtt': 'captions', '.srt': 'captions',
+    '.html': 'html', '.htm': 'html',
+    '.docx': 'docx',
+    '.pdf': 'pdf',
+    '.doc': None, '.mp4': None, '.mov': None, '.mp3': None, '.wav': None, '.m4a': None,
+}
+
+CLAIM_SQL = '''
+    UPDATE knowledge_blobs SET text_status = 'extracting', claimed_by = ?, claimed_at = ?, progress = 0
+    WHERE sha256 = (
+        SELECT sha256 FROM knowledge_blobs WHERE text_status = 'pending' ORDER BY created_at LIMIT 1
+    )
+    RETURNING sha256, kind, size
+'''
+
+DOCX_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+CAPTION_TIMING = re.compile(rb'^\s*(\d+|WEBVTT.*|NOTE.*|[\d:.,]+\s*-->.*)\s*$')
+
+
+class UploadTooLarge(ValueError):
+    """The request body is larger than UPLOAD_MAX_MB"""
+
+
+def create_upload_tables(conn):
+    """Content-addressed blobs with their extraction state, and each tenant's documents"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS knowledge_blobs (
+            sha256 TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            kind TEXT,
+            text_status TEXT NOT NULL,
+            progress INTEGER NOT NULL DEFAULT 0,
+            text_bytes INTEGER,
+            claimed_by TEXT,
+            claimed_at REAL,
+            error TEXT,
+            created_at REAL NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_knowledge_blobs_status '
+                 'ON knowledge_blobs(text_status, created_at)')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS knowledge_documents (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tenant TEXT NOT NULL,
+            user_id INTEGER,
+            filename TEXT NOT NULL,
+            content_type TEXT,
+            sha256 TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_knowledge_documents_tenant '
+                 'ON knowledge_documents(tenant, user_id, created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_knowledge_documents_sha256 '
+                 'ON knowledge_documents(sha256)')
+
+
+def add_document_state_columns(conn):
+    """Per-document extraction state, filled in from the blob for existing documents"""
+    conn.execute("ALTER TABLE knowledge_documents ADD COLUMN text_status TEXT NOT NULL DEFAULT 'pending'")
+    conn.execute('ALTER TABLE knowledge_documents ADD COLUMN progress INTEGER NOT NULL DEFAULT 0')
+    conn.execute('ALTER TABLE knowledge_documents ADD COLUMN text_bytes INTEGER')
+    conn.execute('ALTER TABLE knowledge_documents ADD COLUMN error TEXT')
+    conn.execute('''
+        UPDATE knowledge_documents AS d
+        SET text_status = b.text_status, progress = b.progress, text_bytes = b.text_bytes, error = b.error
+        FROM knowledge_blobs b WHERE b.sha256 = d.sha256
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_knowledge_documents_status '
+                 'ON knowledge_documents(text_status)')
+
+
+def clean_filename(filename):
+    """Base name safe to store and show, or '' if nothing is left"""
+    name = os.path.basename((filename or '').replace('\\', '/')).strip()
+    name = ''.join(ch for ch in name if ch.isprintable())
+    return name[:MAX_FILENAME]
+
+
+def file_kind(filename):
+    """(allowed, extractor or None) for a filename's extension"""
+    extension = os.path.splitext(filename)[1].lower()
+    return extension in EXTENSIONS, EXTENSIONS.get(extension)
+
+
+def blob_path(digest, upload_dir=UPLOAD_DIR):
+    return os.path.join(upload_dir, 'objects', digest[:2], digest[2:4], digest)
+
+
+def text_path(digest, upload_dir=UPLOAD_DIR):
+    return os.path.join(upload_dir, 'text', digest[:2], digest[2:4], digest + '.txt')
+
+
+def store_stream(stream, upload_dir=UPLOAD_DIR, max_bytes=UPLOAD_MAX_MB * 1024 * 1024):
+    """Write a stream to the blob store, hashing as it is written; (sha256, size, created)"""
+    tmp_dir = os.path.join(upload_dir, 'tmp')
+    os.makedirs(tmp_dir, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=tmp_dir, suffix='.part')
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f'Uploads are limited to {max_bytes // (1024 * 1024)} MB')
+                digest.update(chunk)
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        path = blob_path(digest.hexdigest(), upload_dir)
+        if size == 0:
+            # Nothing to keep; the caller rejects empty uploads
+            os.unlink(tmp)
+            return digest.hexdigest(), 0, False
+        if os.path.exists(path):
+            # Stored before, by this tenant or another one; the touch keeps gc off it
+            os.unlink(tmp)
+            os.utime(path)
+            return digest.hexdigest(), size, False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp, path)
+        return digest.hexdigest(), size, True
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def add_document(conn, tenant, user_id, filename, content_type, digest, size):
+    """Record an uploaded blob and a tenant's document for it; returns the document id"""
+    _, kind = file_kind(filename)
+    status = 'pending' if kind else 'skipped'
+    # A blob first stored under an extension without text gets a second chance
+    conn.execute('''
+        INSERT INTO knowledge_blobs (sha256, size, kind, text_status, created_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(sha256) DO UPDATE SET kind = excluded.kind, text_status = excluded.text_status
+        WHERE knowledge_blobs.text_status = 'skipped' AND excluded.text_status = 'pending'
+    ''', (digest, size, kind, status, time.time()))
+    # The document's own state starts fresh whatever the blob's is (see settle_documents)
+    return conn.execute('''
+        INSERT INTO knowledge_documents (tenant, user_id, filename, content_type, sha256, size, text_status)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', (tenant, user_id, filename, content_type, digest, size, status)).lastrowid
+
+
+DOCUMENT_SQL = '''
+    SELECT d.id, d.filename, d.content_type, d.size, d.created_at,
+           d.text_status, d.progress, d.text_bytes, d.error
+    FROM knowledge_documents d
+'''
+
+
+def list_documents(conn, tenant, user_id, limit=200):
+    return [dict(row) for row in conn.execute(
+        DOCUMENT_SQL + ' WHERE d.tenant = ? AND d.user_id = ? ORDER BY d.id DESC LIMIT ?',
+        (tenant, user_id, limit))]
+
+
+def get_document(conn, tenant, user_id, document_id):
+    row = conn.execute(DOCUMENT_SQL + ' WHERE d.id = ? AND d.tenant = ? AND d.user_id = ?',
+                       (document_id, tenant, user_id)).fetchone()
+    return dict(row) if row else None
+
+
+class ProgressReporter:
+    """Writes a child's extraction progress to its blob and document rows, throttled"""
+
+    def __init__(self, database, digest):
+        self.conn = sqlite3.connect(database, timeout=30)
+        self.digest = digest
+        self.sent = 0
+        self.sent_at = 0.0
+
+    def __call__(self, fraction):
+        percent = min(int(fraction * 100), 99)
+        now = time.monotonic()
+        if percent > self.sent and now - self.sent_at >= PROGRESS_INTERVAL:
+            with self.conn:
+                # Also the claim's heartbeat: long extractions are never taken as stale
+                self.conn.execute('UPDATE knowledge_blobs SET progress = ?, claimed_at = ? WHERE sha256 = ?',
+                                  (percent, time.time(), self.digest))
+                self.conn.execute('''
+                    UPDATE knowledge_documents SET text_status = 'extracting', progress = ?
+                    WHERE sha256 = ? AND text_status IN ('pending', 'extracting')
+                ''', (percent, self.digest))
+            self.sent, self.sent_at = percent, now
+
+    def close(self):
+        self.conn.close()
+
+
+def read_chunks(f, size, report):
+    """Binary chunks of `f`, reporting the fraction read"""
+    done = 0
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            return
+        done += len(chunk)
+        report(done / size if size else 1)
+        yield chunk
+
+
+def extract_text(source, out, size, report):
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    with open(source, 'rb') as f:
+        for chunk in read_chunks(f, size, report):
+            out.write(decoder.decode(chunk))
+    out.write(decoder.decode(b'', final=True))
+
+
+def extract_captions(source, out, size, report):
+    """Spoken lines of a VTT/SRT transcript, without cue numbers and timings"""
+    done = 0
+    with open(source, 'rb') as f:
+        for line in f:
+            done += len(line)
+            if line.strip() and not CAPTION_TIMING.match(line):
+                out.write(line.decode('utf-8', 'replace').rstrip() + '\n')
+            report(done / size)
+
+
+class TextOnlyParser(HTMLParser):
+    """Visible text of an HTML document, written as it is parsed"""
+
+    SKIP = {'script', 'style', 'noscript', 'template'}
+    BREAKS = {'p', 'br', 'div', 'li', 'tr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'section', 'article'}
+
+    def __init__(self, out):
+        super().__init__(convert_charrefs=True)
+        self.out = out
+        self.skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP:
+            self.skipping += 1
+        elif tag in self.BREAKS:
+            self.out.write('\n')
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP and self.skipping:
+            self.skipping -= 1
+
+    def handle_data(self, data):
+        if not self.skipping:
+            self.out.write(data)
+
+
+def extract_html(source, out, size, report):
+    parser = TextOnlyParser(out)
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    with open(source, 'rb') as f:
+        for chunk in read_chunks(f, size, report):
+            parser.feed(decoder.decode(chunk))
+    parser.feed(decoder.decode(b'', final=True))
+    parser.close()
+
+
+def extract_docx(source, out, size, report):
+    """Paragraph text of word/document.xml, parsed incrementally"""
+    with zipfile.ZipFile(source) as archive, archive.open('word/document.xml') as f:
+        parser = XMLPullParser(events=('end',))
+        total = archive.getinfo('word/document.xml').file_size
+        for chunk in read_chunks(f, total, report):
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                if element.tag == DOCX_NS + 't':
+                    out.write(element.text or '')
+                elif element.tag == DOCX_NS + 'tab':
+                    out.write('\t')
+                elif element.tag == DOCX_NS + 'p':
+                    out.write('\n')
+                    # Finished paragraphs are not needed again
+                    element.clear()
+        parser.close()
+
+
+def extract_pdf(source, out, size, report):
+    reader = PdfReader(source)
+    pages = len(reader.pages)
+    for number, page in enumerate(reader.pages, 1):
+        out.write((page.extract_text() or '') + '\n\f')
+        report(number / pages)
+
+
+EXTRACTORS = {
+    'text': extract_text,
+    'captions': extract_captions,
+    'html': extract_html,
+    'docx': extract_docx,
+    'pdf': extract_pdf,
+}
+
+
+def extract_blob(database, upload_dir, digest, kind, size):
+    """Pool task: write the text of one blob; returns (status, text bytes, error)"""
+    if kind == 'pdf' and PdfReader is None:
+        return 'skipped', None, 'pypdf is not installed'
+    target = text_path(digest, upload_dir)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp = f'{target}.{os.getpid()}.tmp'
+    report = ProgressReporter(database, digest)
+    try:
+        with open(tmp, 'w', encoding='utf-8') as out:
+            EXTRACTORS[kind](blob_path(digest, upload_dir), out, size, report)
+        os.replace(tmp, target)
+        return 'done', os.path.getsize(target), None
+    except Exception as e:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        return 'failed', None, f'{type(e).__name__}: {e}'[:500]
+    finally:
+        report.close()
+
+
+def connect(database):
+    conn = sqlite3.connect(database, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute('PRAGMA busy_timeout=30000')
+    return conn
+
+
+def settle_documents(conn):
+    """Copy the result of finished blobs to their pending documents; returns documents settled"""
+    return conn.execute('''
+        UPDATE knowledge_documents AS d
+        SET text_status = b.text_status, progress = b.progress, text_bytes = b.text_bytes, error = b.error
+        FROM knowledge_blobs b
+        WHERE b.sha256 = d.sha256 AND d.text_status IN ('pending', 'extracting')
+          AND b.text_status IN ('done', 'failed', 'skipped')
+    ''').rowcount
+
+
+def release_stale_claims(conn, timeout=CLAIM_TIMEOUT):
+    """Return blobs whose extraction stopped reporting to the queue"""
+    return conn.execute('''
+        UPDATE knowledge_blobs SET text_status = 'pending', claimed_by = NULL, claimed_at = NULL
+        WHERE text_status = 'extracting' AND claimed_at < ?
+    ''', (time.time() - timeout,)).rowcount
+
+
+def drain(database, upload_dir=UPLOAD_DIR, workers=EXTRACT_WORKERS):
+    """Extract every pending blob, at most `workers` at a time; returns {status: count}"""
+    conn = connect(database)
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    counts = {}
+    try:
+        release_stale_claims(conn)
+        # Documents of blobs extracted earlier (by any tenant) are settled here, never on upload
+        settle_documents(conn)
+        # spawn, not fork: no SQLite connection or lock crosses into a child
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            running = {}
+            while True:
+                # Claim only what the pool can start now; the rest stays pending for other workers
+                while len(running) < workers:
+                    blob = conn.execute(CLAIM_SQL, (worker_id, time.time())).fetchone()
+                    if blob is None:
+                        break
+                    digest, kind, size = blob
+                    running[pool.submit(extract_blob, database, upload_dir, digest, kind, size)] = digest
+                if not running:
+                    return counts
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    digest = running.pop(future)
+                    status, text_bytes, error = future.result()
+                    conn.execute('''
+                        UPDATE knowledge_blobs
+                        SET text_status = ?, text_bytes = ?, error = ?, claimed_by = NULL,
+                            progress = CASE WHEN ? = 'done' THEN 100 ELSE progress END
+                        WHERE sha256 = ?
+                    ''', (status, text_bytes, error, status, digest))
+                    settle_documents(conn)
+                    counts[status] = counts.get(status, 0) + 1
+    finally:
+        conn.close()
+
+
+def collect_garbage(database, upload_dir=UPLOAD_DIR):
+    """Delete blobs without documents and abandoned partial uploads; returns (blobs, bytes)"""
+    conn = connect(database)
+    try:
+        orphans = conn.execute('''
+            SELECT sha256, size FROM knowledge_blobs b
+            WHERE NOT EXISTS (SELECT 1 FROM knowledge_documents d WHERE d.sha256 = b.sha256)
+              AND text_status != 'extracting'
+        ''').fetchall()
+        removed, freed = 0, 0
+        for digest, size in orphans:
+            path = blob_path(digest, upload_dir)
+            if os.path.exists(path) and time.time() - os.path.getmtime(path) < GC_GRACE:
+                continue
+            deleted = conn.execute('''
+                DELETE FROM knowledge_blobs WHERE sha256 = ?
+                AND NOT EXISTS (SELECT 1 FROM knowledge_documents d WHERE d.sha256 = ?)
+            ''', (digest, digest)).rowcount
+            if not deleted:
+                continue  # uploaded again meanwhile
+            for path in (path, text_path(digest, upload_dir)):
+                if os.path.exists(path):
+                    os.unlink(path)
+            removed += 1
+            freed += size
+    finally:
+        conn.close()
+    tmp_dir = os.path.join(upload_dir, 'tmp')
+    if os.path.isdir(tmp_dir):
+        for name in os.listdir(tmp_dir):
+            path = os.path.join(tmp_dir, name)
+            if time.time() - os.path.getmtime(path) > PART_MAX_AGE:
+                os.unlink(path)
+    return removed, freed
+
+
+def queue_status(database):
+    conn = sqlite3.connect(database)
+    try:
+        return dict(conn.execute(
+            'SELECT text_status, COUNT(*) FROM knowledge_blobs GROUP BY text_status').fetchall())
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    database = os.environ.get('DATABASE', 'edgpt_platform.db')
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    if command == 'run':
+        start = time.perf_counter()
+        counts = drain(database)
+        elapsed = time.perf_counter() - start
+        print(f"✅ Extracted {sum(counts.values())} blobs in {elapsed:.1f}s")
+        for status, count in sorted(counts.items()):
+            print(f"   • {status}: {count}")
+    elif command == 'watch':
+        while True:
+            counts = drain(database)
+            if counts:
+                print(f"Extracted {sum(counts.values())}: {counts}")
+            time.sleep(POLL_INTERVAL)
+    elif command == 'status':
+        for status, count in sorted(queue_status(database).items()):
+            print(f"   • {status}: {count}")
+    elif command == 'gc':
+        blobs, freed = collect_garbage(database)
+        print(f"✅ Deleted {blobs} unreferenced blobs ({freed / 1e6:.1f} MB)")
+    else:
+        print(__doc__)
+        sys.exit(1)
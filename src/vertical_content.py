@@ -0,0 +1,316 @@
+"""
+EdGPT Platform - Vertical Site Content
+Per-domain copy for the shared vertical_landing.html and vertical_signup.html layouts
+
+The five industry verticals share one landing layout and one signup layout;
+everything that differs between them lives here and is attached to
+DOMAIN_CONFIGS in main.py. Values are trusted HTML fragments.
+"""
+
+LANDING_CONTENT = {
+    'gptsites.ai': {
+        'brand': 'GPTSites',
+        'stylesheet': 'css/gptsites_landing.css',
+        'hero_text': 'GPTsite converts your existing business website into a conversational AI that provides instant answers to customers, clients, and visitors 24/7.',
+        'demo_welcome_title': '🏢 Welcome to GPTsite Demo',
+        'demo_welcome_text': 'See how GPTsite transforms traditional business websites into intelligent, conversational experiences that customers actually want to use.',
+        'demo_inquiries_title': '💼 Business Inquiries Made Easy',
+        'demo_inquiries_text': 'Customers get instant answers about your services, pricing, availability, and more - without waiting for callbacks or searching through pages.',
+        'demo_leads_title': '🚀 Lead Generation Supercharged',
+        'demo_leads_text': 'Capture leads that would otherwise leave your site frustrated. GPTsite qualifies prospects and routes them to the right team member.',
+        'demo_results_text': 'Businesses using GPTsite see 40% more qualified leads, 24/7 customer service, and dramatically improved customer satisfaction.',
+        'demo_trial_text': 'See how your business website looks as an intelligent GPTsite. Start your free trial and experience the future of customer engagement.',
+        'benefits_heading': 'Why Businesses Choose GPTsite',
+        'benefit_leads_title': '40% More Leads',
+        'benefit_leads_text': 'AI captures customer inquiries that would otherwise be lost to confusing navigation and contact forms.',
+        'benefit_availability_text': 'Never miss a potential customer inquiry again, even outside business hours or during busy periods.',
+        'benefit_instant_text': 'No more waiting for callbacks - customers get answers immediately when they need them most.',
+        'benefit_qualification_title': 'Better Qualification',
+        'benefit_qualification_text': 'AI pre-qualifies leads and routes them to the right team member with context and priority.',
+        'benefit_innovation_text': 'Show innovation and commitment to excellent customer service with cutting-edge AI technology.',
+        'cta_heading': 'Ready to Transform Your Business Website?',
+        'cta_text': 'Join thousands of businesses providing better customer service with GPTsite',
+    },
+    'lawfirmgpt.ai': {
+        'brand': 'LawFirmGPT',
+        'stylesheet': 'css/lawfirmgpt_landing.css',
+        'hero_text': 'GPTsite converts your existing law firm website into a conversational AI that provides instant answers to clients, prospects, and staff 24/7.',
+        'demo_welcome_title': '⚖️ Welcome to LawFirmGPT Demo',
+        'demo_welcome_text': 'See how GPTsite transforms traditional law firm websites into intelligent, conversational experiences that clients actually want to use.',
+        'demo_inquiries_title': '📝 Legal Inquiries Made Easy',
+        'demo_inquiries_text': 'Clients get instant answers about practice areas, attorney expertise, fee structures, and case eligibility - without waiting for callbacks or searching through pages.',
+        'demo_leads_title': '🚀 Client Acquisition Supercharged',
+        'demo_leads_text': 'Capture leads that would otherwise leave your site frustrated. GPTsite qualifies prospects and routes them to the right attorney with context and priority.',
+        'demo_results_text': 'Law firms using GPTsite see 40% more qualified leads, 24/7 client service, and dramatically improved client satisfaction.',
+        'demo_trial_text': 'See how your law firm website looks as an intelligent GPTsite. Start your free trial and experience the future of client engagement.',
+        'benefits_heading': 'Why Law Firms Choose GPTsite',
+        'benefit_leads_title': '40% More Client Inquiries',
+        'benefit_leads_text': 'AI captures client inquiries that would otherwise be lost to confusing navigation and contact forms.',
+        'benefit_availability_text': 'Never miss a potential client inquiry again, even outside business hours or during court appearances.',
+        'benefit_instant_text': 'No more waiting for callbacks - clients get answers immediately about practice areas, fee structures, and case eligibility.',
+        'benefit_qualification_title': 'Better Client Qualification',
+        'benefit_qualification_text': 'AI pre-qualifies leads and routes them to the right attorney with context and priority.',
+        'benefit_innovation_text': 'Show innovation and commitment to excellent client service with cutting-edge AI technology.',
+        'cta_heading': 'Ready to Transform Your Law Firm Website?',
+        'cta_text': 'Join hundreds of law firms providing better client service with GPTsite',
+    },
+    'cpafirm.ai': {
+        'brand': 'CPAFirm.ai',
+        'stylesheet': 'css/cpafirm_landing.css',
+        'hero_text': 'GPTsite converts your existing CPA firm website into a conversational AI that provides instant answers to clients, prospects, and staff 24/7.',
+        'demo_welcome_title': '💼 Welcome to CPAFirm.ai Demo',
+        'demo_welcome_text': 'See how GPTsite transforms traditional accounting firm websites into intelligent, conversational experiences that clients actually want to use.',
+        'demo_inquiries_title': '📊 Tax & Accounting Inquiries Made Easy',
+        'demo_inquiries_text': 'Clients get instant answers about tax deadlines, document requirements, service offerings, and more - without waiting for callbacks or searching through pages.',
+        'demo_leads_title': '🚀 Client Acquisition Supercharged',
+        'demo_leads_text': 'Capture leads that would otherwise leave your site frustrated. GPTsite qualifies prospects and routes them to the right accountant or tax professional.',
+        'demo_results_text': 'Accounting firms using GPTsite see 40% more qualified leads, 24/7 client service, and dramatically improved client satisfaction during tax season.',
+        'demo_trial_text': 'See how your accounting firm website looks as an intelligent GPTsite. Start your free trial and experience the future of client engagement.',
+        'benefits_heading': 'Why Accounting Firms Choose GPTsite',
+        'benefit_leads_title': '40% More Client Inquiries',
+        'benefit_leads_text': 'AI captures client inquiries that would otherwise be lost to confusing navigation and contact forms.',
+        'benefit_availability_text': 'Never miss a potential client inquiry again, even during tax season or after business hours.',
+        'benefit_instant_text': 'No more waiting for callbacks - clients get answers immediately about tax deadlines, requirements, and services.',
+        'benefit_qualification_title': 'Better Client Qualification',
+        'benefit_qualification_text': 'AI pre-qualifies leads and routes them to the right accountant with context and priority.',
+        'benefit_innovation_text': 'Show innovation and commitment to excellent client service with cutting-edge AI technology.',
+        'cta_heading': 'Ready to Transform Your Accounting Firm Website?',
+        'cta_text': 'Join hundreds of accounting firms providing better client service with GPTsite',
+    },
+    'taxprepgpt.ai': {
+        'brand': 'TaxPrepGPT',
+        'stylesheet': 'css/taxprepgpt_landing.css',
+        'hero_text': 'GPTsite converts your existing tax preparation website into a conversational AI that provides instant answers to taxpayers, clients, and prospects 24/7.',
+        'demo_welcome_title': '💰 Welcome to TaxPrepGPT Demo',
+        'demo_welcome_text': 'See how GPTsite transforms traditional tax preparation websites into intelligent, conversational experiences that taxpayers actually want to use.',
+        'demo_inquiries_title': '📝 Tax Questions Made Easy',
+        'demo_inquiries_text': 'Taxpayers get instant answers about deductions, credits, filing deadlines, document requirements, and more - without waiting for callbacks or searching through pages.',
+        'demo_leads_title': '🚀 Client Acquisition Supercharged',
+        'demo_leads_text': 'Capture leads that would otherwise leave your site frustrated. GPTsite qualifies prospects and routes them to the right tax professional with context.',
+        'demo_results_text': 'Tax preparation firms using GPTsite see 40% more qualified leads, 24/7 client service, and dramatically improved client satisfaction during tax season.',
+        'demo_trial_text': 'See how your tax preparation website looks as an intelligent GPTsite. Start your free trial and experience the future of taxpayer engagement.',
+        'benefits_heading': 'Why Tax Preparation Firms Choose GPTsite',
+        'benefit_leads_title': '40% More Client Inquiries',
+        'benefit_leads_text': 'AI captures taxpayer inquiries that would otherwise be lost to confusing navigation and contact forms.',
+        'benefit_availability_text': 'Never miss a potential client inquiry again, even during peak tax season or after business hours.',
+        'benefit_instant_text': 'No more waiting for callbacks - taxpayers get answers immediately about deductions, credits, and filing requirements.',
+        'benefit_qualification_title': 'Better Client Qualification',
+        'benefit_qualification_text': 'AI pre-qualifies leads and routes them to the right tax professional with context and priority.',
+        'benefit_innovation_text': 'Show innovation and commitment to excellent taxpayer service with cutting-edge AI technology.',
+        'cta_heading': 'Ready to Transform Your Tax Preparation Website?',
+        'cta_text': 'Join hundreds of tax preparation firms providing better taxpayer service with GPTsite',
+    },
+    'businessbrokergpt.ai': {
+        'brand': 'BusinessBrokerGPT',
+        'stylesheet': 'css/businessbrokergpt_landing.css',
+        'hero_text': 'GPTsite converts your existing business brokerage website into a conversational AI that provides instant answers to buyers, sellers, and investors 24/7.',
+        'demo_welcome_title': '🏢 Welcome to BusinessBrokerGPT Demo',
+        'demo_welcome_text': 'See how GPTsite transforms traditional business brokerage websites into intelligent, conversational experiences that buyers and sellers actually want to use.',
+        'demo_inquiries_title': '💼 Business Listings Made Interactive',
+        'demo_inquiries_text': 'Buyers get instant answers about business listings, financials, location details, and seller financing options - without waiting for callbacks or searching through pages.',
+        'demo_leads_title': '🚀 Lead Generation Supercharged',
+        'demo_leads_text': 'Capture leads that would otherwise leave your site frustrated. GPTsite qualifies buyers and sellers, routing them to the right broker with context and priority.',
+        'demo_results_text': 'Business brokerages using GPTsite see 40% more qualified leads, 24/7 client service, and dramatically improved buyer and seller satisfaction.',
+        'demo_trial_text': 'See how your business brokerage website looks as an intelligent GPTsite. Start your free trial and experience the future of business buyer and seller engagement.',
+        'benefits_heading': 'Why Business Brokers Choose GPTsite',
+        'benefit_leads_title': '40% More Qualified Leads',
+        'benefit_leads_text': 'AI captures buyer and seller inquiries that would otherwise be lost to confusing navigation and contact forms.',
+        'benefit_availability_text': 'Never miss a potential buyer or seller inquiry again, even outside business hours or during busy periods.',
+        'benefit_instant_text': 'No more waiting for callbacks - buyers and sellers get answers immediately about listings, valuations, and processes.',
+        'benefit_qualification_title': 'Better Lead Qualification',
+        'benefit_qualification_text': 'AI pre-qualifies buyers and sellers, routing them to the right broker with context and priority.',
+        'benefit_innovation_text': 'Show innovation and commitment to excellent client service with cutting-edge AI technology.',
+        'cta_heading': 'Ready to Transform Your Business Brokerage Website?',
+        'cta_text': 'Join leading business brokers providing better client service with GPTsite',
+    },
+}
+
+SIGNUP_CONTENT = {
+    'gptsites.ai': {
+        'product': 'GPTsite',
+        'theme_primary': '#667eea',
+        'theme_secondary': '#764ba2',
+        'theme_rgb': '102, 126, 234',
+        'subtitle': 'Replace your outdated website with a modern AI assistant that answers customer questions instantly',
+        'business_heading': 'Business Information',
+        'business_field_id': 'businessName',
+        'business_label': 'Business Name',
+        'business_placeholder': 'e.g., Acme Corporation',
+        'owner_field_id': 'owner',
+        'owner_label': 'Business Owner/Manager',
+        'owner_placeholder': 'e.g., John Smith',
+        'owner_title_label': 'Title',
+        'owner_title_placeholder': 'e.g., CEO, Owner, Manager',
+        'email_placeholder': 'e.g., owner@business.com',
+        'website_placeholder': 'e.g., https://www.yourbusiness.com',
+        'specialization_heading': 'Business Size',
+        'specialization_field_id': 'businessSize',
+        'specialization_label': 'Number of Employees',
+        'specialization_prompt': 'Select business size',
+        'specialization_options': [
+            ('1-5', '1-5 employees'),
+            ('6-20', '6-20 employees'),
+            ('21-50', '21-50 employees'),
+            ('51-100', '51-100 employees'),
+            ('100+', '100+ employees'),
+        ],
+        'inquiry_audience': 'customer',
+        'contact_name_placeholder': 'e.g., Jane Doe',
+        'contact_role_label': 'Department',
+        'contact_role_placeholder': 'e.g., Customer Service, Sales',
+        'contact_email_placeholder': 'e.g., support@business.com',
+        'submit_label': '✨ Transform My Business Now 🚀',
+    },
+    'lawfirmgpt.ai': {
+        'product': 'LawFirmGPT',
+        'theme_primary': '#1E40AF',
+        'theme_secondary': '#3730A3',
+        'theme_rgb': '30, 64, 175',
+        'subtitle': 'Replace your outdated website with a modern AI assistant that answers client questions instantly',
+        'business_heading': 'Law Firm Information',
+        'business_field_id': 'firmName',
+        'business_label': 'Law Firm Name',
+        'business_placeholder': 'e.g., Smith & Associates Law Firm',
+        'owner_field_id': 'attorney',
+        'owner_label': 'Managing Partner/Attorney',
+        'owner_placeholder': 'e.g., John Smith, Esq.',
+        'owner_title_label': 'Title',
+        'owner_title_placeholder': 'e.g., Managing Partner, Senior Attorney',
+        'email_placeholder': 'e.g., partner@lawfirm.com',
+        'website_placeholder': 'e.g., https://www.yourlawfirm.com',
+        'specialization_heading': 'Practice Areas',
+        'specialization_field_id': 'practiceAreas',
+        'specialization_label': 'Primary Practice Areas',
+        'specialization_prompt': 'Select primary practice area',
+        'specialization_options': [
+            ('Personal Injury', 'Personal Injury'),
+            ('Family Law', 'Family Law'),
+            ('Criminal Defense', 'Criminal Defense'),
+            ('Corporate Law', 'Corporate Law'),
+            ('Real Estate', 'Real Estate'),
+            ('Estate Planning', 'Estate Planning'),
+            ('Immigration', 'Immigration'),
+            ('Employment Law', 'Employment Law'),
+            ('General Practice', 'General Practice'),
+        ],
+        'inquiry_audience': 'client',
+        'contact_name_placeholder': 'e.g., Sarah Johnson',
+        'contact_role_label': 'Role',
+        'contact_role_placeholder': 'e.g., Legal Assistant, Paralegal',
+        'contact_email_placeholder': 'e.g., intake@lawfirm.com',
+        'submit_label': '⚖️ Transform My Law Firm Now 🚀',
+    },
+    'cpafirm.ai': {
+        'product': 'CPAFirm',
+        'theme_primary': '#059669',
+        'theme_secondary': '#047857',
+        'theme_rgb': '5, 150, 105',
+        'subtitle': 'Replace your outdated website with a modern AI assistant that answers client questions instantly',
+        'business_heading': 'Accounting Firm Information',
+        'business_field_id': 'firmName',
+        'business_label': 'Firm Name',
+        'business_placeholder': 'e.g., Johnson & Associates CPA',
+        'owner_field_id': 'cpa',
+        'owner_label': 'Managing Partner/CPA',
+        'owner_placeholder': 'e.g., Michael Johnson, CPA',
+        'owner_title_label': 'Title',
+        'owner_title_placeholder': 'e.g., Managing Partner, Senior CPA',
+        'email_placeholder': 'e.g., partner@cpafirm.com',
+        'website_placeholder': 'e.g., https://www.yourcpafirm.com',
+        'specialization_heading': 'Service Areas',
+        'specialization_field_id': 'serviceAreas',
+        'specialization_label': 'Primary Services',
+        'specialization_prompt': 'Select primary service area',
+        'specialization_options': [
+            ('Tax Preparation', 'Tax Preparation'),
+            ('Bookkeeping', 'Bookkeeping'),
+            ('Auditing', 'Auditing'),
+            ('Financial Planning', 'Financial Planning'),
+            ('Business Consulting', 'Business Consulting'),
+            ('Payroll Services', 'Payroll Services'),
+            ('QuickBooks Services', 'QuickBooks Services'),
+            ('Full Service CPA', 'Full Service CPA'),
+        ],
+        'inquiry_audience': 'client',
+        'contact_name_placeholder': 'e.g., Lisa Smith',
+        'contact_role_label': 'Role',
+        'contact_role_placeholder': 'e.g., Office Manager, Bookkeeper',
+        'contact_email_placeholder': 'e.g., info@cpafirm.com',
+        'submit_label': '🧮 Transform My Accounting Firm Now 🚀',
+    },
+    'taxprepgpt.ai': {
+        'product': 'TaxPrepGPT',
+        'theme_primary': '#059669',
+        'theme_secondary': '#047857',
+        'theme_rgb': '5, 150, 105',
+        'subtitle': 'Replace your outdated website with a modern AI assistant that answers taxpayer questions instantly',
+        'business_heading': 'Tax Preparation Business Information',
+        'business_field_id': 'businessName',
+        'business_label': 'Business Name',
+        'business_placeholder': 'e.g., Smith Tax Services',
+        'owner_field_id': 'preparer',
+        'owner_label': 'Tax Professional',
+        'owner_placeholder': 'e.g., Robert Smith, EA',
+        'owner_title_label': 'Title/Credentials',
+        'owner_title_placeholder': 'e.g., Enrolled Agent, CPA, Tax Preparer',
+        'email_placeholder': 'e.g., info@taxservices.com',
+        'website_placeholder': 'e.g., https://www.yourtaxservices.com',
+        'specialization_heading': 'Service Specialization',
+        'specialization_field_id': 'serviceType',
+        'specialization_label': 'Primary Tax Services',
+        'specialization_prompt': 'Select primary service type',
+        'specialization_options': [
+            ('Individual Tax Returns', 'Individual Tax Returns'),
+            ('Business Tax Returns', 'Business Tax Returns'),
+            ('Both Individual & Business', 'Both Individual & Business'),
+            ('Tax Planning', 'Tax Planning'),
+            ('IRS Representation', 'IRS Representation'),
+            ('Bookkeeping & Tax', 'Bookkeeping & Tax'),
+            ('Full Service Tax', 'Full Service Tax'),
+        ],
+        'inquiry_audience': 'taxpayer',
+        'contact_name_placeholder': 'e.g., Mary Johnson',
+        'contact_role_label': 'Role',
+        'contact_role_placeholder': 'e.g., Office Manager, Tax Assistant',
+        'contact_email_placeholder': 'e.g., appointments@taxservices.com',
+        'submit_label': '💰 Transform My Tax Business Now 🚀',
+    },
+    'businessbrokergpt.ai': {
+        'product': 'BusinessBrokerGPT',
+        'theme_primary': '#7C3AED',
+        'theme_secondary': '#5B21B6',
+        'theme_rgb': '124, 58, 237',
+        'subtitle': 'Replace your outdated website with a modern AI assistant that answers client questions instantly',
+        'business_heading': 'Business Brokerage Information',
+        'business_field_id': 'brokerageName',
+        'business_label': 'Brokerage Name',
+        'business_placeholder': 'e.g., Premier Business Brokers',
+        'owner_field_id': 'broker',
+        'owner_label': 'Principal Broker',
+        'owner_placeholder': 'e.g., David Wilson',
+        'owner_title_label': 'Title/Credentials',
+        'owner_title_placeholder': 'e.g., Principal Broker, CBI, M&A Advisor',
+        'email_placeholder': 'e.g., broker@businessbrokers.com',
+        'website_placeholder': 'e.g., https://www.yourbrokerage.com',
+        'specialization_heading': 'Deal Specialization',
+        'specialization_field_id': 'dealTypes',
+        'specialization_label': 'Primary Deal Types',
+        'specialization_prompt': 'Select primary deal focus',
+        'specialization_options': [
+            ('Small Business Sales', 'Small Business Sales ($100K-$1M)'),
+            ('Mid-Market M&A', 'Mid-Market M&A ($1M-$10M)'),
+            ('Large M&A', 'Large M&A ($10M+)'),
+            ('Franchise Sales', 'Franchise Sales'),
+            ('Restaurant Sales', 'Restaurant Sales'),
+            ('Manufacturing Sales', 'Manufacturing Sales'),
+            ('Service Business Sales', 'Service Business Sales'),
+            ('Full Service Brokerage', 'Full Service Brokerage'),
+        ],
+        'inquiry_audience': 'client',
+        'contact_name_placeholder': 'e.g., Jennifer Adams',
+        'contact_role_label': 'Role',
+        'contact_role_placeholder': 'e.g., Senior Broker, Deal Coordinator',
+        'contact_email_placeholder': 'e.g., deals@businessbrokers.com',
+        'submit_label': '🤝 Transform My Brokerage Now 🚀',
+    },
+}
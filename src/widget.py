@@ -0,0 +1,101 @@
+"""
+EdGPT Platform - Embeddable Chat Widget
+Content-hashed widget runtime, per-site JSON config and the two-line embed
+
+The embed snippet customers paste is only a loader: it fetches
+/widget/config/<site> (ETag, short max-age) and injects the runtime script
+URL named in that config. The runtime is static/js/widget.js, minified and
+served from /widget/v/<digest>.js with a one-year immutable Cache-Control,
+so a returning visitor downloads nothing but a 304 for the config. Changing
+the widget changes the digest and therefore the config; customers never
+re-paste their snippet.
+"""
+
+import hashlib
+import json
+import os
+
+from flask import Response, jsonify, redirect, request, url_for
+
+from assets import STATIC_DIR, minify_js
+
+WIDGET_SOURCE = os.path.join(STATIC_DIR, 'js', 'widget.js')
+WIDGET_CONFIG_MAX_AGE = int(os.environ.get('WIDGET_CONFIG_MAX_AGE', '300'))
+ONE_YEAR = 365 * 24 * 3600
+SIZES = ('small', 'medium', 'large')
+POSITIONS = ('bottom-right', 'bottom-left', 'top-right', 'top-left')
+
+# Fetches the site config, then the runtime it names. Kept on one line.
+LOADER = ("<script>(function(w,d){var o=w.gptsiteWidget;fetch(o.base+'/widget/config/'+o.site)"
+          ".then(function(r){return r.json()}).then(function(c){o.config=c;"
+          "var s=d.createElement('script');s.async=true;s.src=c.runtime;d.head.appendChild(s)})"
+          "})(window,document);</script>")
+
+_runtime = None
+
+
+def load_runtime(path=WIDGET_SOURCE):
+    """(minified bytes, digest) of the widget runtime, read once per worker"""
+    global _runtime
+    if _runtime is None:
+        with open(path, encoding='utf-8') as f:
+            body = minify_js(f.read()).encode('utf-8')
+        _runtime = (body, hashlib.sha256(body).hexdigest()[:12])
+    return _runtime
+
+
+def site_config(site, tenant):
+    """Public widget settings for a tenant; everything the runtime renders"""
+    config = tenant.config
+    return {
+        'site': site,
+        'name': config['name'],
+        'icon': config['icon'],
+        'color': config['color'],
+        'greeting': (f"Hi! I'm your {config['industry'].lower()} assistant. I can help you with "
+                     "information about our services. What would you like to know?"),
+        'runtime': url_for('widget_runtime', digest=load_runtime()[1], _external=True),
+    }
+
+
+def embed_snippet(site, base_url, color=None, position='bottom-right', size='medium'):
+    """The two-line loader customers paste into their pages"""
+    options = {'site': site, 'base': base_url.rstrip('/'),
+               'position': position if position in POSITIONS else 'bottom-right',
+               'size': size if size in SIZES else 'medium'}
+    if color:
+        options['color'] = color
+    # Escape "</" so option values cannot close the script element
+    options_js = json.dumps(options, separators=(',', ':')).replace('</', '<\\/')
+    return f"<script>window.gptsiteWidget={options_js};</script>\n{LOADER}"
+
+
+def register_widget_routes(app, find_tenant):
+    """Add /widget/config/<site> and /widget/v/<digest>.js
+
+    find_tenant(site) returns the tenant for a domain, or None.
+    """
+
+    @app.route('/widget/config/<site>')
+    def widget_config(site):
+        tenant = find_tenant(site.lower())
+        if tenant is None:
+            return jsonify({'error': 'Unknown site'}), 404
+        response = jsonify(site_config(site.lower(), tenant))
+        response.headers['Cache-Control'] = f'public, max-age={WIDGET_CONFIG_MAX_AGE}'
+        # Embedded on customers' origins
+        response.headers['Access-Control-Allow-Origin'] = '*'
+        response.add_etag()
+        return response.make_conditional(request)
+
+    @app.route('/widget/v/<digest>.js')
+    def widget_runtime(digest):
+        body, current = load_runtime()
+        if digest != current:
+            # Stale config from an older deploy; point at the current runtime
+            return redirect(url_for('widget_runtime', digest=current))
+        response = Response(body, mimetype='application/javascript')
+        response.headers['Cache-Control'] = f'public, max-age={ONE_YEAR}, immutable'
+        response.headers['Access-Control-Allow-Origin'] = '*'
+        response.add_etag()
+        return response.make_conditional(request)